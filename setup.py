@@ -187,6 +187,7 @@ setup(
         "console_scripts": [
             "mvs_tool=multi_vector_simulator.cli:main",
             "mvs_report=multi_vector_simulator.cli:report",
+            "mvs_reevaluate=multi_vector_simulator.cli:reevaluate",
             "mvs_create_input_template=multi_vector_simulator.cli:create_input_template_folder",
         ],
     },
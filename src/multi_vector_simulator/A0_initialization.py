@@ -7,7 +7,7 @@ Module A0_initialization defines functions to parse user inputs to the MVS simul
     - Parse command line arguments and set default values for MVS parameters if not provided
     - Check that all necessary files and folder exist
     - Create output directory
-    - Define screen logging depth
+    - Define screen logging depth (see `get_screen_level()`)
 
 Usage from root of repository:
 
@@ -57,9 +57,6 @@ import logging
 import os
 import shutil
 
-from oemof.tools import logger
-
-
 from multi_vector_simulator.utils.constants import (
     REPO_PATH,
     PACKAGE_DATA_PATH,
@@ -82,18 +79,40 @@ from multi_vector_simulator.utils.constants import (
     OVERWRITE,
     DISPLAY_OUTPUT,
     SAVE_PNG,
+    FROM_PROCESSED,
+    RAW_RESULTS,
+    RAW_RESULTS_FILE,
     LOGFILE,
     REPORT_FOLDER,
     OUTPUT_FOLDER,
     PDF_REPORT,
+    JSON_PROCESSED,
     JSON_WITH_RESULTS,
     JSON_FILE_EXTENSION,
     ARG_PDF,
     ARG_REPORT_PATH,
     ARG_PATH_SIM_OUTPUT,
     ARG_DEBUG_REPORT,
+    SOLVER_ARGUMENTS,
+    DEFAULT_SOLVER,
+    DEFAULT_SOLVER_MIP_GAP,
+    SOLVER_METHOD_SIMPLEX,
+    SOLVER_METHOD_BARRIER,
+    SOLVER_INTERFACE_SHELL,
+    SOLVER_INTERFACE_DIRECT,
+    SOLVER_INTERFACE_PERSISTENT,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    LABEL,
+    SOLVER,
+    SOLVER_THREADS,
+    SOLVER_TIME_LIMIT,
+    SOLVER_MIP_GAP,
+    SOLVER_PRESOLVE,
+    SOLVER_METHOD,
+    SOLVER_INTERFACE,
+    STORE_RAW_RESULTS,
 )
-from multi_vector_simulator.utils.constants_json_strings import LABEL
 
 
 def mvs_arg_parser():
@@ -105,6 +124,11 @@ def mvs_arg_parser():
 
         python mvs_tool.py [-h] [-i [PATH_INPUT_FOLDER]] [-ext [{json,csv}]] [-o [PATH_OUTPUT_FOLDER]]
         [-log [{debug,info,error,warning}]] [-f [OVERWRITE]] [-pdf [PDF_REPORT]] [-png [SAVE_PNG]]
+        [--from-processed FROM_PROCESSED] [--raw-results RAW_RESULTS] [--store-raw-results]
+        [--solver SOLVER] [--solver-threads SOLVER_THREADS]
+        [--solver-time-limit SOLVER_TIME_LIMIT] [--solver-mip-gap SOLVER_MIP_GAP]
+        [--solver-presolve {on,off}] [--solver-method {simplex,barrier}]
+        [--solver-interface {shell,direct,persistent}]
 
     Usage when multi-vector-simulator is installed as a package:
 
@@ -112,6 +136,11 @@ def mvs_arg_parser():
 
         mvs_tool [-h] [-i [PATH_INPUT_FOLDER]] [-ext [{json,csv}]] [-o [PATH_OUTPUT_FOLDER]]
         [-log [{debug,info,error,warning}]] [-f [OVERWRITE]] [-pdf [PDF_REPORT]] [-png [SAVE_PNG]]
+        [--from-processed FROM_PROCESSED] [--raw-results RAW_RESULTS] [--store-raw-results]
+        [--solver SOLVER] [--solver-threads SOLVER_THREADS]
+        [--solver-time-limit SOLVER_TIME_LIMIT] [--solver-mip-gap SOLVER_MIP_GAP]
+        [--solver-presolve {on,off}] [--solver-method {simplex,barrier}]
+        [--solver-interface {shell,direct,persistent}]
 
     Process MVS arguments
 
@@ -140,6 +169,44 @@ def mvs_arg_parser():
         -png [SAVE_PNG]
             generate png figures of the simulation in the output_folder if True (default: False)
 
+        --from-processed FROM_PROCESSED
+            path to the processed json file of a previous simulation (or to the folder containing
+            it), the simulation is resumed from it without pre-processing the input files
+
+        --raw-results RAW_RESULTS
+            path to the raw results file of a previous simulation (or to the folder containing
+            it), the simulation is re-evaluated from it without building and solving the
+            optimization model
+
+        --store-raw-results
+            store the raw results of the optimization in the output folder, so that the
+            simulation can be re-evaluated with `mvs_reevaluate` (default: the simulation setting
+            'store_raw_results', False if not defined)
+
+        --solver SOLVER
+            solver used for the optimization, any solver pyomo can find locally (default: 'cbc')
+
+        --solver-threads SOLVER_THREADS
+            number of threads used by the solver
+
+        --solver-time-limit SOLVER_TIME_LIMIT
+            time limit of the solver in seconds
+
+        --solver-mip-gap SOLVER_MIP_GAP
+            relative MIP gap at which the solver stops (default: 0.03)
+
+        --solver-presolve {on,off}
+            turn the presolve of the solver on or off
+
+        --solver-method {simplex,barrier}
+            method used by the solver to solve the linear problems
+
+        --solver-interface {shell,direct,persistent}
+            interface used to pass the model to the solver, the direct and persistent interfaces
+            avoid writing an lp file if they are available for the solver (default: 'shell')
+
+        The solver options overwrite the ones of the simulation settings of the input files.
+
 
     :return: parser
     """
@@ -208,6 +275,92 @@ def mvs_arg_parser():
         default=False,
         type=bool,
     )
+    parser.add_argument(
+        "--from-processed",
+        dest=FROM_PROCESSED,
+        help=f"path to the processed json file ({JSON_PROCESSED}{JSON_FILE_EXTENSION}) of a previous "
+        f"simulation or to the folder containing it, the simulation is resumed from it without "
+        f"pre-processing the input files",
+        type=str,
+        default=None,
+    )
+    parser.add_argument(
+        "--raw-results",
+        dest=RAW_RESULTS,
+        help=f"path to the raw results file ({RAW_RESULTS_FILE}) of a previous simulation or to "
+        f"the folder containing it, the simulation is re-evaluated from it without building and "
+        f"solving the optimization model",
+        type=str,
+        default=None,
+    )
+    parser.add_argument(
+        "--store-raw-results",
+        dest=STORE_RAW_RESULTS,
+        help=f"store the raw results of the optimization ({RAW_RESULTS_FILE}) in the output "
+        f"folder, so that the simulation can be re-evaluated without optimization",
+        action="store_const",
+        const=True,
+        default=None,
+    )
+    parser.add_argument(
+        "--solver",
+        dest=SOLVER,
+        help=f"solver used for the optimization, any solver pyomo can find locally "
+        f"(default: '{DEFAULT_SOLVER}')",
+        type=str,
+        default=None,
+    )
+    parser.add_argument(
+        "--solver-threads",
+        dest=SOLVER_THREADS,
+        help="number of threads used by the solver",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "--solver-time-limit",
+        dest=SOLVER_TIME_LIMIT,
+        help="time limit of the solver in seconds",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "--solver-mip-gap",
+        dest=SOLVER_MIP_GAP,
+        help=f"relative MIP gap at which the solver stops (default: {DEFAULT_SOLVER_MIP_GAP})",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "--solver-presolve",
+        dest=SOLVER_PRESOLVE,
+        help="turn the presolve of the solver on or off",
+        type=str,
+        default=None,
+        choices=["on", "off"],
+    )
+    parser.add_argument(
+        "--solver-method",
+        dest=SOLVER_METHOD,
+        help="method used by the solver to solve the linear problems",
+        type=str,
+        default=None,
+        choices=[SOLVER_METHOD_SIMPLEX, SOLVER_METHOD_BARRIER],
+    )
+    parser.add_argument(
+        "--solver-interface",
+        dest=SOLVER_INTERFACE,
+        help=f"interface used to pass the model to the solver, the direct and persistent "
+        f"interfaces avoid writing an lp file if they are available for the solver "
+        f"(default: '{SOLVER_INTERFACE_SHELL}')",
+        type=str,
+        default=None,
+        choices=[
+            SOLVER_INTERFACE_SHELL,
+            SOLVER_INTERFACE_DIRECT,
+            SOLVER_INTERFACE_PERSISTENT,
+        ],
+    )
     return parser
 
 
@@ -331,6 +484,94 @@ def check_input_folder(path_input_folder, input_type):
     return path_input_file
 
 
+def check_processed_json(path_processed_json, path_output_folder, overwrite):
+    """Enforces the rules for the processed json file a simulation is resumed from
+
+        If path_processed_json is a folder, the processed json file (JSON_PROCESSED) within this
+        folder is used. An error is raised if the file does not exist or if it is located in the
+        path_output_folder which would be removed when overwriting it.
+
+    :param path_processed_json: path to the processed json file or to the folder containing it
+    :param path_output_folder: path to output folder
+    :param overwrite: boolean indicating what to do if the output folder exists already
+    :return: the path to the processed json file
+    """
+
+    logging.debug("Checking for processed json file")
+
+    if os.path.isdir(path_processed_json):
+        path_processed_json = os.path.join(
+            path_processed_json, JSON_PROCESSED + JSON_FILE_EXTENSION
+        )
+
+    if os.path.exists(path_processed_json) is False:
+        raise (
+            FileNotFoundError(
+                "Missing processed json file!\n"
+                "The processed json file '{}' can not be found.\n"
+                "Operation terminated.".format(path_processed_json)
+            )
+        )
+
+    if overwrite is True and os.path.abspath(path_processed_json).startswith(
+        os.path.join(os.path.abspath(path_output_folder), "")
+    ):
+        raise (
+            FileExistsError(
+                "The processed json file '{}' is located in the output folder '{}', "
+                "which would be removed when overwriting it. "
+                "Please provide the name of a new output folder with option -o.".format(
+                    path_processed_json, path_output_folder
+                )
+            )
+        )
+
+    return path_processed_json
+
+
+def check_raw_results_file(path_raw_results, path_output_folder, overwrite):
+    """Enforces the rules for the raw results file a simulation is re-evaluated from
+
+        If path_raw_results is a folder, the raw results file (RAW_RESULTS_FILE) within this
+        folder is used. An error is raised if the file does not exist or if it is located in the
+        path_output_folder which would be removed when overwriting it.
+
+    :param path_raw_results: path to the raw results file or to the folder containing it
+    :param path_output_folder: path to output folder
+    :param overwrite: boolean indicating what to do if the output folder exists already
+    :return: the path to the raw results file
+    """
+
+    logging.debug("Checking for raw results file")
+
+    if os.path.isdir(path_raw_results):
+        path_raw_results = os.path.join(path_raw_results, RAW_RESULTS_FILE)
+
+    if os.path.exists(path_raw_results) is False:
+        raise (
+            FileNotFoundError(
+                "Missing raw results file!\n"
+                "The raw results file '{}' can not be found.\n"
+                "Operation terminated.".format(path_raw_results)
+            )
+        )
+
+    if overwrite is True and os.path.abspath(path_raw_results).startswith(
+        os.path.join(os.path.abspath(path_output_folder), "")
+    ):
+        raise (
+            FileExistsError(
+                "The raw results file '{}' is located in the output folder '{}', "
+                "which would be removed when overwriting it. "
+                "Please provide the name of a new output folder with option -o.".format(
+                    path_raw_results, path_output_folder
+                )
+            )
+        )
+
+    return path_raw_results
+
+
 def check_output_folder(path_input_folder, path_output_folder, overwrite):
     """Enforces the rules for the output folder
 
@@ -377,6 +618,29 @@ def check_output_folder(path_input_folder, path_output_folder, overwrite):
     shutil.copytree(path_input_folder, path_output_folder_inputs)
 
 
+def get_screen_level(display_output):
+    """
+    Translates the display_output argument into the level of the log messages displayed on screen
+
+    The log messages of a simulation are handled with `utils.simulation_log.simulation_log()`.
+
+    :param display_output:
+        "debug", "info", "warning" or "error"
+    :return: logging level, logging.INFO if display_output is not one of the options
+    """
+    if display_output == "debug":
+        screen_level = logging.DEBUG
+    elif display_output == "info":
+        screen_level = logging.INFO
+    elif display_output == "warning":
+        screen_level = logging.WARNING
+    elif display_output == "error":
+        screen_level = logging.ERROR
+    else:
+        screen_level = logging.INFO
+    return screen_level
+
+
 def process_user_arguments(
     path_input_folder=None,
     input_type=None,
@@ -386,6 +650,16 @@ def process_user_arguments(
     display_output=None,
     save_png=None,
     lp_file_output=False,
+    from_processed=None,
+    raw_results=None,
+    store_raw_results=None,
+    solver=None,
+    solver_threads=None,
+    solver_time_limit=None,
+    solver_mip_gap=None,
+    solver_presolve=None,
+    solver_method=None,
+    solver_interface=None,
     welcome_text=None,
 ):
     """
@@ -414,6 +688,35 @@ def process_user_arguments(
         "error": Only errors,
     :param lp_file_output:
         Save linear equation system generated as lp file
+    :param from_processed:
+        (Optional) Path to the processed json file of a previous simulation (or to the folder
+        containing it) to resume the simulation from, without pre-processing the input files
+        (command line "--from-processed")
+    :param raw_results:
+        (Optional) Path to the raw results file of a previous simulation (or to the folder
+        containing it) to re-evaluate the simulation from, without building and solving the
+        optimization model (command line "--raw-results")
+    :param store_raw_results:
+        (Optional) Store the raw results of the optimization in the output folder if True,
+        overwrites the simulation setting STORE_RAW_RESULTS (command line "--store-raw-results")
+    :param solver:
+        (Optional) Solver used for the optimization (command line "--solver")
+    :param solver_threads:
+        (Optional) Number of threads used by the solver (command line "--solver-threads")
+    :param solver_time_limit:
+        (Optional) Time limit of the solver in seconds (command line "--solver-time-limit")
+    :param solver_mip_gap:
+        (Optional) Relative MIP gap at which the solver stops (command line "--solver-mip-gap")
+    :param solver_presolve:
+        (Optional) Turn the presolve of the solver on (True) or off (False)
+        (command line "--solver-presolve")
+    :param solver_method:
+        (Optional) Method used by the solver to solve the linear problems, "simplex" or "barrier"
+        (command line "--solver-method")
+    :param solver_interface:
+        (Optional) Interface used to pass the model to the solver, "shell", "direct" or
+        "persistent" (command line "--solver-interface")
+        The solver and solver options overwrite the ones of the simulation settings if provided
     :param welcome_text:
         Text to be displayed
     :return: a dict with these arguments as keys (except welcome_text which is replaced by label)
@@ -452,6 +755,32 @@ def process_user_arguments(
     if save_png is None:
         save_png = args.get(SAVE_PNG, DEFAULT_MAIN_KWARGS[SAVE_PNG])
 
+    if from_processed is None:
+        from_processed = args.get(FROM_PROCESSED, DEFAULT_MAIN_KWARGS[FROM_PROCESSED])
+
+    if raw_results is None:
+        raw_results = args.get(RAW_RESULTS, DEFAULT_MAIN_KWARGS[RAW_RESULTS])
+
+    if store_raw_results is None:
+        store_raw_results = args.get(
+            STORE_RAW_RESULTS, DEFAULT_MAIN_KWARGS[STORE_RAW_RESULTS]
+        )
+
+    solver_settings = {
+        SOLVER: solver,
+        SOLVER_THREADS: solver_threads,
+        SOLVER_TIME_LIMIT: solver_time_limit,
+        SOLVER_MIP_GAP: solver_mip_gap,
+        SOLVER_PRESOLVE: solver_presolve,
+        SOLVER_METHOD: solver_method,
+        SOLVER_INTERFACE: solver_interface,
+    }
+    for setting in SOLVER_ARGUMENTS:
+        if solver_settings[setting] is None:
+            solver_settings[setting] = args.get(setting, DEFAULT_MAIN_KWARGS[setting])
+    if solver_settings[SOLVER_PRESOLVE] in ("on", "off"):
+        solver_settings[SOLVER_PRESOLVE] = solver_settings[SOLVER_PRESOLVE] == "on"
+
     # if the default input file does not exist, use package default input file
     if (
         path_input_folder == DEFAULT_INPUT_PATH
@@ -462,7 +791,14 @@ def process_user_arguments(
             "No default input file found in your path, using example simulation input"
         )
 
-    path_input_file = check_input_folder(path_input_folder, input_type)
+    if from_processed is None:
+        path_input_file = check_input_folder(path_input_folder, input_type)
+    else:
+        path_input_file = check_processed_json(
+            from_processed, path_output_folder, overwrite
+        )
+    if raw_results is not None:
+        raw_results = check_raw_results_file(raw_results, path_output_folder, overwrite)
     check_output_folder(path_input_folder, path_output_folder, overwrite)
 
     user_input = {
@@ -474,7 +810,11 @@ def process_user_arguments(
         OVERWRITE: overwrite,
         DISPLAY_OUTPUT: display_output,
         "lp_file_output": lp_file_output,
+        FROM_PROCESSED: from_processed is not None,
+        RAW_RESULTS: raw_results,
+        STORE_RAW_RESULTS: store_raw_results,
     }
+    user_input.update(solver_settings)
 
     if pdf_report is True:
         user_input.update(
@@ -488,37 +828,6 @@ def process_user_arguments(
     if save_png is True:
         user_input.update({"path_png_figs": path_output_folder})
 
-    if display_output == "debug":
-        screen_level = logging.DEBUG
-    elif display_output == "info":
-        screen_level = logging.INFO
-    elif display_output == "warning":
-        screen_level = logging.WARNING
-    elif display_output == "error":
-        screen_level = logging.ERROR
-    else:
-        screen_level = logging.INFO
-
-    # Define logging settings and path for saving log
-    logger.define_logging(
-        logpath=path_output_folder,
-        logfile=LOGFILE,
-        file_level=logging.DEBUG,
-        screen_level=screen_level,
-    )
-
-    # Disable log messages of external libraries saving into the log file, unless they are ERROR or CRITICAL level
-    for ext_lib_logger in (
-        "asyncio",
-        "asyncio.coroutines",
-        "websockets.server",
-        "websockets.protocol",
-        "websockets.client",
-        "urllib3.connectionpool",
-        "PIL.PngImagePlugin",
-    ):
-        logger.getLogger(ext_lib_logger).setLevel(logging.ERROR)
-
     if welcome_text is not None:
         # display welcome text
         logging.info(welcome_text)
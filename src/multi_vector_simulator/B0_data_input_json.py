@@ -4,6 +4,7 @@ Module B0 - Data input json
 """
 import logging
 import copy
+import hashlib
 import json
 import os
 
@@ -14,6 +15,8 @@ from multi_vector_simulator.utils import (
     data_parser,
     compare_input_parameters_with_reference,
 )
+from multi_vector_simulator.utils.exceptions import ProcessedJsonChecksumError
+from multi_vector_simulator.version import version_num
 
 from multi_vector_simulator.utils.constants_json_strings import (
     START_DATE,
@@ -26,6 +29,7 @@ from multi_vector_simulator.utils.constants_json_strings import (
     VALUE,
     DATA,
     TIMESERIES,
+    PROCESSED_JSON_CHECKSUM,
 )
 
 from multi_vector_simulator.utils.constants import (
@@ -337,3 +341,142 @@ def load_json(
     )
 
     return dict_values
+
+
+def compute_processed_json_checksum(json_dict):
+    """Computes the checksum of a processed json file (JSON_PROCESSED) for the current MVS version
+
+    Parameters
+    ----------
+    json_dict: dict
+        Content of the processed json file, as loaded with json.load()
+
+    Returns
+    -------
+    checksum: str
+        md5 hash of the MVS version number and of the content of the file, the
+        PROCESSED_JSON_CHECKSUM itself excluded
+
+    Notes
+    -----
+    Tested with:
+    - B0.test_compute_processed_json_checksum_depends_on_content()
+    """
+    json_string = json.dumps(
+        {key: json_dict[key] for key in json_dict if key != PROCESSED_JSON_CHECKSUM},
+        sort_keys=True,
+    )
+    return hashlib.md5((version_num + json_string).encode("utf-8")).hexdigest()
+
+
+def verify_processed_json_checksum(json_dict):
+    """Verifies that a processed json file matches the current MVS version and was not modified
+
+    Parameters
+    ----------
+    json_dict: dict
+        Content of the processed json file, as loaded with json.load()
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Raises ProcessedJsonChecksumError if the PROCESSED_JSON_CHECKSUM is missing or does not match.
+
+    Tested with:
+    - B0.test_load_processed_json()
+    - B0.test_load_processed_json_modified_content()
+    - B0.test_load_processed_json_without_checksum()
+    """
+    if PROCESSED_JSON_CHECKSUM not in json_dict:
+        raise ProcessedJsonChecksumError(
+            f"The processed json file has no {PROCESSED_JSON_CHECKSUM}, it was not stored by "
+            f"the MVS (V{version_num}). Please run the simulation from the input files."
+        )
+    if json_dict[PROCESSED_JSON_CHECKSUM] != compute_processed_json_checksum(json_dict):
+        raise ProcessedJsonChecksumError(
+            f"The {PROCESSED_JSON_CHECKSUM} of the processed json file does not match, it was either "
+            f"stored by another MVS version than V{version_num} or modified afterwards. "
+            f"Please run the simulation from the input files."
+        )
+
+
+def convert_processed_json_to_dict_values(json_dict):
+    """Converts the content of a processed json file (JSON_PROCESSED) to dict_values
+
+    The pre-processing (C0) is not needed anymore, the returned dict_values can directly be
+    used to build the oemof model (D0).
+
+    Parameters
+    ----------
+    json_dict: dict
+        Content of the processed json file, as loaded with json.load()
+
+    Returns
+    -------
+    dict_values: dict
+        All simulation parameters, as after the pre-processing in C0
+
+    Notes
+    -----
+    Raises ProcessedJsonChecksumError if the file does not match the current MVS version.
+
+    Tested with:
+    - B0.test_load_processed_json()
+    """
+    verify_processed_json_checksum(json_dict)
+    json_dict = {
+        key: json_dict[key] for key in json_dict if key != PROCESSED_JSON_CHECKSUM
+    }
+
+    json_dict[SIMULATION_SETTINGS] = convert_from_json_to_special_types(
+        json_dict[SIMULATION_SETTINGS]
+    )
+    retrieve_date_time_info(json_dict[SIMULATION_SETTINGS])
+    dict_values = convert_from_json_to_special_types(
+        json_dict, time_index=json_dict[SIMULATION_SETTINGS][TIME_INDEX]
+    )
+    return dict_values
+
+
+def load_processed_json(path_processed_json, path_output_folder=None):
+    """Opens and reads a processed json file (JSON_PROCESSED) stored by a previous simulation
+
+    Parameters
+    ----------
+    path_processed_json: str
+        The path to the processed json file
+    path_output_folder : str, optional
+        The path to the directory where the results of the simulation are saved. If not provided,
+        the output folder of the simulation which stored the processed json file is used.
+        Default: None
+
+    Returns
+    -------
+    dict_values: dict
+        All simulation parameters, as after the pre-processing in C0
+
+    Notes
+    -----
+    Tested with:
+    - B0.test_load_processed_json()
+    - B0.test_load_processed_json_path_output_folder()
+    """
+    with open(path_processed_json) as json_file:
+        json_dict = json.load(json_file)
+
+    dict_values = convert_processed_json_to_dict_values(json_dict)
+
+    # The user specified a value
+    if path_output_folder is not None:
+        dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER] = path_output_folder
+        dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER_INPUTS] = os.path.join(
+            path_output_folder, INPUTS_COPY
+        )
+
+    logging.info(
+        f"Loaded the processed simulation data from {path_processed_json}, the pre-processing is skipped."
+    )
+    return dict_values
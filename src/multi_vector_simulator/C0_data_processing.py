@@ -19,9 +19,13 @@ Module C0 prepares the data read from csv or json for simulation, ie. pre-proces
 - Add a source if a conversion object is connected to a new input_direction (bug #186)
 - Define all necessary energyBusses and add all assets that are connected to them specifically with asset name and label
 - Multiply `maximumCap` of non-dispatchable sources by max(timeseries(kWh/kWp)) as the `maximumCap` is limiting the flow but we want to limit the installed capacity (see issue #446)
+- Incremental pre-processing: Only re-process assets whose inputs changed compared to a previous pre-processing
 """
 
 
+import copy
+import hashlib
+import json
 import logging
 import os
 import sys
@@ -45,6 +49,27 @@ import multi_vector_simulator.B0_data_input_json as B0
 import multi_vector_simulator.C1_verification as C1
 import multi_vector_simulator.C2_economic_functions as C2
 import multi_vector_simulator.F0_output as F0
+from multi_vector_simulator.utils.asset_registry import (
+    build_asset_registry,
+    get_asset_registry,
+)
+
+# Asset groups processed in C0, the order is important (see process_all_assets())
+ASSET_GROUPS_OF_PREPROCESSING = (
+    ENERGY_PROVIDERS,
+    ENERGY_CONVERSION,
+    ENERGY_STORAGE,
+    ENERGY_PRODUCTION,
+    ENERGY_CONSUMPTION,
+)
+
+# Simulation settings that the pre-processing depends on (time index and location of the timeseries)
+SIMULATION_SETTINGS_OF_PREPROCESSING = (
+    START_DATE,
+    EVALUATED_PERIOD,
+    TIMESTEP,
+    PATH_INPUT_FOLDER,
+)
 
 
 def all(dict_values):
@@ -72,6 +97,23 @@ def all(dict_values):
     # Adds costs to each asset and sub-asset, adds time series to assets
     process_all_assets(dict_values)
 
+    check_pre_processed_values(dict_values)
+
+
+def check_pre_processed_values(dict_values):
+    """
+    Verifies the pre-processed dict_values with C1 and indexes all busses and assets
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after processing all assets
+
+    Returns
+    -------
+    None, the asset registry of dict_values is built again with all busses and assets, see
+    `utils.asset_registry.get_asset_registry()`
+    """
     # check electricity price >= feed-in tariff todo: can be integrated into check_input_values() later
     C1.check_feedin_tariff_vs_energy_price(dict_values=dict_values)
     # check that energy supply costs are not lower than generation costs of any asset (of the same energy vector)
@@ -93,8 +135,328 @@ def all(dict_values):
     # Perform basic (limited) check for module completeness
     C1.check_for_sufficient_assets_on_busses(dict_values)
 
-    # just to be safe, run evaluation a second time
+    # Index all busses and assets for the following modules, this also checks again
+    # that the labels of the assets added in the pre-processing are unique
+    build_asset_registry(dict_values)
+
+
+def all_incremental(
+    dict_values, processed_dict_values, processed_fingerprints, fingerprints
+):
+    """
+    Pre-processing of dict_values, reusing the pre-processed assets of a previous run
+
+    Only the assets whose raw inputs changed since the previous pre-processing are
+    processed again (incl. reading their timeseries), all other assets are copied from
+    `processed_dict_values`. The dependencies of the pre-processing on the raw inputs
+    are recorded with get_preprocessing_fingerprints():
+
+    - changes of the simulation settings relevant for C0 (SIMULATION_SETTINGS_OF_PREPROCESSING),
+      of the busses or of the asset topology (asset keys and labels, in- and outflow directions,
+      peak demand pricing periods) affect all assets, in this case all() is called
+    - changes of the economic data affect the lifetime costs of all assets and the lifetime
+      of all assets without a LIFETIME of their own, which are re-evaluated
+    - changes of an asset only affect the asset itself, and for an energy provider
+      its auxiliary sources, sinks and peak demand pricing transformers
+
+    Parameters
+    ----------
+    dict_values: dict
+        All raw input data in dict format, eg. a modified copy of the input of the previous run
+
+    processed_dict_values: dict
+        dict_values of the previous run, as pre-processed by all() or all_incremental().
+        It is not modified, as the re-used assets are copied.
+
+    processed_fingerprints: dict
+        Fingerprints of the raw input of the previous run, see get_preprocessing_fingerprints()
+
+    fingerprints: dict
+        Fingerprints of dict_values, determined before the pre-processing
+
+    Returns
+    -------
+    Pre-processed dict_values, as with all()
+
+    Notes
+    -----
+    Changes of the content of timeseries files are not tracked, only changes of their file names.
+    The fingerprints are not stored in dict_values, the caller keeps them with the pre-processed
+    dict_values (eg. in the processed_input_cache of `server.run_simulation()`).
+
+    Tested with:
+    - C0.test_all_incremental_equals_all_for_changed_asset()
+    - C0.test_all_incremental_equals_all_for_changed_energy_provider()
+    - C0.test_all_incremental_equals_all_for_changed_economic_data()
+    - C0.test_all_incremental_does_not_reprocess_unchanged_assets()
+    - C0.test_get_assets_to_reprocess_topology_changed()
+    """
+    assets_to_reprocess = get_assets_to_reprocess(processed_fingerprints, fingerprints)
+    if assets_to_reprocess is None:
+        logging.info(
+            "The simulation settings, busses or asset topology changed since the previous pre-processing. "
+            "All assets are pre-processed."
+        )
+        all(dict_values)
+        return
+
+    economic_data_changed = (
+        processed_fingerprints[ECONOMIC_DATA] != fingerprints[ECONOMIC_DATA]
+    )
+    raw_assets = {group: dict_values[group] for group in ASSET_GROUPS_OF_PREPROCESSING}
+
+    B0.retrieve_date_time_info(dict_values[SIMULATION_SETTINGS])
+    add_economic_parameters(dict_values[ECONOMIC_DATA])
+    # Busses including their asset dicts and excess sinks are only defined by the topology
+    dict_values[ENERGY_BUSSES] = copy.deepcopy(processed_dict_values[ENERGY_BUSSES])
+    # Check if any asset label has duplicates, the busses defined by the pre-processing are registered with them
     C1.check_for_label_duplicates(dict_values)
+    dict_values[SIMULATION_SETTINGS].update(
+        {
+            EXCESS
+            + AUTO_SINK: copy.deepcopy(
+                processed_dict_values[SIMULATION_SETTINGS][EXCESS + AUTO_SINK]
+            )
+        }
+    )
+    define_energy_vectors_from_busses(dict_values)
+
+    # Keep the order of the assets of the previous run, re-use all unchanged assets
+    for group in ASSET_GROUPS_OF_PREPROCESSING:
+        dict_values[group] = {
+            asset: raw_assets[group][asset]
+            if asset in assets_to_reprocess[group]
+            else copy.deepcopy(processed_dict_values[group][asset])
+            for asset in processed_dict_values[group]
+        }
+    C1.check_if_energy_vector_of_all_assets_is_valid(dict_values)
+
+    for group in ASSET_GROUPS_OF_PREPROCESSING:
+        for asset in assets_to_reprocess[group]:
+            add_asset_to_asset_dict_for_each_flow_direction(
+                dict_values, dict_values[group][asset], asset
+            )
+
+    # The auxiliary sources, sinks and transformers of the energy providers and the excess sinks
+    # are (re-)defined with the project duration as lifetime
+    if economic_data_changed:
+        assets_to_reprocess.update(
+            {ENERGY_PROVIDERS: list(raw_assets[ENERGY_PROVIDERS])}
+        )
+        assets_to_reprocess[ENERGY_CONSUMPTION] += define_excess_sinks(dict_values)
+
+    # As the asset topology includes the label and the number of peak demand pricing periods
+    # of the energy providers, the keys of their auxiliary assets do not change
+    energyProviders(
+        dict_values, ENERGY_PROVIDERS, asset_keys=assets_to_reprocess[ENERGY_PROVIDERS]
+    )
+    for dso in assets_to_reprocess[ENERGY_PROVIDERS]:
+        assets_to_reprocess[ENERGY_CONVERSION] += dict_values[ENERGY_PROVIDERS][dso][
+            CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS
+        ]
+        assets_to_reprocess[ENERGY_PRODUCTION].append(dso + DSO_CONSUMPTION)
+        assets_to_reprocess[ENERGY_CONSUMPTION].append(
+            dict_values[ENERGY_PROVIDERS][dso][CONNECTED_FEEDIN_SINK]
+        )
+
+    asset_group_list = {
+        ENERGY_CONVERSION: energyConversion,
+        ENERGY_STORAGE: energyStorage,
+        ENERGY_PRODUCTION: energyProduction,
+        ENERGY_CONSUMPTION: energyConsumption,
+    }
+    for asset_group, asset_function in asset_group_list.items():
+        if len(assets_to_reprocess[asset_group]) > 0:
+            asset_function(
+                dict_values, asset_group, asset_keys=assets_to_reprocess[asset_group]
+            )
+
+    if economic_data_changed:
+        update_default_lifetimes(dict_values, raw_assets)
+        list_of_dict_assets = get_assets_with_costs(dict_values)
+    else:
+        list_of_dict_assets = get_assets_with_costs(dict_values, assets_to_reprocess)
+    evaluate_lifetime_costs_of_assets(
+        dict_values[SIMULATION_SETTINGS],
+        dict_values[ECONOMIC_DATA],
+        list_of_dict_assets,
+    )
+
+    number_of_reprocessed_assets = sum(
+        [len(assets_to_reprocess[group]) for group in assets_to_reprocess]
+    )
+    logging.info(
+        f"Incremental pre-processing: {number_of_reprocessed_assets} assets were pre-processed, "
+        f"the lifetime costs of {len(list_of_dict_assets)} assets and sub-assets were evaluated."
+    )
+
+    check_pre_processed_values(dict_values)
+
+
+def fingerprint(value):
+    """
+    Determines a fingerprint of a (nested) value of dict_values
+
+    Parameters
+    ----------
+    value: dict, list, str, float, pd.Series or any other type that can be stored as json
+
+    Returns
+    -------
+    fingerprint: str
+        md5 hash of the json representation of the value
+    """
+    json_string = json.dumps(
+        value, sort_keys=True, default=B0.convert_from_special_types_to_json
+    )
+    return hashlib.md5(json_string.encode("utf-8")).hexdigest()
+
+
+def get_preprocessing_fingerprints(dict_values):
+    """
+    Records the fingerprints of the raw inputs the pre-processing depends on
+
+    Parameters
+    ----------
+    dict_values: dict
+        All raw input data in dict format (before pre-processing)
+
+    Returns
+    -------
+    fingerprints: dict
+        Fingerprints of the SIMULATION_SETTINGS_OF_PREPROCESSING, ENERGY_BUSSES,
+        ECONOMIC_DATA and the ASSET_TOPOLOGY, as well as a dict with the fingerprints
+        of each asset of the asset groups in ASSET_GROUPS_OF_PREPROCESSING
+
+    Notes
+    -----
+    Tested with:
+    - C0.test_get_preprocessing_fingerprints()
+    """
+    settings = dict_values[SIMULATION_SETTINGS]
+    fingerprints = {
+        SIMULATION_SETTINGS: fingerprint(
+            {
+                parameter: settings.get(parameter, None)
+                for parameter in SIMULATION_SETTINGS_OF_PREPROCESSING
+            }
+        ),
+        ENERGY_BUSSES: fingerprint(dict_values[ENERGY_BUSSES]),
+        ECONOMIC_DATA: fingerprint(dict_values[ECONOMIC_DATA]),
+    }
+
+    asset_topology = {}
+    for group in ASSET_GROUPS_OF_PREPROCESSING:
+        asset_topology.update(
+            {
+                group: {
+                    asset: [
+                        dict_values[group][asset].get(parameter, None)
+                        for parameter in [
+                            LABEL,
+                            INFLOW_DIRECTION,
+                            OUTFLOW_DIRECTION,
+                            PEAK_DEMAND_PRICING_PERIOD,
+                        ]
+                    ]
+                    for asset in dict_values[group]
+                }
+            }
+        )
+        fingerprints.update(
+            {
+                group: {
+                    asset: fingerprint(dict_values[group][asset])
+                    for asset in dict_values[group]
+                }
+            }
+        )
+    fingerprints.update({ASSET_TOPOLOGY: fingerprint(asset_topology)})
+    return fingerprints
+
+
+def get_assets_to_reprocess(previous_fingerprints, fingerprints):
+    """
+    Compares the fingerprints of two pre-processing runs to find the assets to re-process
+
+    Parameters
+    ----------
+    previous_fingerprints: dict or None
+        Fingerprints of the previous pre-processing, see get_preprocessing_fingerprints()
+
+    fingerprints: dict
+        Fingerprints of the current raw inputs
+
+    Returns
+    -------
+    assets_to_reprocess: dict or None
+        Keys of the changed assets of each asset group in ASSET_GROUPS_OF_PREPROCESSING.
+        None, if there are no previous fingerprints or if changes affect all assets.
+
+    Notes
+    -----
+    Tested with:
+    - C0.test_get_assets_to_reprocess_topology_changed()
+    - C0.test_get_assets_to_reprocess_asset_changed()
+    """
+    if previous_fingerprints is None:
+        return None
+
+    for parameter in [SIMULATION_SETTINGS, ENERGY_BUSSES, ASSET_TOPOLOGY]:
+        if previous_fingerprints.get(parameter, None) != fingerprints[parameter]:
+            logging.debug(
+                f"The fingerprint of {parameter} changed since the previous pre-processing."
+            )
+            return None
+
+    assets_to_reprocess = {}
+    for group in ASSET_GROUPS_OF_PREPROCESSING:
+        assets_to_reprocess.update(
+            {
+                group: [
+                    asset
+                    for asset in fingerprints[group]
+                    if previous_fingerprints[group].get(asset, None)
+                    != fingerprints[group][asset]
+                ]
+            }
+        )
+    return assets_to_reprocess
+
+
+def update_default_lifetimes(dict_values, raw_assets):
+    """
+    Sets the LIFETIME of all assets without a lifetime in their raw input to the project duration
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    raw_assets: dict
+        Asset groups of the raw input, before pre-processing
+
+    Returns
+    -------
+    Updates the LIFETIME of the assets and sub-assets in dict_values, as it would be defined
+    by define_missing_cost_data(), define_source() and define_sink()
+    """
+    project_duration = dict_values[ECONOMIC_DATA][PROJECT_DURATION][VALUE]
+    for group in ASSET_GROUPS_OF_PREPROCESSING:
+        for asset in dict_values[group]:
+            raw_asset = raw_assets[group].get(asset, {})
+            if group == ENERGY_STORAGE:
+                list_of_assets = [
+                    (dict_values[group][asset][subasset], raw_asset.get(subasset, {}))
+                    for subasset in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]
+                ]
+            else:
+                list_of_assets = [(dict_values[group][asset], raw_asset)]
+            for dict_asset, raw_dict_asset in list_of_assets:
+                if LIFETIME not in raw_dict_asset:
+                    dict_asset.update(
+                        {LIFETIME: {VALUE: project_duration, UNIT: UNIT_YEAR}}
+                    )
 
 
 def define_energy_vectors_from_busses(dict_values):
@@ -217,9 +579,56 @@ def process_all_assets(dict_values):
             "Finished pre-processing all assets in asset group %s.", asset_group
         )
 
+    # Add lifetime capex (incl. replacement costs), calculate annuity (incl. om), and
+    # simulation annuity to all assets and sub-assets at once
+    evaluate_lifetime_costs_of_assets(
+        dict_values[SIMULATION_SETTINGS],
+        dict_values[ECONOMIC_DATA],
+        get_assets_with_costs(dict_values),
+    )
+
     logging.info("Processed cost data and added economic values.")
 
 
+def get_assets_with_costs(dict_values, asset_keys=None):
+    """
+    Collects all assets and storage sub-assets for which lifetime costs are evaluated
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    asset_keys: dict or None
+        Keys of the assets to be collected for each asset group.
+        Default: None, ie. all assets are collected
+
+    Returns
+    -------
+    list_of_dict_assets: list of dict
+        Asset dicts (references, not copies) of all asset groups, including the
+        sub-assets STORAGE_CAPACITY, INPUT_POWER and OUTPUT_POWER of each storage
+
+    Notes
+    -----
+    Tested with:
+    - C0.test_get_assets_with_costs()
+    """
+    list_of_dict_assets = []
+    for group in ASSET_GROUPS_OF_PREPROCESSING:
+        if asset_keys is None:
+            assets = dict_values[group]
+        else:
+            assets = asset_keys[group]
+        for asset in assets:
+            if group == ENERGY_STORAGE:
+                for subasset in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
+                    list_of_dict_assets.append(dict_values[group][asset][subasset])
+            else:
+                list_of_dict_assets.append(dict_values[group][asset])
+    return list_of_dict_assets
+
+
 def define_excess_sinks(dict_values):
     r"""
     Define energy excess sinks for each bus
@@ -252,21 +661,19 @@ def define_excess_sinks(dict_values):
     return auto_sinks
 
 
-def energyConversion(dict_values, group):
-    """Add lifetime capex (incl. replacement costs), calculate annuity (incl. om), and simulation annuity to each asset
+def energyConversion(dict_values, group, asset_keys=None):
+    """Add missing cost data and timeseries of the efficiencies to each asset
 
     :param dict_values:
     :param group:
+    :param asset_keys: keys of the assets to be processed, default: all assets of the group
     :return:
     """
     #
-    for asset in dict_values[group]:
+    if asset_keys is None:
+        asset_keys = list(dict_values[group].keys())
+    for asset in asset_keys:
         define_missing_cost_data(dict_values, dict_values[group][asset])
-        evaluate_lifetime_costs(
-            dict_values[SIMULATION_SETTINGS],
-            dict_values[ECONOMIC_DATA],
-            dict_values[group][asset],
-        )
         # check if maximumCap exists and add it to dict_values
         process_maximum_cap_constraint(
             dict_values=dict_values, group=group, asset=asset
@@ -296,20 +703,18 @@ def energyConversion(dict_values, group):
             compute_timeseries_properties(dict_values[group][asset])
 
 
-def energyProduction(dict_values, group):
+def energyProduction(dict_values, group, asset_keys=None):
     """
 
     :param dict_values:
     :param group:
+    :param asset_keys: keys of the assets to be processed, default: all assets of the group
     :return:
     """
-    for asset in dict_values[group]:
+    if asset_keys is None:
+        asset_keys = list(dict_values[group].keys())
+    for asset in asset_keys:
         define_missing_cost_data(dict_values, dict_values[group][asset])
-        evaluate_lifetime_costs(
-            dict_values[SIMULATION_SETTINGS],
-            dict_values[ECONOMIC_DATA],
-            dict_values[group][asset],
-        )
 
         if FILENAME in dict_values[group][asset]:
             if dict_values[group][asset][FILENAME] in ("None", None):
@@ -331,23 +736,21 @@ def energyProduction(dict_values, group):
         process_maximum_cap_constraint(dict_values, group, asset)
 
 
-def energyStorage(dict_values, group):
+def energyStorage(dict_values, group, asset_keys=None):
     """
 
     :param dict_values:
     :param group:
+    :param asset_keys: keys of the assets to be processed, default: all assets of the group
     :return:
     """
-    for asset in dict_values[group]:
+    if asset_keys is None:
+        asset_keys = list(dict_values[group].keys())
+    for asset in asset_keys:
         for subasset in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
             define_missing_cost_data(
                 dict_values, dict_values[group][asset][subasset],
             )
-            evaluate_lifetime_costs(
-                dict_values[SIMULATION_SETTINGS],
-                dict_values[ECONOMIC_DATA],
-                dict_values[group][asset][subasset],
-            )
 
             # check if parameters are provided as timeseries
             for parameter in [
@@ -376,41 +779,37 @@ def energyStorage(dict_values, group):
             process_maximum_cap_constraint(dict_values, group, asset, subasset)
 
 
-def energyProviders(dict_values, group):
+def energyProviders(dict_values, group, asset_keys=None):
     """
 
     :param dict_values:
     :param group:
+    :param asset_keys: keys of the assets to be processed, default: all assets of the group
     :return:
     """
     # add sources and sinks depending on items in energy providers as pre-processing
-    for asset in dict_values[group]:
+    if asset_keys is None:
+        asset_keys = list(dict_values[group].keys())
+    for asset in asset_keys:
         define_auxiliary_assets_of_energy_providers(dict_values, asset)
 
-        # Add lifetime capex (incl. replacement costs), calculate annuity
-        # (incl. om), and simulation annuity to each asset
+        # Add missing cost data, the lifetime costs are evaluated for all assets at once
+        # in process_all_assets()
         define_missing_cost_data(dict_values, dict_values[group][asset])
-        evaluate_lifetime_costs(
-            dict_values[SIMULATION_SETTINGS],
-            dict_values[ECONOMIC_DATA],
-            dict_values[group][asset],
-        )
 
 
-def energyConsumption(dict_values, group):
+def energyConsumption(dict_values, group, asset_keys=None):
     """
 
     :param dict_values:
     :param group:
+    :param asset_keys: keys of the assets to be processed, default: all assets of the group
     :return:
     """
-    for asset in dict_values[group]:
+    if asset_keys is None:
+        asset_keys = list(dict_values[group].keys())
+    for asset in asset_keys:
         define_missing_cost_data(dict_values, dict_values[group][asset])
-        evaluate_lifetime_costs(
-            dict_values[SIMULATION_SETTINGS],
-            dict_values[ECONOMIC_DATA],
-            dict_values[group][asset],
-        )
         if INFLOW_DIRECTION not in dict_values[group][asset]:
             dict_values[group][asset].update(
                 {INFLOW_DIRECTION: dict_values[group][asset][ENERGY_VECTOR]}
@@ -596,8 +995,9 @@ def add_asset_to_asset_dict_of_bus(bus, dict_values, asset_key, asset_label):
     - C0.test_add_asset_to_asset_dict_of_bus_ValueError()
     """
     # If bus not defined in `energyBusses.csv` display error message
-    if bus not in dict_values[ENERGY_BUSSES]:
-        bus_string = ", ".join(map(str, dict_values[ENERGY_BUSSES].keys()))
+    asset_registry = get_asset_registry(dict_values)
+    if not asset_registry.has_bus(bus):
+        bus_string = ", ".join(map(str, asset_registry.busses))
         msg = (
             f"Asset {asset_key} has an inflow or outflow direction of {bus}. "
             f"This bus is not defined in `energyBusses.csv`: {bus_string}. "
@@ -1041,6 +1441,11 @@ def define_source(
                 }
             }
         )
+        get_asset_registry(dict_values).add(
+            ENERGY_BUSSES,
+            outflow_direction,
+            dict_values[ENERGY_BUSSES][outflow_direction],
+        )
 
     if price is not None:
         if FILENAME in price and HEADER in price:
@@ -1217,6 +1622,11 @@ def define_sink(
                 }
             }
         )
+        get_asset_registry(dict_values).add(
+            ENERGY_BUSSES,
+            inflow_direction,
+            dict_values[ENERGY_BUSSES][inflow_direction],
+        )
 
     if energy_vector is None:
         raise ValueError(
@@ -1363,91 +1773,139 @@ def evaluate_lifetime_costs(settings, economic_data, dict_asset):
     - SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED
     Notes
     -----
+    This is a wrapper around evaluate_lifetime_costs_of_assets() for a single asset.
 
     Tested with:
     - test_evaluate_lifetime_costs_adds_all_parameters()
     - Test_Economic_KPI.test_benchmark_Economic_KPI_C2_E2()
 
     """
+    evaluate_lifetime_costs_of_assets(settings, economic_data, [dict_asset])
+
+
+def evaluate_lifetime_costs_of_assets(settings, economic_data, list_of_dict_assets):
+    r"""
+    Evaluates specific costs of multiple assets over the project lifetime at once.
+
+    The economic inputs of all assets are collected into one table, the array-capable functions of C2
+    are applied to all of its rows at once and the results are written back to each asset dict.
+    Only LIFETIME_PRICE_DISPATCH is still determined per asset, as the dispatch price can be
+    a scalar, a list or a timeseries.
+
+    Parameters
+    ----------
+    settings: dict
+        dict of simulation settings, including:
+        - EVALUATED_PERIOD
+
+    economic_data: dict
+        dict of economic data of the simulation, including
+        - project duration (PROJECT_DURATION)
+        - discount factor (DISCOUNTFACTOR)
+        - tax (TAX)
+        - CRF
+        - ANNUITY_FACTOR
+
+    list_of_dict_assets: list of dict
+        dicts of all asset parameters, each including
+        - SPECIFIC_COSTS
+        - SPECIFIC_COSTS_OM
+        - LIFETIME
+        - AGE_INSTALLED
+
+    Returns
+    -------
+    Updates each asset dict with the parameters listed in evaluate_lifetime_costs()
+
+    Notes
+    -----
+    Tested with:
+    - test_evaluate_lifetime_costs_of_assets()
+    """
+    if len(list_of_dict_assets) == 0:
+        return
 
-    C2.determine_lifetime_price_dispatch(dict_asset, economic_data)
+    cost_table = pd.DataFrame(
+        {
+            LABEL: [dict_asset[LABEL] for dict_asset in list_of_dict_assets],
+            SPECIFIC_COSTS: [
+                dict_asset[SPECIFIC_COSTS][VALUE] for dict_asset in list_of_dict_assets
+            ],
+            SPECIFIC_COSTS_OM: [
+                dict_asset[SPECIFIC_COSTS_OM][VALUE]
+                for dict_asset in list_of_dict_assets
+            ],
+            LIFETIME: [
+                dict_asset[LIFETIME][VALUE] for dict_asset in list_of_dict_assets
+            ],
+            AGE_INSTALLED: [
+                dict_asset[AGE_INSTALLED][VALUE] for dict_asset in list_of_dict_assets
+            ],
+        }
+    )
 
     (
-        specific_capex,
-        specific_replacement_costs_optimized,
-        specific_replacement_costs_already_installed,
-    ) = C2.capex_from_investment(
-        investment_t0=dict_asset[SPECIFIC_COSTS][VALUE],
-        lifetime=dict_asset[LIFETIME][VALUE],
+        cost_table[LIFETIME_SPECIFIC_COST],
+        cost_table[SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED],
+        cost_table[SPECIFIC_REPLACEMENT_COSTS_INSTALLED],
+    ) = C2.capex_from_investment_vectorized(
+        investment_t0=cost_table[SPECIFIC_COSTS].values,
+        lifetime=cost_table[LIFETIME].values,
         project_life=economic_data[PROJECT_DURATION][VALUE],
         discount_factor=economic_data[DISCOUNTFACTOR][VALUE],
         tax=economic_data[TAX][VALUE],
-        age_of_asset=dict_asset[AGE_INSTALLED][VALUE],
-        asset_label=dict_asset[LABEL],
+        age_of_asset=cost_table[AGE_INSTALLED].values,
+        asset_labels=cost_table[LABEL].values,
     )
 
-    dict_asset.update(
-        {
-            LIFETIME_SPECIFIC_COST: {
-                VALUE: specific_capex,
-                UNIT: dict_asset[SPECIFIC_COSTS][UNIT],
-            }
-        }
+    # Annuities of components including opex AND capex
+    cost_table[ANNUITY_SPECIFIC_INVESTMENT_AND_OM] = (
+        C2.annuity(cost_table[LIFETIME_SPECIFIC_COST], economic_data[CRF][VALUE])
+        + cost_table[SPECIFIC_COSTS_OM]  # changes from dispatch_price
     )
-
-    dict_asset.update(
-        {
-            SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED: {
-                VALUE: specific_replacement_costs_optimized,
-                UNIT: dict_asset[SPECIFIC_COSTS][UNIT],
-            }
-        }
+    cost_table[LIFETIME_SPECIFIC_COST_OM] = (
+        cost_table[SPECIFIC_COSTS_OM] * economic_data[ANNUITY_FACTOR][VALUE]
     )
-
-    dict_asset.update(
-        {
-            SPECIFIC_REPLACEMENT_COSTS_INSTALLED: {
-                VALUE: specific_replacement_costs_already_installed,
-                UNIT: dict_asset[SPECIFIC_COSTS][UNIT],
-            }
-        }
+    cost_table[SIMULATION_ANNUITY] = C2.simulation_annuity(
+        cost_table[ANNUITY_SPECIFIC_INVESTMENT_AND_OM],
+        settings[EVALUATED_PERIOD][VALUE],
     )
 
-    # Annuities of components including opex AND capex #
-    dict_asset.update(
-        {
-            ANNUITY_SPECIFIC_INVESTMENT_AND_OM: {
-                VALUE: C2.annuity(
-                    dict_asset[LIFETIME_SPECIFIC_COST][VALUE],
-                    economic_data[CRF][VALUE],
-                )
-                + dict_asset[SPECIFIC_COSTS_OM][VALUE],  # changes from dispatch_price
-                UNIT: dict_asset[LIFETIME_SPECIFIC_COST][UNIT] + "/" + UNIT_YEAR,
-            }
-        }
-    )
+    for dict_asset, costs in zip(
+        list_of_dict_assets, cost_table.to_dict(orient="records")
+    ):
+        C2.determine_lifetime_price_dispatch(dict_asset, economic_data)
 
-    dict_asset.update(
-        {
-            LIFETIME_SPECIFIC_COST_OM: {
-                VALUE: dict_asset[SPECIFIC_COSTS_OM][VALUE]
-                * economic_data[ANNUITY_FACTOR][VALUE],
-                UNIT: dict_asset[SPECIFIC_COSTS_OM][UNIT][:-2],
-            }
-        }
-    )
+        for parameter in [
+            LIFETIME_SPECIFIC_COST,
+            SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
+            SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
+        ]:
+            dict_asset.update(
+                {
+                    parameter: {
+                        VALUE: float(costs[parameter]),
+                        UNIT: dict_asset[SPECIFIC_COSTS][UNIT],
+                    }
+                }
+            )
 
-    dict_asset.update(
-        {
-            SIMULATION_ANNUITY: {
-                VALUE: C2.simulation_annuity(
-                    dict_asset[ANNUITY_SPECIFIC_INVESTMENT_AND_OM][VALUE],
-                    settings[EVALUATED_PERIOD][VALUE],
-                ),
-                UNIT: CURR + "/" + UNIT + "/" + EVALUATED_PERIOD,
+        dict_asset.update(
+            {
+                ANNUITY_SPECIFIC_INVESTMENT_AND_OM: {
+                    VALUE: float(costs[ANNUITY_SPECIFIC_INVESTMENT_AND_OM]),
+                    UNIT: dict_asset[SPECIFIC_COSTS][UNIT] + "/" + UNIT_YEAR,
+                },
+                LIFETIME_SPECIFIC_COST_OM: {
+                    VALUE: float(costs[LIFETIME_SPECIFIC_COST_OM]),
+                    UNIT: dict_asset[SPECIFIC_COSTS_OM][UNIT][:-2],
+                },
+                SIMULATION_ANNUITY: {
+                    VALUE: float(costs[SIMULATION_ANNUITY]),
+                    UNIT: CURR + "/" + UNIT + "/" + EVALUATED_PERIOD,
+                },
             }
-        }
-    )
+        )
 
 
 # read timeseries. 2 cases are considered: Input type is related to demand or generation profiles,
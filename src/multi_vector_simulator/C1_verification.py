@@ -17,12 +17,9 @@ import os
 
 import pandas as pd
 
-from multi_vector_simulator.utils.helpers import find_value_by_key
+from multi_vector_simulator.utils.asset_registry import build_asset_registry
 
-from multi_vector_simulator.utils.exceptions import (
-    UnknownEnergyVectorError,
-    DuplicateLabels,
-)
+from multi_vector_simulator.utils.exceptions import UnknownEnergyVectorError
 from multi_vector_simulator.utils.constants import (
     PATH_INPUT_FILE,
     PATH_INPUT_FOLDER,
@@ -82,9 +79,6 @@ from multi_vector_simulator.utils.constants_json_strings import (
     RENEWABLE_SHARE_DSO,
 )
 
-# Necessary for check_for_label_duplicates()
-from collections import Counter
-
 
 def lookup_file(file_path, name):
     """
@@ -119,16 +113,13 @@ def check_for_label_duplicates(dict_values):
     Returns
     -------
     pass or error message: DuplicateLabels
+
+    Notes
+    -----
+    The labels are counted by the asset registry of dict_values, which is then used by the
+    pre-processing in C0, see `utils.asset_registry.build_asset_registry()`.
     """
-    values_of_label = find_value_by_key(dict_values, LABEL)
-    count = Counter(values_of_label)
-    msg = ""
-    for item in count:
-        if count[item] > 1:
-            msg += f"Following asset label is not unique with {count[item]} occurrences: {item}. \n"
-    if len(msg) > 1:
-        msg += f"Please make sure that each label is only used once, as oemof otherwise can not build the model."
-        raise DuplicateLabels(msg)
+    build_asset_registry(dict_values)
 
 
 def check_feedin_tariff_vs_levelized_cost_of_generation_of_production(dict_values):
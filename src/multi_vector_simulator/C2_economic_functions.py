@@ -9,11 +9,13 @@ Functionalities:
 - Calculate annuity factor
 - calculate crf depending on year
 - calculate specific lifetime capex, considering replacement costs and residual value of the asset
+- calculate specific lifetime capex of multiple assets at once (array-capable)
 - calculate annuity from present costs
 - calculate present costs based on annuity
 - calculate effective fuel price cost, in case there is a annual fuel price change (this functionality still has to be checked in this module)
 """
 import logging
+import numpy as np
 import pandas as pd
 
 from multi_vector_simulator.utils.constants import UNIT_HOUR
@@ -251,6 +253,181 @@ def get_replacement_costs(
     return replacement_costs
 
 
+def capex_from_investment_vectorized(
+    investment_t0,
+    lifetime,
+    project_life,
+    discount_factor,
+    tax,
+    age_of_asset,
+    asset_labels=None,
+):
+    """
+    Calculates the capital expenditures of multiple assets at once.
+
+    Array-capable counterpart of :func:`capex_from_investment`, used to evaluate the
+    lifetime costs of all assets of an energy system in one go (see C0.evaluate_lifetime_costs_of_assets).
+    All parameters may be scalars or array-likes of equal length, they are broadcast against each other.
+
+    Parameters
+    ----------
+    investment_t0: float or array-like
+        first investment at the beginning of the project made at year 0
+    lifetime: int or array-like
+        time period over which investments and re-investments can occur
+    project_life: int or array-like
+        time period over which the costs of the system occur
+    discount_factor: float or array-like
+        weighted average cost of capital, which is the after-tax average cost of various capital sources
+    tax: float or array-like
+        compulsory financial charge paid to the government
+    age_of_asset: int or array-like
+        age since asset installation in year
+    asset_labels: list of str
+        names of the assets, only used for log messages
+        Default: None
+
+    Returns
+    -------
+    specific_capex: :class:`numpy.ndarray`
+        Specific capital expenditure of each asset over project lifetime
+
+    specific_replacement_costs_optimized: :class:`numpy.ndarray`
+       Specific replacement costs for the asset capacity to be optimized, needed for E2
+
+    specific_replacement_costs_already_installed: :class:`numpy.ndarray`
+       replacement costs per unit for the currently already installed assets, needed for E2
+
+    Notes
+    -----
+    Tested with
+    - test_capex_from_investment_vectorized_equals_capex_from_investment()
+    """
+    first_time_investment = np.asarray(investment_t0, dtype=float) * (
+        1 + np.asarray(tax, dtype=float)
+    )
+    # Specific replacement costs for the asset capacity to be optimized
+    specific_replacement_costs_optimized = get_replacement_costs_vectorized(
+        np.zeros_like(first_time_investment),
+        project_life,
+        lifetime,
+        first_time_investment,
+        discount_factor,
+    )
+    # Specific capex for the optimization
+    specific_capex = first_time_investment + specific_replacement_costs_optimized
+
+    # Calculating the replacement costs per unit for the currently already installed assets
+    specific_replacement_costs_installed = get_replacement_costs_vectorized(
+        age_of_asset,
+        project_life,
+        lifetime,
+        first_time_investment,
+        discount_factor,
+        asset_labels=asset_labels,
+    )
+    return (
+        specific_capex,
+        specific_replacement_costs_optimized,
+        specific_replacement_costs_installed,
+    )
+
+
+def get_replacement_costs_vectorized(
+    age_of_asset,
+    project_lifetime,
+    asset_lifetime,
+    first_time_investment,
+    discount_factor,
+    asset_labels=None,
+):
+    r"""
+    Calculating the replacement costs of multiple assets at once
+
+    Array-capable counterpart of :func:`get_replacement_costs`. The replacements are
+    looped over (at most the largest number of investments of all assets), each loop
+    treating all assets simultaneously.
+
+    Parameters
+    ----------
+    age_of_asset: int or array-like
+        Age in years of already installed assets
+
+    project_lifetime: int or array-like
+        Project duration in years
+
+    asset_lifetime: int or array-like
+        Lifetime of the assets in years
+
+    first_time_investment: float or array-like
+        Investment cost of the assets to be installed
+
+    discount_factor: float or array-like
+        Discount factor of a project
+
+    asset_labels: list of str
+        names of the assets, only used for log messages
+        Default: None
+
+    Returns
+    -------
+    :class:`numpy.ndarray` of the per-unit replacement costs of the assets, see :func:`get_replacement_costs`
+    """
+    (
+        age_of_asset,
+        project_lifetime,
+        asset_lifetime,
+        first_time_investment,
+        discount_factor,
+    ) = np.broadcast_arrays(
+        np.asarray(age_of_asset, dtype=float),
+        np.asarray(project_lifetime, dtype=float),
+        np.asarray(asset_lifetime, dtype=float),
+        np.asarray(first_time_investment, dtype=float),
+        np.asarray(discount_factor, dtype=float),
+    )
+
+    # Calculate number of investments' rounds
+    number_of_investments = np.where(
+        project_lifetime + age_of_asset == asset_lifetime,
+        1,
+        np.round((project_lifetime + age_of_asset) / asset_lifetime + 0.5),
+    ).astype(int)
+
+    for index in np.flatnonzero(age_of_asset >= asset_lifetime):
+        asset_label = asset_labels[index] if asset_labels is not None else ""
+        logging.error(
+            f"The age of the asset `{asset_label}` ({age_of_asset.flat[index]} years) is lower or equal than "
+            f"the asset lifetime ({asset_lifetime.flat[index]} years). This does not make sense, as a "
+            f"replacement is imminent or should already have happened. Please check this value."
+        )
+
+    replacement_costs = np.zeros(first_time_investment.shape)
+    # Latest investment is first investment
+    latest_investment = first_time_investment.copy()
+
+    # Looping over replacements, excluding first_time_investment in year (0 - age_of_asset)
+    for count_of_replacements in range(1, int(number_of_investments.max(initial=1))):
+        is_replaced = count_of_replacements < number_of_investments
+        year = -age_of_asset + count_of_replacements * asset_lifetime
+        investment = first_time_investment / ((1 + discount_factor) ** year)
+        latest_investment = np.where(is_replaced, investment, latest_investment)
+        replacement_costs += np.where(is_replaced, investment, 0)
+
+    # Calculation of residual value / value at project end
+    year = -age_of_asset + number_of_investments * asset_lifetime
+    linear_depreciation_last_investment = latest_investment / asset_lifetime
+    value_at_project_end = (
+        linear_depreciation_last_investment
+        * (year - project_lifetime)
+        / (1 + discount_factor) ** (project_lifetime)
+    )
+    # Subtraction of component value at end of life with last replacement (= number_of_investments - 1)
+    replacement_costs -= np.where(year > project_lifetime, value_at_project_end, 0)
+
+    return replacement_costs
+
+
 def annuity(present_value, crf):
     """
     Calculates the annuity which is a fixed stream of payments incurred by investments in assets
@@ -10,30 +10,73 @@ Functional requirements of module D0:
 - raise warning if component not a (in mvs defined) oemof model type
 - add all energy conversion, energy consumption, energy production, energy storage devices model
 - plot network graph
+- aggregate the time series into typical periods (optional, see D3)
+- dispatch the evaluated period in rolling horizon windows (optional, see D4)
+- reduce the energy system before the pyomo model is created (optional, see D6)
+- optimize independent subsystems in parallel processes (optional, see D7)
 - at constraints to remote model
+- measure the size of the model and stop if it exceeds the maximum model size (optional, see D5)
+- profile the construction of the model (optional, see utils.model_profiling)
 - store lp file (optional)
-- start oemof simulation
+- start oemof simulation with the solver and solver options of the simulation settings
+- diagnose an infeasible model with slack variables (optional, see D8)
+- store the solution of the solver (optional, see D9)
+- store the raw results for a re-evaluation without optimization (see D11)
 - process results by giving them to the next function
 - dump oemof results
 - add simulation parameters to dict values
 """
 
+import csv
+import gzip
 import logging
 import os
+import shutil
 import timeit
-import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 from oemof.solph import processing
 import oemof.solph as solph
+import pyomo.environ as po
+
+try:
+    import zstandard
+except ModuleNotFoundError:
+    zstandard = None
 
 import multi_vector_simulator.D1_model_components as D1
 import multi_vector_simulator.D2_model_constraints as D2
+import multi_vector_simulator.D3_timeseries_aggregation as D3
+import multi_vector_simulator.D4_rolling_horizon as D4
+import multi_vector_simulator.D5_model_statistics as D5
+import multi_vector_simulator.D6_model_reduction as D6
+import multi_vector_simulator.D7_subsystems as D7
+import multi_vector_simulator.D8_infeasibility_diagnosis as D8
+import multi_vector_simulator.D9_solution_storage as D9
+import multi_vector_simulator.D11_raw_results as D11
+from multi_vector_simulator.utils import model_profiling
 
 from multi_vector_simulator.utils.constants import (
     PATH_OUTPUT_FOLDER,
     ES_GRAPH,
     PATHS_TO_PLOTS,
     PLOTS_ES,
+    DEFAULT_SOLVER,
+    DEFAULT_SOLVER_MIP_GAP,
+    SOLVER_METHOD_SIMPLEX,
+    SOLVER_METHOD_BARRIER,
+    SOLVER_OPTION_NAMES,
+    SOLVER_INTERFACE_SHELL,
+    SOLVER_INTERFACE_DIRECT,
+    SOLVER_INTERFACE_PERSISTENT,
+    SOLVER_INTERFACE_NAMES,
+    LP_FILE,
+    LP_FILE_LABELS,
+    LP_FILE_FORMAT_LP,
+    LP_FILE_FORMAT_MPS,
+    LP_FILE_COMPRESSION_GZIP,
+    LP_FILE_COMPRESSION_ZSTD,
+    LP_FILE_COMPRESSION_EXTENSIONS,
 )
 from multi_vector_simulator.utils.constants_json_strings import (
     ENERGY_BUSSES,
@@ -52,12 +95,33 @@ from multi_vector_simulator.utils.constants_json_strings import (
     SIMULATION_RESULTS,
     OBJECTIVE_VALUE,
     SIMULTATION_TIME,
+    TYPICAL_PERIODS,
+    AGGREGATION_ERROR,
+    ROLLING_HORIZON_WINDOWS,
+    SOLVER,
+    SOLVER_THREADS,
+    SOLVER_TIME_LIMIT,
+    SOLVER_MIP_GAP,
+    SOLVER_PRESOLVE,
+    SOLVER_METHOD,
+    SOLVER_OPTIONS,
+    SOLVER_INTERFACE,
+    SOLVER_ITERATIONS,
+    MODEL_SIZE,
+    MODEL_CONSTRUCTION_PROFILE,
+    LP_FILE_FORMAT,
+    LP_FILE_SYMBOLIC_LABELS,
+    LP_FILE_COMPRESSION,
+    LP_FILE_FROM_SOLVER,
 )
 
 from multi_vector_simulator.utils.exceptions import (
     MVSOemofError,
     WrongOemofAssetForGroupError,
     UnknownOemofAssetType,
+    SolverNotAvailableError,
+    InvalidSolverOptionError,
+    InvalidLpFileOptionError,
 )
 
 
@@ -76,38 +140,370 @@ def run_oemof(dict_values, save_energy_system_graph=False):
     Returns
     -------
     saves and returns oemof simulation results
+
+    Notes
+    -----
+    If TYPICAL_PERIODS is defined in the simulation settings, the reduced model of the typical periods
+    is solved and its results are mapped back to the full evaluated period (see D3_timeseries_aggregation).
+    If ROLLING_HORIZON_WINDOW is defined in the simulation settings, the evaluated period is dispatched
+    in consecutive windows with `run_oemof_rolling_horizon()`.
+    If MODEL_REDUCTION is True, the energy system is reduced before the pyomo model is created and
+    the results are mapped back to all its components (see D6_model_reduction).
+    If PARALLEL_SUBSYSTEMS is True, the independent subsystems of the energy system are optimized
+    in parallel processes with `run_oemof_subsystems()` (see D7_subsystems).
+    If PROFILE_MODEL_CONSTRUCTION is True, the construction time of each component, constraint and
+    block of the model is stored in MODEL_CONSTRUCTION_PROFILE (see utils.model_profiling).
+    If STORE_RAW_RESULTS is True, the results of the optimization are stored in RAW_RESULTS_FILE,
+    so that the simulation can be re-evaluated without optimization (see D11_raw_results).
+
+    Tested with:
+    - test_if_simulation_results_added_to_dict_values()
+    - D3.test_run_oemof_with_typical_periods()
+    - D4.test_run_oemof_with_rolling_horizon()
+    - D6.test_run_oemof_with_model_reduction()
+    - D7.test_run_oemof_with_subsystems()
+    - test_run_oemof_with_profiling()
     """
 
     start = timer.initalize()
 
-    model, dict_model = model_building.initialize(dict_values)
-
-    model = model_building.adding_assets_to_energysystem_model(
-        dict_values, dict_model, model
-    )
+    windows = D4.get_rolling_horizon_windows(dict_values)
+    if windows is not None:
+        results_main = run_oemof_rolling_horizon(
+            dict_values, windows, save_energy_system_graph=save_energy_system_graph
+        )
+        timer.stop(dict_values, start)
+        store_raw_results(dict_values, results_main)
+        return results_main, results_main
+
+    subsystems = D7.get_subsystems(dict_values)
+    if subsystems is not None:
+        results_main = run_oemof_subsystems(
+            dict_values, subsystems, save_energy_system_graph=save_energy_system_graph
+        )
+        timer.stop(dict_values, start)
+        store_raw_results(dict_values, results_main)
+        return results_main, results_main
+
+    typical_periods = D3.select_typical_periods(dict_values)
+    if typical_periods is None:
+        dict_values_model = dict_values
+    else:
+        dict_values_model = D3.reduce_dict_values(dict_values, typical_periods)
+
+    profile = model_building.get_construction_profile(dict_values)
+    with model_profiling.construction_profile(profile):
+        model, dict_model = model_building.initialize(dict_values_model)
+
+        model = model_building.adding_assets_to_energysystem_model(
+            dict_values_model, dict_model, model
+        )
 
-    model_building.plot_networkx_graph(
-        dict_values, model, save_energy_system_graph=save_energy_system_graph
-    )
+        model_building.plot_networkx_graph(
+            dict_values, model, save_energy_system_graph=save_energy_system_graph
+        )
+        model, reductions = D6.reduce_energy_system(
+            dict_values_model, model, dict_model
+        )
 
-    logging.debug("Creating oemof model based on created components and busses...")
-    local_energy_system = solph.Model(model)
-    logging.debug("Created oemof model based on created components and busses.")
+        logging.debug("Creating oemof model based on created components and busses...")
+        if typical_periods is None:
+            local_energy_system = model_building.create_model(model)
+        else:
+            local_energy_system = model_building.create_model(
+                model, objective_weighting=D3.get_objective_weighting(dict_values_model)
+            )
+            local_energy_system = D3.add_storage_linking_constraints(
+                local_energy_system, typical_periods
+            )
+        logging.debug("Created oemof model based on created components and busses.")
 
-    local_energy_system = D2.add_constraints(
-        local_energy_system, dict_values, dict_model
-    )
-    model_building.store_lp_file(dict_values, local_energy_system)
+        local_energy_system = D2.add_constraints(
+            local_energy_system, dict_values_model, dict_model
+        )
+    model_size = model_building.measure_model_size(dict_values, local_energy_system)
+    lp_file_options = model_building.store_lp_file(dict_values, local_energy_system)
 
     model, results_main, results_meta = model_building.simulating(
-        dict_values, model, local_energy_system
+        dict_values, model, local_energy_system, lp_file_options=lp_file_options
     )
+    dict_values[SIMULATION_RESULTS].update({MODEL_SIZE: model_size})
+    model_building.store_construction_profile(dict_values, profile)
+
+    if reductions is not None:
+        results_main = D6.expand_results(results_main, reductions)
+
+    if typical_periods is not None:
+        # results_meta refers to the same results as results_main
+        results_main = D3.expand_results_to_time_index(
+            results_main, typical_periods, dict_values[SIMULATION_SETTINGS][TIME_INDEX],
+        )
+        dict_values[SIMULATION_RESULTS].update(
+            {
+                TYPICAL_PERIODS: len(typical_periods[D3.MEDOIDS]),
+                AGGREGATION_ERROR: typical_periods[AGGREGATION_ERROR],
+            }
+        )
 
     timer.stop(dict_values, start)
+    store_raw_results(dict_values, results_main)
 
     return results_meta, results_main
 
 
+def store_raw_results(dict_values, results_main):
+    r"""
+    Stores the results of the optimization with D11 if STORE_RAW_RESULTS is activated
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, with the SIMULATION_RESULTS of the optimization
+
+    results_main: dict
+        oemof simulation results as output by processing.results()
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Tested with:
+    - D11.test_store_and_load_raw_results()
+    """
+    if D11.is_raw_results_storage_activated(dict_values):
+        D11.store_raw_results(dict_values, results_main)
+
+
+def run_oemof_rolling_horizon(dict_values, windows, save_energy_system_graph=False):
+    """
+    Dispatches the evaluated period in consecutive windows (rolling horizon).
+
+    Each window is built, solved and discarded before the next one, so that the size of the model
+    only depends on the window length. The storage levels at the end of a window are the initial
+    storage levels of the next window and the storage content at the end of the last window equals
+    the initial storage content of the first window.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    windows: list of tuple
+        Windows of the rolling horizon dispatch, see `D4.get_rolling_horizon_windows()`
+
+    save_energy_system_graph: bool
+        if True, save the graph of the energy system in the mvs output folder
+        Default: False
+
+    Returns
+    -------
+    results_main: dict
+        Main results of the oemof simulations of the windows, stitched over the evaluated period
+
+    Notes
+    -----
+    The objective value and simulation time in SIMULATION_RESULTS are the sums over all windows,
+    including their overlaps. Only the lp file of the first window is stored.
+
+    Tested with:
+    - D4.test_run_oemof_with_rolling_horizon()
+    """
+    results_of_windows = []
+    storage_levels = None
+    initial_storage_contents = {}
+    objective_value = 0
+    simulation_time = 0
+    profile = model_building.get_construction_profile(dict_values)
+
+    for count, (start, end_of_results, end) in enumerate(windows):
+        logging.info(
+            f"Dispatching window {count + 1} of {len(windows)} (timesteps {start} to {end - 1})."
+        )
+        dict_values_window = D4.select_window(dict_values, start, end, storage_levels)
+
+        with model_profiling.construction_profile(profile):
+            model, dict_model = model_building.initialize(dict_values_window)
+            model = model_building.adding_assets_to_energysystem_model(
+                dict_values_window, dict_model, model
+            )
+            if count == 0:
+                model_building.plot_networkx_graph(
+                    dict_values,
+                    model,
+                    save_energy_system_graph=save_energy_system_graph,
+                )
+            model, reductions = D6.reduce_energy_system(
+                dict_values_window, model, dict_model
+            )
+
+            local_energy_system = model_building.create_model(model)
+            local_energy_system = D4.deactivate_balanced_storage_constraints(
+                local_energy_system
+            )
+            if count == len(windows) - 1:
+                local_energy_system = D4.add_final_storage_content_constraints(
+                    local_energy_system, initial_storage_contents
+                )
+            local_energy_system = D2.add_constraints(
+                local_energy_system, dict_values_window, dict_model
+            )
+        if count == 0:
+            model_size = model_building.measure_model_size(
+                dict_values, local_energy_system
+            )
+            lp_file_options = model_building.store_lp_file(
+                dict_values, local_energy_system
+            )
+
+        model, results_main, results_meta = model_building.simulating(
+            dict_values_window,
+            model,
+            local_energy_system,
+            lp_file_options=lp_file_options if count == 0 else None,
+        )
+        if reductions is not None:
+            results_main = D6.expand_results(results_main, reductions)
+        if count == 0:
+            initial_storage_contents = D4.get_initial_storage_contents(
+                local_energy_system
+            )
+        storage_levels = D4.get_storage_levels(
+            results_main, dict_values, end_of_results - start - 1
+        )
+        results_of_windows.append(
+            D4.truncate_results(results_main, end_of_results - start)
+        )
+        objective_value += dict_values_window[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+        simulation_time += dict_values_window[SIMULATION_RESULTS][SIMULTATION_TIME]
+
+    dict_values.update(
+        {
+            SIMULATION_RESULTS: {
+                LABEL: SIMULATION_RESULTS,
+                OBJECTIVE_VALUE: objective_value,
+                SIMULTATION_TIME: round(simulation_time, 2),
+                ROLLING_HORIZON_WINDOWS: len(windows),
+                MODEL_SIZE: model_size,
+                SOLVER: dict_values_window[SIMULATION_RESULTS][SOLVER],
+                SOLVER_OPTIONS: dict_values_window[SIMULATION_RESULTS][SOLVER_OPTIONS],
+                SOLVER_INTERFACE: dict_values_window[SIMULATION_RESULTS][
+                    SOLVER_INTERFACE
+                ],
+            }
+        }
+    )
+    model_building.store_construction_profile(dict_values, profile)
+    return D4.stitch_results(
+        results_of_windows, dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    )
+
+
+def run_oemof_subsystems(dict_values, subsystems, save_energy_system_graph=False):
+    """
+    Optimizes the independent subsystems of the energy system in parallel processes.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    subsystems: list of list of str
+        Busses of each subsystem, see `D7.get_subsystems()`
+
+    save_energy_system_graph: bool
+        if True, save the graph of the whole energy system in the mvs output folder
+        Default: False
+
+    Returns
+    -------
+    results_main: dict
+        Main results of the oemof simulations of all subsystems
+
+    Notes
+    -----
+    The size of the model is compared with MAXIMUM_MODEL_SIZE for each subsystem, the lp file
+    of each subsystem is stored in its own folder of the output folder.
+
+    Tested with:
+    - D7.test_run_oemof_with_subsystems()
+    """
+    if save_energy_system_graph is True:
+        model, dict_model = model_building.initialize(dict_values)
+        model = model_building.adding_assets_to_energysystem_model(
+            dict_values, dict_model, model
+        )
+        model_building.plot_networkx_graph(
+            dict_values, model, save_energy_system_graph=save_energy_system_graph
+        )
+
+    dict_values_of_subsystems = [
+        D7.select_subsystem(dict_values, busses, number)
+        for number, busses in enumerate(subsystems)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=min(len(subsystems), os.cpu_count() or 1)
+    ) as executor:
+        results_of_subsystems = list(
+            executor.map(run_oemof_subsystem, dict_values_of_subsystems)
+        )
+
+    results_main = {}
+    for results_main_subsystem, _ in results_of_subsystems:
+        results_main.update(results_main_subsystem)
+    dict_values.update(
+        {
+            SIMULATION_RESULTS: D7.merge_simulation_results(
+                [simulation_results for _, simulation_results in results_of_subsystems]
+            )
+        }
+    )
+    return results_main
+
+
+def run_oemof_subsystem(dict_values):
+    """
+    Builds and solves the model of a subsystem of the energy system, in a worker process.
+
+    Parameters
+    ----------
+    dict_values: dict
+        Simulation parameters of the subsystem, see `D7.select_subsystem()`
+
+    Returns
+    -------
+    results_main: dict
+        Main results of the oemof simulation of the subsystem
+
+    simulation_results: dict
+        SIMULATION_RESULTS of the subsystem, incl. the size of its model
+    """
+    profile = model_building.get_construction_profile(dict_values)
+    with model_profiling.construction_profile(profile):
+        model, dict_model = model_building.initialize(dict_values)
+        model = model_building.adding_assets_to_energysystem_model(
+            dict_values, dict_model, model
+        )
+        model, reductions = D6.reduce_energy_system(dict_values, model, dict_model)
+
+        local_energy_system = model_building.create_model(model)
+        local_energy_system = D2.add_constraints(
+            local_energy_system, dict_values, dict_model
+        )
+    model_size = model_building.measure_model_size(dict_values, local_energy_system)
+    lp_file_options = model_building.store_lp_file(dict_values, local_energy_system)
+
+    model, results_main, results_meta = model_building.simulating(
+        dict_values, model, local_energy_system, lp_file_options=lp_file_options
+    )
+    if reductions is not None:
+        results_main = D6.expand_results(results_main, reductions)
+    dict_values[SIMULATION_RESULTS].update({MODEL_SIZE: model_size})
+    model_building.store_construction_profile(dict_values, profile)
+    return results_main, dict_values[SIMULATION_RESULTS]
+
+
 class model_building:
     def initialize(dict_values):
         """
@@ -162,30 +558,28 @@ class model_building:
         for bus in dict_values[ENERGY_BUSSES]:
             D1.bus(model, dict_values[ENERGY_BUSSES][bus][LABEL], **dict_model)
 
+        # Time series with identical values are passed to oemof as one array
+        interned_arrays = {}
+
         # Adding step by step all assets defined within the asset groups
         for asset_group in ACCEPTED_ASSETS_FOR_ASSET_GROUPS:
             if asset_group in dict_values:
                 for asset in dict_values[asset_group]:
                     type = dict_values[asset_group][asset][OEMOF_ASSET_TYPE]
+                    dict_asset = D1.timeseries_to_arrays(
+                        dict_values[asset_group][asset], interned_arrays
+                    )
                     # Checking if the asset type is one accepted for the asset group (security measure)
                     if type in ACCEPTED_ASSETS_FOR_ASSET_GROUPS[asset_group]:
                         # if so, then the appropriate function of D1 should be called
                         if type == OEMOF_TRANSFORMER:
-                            D1.transformer(
-                                model, dict_values[asset_group][asset], **dict_model
-                            )
+                            D1.transformer(model, dict_asset, **dict_model)
                         elif type == OEMOF_SINK:
-                            D1.sink(
-                                model, dict_values[asset_group][asset], **dict_model
-                            )
+                            D1.sink(model, dict_asset, **dict_model)
                         elif type == OEMOF_SOURCE:
-                            D1.source(
-                                model, dict_values[asset_group][asset], **dict_model
-                            )
+                            D1.source(model, dict_asset, **dict_model)
                         elif type == OEMOF_GEN_STORAGE:
-                            D1.storage(
-                                model, dict_values[asset_group][asset], **dict_model
-                            )
+                            D1.storage(model, dict_asset, **dict_model)
                         else:
                             raise UnknownOemofAssetType(
                                 f"Asset {asset} has type {type}, "
@@ -236,6 +630,213 @@ class model_building:
 
             graph.render()
 
+    def get_construction_profile(dict_values):
+        r"""
+        Returns a new profile of the model construction if it is activated in the simulation settings.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation parameters
+
+        Returns
+        -------
+        :class:`utils.model_profiling.ConstructionProfile` or None
+            None if PROFILE_MODEL_CONSTRUCTION is not True
+
+        Notes
+        -----
+        Tested with:
+        - test_run_oemof_with_profiling()
+        """
+        if model_profiling.is_profiling_activated(dict_values):
+            return model_profiling.ConstructionProfile()
+        return None
+
+    def create_model(model, **kwargs):
+        r"""
+        Creates the pyomo model of the energy system with oemof-solph.
+
+        If the construction of the model is profiled, the sets and variables, each block of
+        oemof-solph (eg. `InvestmentFlow`) and the objective are created and timed one by one.
+
+        Parameters
+        ----------
+        model: object
+            oemof-solph energy system with all components
+
+        kwargs:
+            Keyword arguments of `solph.Model`, eg. objective_weighting
+
+        Returns
+        -------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        Notes
+        -----
+        Tested with:
+        - test_create_model_with_profiling()
+        """
+        if model_profiling.get_active_profile() is None:
+            return solph.Model(model, **kwargs)
+
+        # same steps as solph.Model._construct()
+        local_energy_system = solph.Model(model, auto_construct=False, **kwargs)
+        with model_profiling.timed(
+            model_profiling.CATEGORY_OEMOF, "sets and variables"
+        ):
+            local_energy_system._add_parent_block_sets()
+            local_energy_system._add_parent_block_variables()
+        for group in local_energy_system._constraint_groups:
+            block = group()
+            with model_profiling.timed(model_profiling.CATEGORY_OEMOF, str(block)):
+                local_energy_system.add_component(str(block), block)
+                block._create(group=local_energy_system.es.groups.get(group))
+        with model_profiling.timed(model_profiling.CATEGORY_OEMOF, "objective"):
+            local_energy_system._add_objective()
+        return local_energy_system
+
+    def store_construction_profile(dict_values, profile):
+        r"""
+        Adds the profile of the model construction to the simulation results and logs it.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation parameters, with the SIMULATION_RESULTS of the solve
+
+        profile: :class:`utils.model_profiling.ConstructionProfile` or None
+            Profile of the model construction, nothing is stored if None
+
+        Returns
+        -------
+        None
+            Updates dict_values[SIMULATION_RESULTS][MODEL_CONSTRUCTION_PROFILE]
+
+        Notes
+        -----
+        Tested with:
+        - test_run_oemof_with_profiling()
+        """
+        if profile is None:
+            return
+        table = profile.table()
+        dict_values[SIMULATION_RESULTS].update({MODEL_CONSTRUCTION_PROFILE: table})
+        model_profiling.log_profile_table(table)
+
+    def measure_model_size(dict_values, local_energy_system):
+        """
+        Computes and logs the size of the model and compares it with the maximum model size, if
+        the size of the model is to be measured (see `D5.is_model_size_measurement_activated()`)
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        Returns
+        -------
+        dict or None
+            Size of the model (see `D5.get_model_size()`), None if it is not measured. A
+            ModelSizeError is raised if the model is larger than MAXIMUM_MODEL_SIZE and
+            MODEL_SIZE_GUARD is "error"
+
+        Notes
+        -----
+        Tested with:
+        - test_if_simulation_results_added_to_dict_values()
+        - D5.test_run_oemof_model_size_error()
+        """
+        if not D5.is_model_size_measurement_activated(dict_values):
+            return None
+        model_size = D5.get_model_size(local_energy_system)
+        D5.log_model_size(model_size)
+        D5.check_model_size(dict_values, model_size)
+        return model_size
+
+    def get_lp_file_options(dict_values):
+        """
+        Reads the options of the export of the lp file from the simulation settings
+
+        The model is written in the format LP_FILE_FORMAT ("lp", default, or "mps"). With
+        LP_FILE_SYMBOLIC_LABELS (default: True) the variables and constraints are named after the
+        components of the model. Otherwise they get short generic names (x1, c_e_x2_, ...), which
+        is much faster to write, and the names of the components are stored in the label map
+        LP_FILE_LABELS. The file can be compressed with LP_FILE_COMPRESSION ("gzip" or "zstd").
+        With LP_FILE_FROM_SOLVER (default: False), the lp file written for the solver by the shell
+        interface is kept instead of writing the model a second time.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        dict or None
+            Options of the export of the lp file and output folder (PATH_OUTPUT_FOLDER), None if
+            OUTPUT_LP_FILE is not True
+
+        Notes
+        -----
+        If "zstd" compression is requested but the package zstandard is not installed, the file is
+        compressed with "gzip".
+
+        Tested with:
+        - test_get_lp_file_options_default()
+        - test_get_lp_file_options_output_lp_file_false()
+        - test_get_lp_file_options_invalid_format_raises_error()
+        - test_get_lp_file_options_invalid_compression_raises_error()
+        """
+        simulation_settings = dict_values[SIMULATION_SETTINGS]
+        if simulation_settings[OUTPUT_LP_FILE][VALUE] is not True:
+            return None
+
+        lp_file_options = {PATH_OUTPUT_FOLDER: simulation_settings[PATH_OUTPUT_FOLDER]}
+        for setting, default in (
+            (LP_FILE_FORMAT, LP_FILE_FORMAT_LP),
+            (LP_FILE_SYMBOLIC_LABELS, True),
+            (LP_FILE_COMPRESSION, None),
+            (LP_FILE_FROM_SOLVER, False),
+        ):
+            value = simulation_settings.get(setting, {}).get(VALUE)
+            lp_file_options.update({setting: default if value is None else value})
+
+        if lp_file_options[LP_FILE_FORMAT] not in (
+            LP_FILE_FORMAT_LP,
+            LP_FILE_FORMAT_MPS,
+        ):
+            raise InvalidLpFileOptionError(
+                f"The value of {LP_FILE_FORMAT} has to be {LP_FILE_FORMAT_LP} or "
+                f"{LP_FILE_FORMAT_MPS}, not {lp_file_options[LP_FILE_FORMAT]}."
+            )
+        for setting in (LP_FILE_SYMBOLIC_LABELS, LP_FILE_FROM_SOLVER):
+            if lp_file_options[setting] not in (True, False):
+                raise InvalidLpFileOptionError(
+                    f"The value of {setting} has to be True or False, not "
+                    f"{lp_file_options[setting]}."
+                )
+        compression = lp_file_options[LP_FILE_COMPRESSION]
+        if (
+            compression is not None
+            and compression not in LP_FILE_COMPRESSION_EXTENSIONS
+        ):
+            raise InvalidLpFileOptionError(
+                f"The value of {LP_FILE_COMPRESSION} has to be "
+                f"{LP_FILE_COMPRESSION_GZIP} or {LP_FILE_COMPRESSION_ZSTD}, not {compression}."
+            )
+        if compression == LP_FILE_COMPRESSION_ZSTD and zstandard is None:
+            logging.warning(
+                f"The package zstandard is not installed, the lp file is compressed with "
+                f"{LP_FILE_COMPRESSION_GZIP} instead of {LP_FILE_COMPRESSION_ZSTD}."
+            )
+            lp_file_options[LP_FILE_COMPRESSION] = LP_FILE_COMPRESSION_GZIP
+        return lp_file_options
+
     def store_lp_file(dict_values, local_energy_system):
         """
         Stores linear equation system generated with pyomo as an "lp file".
@@ -250,29 +851,539 @@ class model_building:
 
         Returns
         -------
-        Nothing.
+        dict or None
+            Options of the lp file (see `get_lp_file_options()`) if the lp file has to be stored
+            by the solver (LP_FILE_FROM_SOLVER with the shell interface), None otherwise
+
+        Notes
+        -----
+        Tested with:
+        - test_if_lp_file_is_stored_to_file_if_output_lp_file_true()
+        - test_if_lp_file_is_stored_to_file_if_output_lp_file_false()
+        - test_store_lp_file_mps_without_symbolic_labels()
+        - test_store_lp_file_compressed()
+        - test_store_lp_file_from_solver()
+        """
+        lp_file_options = model_building.get_lp_file_options(dict_values)
+        if lp_file_options is None:
+            return None
+
+        solver_interface = (
+            dict_values[SIMULATION_SETTINGS].get(SOLVER_INTERFACE, {}).get(VALUE)
+            or SOLVER_INTERFACE_SHELL
+        )
+        if lp_file_options[LP_FILE_FROM_SOLVER] is True:
+            # only the shell interface passes the model to the solver as lp file
+            if (
+                solver_interface == SOLVER_INTERFACE_SHELL
+                and lp_file_options[LP_FILE_FORMAT] == LP_FILE_FORMAT_LP
+            ):
+                logging.debug(
+                    "The lp-file is saved when the model is passed to the solver."
+                )
+                return lp_file_options
+            logging.warning(
+                f"The model is not passed to the solver as {lp_file_options[LP_FILE_FORMAT]} "
+                f"file with the {solver_interface} interface, {LP_FILE_FROM_SOLVER} is ignored."
+            )
+
+        path_lp_file = os.path.join(
+            lp_file_options[PATH_OUTPUT_FOLDER],
+            f"{LP_FILE}.{lp_file_options[LP_FILE_FORMAT]}",
+        )
+        logging.debug("Saving to lp-file.")
+        path_lp_file, symbol_map_id = local_energy_system.write(
+            path_lp_file,
+            io_options={
+                "symbolic_solver_labels": lp_file_options[LP_FILE_SYMBOLIC_LABELS]
+            },
+        )
+        model_building.save_lp_file(
+            path_lp_file,
+            local_energy_system.solutions.symbol_map[symbol_map_id],
+            lp_file_options,
+        )
+        local_energy_system.solutions.delete_symbol_map(symbol_map_id)
+        return None
+
+    def save_lp_file(problem_file, symbol_map, lp_file_options):
+        """
+        Moves or compresses a file written by pyomo into the output folder and saves its label map
+
+        Parameters
+        ----------
+        problem_file: str
+            Path of the file written by pyomo
+
+        symbol_map: :pyomo:`SymbolMap`
+            Map of the labels of the file to the components of the model
+
+        lp_file_options: dict
+            Output of `get_lp_file_options()`
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        Tested with:
+        - test_store_lp_file_mps_without_symbolic_labels()
+        - test_store_lp_file_compressed()
+        """
+        path_output_folder = lp_file_options[PATH_OUTPUT_FOLDER]
+        path_lp_file = os.path.join(
+            path_output_folder, f"{LP_FILE}.{lp_file_options[LP_FILE_FORMAT]}"
+        )
+        compression = lp_file_options[LP_FILE_COMPRESSION]
+        if compression is not None:
+            model_building.compress_file(
+                problem_file,
+                path_lp_file + LP_FILE_COMPRESSION_EXTENSIONS[compression],
+                compression,
+            )
+            os.remove(problem_file)
+        elif os.path.abspath(problem_file) != os.path.abspath(path_lp_file):
+            shutil.move(problem_file, path_lp_file)
+
+        if lp_file_options[LP_FILE_SYMBOLIC_LABELS] is False:
+            with open(
+                os.path.join(path_output_folder, LP_FILE_LABELS), "w", newline=""
+            ) as label_file:
+                writer = csv.writer(label_file)
+                writer.writerow(["solver_label", "model_label"])
+                # the buffer caches the names of the indexed components
+                name_buffer = {}
+                for label, component in symbol_map.bySymbol.items():
+                    writer.writerow(
+                        [
+                            label,
+                            component().getname(
+                                fully_qualified=True, name_buffer=name_buffer
+                            ),
+                        ]
+                    )
+
+    def compress_file(path_input, path_output, compression):
+        """
+        Compresses a file in chunks, so that it is never completely loaded into memory
+
+        Parameters
+        ----------
+        path_input: str
+            Path of the file to compress
+
+        path_output: str
+            Path of the compressed file
+
+        compression: str
+            LP_FILE_COMPRESSION_GZIP or LP_FILE_COMPRESSION_ZSTD
+
+        Returns
+        -------
+        None
+        """
+        with open(path_input, "rb") as input_file, open(
+            path_output, "wb"
+        ) as output_file:
+            if compression == LP_FILE_COMPRESSION_ZSTD:
+                zstandard.ZstdCompressor().copy_stream(input_file, output_file)
+            else:
+                # the default level of zlib, the maximum level is a lot slower for large files
+                with gzip.GzipFile(
+                    fileobj=output_file, mode="wb", compresslevel=6
+                ) as gzip_file:
+                    shutil.copyfileobj(input_file, gzip_file)
+
+    def get_solver_options(dict_values):
+        """
+        Translates the solver settings of the simulation settings into the options of the solver
+
+        The solver is defined by SOLVER (default: DEFAULT_SOLVER) and can be any solver pyomo can
+        find locally. The number of threads (SOLVER_THREADS), the time limit in seconds
+        (SOLVER_TIME_LIMIT), the relative MIP gap (SOLVER_MIP_GAP, default: DEFAULT_SOLVER_MIP_GAP),
+        presolve (SOLVER_PRESOLVE, True/False) and the LP method (SOLVER_METHOD, simplex or barrier)
+        are translated into the option names of the solver with SOLVER_OPTION_NAMES. Settings which
+        are not defined are left to the defaults of the solver.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        Returns
+        -------
+        solver: str
+            Name of the solver
+
+        cmdline_options: dict
+            Options passed to the solver, with the option names of the solver as keys
+
+        Notes
+        -----
+        Settings which are not supported by the solver, or all settings if the solver is not in
+        SOLVER_OPTION_NAMES, are ignored with a warning.
+
+        Tested with:
+        - test_get_solver_options_default()
+        - test_get_solver_options_cbc()
+        - test_get_solver_options_glpk()
+        - test_get_solver_options_unsupported_option_ignored()
+        - test_get_solver_options_unknown_solver()
+        - test_get_solver_options_invalid_method_raises_error()
+        - test_get_solver_options_invalid_presolve_raises_error()
         """
-        if dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE][VALUE] is True:
-            path_lp_file = os.path.join(
-                dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER], "lp_file.lp"
+        simulation_settings = dict_values[SIMULATION_SETTINGS]
+        solver = simulation_settings.get(SOLVER, {}).get(VALUE) or DEFAULT_SOLVER
+        option_names = SOLVER_OPTION_NAMES.get(solver, {})
+
+        solver_settings = {}
+        for setting in (
+            SOLVER_THREADS,
+            SOLVER_TIME_LIMIT,
+            SOLVER_MIP_GAP,
+            SOLVER_PRESOLVE,
+            SOLVER_METHOD,
+        ):
+            value = simulation_settings.get(setting, {}).get(VALUE)
+            if value is not None:
+                solver_settings.update({setting: value})
+
+        if SOLVER_MIP_GAP not in solver_settings and SOLVER_MIP_GAP in option_names:
+            solver_settings.update({SOLVER_MIP_GAP: DEFAULT_SOLVER_MIP_GAP})
+        if SOLVER_THREADS in solver_settings:
+            solver_settings[SOLVER_THREADS] = int(solver_settings[SOLVER_THREADS])
+        if solver_settings.get(SOLVER_PRESOLVE, True) not in (True, False):
+            raise InvalidSolverOptionError(
+                f"The value of {SOLVER_PRESOLVE} has to be True or False, not "
+                f"{solver_settings[SOLVER_PRESOLVE]}."
             )
-            logging.debug("Saving to lp-file.")
-            local_energy_system.write(
-                path_lp_file, io_options={"symbolic_solver_labels": True},
+        if solver_settings.get(SOLVER_METHOD, SOLVER_METHOD_SIMPLEX) not in (
+            SOLVER_METHOD_SIMPLEX,
+            SOLVER_METHOD_BARRIER,
+        ):
+            raise InvalidSolverOptionError(
+                f"The value of {SOLVER_METHOD} has to be {SOLVER_METHOD_SIMPLEX} or "
+                f"{SOLVER_METHOD_BARRIER}, not {solver_settings[SOLVER_METHOD]}."
             )
 
-    def simulating(dict_values, model, local_energy_system):
+        cmdline_options = {}
+        for setting, value in solver_settings.items():
+            if setting not in option_names:
+                logging.warning(
+                    f"The simulation setting {setting} is not supported for the solver {solver}, "
+                    f"it is ignored."
+                )
+                continue
+            option_name = option_names[setting]
+            if isinstance(option_name, dict):
+                option_name, value = option_name[value]
+            cmdline_options.update({option_name: value})
+
+        return solver, cmdline_options
+
+    def check_solver_availability(solver):
         """
-        Initiates the oemof-solph simulation, accesses results and writes main results into dict
+        Checks that pyomo can find the solver locally
+
+        Parameters
+        ----------
+        solver: str
+            Name of the solver
+
+        Returns
+        -------
+        Raises SolverNotAvailableError if the solver is not available
+
+        Notes
+        -----
+        Tested with:
+        - test_check_solver_availability()
+        - test_check_solver_availability_unknown_solver_raises_error()
+        """
+        if po.SolverFactory(solver).available(exception_flag=False) is False:
+            raise SolverNotAvailableError(
+                f"The solver {solver} ({SOLVER} of the {SIMULATION_SETTINGS}) could not be "
+                f"found. Please install it or choose a solver which is available locally."
+            )
+
+    def get_solver_interface(dict_values, solver):
+        """
+        Selects the pyomo interface used to pass the model to the solver
+
+        With the shell interface (default), pyomo writes the model to an lp file, calls the solver
+        executable and parses its solution file. If SOLVER_INTERFACE is "direct" or "persistent"
+        in the simulation settings, the model is passed in memory to the python bindings of the
+        solver (see SOLVER_INTERFACE_NAMES) instead, which avoids the file round-trips. If the
+        requested interface is not available for the solver, the shell interface is used.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        solver: str
+            Name of the solver
+
+        Returns
+        -------
+        solver_name: str
+            Name of the solver interface for pyomo's SolverFactory
+
+        solver_interface: str
+            Interface actually used, one of SOLVER_INTERFACE_SHELL, SOLVER_INTERFACE_DIRECT and
+            SOLVER_INTERFACE_PERSISTENT
+
+        Notes
+        -----
+        Tested with:
+        - test_get_solver_interface_default()
+        - test_get_solver_interface_falls_back_to_shell()
+        - test_get_solver_interface_persistent_cbc_falls_back_to_shell()
+        - test_get_solver_interface_invalid_value_raises_error()
+        """
+        solver_interface = (
+            dict_values[SIMULATION_SETTINGS].get(SOLVER_INTERFACE, {}).get(VALUE)
+            or SOLVER_INTERFACE_SHELL
+        )
+        if solver_interface == SOLVER_INTERFACE_SHELL:
+            return solver, SOLVER_INTERFACE_SHELL
+        if solver_interface not in SOLVER_INTERFACE_NAMES:
+            raise InvalidSolverOptionError(
+                f"The value of {SOLVER_INTERFACE} has to be {SOLVER_INTERFACE_SHELL}, "
+                f"{SOLVER_INTERFACE_DIRECT} or {SOLVER_INTERFACE_PERSISTENT}, not "
+                f"{solver_interface}."
+            )
+
+        solver_name = SOLVER_INTERFACE_NAMES[solver_interface].get(solver)
+        if (
+            solver_name is not None
+            and po.SolverFactory(solver_name).available(exception_flag=False) is True
+        ):
+            return solver_name, solver_interface
+
+        logging.warning(
+            f"The {solver_interface} interface of the solver {solver} is not available, the "
+            f"model is passed to the solver with the {SOLVER_INTERFACE_SHELL} interface (lp file)."
+        )
+        return solver, SOLVER_INTERFACE_SHELL
+
+    def solve(
+        local_energy_system,
+        solver_name,
+        solver_interface,
+        cmdline_options,
+        lp_file_options=None,
+    ):
+        """
+        Solves the model with the solver interface selected by `get_solver_interface()`
+
+        The shell and direct interfaces are called with the solve method of the oemof model. A
+        persistent interface has to be given the model with `set_instance()` before solving, the
+        solver results are then stored in the model like oemof does. If the lp file has to be
+        stored by the solver (see `store_lp_file()`), the model is written once to the output
+        folder, the shell interface solves this lp file and its solution is loaded into the model
+        with the symbol map of the file.
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model
+
+        solver_name: str
+            Name of the solver interface for pyomo's SolverFactory
+
+        solver_interface: str
+            One of SOLVER_INTERFACE_SHELL, SOLVER_INTERFACE_DIRECT and SOLVER_INTERFACE_PERSISTENT
+
+        cmdline_options: dict
+            Options passed to the solver
+
+        lp_file_options: dict or None
+            Options of the lp file returned by `store_lp_file()`
+            Default: None
+
+        Returns
+        -------
+        Solved local_energy_system, its status is checked with `check_solver_status()`
+
+        Notes
+        -----
+        Tested with:
+        - test_if_simulation_results_added_to_dict_values()
+        - test_store_lp_file_from_solver()
+        """
+        if solver_interface == SOLVER_INTERFACE_SHELL and lp_file_options is not None:
+            # the model is written only once, the solver reads the lp file which is then saved
+            path_lp_file, symbol_map_id = local_energy_system.write(
+                os.path.join(
+                    lp_file_options[PATH_OUTPUT_FOLDER],
+                    f"{LP_FILE}.{LP_FILE_FORMAT_LP}",
+                ),
+                io_options={
+                    "symbolic_solver_labels": lp_file_options[LP_FILE_SYMBOLIC_LABELS]
+                },
+            )
+            solver = po.SolverFactory(solver_name, solver_io=LP_FILE_FORMAT_LP)
+            for option, value in cmdline_options.items():
+                solver.options[option] = value
+            solver_results = solver.solve(path_lp_file, tee=False)
+            # the solution of the lp file is mapped to the model with its symbol map
+            if len(solver_results.solution) > 0:
+                local_energy_system.solutions.add_solution(
+                    solver_results.solution(0), symbol_map_id, delete_symbol_map=False,
+                )
+                local_energy_system.solutions.select(0)
+            model_building.save_lp_file(
+                path_lp_file,
+                local_energy_system.solutions.symbol_map[symbol_map_id],
+                lp_file_options,
+            )
+            local_energy_system.solutions.delete_symbol_map(symbol_map_id)
+        elif solver_interface != SOLVER_INTERFACE_PERSISTENT:
+            local_energy_system.solve(
+                solver=solver_name,
+                # if tee_switch is true solver messages will be displayed
+                solve_kwargs={"tee": False},
+                cmdline_options=cmdline_options,
+            )
+            return local_energy_system
+        else:
+            solver = po.SolverFactory(solver_name)
+            for option, value in cmdline_options.items():
+                solver.options[option] = value
+            if hasattr(solver, "set_instance"):
+                solver.set_instance(local_energy_system)
+            solver_results = solver.solve(local_energy_system, tee=False)
+
+        local_energy_system.es.results = solver_results
+        local_energy_system.solver_results = solver_results
+        return local_energy_system
+
+    def check_solver_status(local_energy_system):
+        """
+        Checks that the solver found an optimal solution
 
         If an error is encountered in the oemof solver, mvs should not be allowed to continue,
         otherwise other errors related to the uncomplete simulation result might occur and it will
         be more obscure to the endusers what went wrong.
 
-        A MVS error is raised if the omoef solver warning states explicitely that
-        "termination condition infeasible", otherwise the oemof solver warning is re-raised as
-        an error.
+        The status is read from the solver results stored in the model, rather than by turning
+        the warning of oemof into an error: the filters of the warnings module are shared by all
+        threads of the process, so that simulations running concurrently would interfere.
+
+        Parameters
+        ----------
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model, after the solve
+
+        Returns
+        -------
+        None, a MVSOemofError is raised if the solution is not optimal
+
+        Notes
+        -----
+        Tested with:
+        - test_check_solver_status_optimal()
+        - test_check_solver_status_infeasible_raises_error()
+        - test_check_solver_status_not_optimal_raises_error()
+        """
+        solver_results = local_energy_system.solver_results
+        status = solver_results["Solver"][0]["Status"]
+        termination_condition = solver_results["Solver"][0]["Termination condition"]
+        if status == "ok" and termination_condition == "optimal":
+            return
+
+        error_message = (
+            f"Optimization ended with status {status} and termination condition "
+            f"{termination_condition}"
+        )
+        if termination_condition == "infeasible":
+            error_message = (
+                f"The following error occurred during the mvs solver: {error_message}\n\n "
+                f"There are several reasons why this could have happened."
+                "\n\t- the energy system is not properly connected. "
+                "\n\t- the capacity of some assets might not have been optimized. "
+                "\n\t- the demands might not be supplied with the installed capacities in "
+                "current energy system. Check your maximum power demand and if your energy "
+                "production assets and/or energy conversion assets have enough capacity to "
+                "meet the total demand"
+            )
+        logging.error(error_message)
+        raise MVSOemofError(error_message)
+
+    def diagnose_infeasibility(
+        dict_values, local_energy_system, solver_name, solver_interface, cmdline_options
+    ):
+        """
+        Solves an infeasible model again with penalized slack variables to locate the infeasibility
+
+        The bus balances and the constraints of D2 are relaxed with slack variables (see
+        `D8.add_slack_variables()`), the slack needed by the solution is logged and stored in the
+        output folder.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation inputs
+
+        local_energy_system: object
+            pyomo object storing all constraints of the energy system model, after the infeasible
+            solve, it is modified in place
+
+        solver_name: str
+            Name of the solver interface for pyomo's SolverFactory
+
+        solver_interface: str
+            One of SOLVER_INTERFACE_SHELL, SOLVER_INTERFACE_DIRECT and SOLVER_INTERFACE_PERSISTENT
+
+        cmdline_options: dict
+            Options passed to the solver
+
+        Returns
+        -------
+        str
+            Summary of the diagnosis, see `D8.summarize_slack()`
+
+        Notes
+        -----
+        Tested with:
+        - test_diagnose_infeasibility_bus_shortage()
+        - test_diagnose_infeasibility_maximum_emissions()
+        - test_run_oemof_infeasibility_diagnosis()
+        """
+        logging.info(
+            "The optimization problem is infeasible, it is solved again with slack variables "
+            "on the bus balances and constraints to diagnose the infeasibility."
+        )
+        relaxed_constraints = D8.add_slack_variables(local_energy_system)
+        model_building.solve(
+            local_energy_system, solver_name, solver_interface, cmdline_options
+        )
+        try:
+            model_building.check_solver_status(local_energy_system)
+        except MVSOemofError:
+            diagnosis = (
+                "The optimization problem is still infeasible with slack variables on the bus "
+                "balances and constraints, the infeasibility could not be located."
+            )
+            logging.error(diagnosis)
+            return diagnosis
+
+        slack = D8.get_slack(local_energy_system, relaxed_constraints)
+        D8.store_slack(dict_values, slack)
+        diagnosis = D8.summarize_slack(slack)
+        logging.error(diagnosis)
+        return diagnosis
+
+    def simulating(dict_values, model, local_energy_system, lp_file_options=None):
+        """
+        Initiates the oemof-solph simulation, accesses results and writes main results into dict
 
+        A MVS error is raised if the solver does not find an optimal solution, see
+        `check_solver_status()`. If the problem is infeasible and the simulation setting
+        INFEASIBILITY_DIAGNOSIS is True, the diagnosis of `diagnose_infeasibility()` is added to
+        the error message.
 
         Parameters
         ----------
@@ -285,42 +1396,56 @@ class model_building:
         local_energy_system: object
             pyomo object storing all constraints of the energy system model
 
+        lp_file_options: dict or None
+            Options of the lp file if it is stored by the solver, see `store_lp_file()`
+            Default: None
+
         Returns
         -------
         Updated model with results, main results (flows, assets) and meta results (simulation)
+
+        Notes
+        -----
+        The solver, its options and the solver interface are defined in the simulation settings
+        (see `get_solver_options()` and `get_solver_interface()`), the options and the interface
+        actually used are stored in SIMULATION_RESULTS. The solution is stored if STORE_SOLUTION is
+        True, see D9.
         """
 
-        logging.info("Starting simulation.")
-        # turn warnings into errors
-        warnings.filterwarnings("error")
+        solver, cmdline_options = model_building.get_solver_options(dict_values)
+        solver_name, solver_interface = model_building.get_solver_interface(
+            dict_values, solver
+        )
+        if solver_interface == SOLVER_INTERFACE_SHELL:
+            model_building.check_solver_availability(solver)
+
+        logging.info(
+            f"Starting simulation with the solver {solver} ({solver_interface} interface)."
+        )
+        start = timeit.default_timer()
+        model_building.solve(
+            local_energy_system,
+            solver_name,
+            solver_interface,
+            cmdline_options,
+            lp_file_options=lp_file_options,
+        )
         try:
-            local_energy_system.solve(
-                solver="cbc",
-                solve_kwargs={
-                    "tee": False
-                },  # if tee_switch is true solver messages will be displayed
-                cmdline_options={"ratioGap": str(0.03)},
-            )  # ratioGap allowedGap mipgap
-        except UserWarning as e:
-            error_message = str(e)
-            compare_message = "termination condition infeasible"
-            if compare_message in error_message:
-                error_message = (
-                    f"The following error occurred during the mvs solver: {error_message}\n\n "
-                    f"There are several reasons why this could have happened."
-                    "\n\t- the energy system is not properly connected. "
-                    "\n\t- the capacity of some assets might not have been optimized. "
-                    "\n\t- the demands might not be supplied with the installed capacities in "
-                    "current energy system. Check your maximum power demand and if your energy "
-                    "production assets and/or energy conversion assets have enough capacity to "
-                    "meet the total demand"
+            model_building.check_solver_status(local_energy_system)
+        except MVSOemofError as error:
+            if D8.is_infeasibility_diagnosis_activated(
+                dict_values
+            ) and D8.is_infeasible(local_energy_system):
+                diagnosis = model_building.diagnose_infeasibility(
+                    dict_values,
+                    local_energy_system,
+                    solver_name,
+                    solver_interface,
+                    cmdline_options,
                 )
-                logging.error(error_message)
-                raise MVSOemofError(error_message) from None
-            else:
-                raise e
-        # stop turning warnings into errors
-        warnings.resetwarnings()
+                raise MVSOemofError(f"{error}\n\n{diagnosis}") from error
+            raise
+        solving_time = timeit.default_timer() - start
 
         # add results to the energy system to make it possible to store them.
         results_main = processing.results(local_energy_system)
@@ -334,7 +1459,14 @@ class model_building:
                 SIMULATION_RESULTS: {
                     LABEL: SIMULATION_RESULTS,
                     OBJECTIVE_VALUE: results_meta["objective"],
-                    SIMULTATION_TIME: round(results_meta["solver"]["Time"], 2),
+                    # the direct and persistent interfaces do not always report the solver time
+                    SIMULTATION_TIME: round(
+                        results_meta["solver"].get("Time", solving_time), 2
+                    ),
+                    SOLVER: solver,
+                    SOLVER_OPTIONS: cmdline_options,
+                    SOLVER_INTERFACE: solver_interface,
+                    SOLVER_ITERATIONS: D9.get_solver_iterations(local_energy_system),
                 }
             }
         )
@@ -342,6 +1474,8 @@ class model_building:
             "Simulation time: %s minutes.",
             round(dict_values[SIMULATION_RESULTS][SIMULTATION_TIME] / 60, 2),
         )
+        if D9.is_solution_storage_activated(dict_values):
+            D9.store_solution(dict_values, local_energy_system)
         return model, results_main, results_main
 
 
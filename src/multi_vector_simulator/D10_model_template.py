@@ -0,0 +1,577 @@
+"""
+Module D10 - Model template
+===========================
+
+Build-once, re-solve-many model for scenario variants which share the topology of the energy
+system and only differ in their numeric data. Building the pyomo model takes most of the time of
+the optimization of a small energy system, the model template builds it once and re-solves it for
+each variant.
+
+Functional requirements of module D10:
+- build the pyomo model of a scenario with D0, D1 and D2, with the numeric data of the components
+  bound to mutable pyomo parameters instead of numbers:
+    - costs: variable costs of the flows, annuities of the investments
+    - time series: fixed and maximal flows
+    - efficiencies: conversion factors of the transformers, efficiencies and losses of the storages
+    - capacities: nominal values of the flows and storages, existing and maximal capacities,
+      C-rates of the storages
+    - emission factors
+- check that a variant is compatible with the template, ie. it has the same components, flows,
+  investments and structural parameters (eg. the minimal flows and storage levels)
+- bind the numeric data of the variant to the parameters, update the values of the fixed flows and
+  re-add the constraints of D2, which depend on the constraint values of the variant
+- solve the model of the variant and return its results as `D0.run_oemof()`
+- rebuild the model in the process which unpickles the template, eg. a worker of a process pool
+
+The numeric data of a variant is read from its oemof energy system, which is built with D1 as for
+any simulation, so that the variants are processed exactly as by `D0.run_oemof()`. The typical
+periods (D3), the rolling horizon dispatch (D4), the model reduction (D6) and the parallel
+subsystems (D7) change the structure of the model and can not be used with a template.
+"""
+
+import copy
+import logging
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as po
+from oemof import solph
+from oemof.solph.plumbing import sequence
+
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D2_model_constraints as D2
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    TYPICAL_PERIODS,
+    ROLLING_HORIZON_WINDOW,
+    MODEL_REDUCTION,
+    PARALLEL_SUBSYSTEMS,
+    MODEL_SIZE,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidModelTemplateError
+
+# Name of the block of the mutable parameters in the pyomo model
+PARAMETER_BLOCK = "template_parameters"
+
+# Attributes bound to mutable parameters
+FLOW_PARAMETERS = ("variable_costs", "fix", "max", "nominal_value", "emission_factor")
+INVESTMENT_PARAMETERS = ("ep_costs", "existing", "maximum")
+STORAGE_PARAMETERS = (
+    "loss_rate",
+    "fixed_losses_relative",
+    "fixed_losses_absolute",
+    "inflow_conversion_factor",
+    "outflow_conversion_factor",
+    "nominal_storage_capacity",
+    "invest_relation_input_capacity",
+    "invest_relation_output_capacity",
+)
+
+# Attributes which define the structure of the model and have to be the same for all variants
+FLOW_STRUCTURE = ("min",)
+INVESTMENT_STRUCTURE = ("minimum",)
+STORAGE_STRUCTURE = ("min_storage_level", "max_storage_level", "initial_storage_level")
+
+# Simulation settings which change the structure of the model
+UNSUPPORTED_SETTINGS = (
+    TYPICAL_PERIODS,
+    ROLLING_HORIZON_WINDOW,
+    MODEL_REDUCTION,
+    PARALLEL_SUBSYSTEMS,
+)
+
+# Components of the pyomo model added by D2
+D2_COMPONENTS = (
+    "integral_limit_emission_factor",
+    "integral_limit_emission_factor_constraint",
+    "constraint_minimal_renewable_share",
+    "constraint_minimal_degree_of_autonomy",
+)
+
+
+def check_template_settings(dict_values):
+    r"""
+    Checks that the simulation settings can be used with a model template.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Raises InvalidModelTemplateError if a simulation setting of UNSUPPORTED_SETTINGS is activated.
+
+    Tested with:
+    - test_check_template_settings_unsupported_setting_raises_error()
+    """
+    simulation_settings = dict_values[SIMULATION_SETTINGS]
+    for setting in UNSUPPORTED_SETTINGS:
+        if simulation_settings.get(setting, {}).get(VALUE) not in (None, False):
+            raise InvalidModelTemplateError(
+                f"The simulation setting {setting} changes the structure of the model and can "
+                f"not be used with a model template."
+            )
+
+
+def get_attributes(
+    energy_system, flow_attributes, investment_attributes, storage_attributes
+):
+    r"""
+    Lists the attributes of the flows and components of an energy system.
+
+    Parameters
+    ----------
+    energy_system: :oemof-solph: <oemof.solph.network.EnergySystem>
+        Energy system with all components
+
+    flow_attributes: tuple of str
+        Attributes of the flows
+
+    investment_attributes: tuple of str
+        Attributes of the investments of the flows and storages
+
+    storage_attributes: tuple of str
+        Attributes of the storages
+
+    Returns
+    -------
+    dict
+        Object (flow, investment, storage or conversion factors of a transformer) and name of
+        each attribute, keyed by the labels of the component, the name of the attribute and, for
+        the conversion factors, the label of the bus. Attributes which are not defined or None are
+        not listed.
+
+    Notes
+    -----
+    Tested with:
+    - test_get_attributes()
+    """
+    attributes = {}
+
+    def add(key, owner, name):
+        value = (
+            owner.get(name) if isinstance(owner, dict) else getattr(owner, name, None)
+        )
+        # undefined sequence attributes (eg. the fix of a flow) are emulated sequences of None
+        if value is not None and getattr(value, "default", 0) is not None:
+            attributes[key] = (owner, name)
+
+    for (source, target), flow in energy_system.flows().items():
+        labels = (source.label, target.label)
+        for name in flow_attributes:
+            add(labels + (name,), flow, name)
+        if flow.investment is not None:
+            for name in investment_attributes:
+                add(labels + ("investment", name), flow.investment, name)
+    for node in energy_system.nodes:
+        if isinstance(node, solph.components.GenericStorage):
+            for name in storage_attributes:
+                add((node.label, name), node, name)
+            if node.investment is not None:
+                for name in investment_attributes:
+                    add((node.label, "investment", name), node.investment, name)
+        elif isinstance(node, solph.Transformer) and flow_attributes == FLOW_PARAMETERS:
+            for bus in node.conversion_factors:
+                add(
+                    (node.label, bus.label, "conversion_factors"),
+                    node.conversion_factors,
+                    bus,
+                )
+    return attributes
+
+
+def get_value(owner, name):
+    return owner[name] if isinstance(owner, dict) else getattr(owner, name)
+
+
+def set_value(owner, name, value):
+    if isinstance(owner, dict):
+        owner[name] = value
+    else:
+        setattr(owner, name, value)
+
+
+def is_time_series(value):
+    r"""
+    Returns True if the value of an attribute is a time series, False if it is a scalar.
+
+    oemof-solph stores the scalar values of sequence attributes as emulated sequences, which are no
+    lists.
+    """
+    return isinstance(value, (list, tuple, np.ndarray, pd.Series))
+
+
+def get_structure(energy_system):
+    r"""
+    Describes the structure of the model of an energy system.
+
+    Parameters
+    ----------
+    energy_system: :oemof-solph: <oemof.solph.network.EnergySystem>
+        Energy system with all components
+
+    Returns
+    -------
+    dict
+        Type of each component, whether each flow has an investment, the keys of the attributes
+        bound to parameters (see `get_attributes()`), whether they are time series, and the
+        values of the structural attributes (FLOW_STRUCTURE, INVESTMENT_STRUCTURE,
+        STORAGE_STRUCTURE) for each timestep
+
+    Notes
+    -----
+    Tested with:
+    - test_bind_incompatible_variant_raises_error()
+    """
+    n_timesteps = len(energy_system.timeindex)
+    structure = {
+        ("type", node.label): type(node).__name__ for node in energy_system.nodes
+    }
+    for (source, target), flow in energy_system.flows().items():
+        structure[("investment", source.label, target.label)] = (
+            flow.investment is not None
+        )
+    parameters = get_attributes(
+        energy_system, FLOW_PARAMETERS, INVESTMENT_PARAMETERS, STORAGE_PARAMETERS
+    )
+    for key in parameters:
+        structure[("parameter",) + key] = True
+    structural_attributes = get_attributes(
+        energy_system, FLOW_STRUCTURE, INVESTMENT_STRUCTURE, STORAGE_STRUCTURE
+    )
+    for key, (owner, name) in structural_attributes.items():
+        values = sequence(get_value(owner, name))
+        structure[key] = tuple(float(values[t]) for t in range(n_timesteps))
+    return structure
+
+
+def check_compatibility(template_structure, variant_structure):
+    r"""
+    Checks that a variant has the structure of the model template.
+
+    Parameters
+    ----------
+    template_structure: dict
+        Structure of the energy system of the template, see `get_structure()`
+
+    variant_structure: dict
+        Structure of the energy system of the variant
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Raises InvalidModelTemplateError for the first difference of the structures.
+
+    Tested with:
+    - test_bind_incompatible_variant_raises_error()
+    """
+    for key in template_structure.keys() | variant_structure.keys():
+        template_value = template_structure.get(key)
+        variant_value = variant_structure.get(key)
+        if template_value != variant_value:
+            raise InvalidModelTemplateError(
+                f"The variant is not compatible with the model template: {key} is "
+                f"{variant_value} instead of {template_value}."
+            )
+
+
+def get_fixed_variables(local_energy_system):
+    r"""
+    Lists the variables which oemof-solph fixes to values computed from the bound parameters.
+
+    Parameters
+    ----------
+    local_energy_system: :oemof-solph: <oemof.solph.model>
+        pyomo model built with the attributes bound to the parameters of the template
+
+    Returns
+    -------
+    list of tuple
+        Each fixed variable with the expression of its value: the flows with a fixed time series
+        and a nominal value (fix * nominal_value) and the initial content of the storages with
+        an initial storage level (initial_storage_level * nominal_storage_capacity)
+
+    Notes
+    -----
+    oemof-solph assigns the values of these variables when it builds the model, pyomo evaluates
+    the expressions of the parameters to numbers at this point. The expressions are therefore
+    built again from the bound attributes, with the same rules as oemof-solph.
+
+    Tested with:
+    - test_get_fixed_variables()
+    - test_model_template_run()
+    """
+    fixed_variables = []
+    first_timestep = local_energy_system.TIMESTEPS[1]
+    for (source, target) in local_energy_system.FLOWS:
+        flow = local_energy_system.flows[source, target]
+        if flow.nominal_value is not None and flow.fix[first_timestep] is not None:
+            fixed_variables += [
+                (
+                    local_energy_system.flow[source, target, t],
+                    flow.fix[t] * flow.nominal_value,
+                )
+                for t in local_energy_system.TIMESTEPS
+            ]
+    if hasattr(local_energy_system, "GenericStorageBlock"):
+        block = local_energy_system.GenericStorageBlock
+        for storage in block.STORAGES:
+            if storage.initial_storage_level is not None:
+                fixed_variables.append(
+                    (
+                        block.init_content[storage],
+                        storage.initial_storage_level
+                        * storage.nominal_storage_capacity,
+                    )
+                )
+    return fixed_variables
+
+
+class ModelTemplate:
+    r"""
+    Model of a scenario with mutable parameters, re-solved for variants of the scenario.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters of the scenario, after the pre-processing in C0
+
+    Attributes
+    ----------
+    energy_system: :oemof-solph: <oemof.solph.network.EnergySystem>
+        Energy system of the template, the results of the variants are added to it
+
+    local_energy_system: :oemof-solph: <oemof.solph.model>
+        pyomo model of the template
+
+    Notes
+    -----
+    The pyomo model of a template is not pickled, as the rules of the constraints of oemof-solph
+    are local functions. A pickled template holds the simulation parameters of the scenario and
+    rebuilds the model once when it is unpickled, eg. in a worker of a process pool, which then
+    re-solves it for any number of variants.
+
+    Tested with:
+    - test_model_template_run()
+    - test_model_template_pickle()
+    """
+
+    def __init__(self, dict_values):
+        check_template_settings(dict_values)
+        self.dict_values = copy.deepcopy(dict_values)
+        self.build()
+
+    def __getstate__(self):
+        return {"dict_values": self.dict_values}
+
+    def __setstate__(self, state):
+        self.dict_values = state["dict_values"]
+        self.build()
+
+    def build(self):
+        r"""
+        Builds the pyomo model of the template with mutable parameters.
+
+        The parameters are stored in the block PARAMETER_BLOCK of the model: the scalars in
+        `scalars`, indexed by the number of the attribute, and the time series in `time_series`,
+        indexed by the number of the attribute and the timestep. The attributes of the flows and
+        components are replaced by these parameters before oemof-solph creates its constraints.
+        """
+        logging.info("Building the model template.")
+        energy_system, self.dict_model = D0.model_building.initialize(self.dict_values)
+        self.energy_system = D0.model_building.adding_assets_to_energysystem_model(
+            self.dict_values, self.dict_model, energy_system
+        )
+        self.structure = get_structure(self.energy_system)
+        self.n_timesteps = len(self.energy_system.timeindex)
+
+        self.attributes = get_attributes(
+            self.energy_system,
+            FLOW_PARAMETERS,
+            INVESTMENT_PARAMETERS,
+            STORAGE_PARAMETERS,
+        )
+        scalars = [
+            key
+            for key, (owner, name) in self.attributes.items()
+            if not is_time_series(get_value(owner, name))
+        ]
+        time_series = [key for key in self.attributes if key not in scalars]
+        self.scalars = {key: number for number, key in enumerate(scalars)}
+        self.time_series = {key: number for number, key in enumerate(time_series)}
+
+        local_energy_system = solph.Model(self.energy_system, auto_construct=False)
+        parameters = po.Block()
+        local_energy_system.add_component(PARAMETER_BLOCK, parameters)
+        parameters.SCALARS = po.Set(initialize=range(len(scalars)), ordered=True)
+        parameters.TIME_SERIES = po.Set(
+            initialize=range(len(time_series)), ordered=True
+        )
+        parameters.TIMESTEPS = po.Set(initialize=range(self.n_timesteps), ordered=True)
+        parameters.scalars = po.Param(
+            parameters.SCALARS, mutable=True, initialize=0, within=po.Any
+        )
+        parameters.time_series = po.Param(
+            parameters.TIME_SERIES,
+            parameters.TIMESTEPS,
+            mutable=True,
+            initialize=0,
+            within=po.Any,
+        )
+        self.parameters = parameters
+        self.bind_attributes(self.attributes)
+
+        for key, (owner, name) in self.attributes.items():
+            if key in self.scalars:
+                parameter = parameters.scalars[self.scalars[key]]
+                # sequence attributes have to stay sequences
+                if not isinstance(get_value(owner, name), (int, float)):
+                    parameter = sequence(parameter)
+            else:
+                number = self.time_series[key]
+                parameter = [
+                    parameters.time_series[number, t] for t in range(self.n_timesteps)
+                ]
+            set_value(owner, name, parameter)
+
+        local_energy_system._construct()
+        self.local_energy_system = local_energy_system
+
+        # oemof-solph fixes some variables to values computed from the parameters (eg. the flows
+        # with a fixed time series), their values are updated after each binding
+        self.fixed_variables = get_fixed_variables(local_energy_system)
+        self.update_fixed_variables()
+        D2.add_constraints(local_energy_system, self.dict_values, self.dict_model)
+
+    def bind_attributes(self, attributes):
+        r"""
+        Binds the values of the attributes of an energy system to the parameters of the template.
+
+        Parameters
+        ----------
+        attributes: dict
+            Attributes of the energy system, with the same keys as the attributes of the template,
+            see `get_attributes()`
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        Raises InvalidModelTemplateError if an attribute which is a scalar in the template is a
+        time series with more than one value in the variant.
+        """
+        for key, number in self.scalars.items():
+            value = get_value(*attributes[key])
+            if is_time_series(value):
+                values = set(np.asarray(value, dtype=float))
+                if len(values) > 1:
+                    raise InvalidModelTemplateError(
+                        f"The variant is not compatible with the model template: {key} is a "
+                        f"time series, but a scalar in the template."
+                    )
+                value = values.pop()
+            elif not isinstance(value, (int, float)):
+                value = value[0]
+            self.parameters.scalars[number] = float(value)
+        for key, number in self.time_series.items():
+            values = sequence(get_value(*attributes[key]))
+            self.parameters.time_series.store_values(
+                {(number, t): float(values[t]) for t in range(self.n_timesteps)}
+            )
+
+    def update_fixed_variables(self):
+        r"""
+        Fixes the variables fixed by oemof-solph to the values of the bound parameters.
+        """
+        for variable, value in self.fixed_variables:
+            variable.fix(po.value(value))
+
+    def bind(self, dict_values):
+        r"""
+        Binds the numeric data of a variant to the model template.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation parameters of the variant, after the pre-processing in C0
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        The energy system of the variant is built with D1 and its numeric data is bound to the
+        parameters of the template. The constraints of D2 are replaced by the ones of the variant.
+        Raises InvalidModelTemplateError if the variant is not compatible with the template.
+
+        Tested with:
+        - test_model_template_run()
+        - test_bind_incompatible_variant_raises_error()
+        """
+        check_template_settings(dict_values)
+        energy_system, dict_model = D0.model_building.initialize(dict_values)
+        energy_system = D0.model_building.adding_assets_to_energysystem_model(
+            dict_values, dict_model, energy_system
+        )
+        check_compatibility(self.structure, get_structure(energy_system))
+        self.bind_attributes(
+            get_attributes(
+                energy_system,
+                FLOW_PARAMETERS,
+                INVESTMENT_PARAMETERS,
+                STORAGE_PARAMETERS,
+            )
+        )
+        self.update_fixed_variables()
+
+        for name in D2_COMPONENTS:
+            if hasattr(self.local_energy_system, name):
+                self.local_energy_system.del_component(name)
+        D2.add_constraints(self.local_energy_system, dict_values, self.dict_model)
+
+    def run(self, dict_values):
+        r"""
+        Solves the model template for a variant.
+
+        Parameters
+        ----------
+        dict_values: dict
+            All simulation parameters of the variant, after the pre-processing in C0
+
+        Returns
+        -------
+        results_meta, results_main
+            Results of the oemof simulation, as returned by `D0.run_oemof()`
+
+        Notes
+        -----
+        The SIMULATION_RESULTS of the variant are added to `dict_values`.
+
+        Tested with:
+        - test_model_template_run()
+        """
+        start = D0.timer.initalize()
+        self.bind(dict_values)
+        model_size = D0.model_building.measure_model_size(
+            dict_values, self.local_energy_system
+        )
+        _, results_main, results_meta = D0.model_building.simulating(
+            dict_values, self.energy_system, self.local_energy_system
+        )
+        dict_values[SIMULATION_RESULTS].update({MODEL_SIZE: model_size})
+        D0.timer.stop(dict_values, start)
+        return results_meta, results_main
@@ -0,0 +1,305 @@
+"""
+Module D11 - Raw results
+========================
+
+Storage of the raw results of the optimization and re-evaluation of a simulation from them.
+Post-processing parameters (eg. emission factors, renewable shares, weights of the energy
+carriers) often change after a long optimization. The evaluation (E0 to F0) only needs the flows
+and invest values of the optimized energy system, so that a simulation can be re-evaluated with
+modified inputs without building and solving the optimization model again.
+
+Functional requirements of module D11:
+- store the sequences and scalars of all flows of the oemof results and the SIMULATION_RESULTS
+  (incl. the objective value) in one compressed binary file in the output folder
+- load the stored results in the format of the oemof results processed by E0
+- verify that the stored results cover all busses and assets of the inputs and their evaluated
+  period
+
+The raw results are only stored if the optional simulation setting STORE_RAW_RESULTS is True (eg.
+with the option `--store-raw-results` of `mvs_tool`). The re-evaluation does not check whether the modified inputs would change the
+optimal dispatch or capacities: only parameters which are not part of the optimization problem
+should be modified.
+"""
+
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+import multi_vector_simulator.E1_process_results as E1
+from multi_vector_simulator.B0_data_input_json import convert_from_special_types_to_json
+from multi_vector_simulator.utils.constants import (
+    PATH_OUTPUT_FOLDER,
+    RAW_RESULTS_FILE,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    STORE_RAW_RESULTS,
+    OBJECTIVE_VALUE,
+    TIME_INDEX,
+    ENERGY_BUSSES,
+    ENERGY_CONVERSION,
+    ENERGY_CONSUMPTION,
+    ENERGY_PRODUCTION,
+    ENERGY_STORAGE,
+    LABEL,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidRawResultsError
+
+# Version of the format of the raw results file, to be increased if the format changes
+RAW_RESULTS_FORMAT = 1
+
+# Arrays of the raw results file
+RAW_RESULTS_FORMAT_VERSION = "format_version"
+RAW_RESULTS_VALUES = "values"
+RAW_RESULTS_COLUMNS = "columns"
+RAW_RESULTS_INDEX = "index"
+RAW_RESULTS_FREQUENCY = "frequency"
+RAW_RESULTS_SCALARS = "scalars"
+RAW_RESULTS_SCALAR_KEYS = "scalar_keys"
+RAW_RESULTS_SIMULATION_RESULTS = "simulation_results"
+
+# Keys of the oemof results of an edge of the energy system
+SEQUENCES = "sequences"
+SCALARS = "scalars"
+
+
+def is_raw_results_storage_activated(dict_values):
+    r"""
+    Reads the simulation setting STORE_RAW_RESULTS.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    bool
+        True if the raw results of the optimization are to be stored, False by default
+
+    Notes
+    -----
+    Raises InvalidRawResultsError if STORE_RAW_RESULTS is not True or False.
+
+    Tested with:
+    - test_is_raw_results_storage_activated_not_defined()
+    - test_is_raw_results_storage_activated_true()
+    - test_is_raw_results_storage_activated_invalid_value_raises_error()
+    """
+    activated = (
+        dict_values[SIMULATION_SETTINGS].get(STORE_RAW_RESULTS, {}).get(VALUE, False)
+    )
+    if activated not in (True, False):
+        raise InvalidRawResultsError(
+            f"The value of {STORE_RAW_RESULTS} has to be True or False, not {activated}."
+        )
+    return activated
+
+
+def store_raw_results(dict_values, results_main):
+    r"""
+    Stores the raw results of the optimization in the output folder.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, with the SIMULATION_RESULTS of the optimization
+
+    results_main: dict
+        oemof simulation results as output by processing.results()
+
+    Returns
+    -------
+    str
+        Path of the file RAW_RESULTS_FILE
+
+    Notes
+    -----
+    The sequences of all flows are stored as one matrix (timesteps x sequences) with the keys of
+    the sequences, see `E1.get_flow_matrix()`. The scalars (eg. the invest values) are stored
+    as one array with their keys and the SIMULATION_RESULTS as json string.
+
+    Tested with:
+    - test_store_and_load_raw_results()
+    """
+    flow_matrix = E1.get_flow_matrix(results_main)
+    scalar_keys = list(flow_matrix[E1.FLOW_MATRIX_SCALARS].keys())
+    index = flow_matrix[E1.FLOW_MATRIX_INDEX]
+
+    path_output_folder = dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER]
+    os.makedirs(path_output_folder, exist_ok=True)
+    path_file = os.path.join(path_output_folder, RAW_RESULTS_FILE)
+    np.savez_compressed(
+        path_file,
+        **{
+            RAW_RESULTS_FORMAT_VERSION: np.array(RAW_RESULTS_FORMAT),
+            RAW_RESULTS_VALUES: flow_matrix[E1.FLOW_MATRIX_VALUES],
+            RAW_RESULTS_COLUMNS: np.array(
+                json.dumps(flow_matrix[E1.FLOW_MATRIX_COLUMNS])
+            ),
+            RAW_RESULTS_INDEX: index.asi8,
+            RAW_RESULTS_FREQUENCY: np.array(index.freqstr or ""),
+            RAW_RESULTS_SCALARS: np.array(
+                [flow_matrix[E1.FLOW_MATRIX_SCALARS][key] for key in scalar_keys],
+                dtype=float,
+            ),
+            RAW_RESULTS_SCALAR_KEYS: np.array(json.dumps(scalar_keys)),
+            RAW_RESULTS_SIMULATION_RESULTS: np.array(
+                json.dumps(
+                    dict_values[SIMULATION_RESULTS],
+                    default=convert_from_special_types_to_json,
+                )
+            ),
+        },
+    )
+    logging.info(f"The raw results of the optimization are stored in {path_file}.")
+    return path_file
+
+
+def load_raw_results(dict_values, path_file):
+    r"""
+    Loads the raw results of a previous optimization to re-evaluate a simulation.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    path_file: str
+        Path of a file stored with `store_raw_results()`
+
+    Returns
+    -------
+    results_meta: dict
+        Objective value of the optimization ('objective')
+
+    results_main: dict
+        Results of each flow (source, target) with its 'sequences' (pd.DataFrame) and
+        'scalars' (pd.Series), as output by processing.results() with the labels of the nodes
+        instead of the nodes
+
+    Notes
+    -----
+    Updates dict_values[SIMULATION_RESULTS] with the SIMULATION_RESULTS of the optimization.
+    Raises InvalidRawResultsError if the file was stored in another format or if the raw results do
+    not cover the evaluated period or the busses and assets of dict_values, see
+    `check_raw_results()`.
+
+    Tested with:
+    - test_store_and_load_raw_results()
+    - test_load_raw_results_other_format_raises_error()
+    """
+    if not os.path.isfile(path_file):
+        raise InvalidRawResultsError(
+            f"The raw results file {path_file} does not exist."
+        )
+    with np.load(path_file) as raw_results:
+        if int(raw_results[RAW_RESULTS_FORMAT_VERSION]) != RAW_RESULTS_FORMAT:
+            raise InvalidRawResultsError(
+                f"The raw results file {path_file} is stored in format "
+                f"{int(raw_results[RAW_RESULTS_FORMAT_VERSION])}, this version of the MVS reads "
+                f"format {RAW_RESULTS_FORMAT}."
+            )
+        values = raw_results[RAW_RESULTS_VALUES]
+        columns = json.loads(str(raw_results[RAW_RESULTS_COLUMNS]))
+        index = pd.DatetimeIndex(
+            raw_results[RAW_RESULTS_INDEX],
+            freq=str(raw_results[RAW_RESULTS_FREQUENCY]) or None,
+        )
+        scalars = raw_results[RAW_RESULTS_SCALARS]
+        scalar_keys = json.loads(str(raw_results[RAW_RESULTS_SCALAR_KEYS]))
+        simulation_results = json.loads(
+            str(raw_results[RAW_RESULTS_SIMULATION_RESULTS])
+        )
+
+    check_raw_results(
+        dict_values, columns + scalar_keys, index, path_file,
+    )
+
+    results_main = {}
+    sequences = {}
+    for column, ((source, target), variable) in enumerate(columns):
+        sequences.setdefault((source, target), {})[variable] = values[:, column]
+    for (source, target), edge_sequences in sequences.items():
+        results_main[(source, target)] = {
+            SEQUENCES: pd.DataFrame(edge_sequences, index=index),
+            SCALARS: pd.Series(dtype=float),
+        }
+    edge_scalars = {}
+    for value, ((source, target), variable) in zip(scalars, scalar_keys):
+        edge_scalars.setdefault((source, target), {})[variable] = value
+    for (source, target), scalar_values in edge_scalars.items():
+        results_main.setdefault(
+            (source, target), {SEQUENCES: pd.DataFrame(index=index)}
+        )[SCALARS] = pd.Series(scalar_values, dtype=float)
+
+    dict_values.update({SIMULATION_RESULTS: simulation_results})
+    logging.info(
+        f"The simulation is re-evaluated from the raw results of {path_file}, the optimization "
+        f"model is not built and solved again."
+    )
+    return {"objective": simulation_results.get(OBJECTIVE_VALUE)}, results_main
+
+
+def check_raw_results(dict_values, keys, index, path_file):
+    r"""
+    Checks that the raw results cover the busses and assets of the simulation and its evaluated period.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    keys: list
+        Keys of the stored sequences and scalars, eg. [['pv', 'Electricity'], 'flow']
+
+    index: :pandas:`pandas.DatetimeIndex`
+        Timesteps of the stored sequences
+
+    path_file: str
+        Path of the raw results file
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Raises InvalidRawResultsError if the timesteps of the raw results are not the TIME_INDEX of
+    the simulation settings or if a bus or asset of dict_values is no node of the raw results, eg.
+    if an asset was added to the inputs after the optimization.
+
+    Tested with:
+    - test_check_raw_results_other_time_index_raises_error()
+    - test_check_raw_results_missing_asset_raises_error()
+    """
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    if not index.equals(pd.DatetimeIndex(time_index)):
+        raise InvalidRawResultsError(
+            f"The raw results of {path_file} cover {len(index)} timesteps from {index[0]}, the "
+            f"evaluated period of the inputs {len(time_index)} timesteps from {time_index[0]}."
+        )
+
+    nodes = {label for (labels, _) in keys for label in labels}
+    labels = list(dict_values[ENERGY_BUSSES]) + [
+        dict_values[group][asset][LABEL]
+        for group in [
+            ENERGY_CONVERSION,
+            ENERGY_CONSUMPTION,
+            ENERGY_PRODUCTION,
+            ENERGY_STORAGE,
+        ]
+        for asset in dict_values[group]
+    ]
+    missing_labels = [label for label in labels if label not in nodes]
+    if len(missing_labels) > 0:
+        raise InvalidRawResultsError(
+            f"The raw results of {path_file} do not include the busses or assets "
+            f"{', '.join(missing_labels)} of the inputs. The simulation can only be re-evaluated "
+            f"with inputs of the same energy system."
+        )
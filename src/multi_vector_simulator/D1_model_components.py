@@ -10,13 +10,19 @@ Module D1 includes all functions that are required to build an oemof model with
 - add storage objects (fix, to be optimized)
 - add multiple input/output busses if required for each of the assets
 - add oemof component parameters as scalar or time series values
+- convert the time series of the assets to numpy arrays before they are added to the model
 
+The constructors of the components are timed if the construction of the model is profiled (see
+`utils.model_profiling`).
 """
 
 import logging
 
+import numpy as np
+import pandas as pd
 import oemof.solph as solph
 
+from multi_vector_simulator.utils.model_profiling import timed, CATEGORY_D1
 from multi_vector_simulator.utils.constants_json_strings import (
     VALUE,
     LABEL,
@@ -52,6 +58,59 @@ from multi_vector_simulator.utils.constants_json_strings import (
 )
 
 
+def timeseries_to_arrays(dict_asset, interned_arrays=None):
+    r"""
+    Returns a copy of the asset in which each time series is a contiguous float64 numpy array.
+
+    oemof-solph reads the parameters of the components timestep by timestep while the pyomo model
+    is built. Reading a numpy array by position is much faster than reading a pandas Series, which
+    looks up its index first. The time series are converted once, before the asset is added to the
+    model, and are passed to oemof-solph instead of the Series of `dict_asset`.
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Dictionary of the asset, incl. time series (eg. TIMESERIES_NORMALIZED) and parameters with
+        time series values (eg. DISPATCH_PRICE, EFFICIENCY or THERM_LOSSES_REL)
+
+    interned_arrays: dict or None
+        Arrays converted so far, keyed by their bytes. Time series with identical values (eg. the
+        same price time series of several assets) are converted to the same read-only array if the
+        dict is shared by the assets of an energy system.
+        Default: None
+
+    Returns
+    -------
+    dict
+        Copy of `dict_asset` with numpy arrays instead of pandas Series, `dict_asset` is not changed
+
+    Notes
+    -----
+    Only pandas Series with a DatetimeIndex are converted, other values are kept as they are.
+
+    Tested with:
+    - test_timeseries_to_arrays()
+    - test_timeseries_to_arrays_interned()
+    """
+    if interned_arrays is None:
+        interned_arrays = {}
+    if isinstance(dict_asset, dict):
+        return {
+            key: timeseries_to_arrays(value, interned_arrays)
+            for key, value in dict_asset.items()
+        }
+    if isinstance(dict_asset, list):
+        return [timeseries_to_arrays(value, interned_arrays) for value in dict_asset]
+    if isinstance(dict_asset, pd.Series) and isinstance(
+        dict_asset.index, pd.DatetimeIndex
+    ):
+        array = np.ascontiguousarray(dict_asset.to_numpy(dtype=np.float64))
+        array = interned_arrays.setdefault(array.tobytes(), array)
+        array.flags.writeable = False
+        return array
+    return dict_asset
+
+
 def transformer(model, dict_asset, **kwargs):
     r"""
     Defines a transformer component specified in `dict_asset`.
@@ -196,9 +255,11 @@ def sink(model, dict_asset, **kwargs):
 
     """
     if TIMESERIES in dict_asset:
-        sink_non_dispatchable(model, dict_asset, **kwargs)
+        with timed(CATEGORY_D1, sink_non_dispatchable.__name__):
+            sink_non_dispatchable(model, dict_asset, **kwargs)
     else:
-        sink_dispatchable_optimize(model, dict_asset, **kwargs)
+        with timed(CATEGORY_D1, sink_dispatchable_optimize.__name__):
+            sink_dispatchable_optimize(model, dict_asset, **kwargs)
 
 
 def source(model, dict_asset, **kwargs):
@@ -316,7 +377,8 @@ def check_optimize_cap(model, dict_asset, func_constant, func_optimize, **kwargs
 
     """
     if dict_asset[OPTIMIZE_CAP][VALUE] is False:
-        func_constant(model, dict_asset, **kwargs)
+        with timed(CATEGORY_D1, func_constant.__name__):
+            func_constant(model, dict_asset, **kwargs)
         if dict_asset[OEMOF_ASSET_TYPE] != "source":
             logging.debug(
                 "Added: %s %s (fixed capacity)",
@@ -325,7 +387,8 @@ def check_optimize_cap(model, dict_asset, func_constant, func_optimize, **kwargs
             )
 
     elif dict_asset[OPTIMIZE_CAP][VALUE] is True:
-        func_optimize(model, dict_asset, **kwargs)
+        with timed(CATEGORY_D1, func_optimize.__name__):
+            func_optimize(model, dict_asset, **kwargs)
         if dict_asset[OEMOF_ASSET_TYPE] != "source":
             logging.debug(
                 "Added: %s %s (capacity to be optimized)",
@@ -511,7 +574,7 @@ def transformer_constant_efficiency_optimize(model, dict_asset, **kwargs):
                         existing=dict_asset[INSTALLED_CAP][VALUE],
                     ),
                     variable_costs=dict_asset[DISPATCH_PRICE][VALUE],
-                    max=dict_asset[AVAILABILITY_DISPATCH].values,
+                    max=np.asarray(dict_asset[AVAILABILITY_DISPATCH]),
                 )
             }
         else:
@@ -11,9 +11,12 @@ constraints should be tested in-code (examples) and by comparing the lp file gen
 """
 import logging
 import pyomo.environ as po
-from oemof.solph import constraints
+from pyomo.core.expr.numeric_expr import LinearExpression
+from oemof.solph.plumbing import sequence
 
 from multi_vector_simulator.utils.constants import DEFAULT_WEIGHTS_ENERGY_CARRIERS
+from multi_vector_simulator.utils.asset_registry import get_asset_registry
+from multi_vector_simulator.utils.model_profiling import timed, CATEGORY_D2
 
 from multi_vector_simulator.utils.constants_json_strings import (
     OEMOF_SOURCE,
@@ -37,6 +40,8 @@ from multi_vector_simulator.utils.constants_json_strings import (
     MINIMAL_RENEWABLE_FACTOR,
     MAXIMUM_EMISSIONS,
     MINIMAL_DEGREE_OF_AUTONOMY,
+    SIMULATION_SETTINGS,
+    TYPICAL_PERIOD_WEIGHTS,
 )
 
 
@@ -77,23 +82,26 @@ def add_constraints(local_energy_system, dict_values, dict_model):
 
     if dict_values[CONSTRAINTS][MINIMAL_RENEWABLE_FACTOR][VALUE] > 0:
         # Add minimal renewable factor constraint
-        local_energy_system = constraint_minimal_renewable_share(
-            local_energy_system, dict_values, dict_model
-        )
+        with timed(CATEGORY_D2, constraint_minimal_renewable_share.__name__):
+            local_energy_system = constraint_minimal_renewable_share(
+                local_energy_system, dict_values, dict_model
+            )
         count_added_constraints += 1
 
     if dict_values[CONSTRAINTS][MAXIMUM_EMISSIONS][VALUE] is not None:
         # Add maximum emissions constraint
-        local_energy_system = constraint_maximum_emissions(
-            local_energy_system, dict_values
-        )
+        with timed(CATEGORY_D2, constraint_maximum_emissions.__name__):
+            local_energy_system = constraint_maximum_emissions(
+                local_energy_system, dict_values
+            )
         count_added_constraints += 1
 
     if dict_values[CONSTRAINTS][MINIMAL_DEGREE_OF_AUTONOMY][VALUE] > 0:
         # Add minimal renewable factor constraint
-        local_energy_system = constraint_minimal_degree_of_autonomy(
-            local_energy_system, dict_values, dict_model
-        )
+        with timed(CATEGORY_D2, constraint_minimal_degree_of_autonomy.__name__):
+            local_energy_system = constraint_minimal_degree_of_autonomy(
+                local_energy_system, dict_values, dict_model
+            )
         count_added_constraints += 1
 
     if count_added_constraints == 0:
@@ -123,12 +131,187 @@ def constraint_maximum_emissions(model, dict_values):
 
     """
     maximum_emissions = dict_values[CONSTRAINTS][MAXIMUM_EMISSIONS][VALUE]
+    timestep_weights = get_timestep_weights(dict_values)
     # Updates the model with the constraint for maximum amount of emissions
-    constraints.emission_limit(model, limit=maximum_emissions)
+    emission_limit(model, maximum_emissions, timestep_weights)
     logging.info("Added maximum emission constraint.")
     return model
 
 
+def get_timestep_weights(dict_values):
+    r"""
+    Returns the weight of each timestep of the model if the time series are aggregated into typical periods.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    list or None
+        TYPICAL_PERIOD_WEIGHTS of the simulation settings, None if the time series are not aggregated.
+
+    Notes
+    -----
+    Tested with:
+    - D2.test_sum_of_flow_with_timestep_weights()
+    """
+    return dict_values.get(SIMULATION_SETTINGS, {}).get(TYPICAL_PERIOD_WEIGHTS, None)
+
+
+def sum_of_flow(model, source, target, timestep_weights=None):
+    r"""
+    Sum of the flow between source and target over all timesteps, weighted by the timestep weights if provided.
+
+    Parameters
+    ----------
+    model: :oemof-solph: <oemof.solph.model>
+        Model including the flow
+
+    source: :oemof-solph: <oemof.solph.network.Node>
+        Source of the flow
+
+    target: :oemof-solph: <oemof.solph.network.Node>
+        Target of the flow
+
+    timestep_weights: list or None
+        Weight of each timestep, see `get_timestep_weights()`
+        Default: None
+
+    Returns
+    -------
+    pyomo expression
+
+    Notes
+    -----
+    Tested with:
+    - D2.test_sum_of_flow_with_timestep_weights()
+    """
+    return linear_expression([flow_terms(model, source, target, 1, timestep_weights)])
+
+
+def flow_terms(model, source, target, factor, timestep_weights=None):
+    r"""
+    Coefficients and variables of the flow between source and target over all timesteps.
+
+    Parameters
+    ----------
+    model: :oemof-solph: <oemof.solph.model>
+        Model including the flow
+
+    source: :oemof-solph: <oemof.solph.network.Node>
+        Source of the flow
+
+    target: :oemof-solph: <oemof.solph.network.Node>
+        Target of the flow
+
+    factor: float or list
+        Factor of the flow, either a constant or one value per timestep
+
+    timestep_weights: list or None
+        Weight of each timestep, see `get_timestep_weights()`
+        Default: None
+
+    Returns
+    -------
+    tuple of list
+        Coefficient (factor multiplied with the timestep weight) and flow variable of each timestep
+
+    Notes
+    -----
+    Tested with:
+    - D2.test_sum_of_flow_with_timestep_weights()
+    - D2.test_linear_expression()
+    """
+    factors = sequence(factor)
+    if timestep_weights is None:
+        coefficients = [factors[t] for t in model.TIMESTEPS]
+    else:
+        coefficients = [factors[t] * timestep_weights[t] for t in model.TIMESTEPS]
+    variables = [model.flow[source, target, t] for t in model.TIMESTEPS]
+    return coefficients, variables
+
+
+def linear_expression(terms):
+    r"""
+    Linear pyomo expression of the sum of the terms, built in linear time.
+
+    Summing up pyomo variables with the builtin `sum()` rebuilds the expression at each addition,
+    which takes seconds for the flows of many assets over thousands of timesteps. The coefficients
+    and variables are collected first and passed to a single `LinearExpression`.
+
+    Parameters
+    ----------
+    terms: list of tuple
+        Coefficients and variables of each term of the sum, see `flow_terms()`
+
+    Returns
+    -------
+    :pyomo: <pyomo.core.expr.numeric_expr.LinearExpression>
+
+    Notes
+    -----
+    Tested with:
+    - D2.test_linear_expression()
+    - D2.test_benchmark_constraint_build_time()
+    """
+    coefficients = []
+    variables = []
+    for term_coefficients, term_variables in terms:
+        coefficients.extend(term_coefficients)
+        variables.extend(term_variables)
+    return LinearExpression(
+        constant=0, linear_coefs=coefficients, linear_vars=variables
+    )
+
+
+def emission_limit(model, limit, timestep_weights=None):
+    r"""
+    Emission limit of all flows with an emission factor, with the emissions of each timestep weighted by the timestep weights if provided.
+
+    Equivalent to oemof-solph's `constraints.emission_limit()`, with a linear expression (see
+    `linear_expression()`) and for models of aggregated typical periods.
+
+    Parameters
+    ----------
+    model: :oemof-solph: <oemof.solph.model>
+        Model to which constraint is added.
+
+    limit: float
+        Maximum emissions
+
+    timestep_weights: list or None
+        Weight of each timestep, see `get_timestep_weights()`
+        Default: None
+
+    Returns
+    -------
+    model: :oemof-solph: <oemof.solph.model>
+        Updated model
+
+    Notes
+    -----
+    Tested with:
+    - D2.test_emission_limit()
+    - D2.test_constraint_maximum_emissions()
+    - D3.test_run_oemof_with_typical_periods()
+    """
+    terms = []
+    for (i, o) in model.flows:
+        if hasattr(model.flows[i, o], "emission_factor"):
+            emission_factor = sequence(model.flows[i, o].emission_factor)
+            factors = [
+                model.timeincrement[t] * emission_factor[t] for t in model.TIMESTEPS
+            ]
+            terms.append(flow_terms(model, i, o, factors, timestep_weights))
+    model.integral_limit_emission_factor = po.Expression(expr=linear_expression(terms))
+    model.integral_limit_emission_factor_constraint = po.Constraint(
+        expr=(model.integral_limit_emission_factor <= limit)
+    )
+    return model
+
+
 def constraint_minimal_renewable_share(model, dict_values, dict_model):
     r"""
     Resulting in an energy system adhering to a minimal renewable factor.
@@ -174,47 +357,44 @@ def constraint_minimal_renewable_share(model, dict_values, dict_model):
         oemof_solph_object_bus,
     )
 
+    timestep_weights = get_timestep_weights(dict_values)
+
+    minimal_renewable_factor = dict_values[CONSTRAINTS][MINIMAL_RENEWABLE_FACTOR][VALUE]
+
     def renewable_share_rule(model):
-        renewable_generation = 0
-        total_generation = 0
+        # renewable generation - minimal renewable factor * total generation >= 0, with the
+        # renewable generation being part of the total generation
+        terms = []
 
         # Get the flows from all renewable assets
         for asset in renewable_assets:
-            generation = (
-                sum(
-                    model.flow[
-                        renewable_assets[asset][oemof_solph_object_asset],
-                        renewable_assets[asset][oemof_solph_object_bus],
-                        :,
-                    ]
+            terms.append(
+                flow_terms(
+                    model,
+                    renewable_assets[asset][oemof_solph_object_asset],
+                    renewable_assets[asset][oemof_solph_object_bus],
+                    renewable_assets[asset][weighting_factor_energy_carrier]
+                    * renewable_assets[asset][renewable_share_asset_flow]
+                    * (1 - minimal_renewable_factor),
+                    timestep_weights,
                 )
-                * renewable_assets[asset][weighting_factor_energy_carrier]
-                * renewable_assets[asset][renewable_share_asset_flow]
             )
-            total_generation += generation
-            renewable_generation += generation
 
         # Get the flows from all non renewable assets
         for asset in non_renewable_assets:
-            generation = (
-                sum(
-                    model.flow[
-                        non_renewable_assets[asset][oemof_solph_object_asset],
-                        non_renewable_assets[asset][oemof_solph_object_bus],
-                        :,
-                    ]
+            terms.append(
+                flow_terms(
+                    model,
+                    non_renewable_assets[asset][oemof_solph_object_asset],
+                    non_renewable_assets[asset][oemof_solph_object_bus],
+                    -non_renewable_assets[asset][weighting_factor_energy_carrier]
+                    * (1 - non_renewable_assets[asset][renewable_share_asset_flow])
+                    * minimal_renewable_factor,
+                    timestep_weights,
                 )
-                * non_renewable_assets[asset][weighting_factor_energy_carrier]
-                * (1 - non_renewable_assets[asset][renewable_share_asset_flow])
             )
-            total_generation += generation
 
-        expr = (
-            renewable_generation
-            - (dict_values[CONSTRAINTS][MINIMAL_RENEWABLE_FACTOR][VALUE])
-            * total_generation
-        )
-        return expr >= 0
+        return linear_expression(terms) >= 0
 
     model.constraint_minimal_renewable_share = po.Constraint(rule=renewable_share_rule)
 
@@ -334,9 +514,11 @@ def prepare_constraint_minimal_renewable_share(
     )
 
     dso_sources = []
-    for dso in dict_values[ENERGY_PROVIDERS]:
-        # Get source connected to the specific DSO in question
-        DSO_source_name = dso + DSO_CONSUMPTION
+    # Get source connected to the specific DSO in question
+    dso_consumption_sources = get_asset_registry(
+        dict_values
+    ).energy_provider_consumption_sources
+    for dso, DSO_source_name in dso_consumption_sources.items():
         # Add DSO to both renewable and nonrenewable assets (as only a share of their supply may be renewable)
         dso_sources.append(DSO_source_name)
 
@@ -444,48 +626,46 @@ def constraint_minimal_degree_of_autonomy(model, dict_values, dict_model):
         oemof_solph_object_bus,
     )
 
+    timestep_weights = get_timestep_weights(dict_values)
+
+    minimal_degree_of_autonomy = dict_values[CONSTRAINTS][MINIMAL_DEGREE_OF_AUTONOMY][
+        VALUE
+    ]
+
     def degree_of_autonomy_rule(model):
-        total_demand = 0
-        total_consumption_from_energy_provider = 0
+        # (1 - minimal degree of autonomy) * total demand - consumption from energy providers >= 0
+        terms = []
 
         # Get the flows from demands and add weighing
         for asset in demands:
-            demand_one_asset = (
-                sum(
-                    model.flow[
-                        demands[asset][oemof_solph_object_bus],
-                        demands[asset][oemof_solph_object_asset],
-                        :,
-                    ]
+            terms.append(
+                flow_terms(
+                    model,
+                    demands[asset][oemof_solph_object_bus],
+                    demands[asset][oemof_solph_object_asset],
+                    demands[asset][weighting_factor_energy_carrier]
+                    * (1 - minimal_degree_of_autonomy),
+                    timestep_weights,
                 )
-                * demands[asset][weighting_factor_energy_carrier]
             )
-            total_demand += demand_one_asset
 
         # Get the flows from providers and add weighing
         for asset in energy_provider_consumption_sources:
-            consumption_of_one_provider = (
-                sum(
-                    model.flow[
-                        energy_provider_consumption_sources[asset][
-                            oemof_solph_object_asset
-                        ],
-                        energy_provider_consumption_sources[asset][
-                            oemof_solph_object_bus
-                        ],
-                        :,
-                    ]
+            terms.append(
+                flow_terms(
+                    model,
+                    energy_provider_consumption_sources[asset][
+                        oemof_solph_object_asset
+                    ],
+                    energy_provider_consumption_sources[asset][oemof_solph_object_bus],
+                    -energy_provider_consumption_sources[asset][
+                        weighting_factor_energy_carrier
+                    ],
+                    timestep_weights,
                 )
-                * energy_provider_consumption_sources[asset][
-                    weighting_factor_energy_carrier
-                ]
             )
-            total_consumption_from_energy_provider += consumption_of_one_provider
 
-        expr = (
-            1 - dict_values[CONSTRAINTS][MINIMAL_DEGREE_OF_AUTONOMY][VALUE]
-        ) * total_demand - total_consumption_from_energy_provider
-        return expr >= 0
+        return linear_expression(terms) >= 0
 
     model.constraint_minimal_degree_of_autonomy = po.Constraint(
         rule=degree_of_autonomy_rule
@@ -565,9 +745,11 @@ def prepare_constraint_minimal_degree_of_autonomy(
             )
             demand_list.append(asset)
 
-    for dso in dict_values[ENERGY_PROVIDERS]:
-        # Get source connected to the specific DSO in question
-        DSO_source_name = dso + DSO_CONSUMPTION
+    # Get source connected to the specific DSO in question
+    dso_consumption_sources = get_asset_registry(
+        dict_values
+    ).energy_provider_consumption_sources
+    for dso, DSO_source_name in dso_consumption_sources.items():
         # Add DSO to assets
         dso_consumption_source_list.append(DSO_source_name)
 
@@ -0,0 +1,876 @@
+"""
+Module D3 - Time series aggregation
+===================================
+
+Optional aggregation of the evaluated period into typical periods (eg. typical days), which
+reduces the size of the linear problem solved in D0.
+
+Functional requirements of module D3:
+- read the number and length of the typical periods from the simulation settings
+- cluster the periods of the evaluated period with k-medoids, based on all time series of the assets
+- build the reduced simulation parameters, in which each time series only includes the typical periods
+- weight each timestep of the reduced model by the number of periods its typical period represents
+- link the storage content of the typical periods along the periods of the evaluated period
+- map the results of the reduced model back to the full time index, so that E0-E3 compute the
+  KPI of the full evaluated period
+- provide the aggregation error
+
+The aggregation is activated by defining the optional parameter TYPICAL_PERIODS in the simulation
+settings, the length of a typical period is defined with TYPICAL_PERIOD_LENGTH in days (default: 1).
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as po
+from pyomo.repn import generate_standard_repn
+
+from multi_vector_simulator.utils.asset_registry import ASSET_GROUPS_OF_REGISTRY
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    PERIODS,
+    TIMESTEP,
+    VALUE,
+    UNIT,
+    UNIT_DAY,
+    TYPICAL_PERIODS,
+    TYPICAL_PERIOD_LENGTH,
+    TYPICAL_PERIOD_WEIGHTS,
+    AGGREGATION_ERROR,
+)
+from multi_vector_simulator.utils.exceptions import InvalidTypicalPeriodsError
+
+# Keys of the dict describing the selected typical periods
+MEDOIDS = "medoids"
+ASSIGNMENT = "assignment"
+PERIOD_LENGTH = "period_length"
+# Retention factor of the storage content at each timestep of the reduced model, by storage label,
+# added by add_storage_linking_constraints()
+STORAGE_RETENTION = "storage_retention"
+
+# Prefixes of the variables linking the storage content of the typical periods, one variable per
+# period of the evaluated period or per typical period (numbered by a suffix)
+PERIOD_START_CONTENT = "period_start_content"
+TYPICAL_PERIOD_MAX_CONTENT = "typical_period_max_content"
+TYPICAL_PERIOD_MIN_CONTENT = "typical_period_min_content"
+
+# Default length of a typical period in days
+DEFAULT_TYPICAL_PERIOD_LENGTH = 1
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def get_typical_period_settings(simulation_settings):
+    r"""
+    Reads the number of typical periods and their length in timesteps from the simulation settings.
+
+    Parameters
+    ----------
+    simulation_settings: dict
+        Simulation settings, including TIMESTEP and PERIODS
+
+    Returns
+    -------
+    n_typical_periods: int or None
+        Number of typical periods, None if the time series aggregation is not activated
+
+    period_length: int or None
+        Number of timesteps of one period, None if the time series aggregation is not activated
+
+    Notes
+    -----
+    Raises InvalidTypicalPeriodsError if the number of typical periods is negative or if the
+    evaluated period can not be divided into periods of TYPICAL_PERIOD_LENGTH days.
+
+    Tested with:
+    - test_get_typical_period_settings_not_defined()
+    - test_get_typical_period_settings_days()
+    - test_get_typical_period_settings_weeks()
+    - test_get_typical_period_settings_negative_number_raises_error()
+    - test_get_typical_period_settings_indivisible_evaluated_period_raises_error()
+    """
+    n_typical_periods = simulation_settings.get(TYPICAL_PERIODS, {}).get(VALUE, None)
+    if n_typical_periods is None or n_typical_periods == 0:
+        return None, None
+
+    if n_typical_periods < 0:
+        raise InvalidTypicalPeriodsError(
+            f"The number of typical periods ({TYPICAL_PERIODS}) has to be positive, "
+            f"but it is {n_typical_periods}."
+        )
+
+    period_length_days = simulation_settings.get(TYPICAL_PERIOD_LENGTH, {}).get(
+        VALUE, DEFAULT_TYPICAL_PERIOD_LENGTH
+    )
+    period_length = (
+        period_length_days * MINUTES_PER_DAY / simulation_settings[TIMESTEP][VALUE]
+    )
+
+    if period_length != int(period_length) or period_length < 1:
+        raise InvalidTypicalPeriodsError(
+            f"A typical period of {period_length_days} {UNIT_DAY}(s) can not be divided into "
+            f"timesteps of {simulation_settings[TIMESTEP][VALUE]} {simulation_settings[TIMESTEP][UNIT]}."
+        )
+    period_length = int(period_length)
+
+    if simulation_settings[PERIODS] % period_length != 0:
+        raise InvalidTypicalPeriodsError(
+            f"The evaluated period of {simulation_settings[PERIODS]} timesteps can not be divided "
+            f"into typical periods of {period_length_days} {UNIT_DAY}(s) ({period_length} timesteps)."
+        )
+
+    return int(n_typical_periods), period_length
+
+
+def get_time_series_features(dict_values, period_length):
+    r"""
+    Stacks all time series of the assets into one feature vector per period.
+
+    Each time series is normalized by its maximum absolute value, constant time series and
+    duplicates are not considered as they do not differentiate the periods. NaN values are set to 0.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    period_length: int
+        Number of timesteps of one period
+
+    Returns
+    -------
+    features: :numpy:`numpy.ndarray`
+        Array of shape (number of periods, number of time series * period_length)
+
+    Notes
+    -----
+    Tested with:
+    - test_get_time_series_features()
+    """
+    n_timesteps = dict_values[SIMULATION_SETTINGS][PERIODS]
+    n_periods = n_timesteps // period_length
+
+    time_series = []
+    for group in ASSET_GROUPS_OF_REGISTRY:
+        if isinstance(dict_values.get(group), dict):
+            time_series.extend(find_time_series(dict_values[group], n_timesteps))
+
+    features = []
+    known_features = set()
+    for series in time_series:
+        # NaN values are simulated as 0 (see C0.replace_nans_in_timeseries_with_0)
+        values = np.nan_to_num(np.asarray(series, dtype=float))
+        maximum = np.abs(values).max()
+        if maximum == 0 or np.ptp(values) == 0:
+            continue
+        values = values / maximum
+        if values.tobytes() in known_features:
+            continue
+        known_features.add(values.tobytes())
+        features.append(values.reshape(n_periods, period_length))
+
+    logging.debug(
+        f"Clustering the typical periods based on {len(features)} normalized time series."
+    )
+
+    if len(features) == 0:
+        return np.zeros((n_periods, 0))
+    return np.hstack(features)
+
+
+def find_time_series(dict_asset, n_timesteps):
+    r"""
+    Returns all time series of the length of the evaluated period found (recursively) in dict_asset.
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Parameters of one or several assets
+
+    n_timesteps: int
+        Number of timesteps of the evaluated period
+
+    Returns
+    -------
+    list of :pandas:`pandas.Series` or :numpy:`numpy.ndarray`
+
+    Notes
+    -----
+    Tested with:
+    - test_get_time_series_features()
+    """
+    time_series = []
+    for value in dict_asset.values():
+        if isinstance(value, dict):
+            time_series.extend(find_time_series(value, n_timesteps))
+        elif is_time_series(value, n_timesteps):
+            time_series.append(value)
+    return time_series
+
+
+def is_time_series(value, n_timesteps):
+    r"""
+    Returns True if value is a pd.Series or np.ndarray with one entry per timestep of the evaluated period.
+    """
+    return (
+        isinstance(value, (pd.Series, np.ndarray))
+        and value.ndim == 1
+        and len(value) == n_timesteps
+    )
+
+
+def k_medoids(features, n_clusters, max_iterations=100):
+    r"""
+    Clusters the periods with the k-medoids algorithm.
+
+    The medoids are initialized with the greedy BUILD step of the PAM algorithm and then improved
+    by alternately assigning each period to its closest medoid and choosing the period with the
+    smallest distance to all other periods of a cluster as its new medoid. The result is deterministic.
+
+    Parameters
+    ----------
+    features: :numpy:`numpy.ndarray`
+        Feature vector of each period, shape (number of periods, number of features)
+
+    n_clusters: int
+        Number of clusters (typical periods), smaller than the number of periods
+
+    max_iterations: int
+        Maximum number of iterations of the assignment and update steps
+        Default: 100
+
+    Returns
+    -------
+    medoids: :numpy:`numpy.ndarray`
+        Index of the period representing each cluster, in chronological order
+
+    assignment: :numpy:`numpy.ndarray`
+        For each period, the position of its cluster in `medoids`
+
+    Notes
+    -----
+    Tested with:
+    - test_k_medoids_separates_distinct_periods()
+    - test_k_medoids_identical_periods()
+    """
+    squared_norms = (features ** 2).sum(axis=1)
+    distances = np.sqrt(
+        np.maximum(
+            squared_norms[:, None]
+            + squared_norms[None, :]
+            - 2 * features.dot(features.T),
+            0,
+        )
+    )
+
+    # BUILD: start with the most central period and greedily add the period reducing the total distance most
+    medoids = [int(np.argmin(distances.sum(axis=1)))]
+    for _ in range(1, n_clusters):
+        nearest = distances[:, medoids].min(axis=1)
+        costs = np.minimum(nearest[:, None], distances).sum(axis=0)
+        costs[medoids] = np.inf
+        medoids.append(int(np.argmin(costs)))
+    medoids = np.array(medoids)
+
+    def assign(medoids):
+        assignment = np.argmin(distances[:, medoids], axis=1)
+        # Identical periods could otherwise leave a cluster without its own medoid
+        assignment[medoids] = np.arange(len(medoids))
+        return assignment
+
+    for _ in range(max_iterations):
+        assignment = assign(medoids)
+        new_medoids = medoids.copy()
+        for cluster in range(n_clusters):
+            members = np.flatnonzero(assignment == cluster)
+            within_distances = distances[np.ix_(members, members)].sum(axis=0)
+            new_medoids[cluster] = members[np.argmin(within_distances)]
+        if np.array_equal(new_medoids, medoids):
+            break
+        medoids = new_medoids
+
+    assignment = assign(medoids)
+
+    # Order the typical periods chronologically
+    order = np.argsort(medoids)
+    position = np.empty(n_clusters, dtype=int)
+    position[order] = np.arange(n_clusters)
+    return medoids[order], position[assignment]
+
+
+def select_typical_periods(dict_values):
+    r"""
+    Selects the typical periods of the evaluated period if the time series aggregation is activated.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    Returns
+    -------
+    typical_periods: dict or None
+        MEDOIDS (index of the typical periods), ASSIGNMENT (position of the typical period in MEDOIDS
+        representing each period), PERIOD_LENGTH (number of timesteps of one period) and
+        AGGREGATION_ERROR. None if the time series aggregation is not activated or if the number of
+        typical periods is not smaller than the number of periods.
+
+    Notes
+    -----
+    Tested with:
+    - test_select_typical_periods_not_activated()
+    - test_select_typical_periods_more_typical_periods_than_periods()
+    - test_select_typical_periods()
+    """
+    n_typical_periods, period_length = get_typical_period_settings(
+        dict_values[SIMULATION_SETTINGS]
+    )
+    if n_typical_periods is None:
+        return None
+
+    n_periods = dict_values[SIMULATION_SETTINGS][PERIODS] // period_length
+    if n_typical_periods >= n_periods:
+        logging.info(
+            f"The number of typical periods ({n_typical_periods}) is not smaller than the number of "
+            f"periods of the evaluated period ({n_periods}), the time series are not aggregated."
+        )
+        return None
+
+    features = get_time_series_features(dict_values, period_length)
+    medoids, assignment = k_medoids(features, n_typical_periods)
+
+    typical_periods = {
+        MEDOIDS: medoids,
+        ASSIGNMENT: assignment,
+        PERIOD_LENGTH: period_length,
+        AGGREGATION_ERROR: aggregation_error(features, medoids, assignment),
+    }
+    logging.info(
+        f"Aggregated the evaluated period of {n_periods} periods into {n_typical_periods} typical "
+        f"periods of {period_length} timesteps (aggregation error: {round(typical_periods[AGGREGATION_ERROR], 4)})."
+    )
+    return typical_periods
+
+
+def aggregation_error(features, medoids, assignment):
+    r"""
+    Root mean square error between the normalized time series of each period and its typical period.
+
+    Parameters
+    ----------
+    features: :numpy:`numpy.ndarray`
+        Feature vector of each period, see `get_time_series_features()`
+
+    medoids: :numpy:`numpy.ndarray`
+        Index of the typical periods
+
+    assignment: :numpy:`numpy.ndarray`
+        Position of the typical period in `medoids` representing each period
+
+    Returns
+    -------
+    float
+
+    Notes
+    -----
+    Tested with:
+    - test_aggregation_error()
+    """
+    if features.size == 0:
+        return 0.0
+    deviation = features - features[medoids[assignment]]
+    return float(np.sqrt((deviation ** 2).mean()))
+
+
+def reduce_dict_values(dict_values, typical_periods):
+    r"""
+    Builds the simulation parameters of the reduced model, which only includes the typical periods.
+
+    All time series of the length of the evaluated period are reduced to the timesteps of the
+    typical periods. TIME_INDEX and PERIODS are updated and the weight of each timestep is
+    added as TYPICAL_PERIOD_WEIGHTS to the simulation settings.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0. It is not modified.
+
+    typical_periods: dict
+        Typical periods, see `select_typical_periods()`
+
+    Returns
+    -------
+    dict_values_reduced: dict
+        Simulation parameters of the reduced model
+
+    Notes
+    -----
+    Tested with:
+    - test_reduce_dict_values()
+    """
+    medoids = typical_periods[MEDOIDS]
+    period_length = typical_periods[PERIOD_LENGTH]
+    n_reduced_timesteps = len(medoids) * period_length
+
+    positions = np.concatenate(
+        [np.arange(m * period_length, (m + 1) * period_length) for m in medoids]
+    )
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX][:n_reduced_timesteps]
+
+    dict_values_reduced = select_timesteps(dict_values, positions, time_index)
+
+    weights = np.bincount(typical_periods[ASSIGNMENT], minlength=len(medoids))
+    dict_values_reduced[SIMULATION_SETTINGS].update(
+        {TYPICAL_PERIOD_WEIGHTS: np.repeat(weights, period_length).tolist()}
+    )
+
+    return dict_values_reduced
+
+
+def select_timesteps(dict_values, positions, time_index):
+    r"""
+    Copies the simulation parameters, with all time series only including the timesteps at `positions`.
+
+    Time series are all pd.Series and np.ndarray of the length of the evaluated period.
+    TIME_INDEX and PERIODS of the simulation settings are updated.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0. It is not modified.
+
+    positions: :numpy:`numpy.ndarray`
+        Positions of the selected timesteps in the evaluated period
+
+    time_index: :pandas:`pandas.DatetimeIndex`
+        Time index of the selected timesteps, of the same length as `positions`
+
+    Returns
+    -------
+    dict_values_selection: dict
+        Simulation parameters of the selected timesteps
+
+    Notes
+    -----
+    Tested with:
+    - test_reduce_dict_values()
+    - D4.test_select_window()
+    """
+    n_timesteps = dict_values[SIMULATION_SETTINGS][PERIODS]
+
+    def select(value):
+        if isinstance(value, dict):
+            return {key: select(item) for key, item in value.items()}
+        elif isinstance(value, pd.Series) and is_time_series(value, n_timesteps):
+            return pd.Series(value.values[positions], index=time_index, name=value.name)
+        elif isinstance(value, np.ndarray) and is_time_series(value, n_timesteps):
+            return value[positions]
+        else:
+            return value
+
+    dict_values_selection = select(dict_values)
+    dict_values_selection[SIMULATION_SETTINGS].update(
+        {TIME_INDEX: time_index, PERIODS: len(positions)}
+    )
+
+    return dict_values_selection
+
+
+def get_objective_weighting(dict_values_reduced):
+    r"""
+    Weighting of each timestep of the reduced model in the objective function.
+
+    The oemof default weighting is the timeincrement (in hours), which is multiplied by the
+    number of periods represented by the typical period of the timestep.
+
+    Parameters
+    ----------
+    dict_values_reduced: dict
+        Simulation parameters of the reduced model, see `reduce_dict_values()`
+
+    Returns
+    -------
+    list of float
+
+    Notes
+    -----
+    Tested with:
+    - test_get_objective_weighting()
+    """
+    timeincrement = dict_values_reduced[SIMULATION_SETTINGS][TIMESTEP][VALUE] / 60
+    return [
+        weight * timeincrement
+        for weight in dict_values_reduced[SIMULATION_SETTINGS][TYPICAL_PERIOD_WEIGHTS]
+    ]
+
+
+def rebase_storage_balance(block, storages, n_typical_periods, period_length):
+    r"""
+    Starts the storage content of each typical period at zero.
+
+    The storage balance of the first timestep of each typical period is replaced by the same
+    balance without the storage content of the previous timestep (or the initial storage content),
+    so that the storage content of the reduced model is the content relative to the start of its
+    typical period.
+
+    Parameters
+    ----------
+    block: :pyomo:`Block`
+        GenericStorageBlock or GenericInvestmentStorageBlock of the model of the reduced energy system
+
+    storages: :pyomo:`Set`
+        Storages of the block
+
+    n_typical_periods: int
+        Number of typical periods
+
+    period_length: int
+        Number of timesteps of one period
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Tested with:
+    - test_add_storage_linking_constraints_seasonal_storage()
+    """
+    rebased_balances = {}
+    for n in storages:
+        for typical in range(n_typical_periods):
+            start = typical * period_length
+            if start == 0:
+                balance, previous_content = (
+                    block.balance_first[n],
+                    block.init_content[n],
+                )
+            else:
+                balance = block.balance[n, start]
+                previous_content = block.storage_content[n, start - 1]
+            balance.deactivate()
+            repn = generate_standard_repn(balance.body)
+            rebased_balances[n, typical] = repn.constant + sum(
+                coefficient * variable
+                for coefficient, variable in zip(repn.linear_coefs, repn.linear_vars)
+                if variable is not previous_content
+            ) == po.value(balance.upper)
+
+    block.typical_period_start_balance = po.Constraint(
+        storages,
+        range(n_typical_periods),
+        rule=lambda block, n, typical: rebased_balances[n, typical],
+    )
+
+
+def add_storage_linking_constraints(local_energy_system, typical_periods):
+    r"""
+    Links the storage content of the typical periods along the sequence of periods of the evaluated period.
+
+    The storage content of each storage is split into the content at the start of each period of
+    the evaluated period (one variable per period) and the content within the typical periods,
+    relative to their start (see `rebase_storage_balance()`). The content at the start of the next
+    period is the content at the start of the period, reduced by the self-discharge over the
+    period, plus the content at the end of its typical period. The maximum and minimum of the
+    content within each typical period are bounded by one variable each, the content at the start
+    of each period plus these extremes has to stay within the storage levels. The bounds of oemof
+    on the storage content are relaxed, as they apply to the content relative to the start of the
+    typical periods. For balanced storages, the content at the end of the evaluated period equals
+    the initial storage content. This allows a storage to shift energy between periods (eg. a
+    seasonal storage), with a number of variables and constraints in the order of the number of
+    periods and the number of timesteps of the reduced model.
+
+    The retention factor of each storage at each timestep is added to `typical_periods` as
+    STORAGE_RETENTION, to rebuild the storage content of the evaluated period from the results
+    in `expand_results_to_time_index()`.
+
+    Parameters
+    ----------
+    local_energy_system: :oemof-solph: <oemof.solph.model>
+        Model of the reduced energy system
+
+    typical_periods: dict
+        Typical periods, see `select_typical_periods()`. It is updated with STORAGE_RETENTION.
+
+    Returns
+    -------
+    local_energy_system: :oemof-solph: <oemof.solph.model>
+        Updated model
+
+    Notes
+    -----
+    Tested with:
+    - test_add_storage_linking_constraints_seasonal_storage()
+    - test_run_oemof_with_typical_periods()
+    """
+    period_length = typical_periods[PERIOD_LENGTH]
+    n_typical_periods = len(typical_periods[MEDOIDS])
+    assignment = typical_periods[ASSIGNMENT]
+    n_periods = len(assignment)
+    timesteps = list(local_energy_system.TIMESTEPS)
+    typical_period_timesteps = [
+        timesteps[typical * period_length : (typical + 1) * period_length]
+        for typical in range(n_typical_periods)
+    ]
+
+    for block_name, storages_name, get_capacity in [
+        (
+            "GenericStorageBlock",
+            "STORAGES",
+            lambda block, n: n.nominal_storage_capacity,
+        ),
+        (
+            "GenericInvestmentStorageBlock",
+            "INVESTSTORAGES",
+            lambda block, n: n.investment.existing + block.invest[n],
+        ),
+    ]:
+        block = getattr(local_energy_system, block_name, None)
+        if block is None:
+            continue
+        storages = getattr(block, storages_name)
+
+        retention = {
+            n: np.array(
+                [
+                    (1 - n.loss_rate[t]) ** local_energy_system.timeincrement[t]
+                    for t in timesteps
+                ]
+            )
+            for n in storages
+        }
+        typical_periods.setdefault(STORAGE_RETENTION, {}).update(
+            {str(n.label): retention[n] for n in storages}
+        )
+
+        rebase_storage_balance(block, storages, n_typical_periods, period_length)
+        for n in storages:
+            for t in timesteps:
+                block.storage_content[n, t].domain = po.Reals
+                block.storage_content[n, t].setlb(None)
+                block.storage_content[n, t].setub(None)
+        for constraint in (
+            "balanced_cstr",
+            "max_storage_content",
+            "min_storage_content",
+        ):
+            if hasattr(block, constraint):
+                getattr(block, constraint).deactivate()
+
+        for typical in range(n_typical_periods):
+            setattr(
+                block,
+                f"{TYPICAL_PERIOD_MAX_CONTENT}_{typical}",
+                po.Var(storages, bounds=(0, None)),
+            )
+            setattr(
+                block,
+                f"{TYPICAL_PERIOD_MIN_CONTENT}_{typical}",
+                po.Var(storages, bounds=(None, 0)),
+            )
+        for period in range(n_periods + 1):
+            setattr(block, f"{PERIOD_START_CONTENT}_{period}", po.Var(storages))
+
+        def maximum(block, n, typical):
+            return getattr(block, f"{TYPICAL_PERIOD_MAX_CONTENT}_{typical}")[n]
+
+        def minimum(block, n, typical):
+            return getattr(block, f"{TYPICAL_PERIOD_MIN_CONTENT}_{typical}")[n]
+
+        def start_content(block, n, period):
+            return getattr(block, f"{PERIOD_START_CONTENT}_{period}")[n]
+
+        def period_retention(n, period):
+            return float(
+                np.prod(retention[n][typical_period_timesteps[assignment[period]]])
+            )
+
+        block.typical_period_max_content = po.Constraint(
+            storages,
+            timesteps,
+            rule=lambda block, n, t: maximum(block, n, t // period_length)
+            >= block.storage_content[n, t],
+        )
+        block.typical_period_min_content = po.Constraint(
+            storages,
+            timesteps,
+            rule=lambda block, n, t: minimum(block, n, t // period_length)
+            <= block.storage_content[n, t],
+        )
+        block.period_start_content_init = po.Constraint(
+            storages,
+            rule=lambda block, n: start_content(block, n, 0) == block.init_content[n],
+        )
+        block.period_start_content_link = po.Constraint(
+            storages,
+            range(n_periods),
+            rule=lambda block, n, period: start_content(block, n, period + 1)
+            == start_content(block, n, period) * period_retention(n, period)
+            + block.storage_content[
+                n, typical_period_timesteps[assignment[period]][-1]
+            ],
+        )
+        block.period_start_content_balanced = po.Constraint(
+            getattr(block, f"{storages_name}_BALANCED"),
+            rule=lambda block, n: start_content(block, n, n_periods)
+            == start_content(block, n, 0),
+        )
+        # the content retained from the start of the period is largest at the start of the
+        # period and smallest at its end
+        block.period_max_content = po.Constraint(
+            storages,
+            range(n_periods),
+            rule=lambda block, n, period: start_content(block, n, period)
+            + maximum(block, n, assignment[period])
+            <= get_capacity(block, n)
+            * min(
+                n.max_storage_level[t]
+                for t in typical_period_timesteps[assignment[period]]
+            ),
+        )
+        block.period_min_content = po.Constraint(
+            storages,
+            range(n_periods),
+            rule=lambda block, n, period: start_content(block, n, period)
+            * period_retention(n, period)
+            + minimum(block, n, assignment[period])
+            >= get_capacity(block, n)
+            * max(
+                n.min_storage_level[t]
+                for t in typical_period_timesteps[assignment[period]]
+            ),
+        )
+    return local_energy_system
+
+
+def get_storage_contents_of_periods(
+    sequences, scalars, typical_periods, retention=None
+):
+    r"""
+    Storage content over the evaluated period, see `add_storage_linking_constraints()`.
+
+    The storage content of each period is its content at the start of the period, reduced by the
+    self-discharge, plus the storage content of its typical period relative to the start of the
+    typical period.
+
+    Parameters
+    ----------
+    sequences: :pandas:`pandas.DataFrame`
+        Sequences of a storage in the results of the reduced model, with the column "storage_content"
+
+    scalars: :pandas:`pandas.Series`
+        Scalars of the storage in the results of the reduced model, with the content at the start
+        of each period (PERIOD_START_CONTENT)
+
+    typical_periods: dict
+        Typical periods, see `select_typical_periods()`
+
+    retention: :numpy:`numpy.ndarray` or None
+        Retention factor of the storage content at each timestep of the reduced model.
+        If None, the storage has no self-discharge.
+        Default: None
+
+    Returns
+    -------
+    :numpy:`numpy.ndarray`
+        Storage content at each timestep of the evaluated period
+
+    Notes
+    -----
+    Tested with:
+    - test_expand_results_to_time_index_storage_content()
+    """
+    period_length = typical_periods[PERIOD_LENGTH]
+    assignment = typical_periods[ASSIGNMENT]
+    storage_content = sequences["storage_content"].values.reshape(-1, period_length)
+    if retention is None:
+        retention = np.ones(storage_content.size)
+    retained_share = np.asarray(retention).reshape(-1, period_length).cumprod(axis=1)
+    start_contents = np.array(
+        [
+            scalars[f"{PERIOD_START_CONTENT}_{period}"]
+            for period in range(len(assignment))
+        ]
+    )
+    return (
+        start_contents[:, np.newaxis] * retained_share[assignment]
+        + storage_content[assignment]
+    ).flatten()
+
+
+def expand_results_to_time_index(results_main, typical_periods, time_index):
+    r"""
+    Maps the sequences of the results of the reduced model to the full time index.
+
+    Each period of the evaluated period takes the results of its typical period, except the
+    storage content which is linked along the periods (see `get_storage_contents_of_periods()`).
+    The scalar results (eg. the optimized capacities) are not changed, except that the variables
+    linking the storage content of the typical periods are dropped.
+
+    Parameters
+    ----------
+    results_main: dict
+        Main results of the oemof simulation of the reduced model, updated in place
+
+    typical_periods: dict
+        Typical periods, see `select_typical_periods()`
+
+    time_index: :pandas:`pandas.DatetimeIndex`
+        Time index of the evaluated period
+
+    Returns
+    -------
+    results_main: dict
+        Main results with sequences over the evaluated period
+
+    Notes
+    -----
+    Tested with:
+    - test_expand_results_to_time_index()
+    - test_expand_results_to_time_index_storage_content()
+    """
+    period_length = typical_periods[PERIOD_LENGTH]
+    n_reduced_timesteps = len(typical_periods[MEDOIDS]) * period_length
+    positions = np.concatenate(
+        [
+            np.arange(typical * period_length, (typical + 1) * period_length)
+            for typical in typical_periods[ASSIGNMENT]
+        ]
+    )
+
+    for key, result in results_main.items():
+        sequences = result.get("sequences", None)
+        if sequences is None or len(sequences) != n_reduced_timesteps:
+            continue
+        expanded_sequences = sequences.iloc[positions]
+        expanded_sequences.index = time_index
+        scalars = result.get("scalars", pd.Series(dtype=float))
+        if f"{PERIOD_START_CONTENT}_0" in scalars:
+            label = str(getattr(key[0], "label", key[0]))
+            expanded_sequences = expanded_sequences.assign(
+                storage_content=get_storage_contents_of_periods(
+                    sequences,
+                    scalars,
+                    typical_periods,
+                    typical_periods.get(STORAGE_RETENTION, {}).get(label),
+                )
+            )
+            # the variables linking the typical periods are not results of the evaluated period
+            result["scalars"] = scalars.drop(
+                [
+                    name
+                    for name in scalars.index
+                    if name.startswith(
+                        (
+                            PERIOD_START_CONTENT,
+                            TYPICAL_PERIOD_MAX_CONTENT,
+                            TYPICAL_PERIOD_MIN_CONTENT,
+                        )
+                    )
+                ]
+            )
+        result["sequences"] = expanded_sequences
+
+    return results_main
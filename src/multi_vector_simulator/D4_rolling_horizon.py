@@ -0,0 +1,597 @@
+"""
+Module D4 - Rolling horizon dispatch
+====================================
+
+Optional dispatch of the evaluated period in consecutive windows instead of one model over the
+whole time index, so that the size of the model scales with the window length and not with the
+length of the evaluated period.
+
+Functional requirements of module D4:
+- read the window length and the overlap from the simulation settings
+- only allow a rolling horizon dispatch if no capacity of an asset defined by the user is optimized
+- warn that the minimal renewable factor and minimal degree of autonomy are met in each window
+- select the simulation parameters of each window
+- carry the storage content at the end of a window to the next window
+- balance the storage content of the evaluated period, ie. the storage content at the end of the
+  last window equals the initial storage content of the first window
+- stitch the results of the windows into one set of results over the evaluated period
+
+The rolling horizon dispatch is activated by defining the optional parameter ROLLING_HORIZON_WINDOW
+(in days) in the simulation settings, the overlap of consecutive windows is defined with
+ROLLING_HORIZON_OVERLAP (in days, default: 0). Each window is optimized for the window length
+plus the overlap, only the results of the window length are kept.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as po
+
+from multi_vector_simulator.D3_timeseries_aggregation import (
+    MINUTES_PER_DAY,
+    select_timesteps,
+)
+from multi_vector_simulator.utils.asset_registry import ASSET_GROUPS_OF_REGISTRY
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    PERIODS,
+    TIMESTEP,
+    VALUE,
+    UNIT,
+    UNIT_DAY,
+    LABEL,
+    OPTIMIZE_CAP,
+    ENERGY_BUSSES,
+    ENERGY_PROVIDERS,
+    EXCESS,
+    DSO_CONSUMPTION,
+    CONNECTED_FEEDIN_SINK,
+    CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS,
+    ENERGY_STORAGE,
+    STORAGE_CAPACITY,
+    INSTALLED_CAP,
+    SOC_INITIAL,
+    CONSTRAINTS,
+    MAXIMUM_EMISSIONS,
+    MINIMAL_RENEWABLE_FACTOR,
+    MINIMAL_DEGREE_OF_AUTONOMY,
+    TYPICAL_PERIODS,
+    ROLLING_HORIZON_WINDOW,
+    ROLLING_HORIZON_OVERLAP,
+)
+from multi_vector_simulator.utils.exceptions import InvalidRollingHorizonError
+
+# Name of the sequence of the storage content in the oemof results
+STORAGE_CONTENT = "storage_content"
+
+
+def convert_days_to_timesteps(days, simulation_settings, parameter):
+    r"""
+    Converts a duration in days into a number of timesteps.
+
+    Parameters
+    ----------
+    days: float
+        Duration in days
+
+    simulation_settings: dict
+        Simulation settings, including TIMESTEP
+
+    parameter: str
+        Name of the parameter, used in the error message
+
+    Returns
+    -------
+    int
+        Number of timesteps
+
+    Notes
+    -----
+    Raises InvalidRollingHorizonError if the duration is negative or not a multiple of the timestep.
+
+    Tested with:
+    - test_get_rolling_horizon_settings_not_a_multiple_of_the_timestep()
+    """
+    timesteps = days * MINUTES_PER_DAY / simulation_settings[TIMESTEP][VALUE]
+    if timesteps < 0 or timesteps != int(timesteps):
+        raise InvalidRollingHorizonError(
+            f"The parameter {parameter} ({days} {UNIT_DAY}(s)) has to be a positive multiple of "
+            f"the timestep ({simulation_settings[TIMESTEP][VALUE]} {simulation_settings[TIMESTEP][UNIT]})."
+        )
+    return int(timesteps)
+
+
+def get_rolling_horizon_settings(simulation_settings):
+    r"""
+    Reads the window length and overlap of the rolling horizon dispatch in timesteps from the simulation settings.
+
+    Parameters
+    ----------
+    simulation_settings: dict
+        Simulation settings, including TIMESTEP
+
+    Returns
+    -------
+    window: int or None
+        Number of timesteps of one window, None if the rolling horizon dispatch is not activated
+
+    overlap: int or None
+        Number of timesteps by which each window is extended, None if the rolling horizon dispatch
+        is not activated
+
+    Notes
+    -----
+    Tested with:
+    - test_get_rolling_horizon_settings_not_defined()
+    - test_get_rolling_horizon_settings()
+    - test_get_rolling_horizon_settings_not_a_multiple_of_the_timestep()
+    """
+    window_days = simulation_settings.get(ROLLING_HORIZON_WINDOW, {}).get(VALUE, None)
+    if window_days is None or window_days == 0:
+        return None, None
+
+    window = convert_days_to_timesteps(
+        window_days, simulation_settings, ROLLING_HORIZON_WINDOW
+    )
+    overlap = convert_days_to_timesteps(
+        simulation_settings.get(ROLLING_HORIZON_OVERLAP, {}).get(VALUE, 0),
+        simulation_settings,
+        ROLLING_HORIZON_OVERLAP,
+    )
+    if window == 0:
+        raise InvalidRollingHorizonError(
+            f"The window of the rolling horizon dispatch ({ROLLING_HORIZON_WINDOW}) has to include "
+            f"at least one timestep."
+        )
+    return window, overlap
+
+
+def get_auxiliary_assets(dict_values):
+    r"""
+    Keys of the assets added by C0 to the asset groups, which are not defined by the user.
+
+    These are the excess sinks of the busses and, for each energy provider, its consumption
+    source, its feed-in sink and its peak demand pricing transformers.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    Returns
+    -------
+    set of str
+
+    Notes
+    -----
+    Tested with:
+    - test_get_auxiliary_assets()
+    """
+    auxiliary_assets = set()
+    for dict_bus in dict_values.get(ENERGY_BUSSES, {}).values():
+        if EXCESS in dict_bus:
+            auxiliary_assets.add(dict_bus[EXCESS])
+    for dso, dict_dso in dict_values.get(ENERGY_PROVIDERS, {}).items():
+        auxiliary_assets.add(dso + DSO_CONSUMPTION)
+        if CONNECTED_FEEDIN_SINK in dict_dso:
+            auxiliary_assets.add(dict_dso[CONNECTED_FEEDIN_SINK])
+        auxiliary_assets.update(
+            dict_dso.get(CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS, [])
+        )
+    return auxiliary_assets
+
+
+def check_for_capacity_optimization(dict_values):
+    r"""
+    Raises InvalidRollingHorizonError if the capacity of any asset defined by the user is optimized.
+
+    The capacities optimized in one window would not be valid for the other windows,
+    therefore the rolling horizon dispatch can only be applied to a pure dispatch problem.
+    The energy providers and the assets added for them and for the busses by C0 (see
+    `get_auxiliary_assets()`) are not checked, as their capacity is always optimized: it is the
+    peak of their flow in each window, see `stitch_results()`.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Tested with:
+    - test_get_rolling_horizon_windows_with_capacity_optimization_raises_error()
+    - test_get_rolling_horizon_windows_without_capacity_optimization_by_the_user()
+    """
+    auxiliary_assets = get_auxiliary_assets(dict_values)
+    optimized_assets = []
+    for group in ASSET_GROUPS_OF_REGISTRY:
+        if group == ENERGY_PROVIDERS or not isinstance(dict_values.get(group), dict):
+            continue
+        for asset, dict_asset in dict_values[group].items():
+            if asset in auxiliary_assets:
+                continue
+            if dict_asset.get(OPTIMIZE_CAP, {}).get(VALUE, False) is True:
+                optimized_assets.append(dict_asset.get(LABEL, asset))
+
+    if len(optimized_assets) > 0:
+        raise InvalidRollingHorizonError(
+            f"The rolling horizon dispatch ({ROLLING_HORIZON_WINDOW}) can only be used if no "
+            f"capacity is optimized, but the capacity of following assets is optimized: "
+            f"{', '.join(optimized_assets)}. Please set {OPTIMIZE_CAP} to False for these assets "
+            f"or remove the parameter {ROLLING_HORIZON_WINDOW} from the simulation settings."
+        )
+
+
+def check_for_constraints_applied_per_window(dict_values):
+    r"""
+    Logs a warning for each share constraint which is applied to each window separately.
+
+    The minimal renewable factor and the minimal degree of autonomy are shares of the energy
+    flows, they can not be split between the windows like the maximum emissions. Each window has
+    to meet them, which is more restrictive than meeting them over the evaluated period.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Tested with:
+    - test_get_rolling_horizon_windows_with_minimal_renewable_factor()
+    - test_get_rolling_horizon_windows_without_share_constraints()
+    """
+    for constraint in (MINIMAL_RENEWABLE_FACTOR, MINIMAL_DEGREE_OF_AUTONOMY):
+        value = dict_values.get(CONSTRAINTS, {}).get(constraint, {}).get(VALUE, 0)
+        if value is not None and value > 0:
+            logging.warning(
+                f"The constraint {constraint} ({value}) is applied to each window of the rolling "
+                f"horizon dispatch ({ROLLING_HORIZON_WINDOW}) separately, each window has to "
+                f"meet it instead of the evaluated period as a whole."
+            )
+
+
+def get_rolling_horizon_windows(dict_values):
+    r"""
+    Defines the windows of the rolling horizon dispatch if it is activated.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    Returns
+    -------
+    windows: list of tuple or None
+        For each window: (first timestep, first timestep of the next window, end of the
+        optimized timesteps including the overlap). None if the rolling horizon dispatch is not
+        activated or if the window covers the whole evaluated period.
+
+    Notes
+    -----
+    Raises InvalidRollingHorizonError if the capacity of any asset is optimized or if the
+    time series are also aggregated into typical periods. Logs a warning if the minimal renewable
+    factor or the minimal degree of autonomy are applied to each window.
+
+    Tested with:
+    - test_get_rolling_horizon_windows_not_activated()
+    - test_get_rolling_horizon_windows()
+    - test_get_rolling_horizon_windows_longer_than_evaluated_period()
+    - test_get_rolling_horizon_windows_with_capacity_optimization_raises_error()
+    - test_get_rolling_horizon_windows_with_typical_periods_raises_error()
+    - test_get_rolling_horizon_windows_with_minimal_renewable_factor()
+    """
+    window, overlap = get_rolling_horizon_settings(dict_values[SIMULATION_SETTINGS])
+    if window is None:
+        return None
+
+    if dict_values[SIMULATION_SETTINGS].get(TYPICAL_PERIODS, {}).get(VALUE, None):
+        raise InvalidRollingHorizonError(
+            f"The rolling horizon dispatch ({ROLLING_HORIZON_WINDOW}) can not be combined with "
+            f"the aggregation into typical periods ({TYPICAL_PERIODS})."
+        )
+    check_for_capacity_optimization(dict_values)
+
+    n_timesteps = dict_values[SIMULATION_SETTINGS][PERIODS]
+    if window >= n_timesteps:
+        logging.info(
+            f"The window of the rolling horizon dispatch ({window} timesteps) covers the whole "
+            f"evaluated period, the evaluated period is optimized at once."
+        )
+        return None
+
+    windows = [
+        (
+            start,
+            min(start + window, n_timesteps),
+            min(start + window + overlap, n_timesteps),
+        )
+        for start in range(0, n_timesteps, window)
+    ]
+    logging.info(
+        f"The evaluated period is dispatched in {len(windows)} windows of {window} timesteps "
+        f"with an overlap of {overlap} timesteps."
+    )
+    check_for_constraints_applied_per_window(dict_values)
+    return windows
+
+
+def select_window(dict_values, start, end, storage_levels=None):
+    r"""
+    Simulation parameters of one window of the rolling horizon dispatch.
+
+    The maximum emissions are scaled to the share of the evaluated period covered by the window,
+    all other constraints (eg. the minimal renewable factor and the minimal degree of autonomy)
+    are applied to each window, see `check_for_constraints_applied_per_window()`.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0. It is not modified.
+
+    start: int
+        First timestep of the window
+
+    end: int
+        End of the window (excluded)
+
+    storage_levels: dict or None
+        Initial storage level (SOC) of each storage of ENERGY_STORAGE, see `get_storage_levels()`.
+        If None, the initial storage levels of dict_values are used.
+        Default: None
+
+    Returns
+    -------
+    dict_values_window: dict
+        Simulation parameters of the window
+
+    Notes
+    -----
+    Tested with:
+    - test_select_window()
+    """
+    dict_values_window = select_timesteps(
+        dict_values,
+        np.arange(start, end),
+        dict_values[SIMULATION_SETTINGS][TIME_INDEX][start:end],
+    )
+
+    maximum_emissions = dict_values_window.get(CONSTRAINTS, {}).get(
+        MAXIMUM_EMISSIONS, {VALUE: None}
+    )
+    if maximum_emissions[VALUE] is not None:
+        dict_values_window[CONSTRAINTS][MAXIMUM_EMISSIONS] = dict(
+            maximum_emissions,
+            **{
+                VALUE: maximum_emissions[VALUE]
+                * (end - start)
+                / dict_values[SIMULATION_SETTINGS][PERIODS]
+            },
+        )
+
+    for storage, level in (storage_levels or {}).items():
+        dict_storage_capacity = dict_values_window[ENERGY_STORAGE][storage][
+            STORAGE_CAPACITY
+        ]
+        dict_storage_capacity[SOC_INITIAL] = dict(
+            dict_storage_capacity[SOC_INITIAL], **{VALUE: level}
+        )
+
+    return dict_values_window
+
+
+def get_storage_levels(results_main, dict_values, timestep):
+    r"""
+    Storage level (SOC) of each storage at the end of a timestep of a window.
+
+    Parameters
+    ----------
+    results_main: dict
+        Main results of the oemof simulation of the window
+
+    dict_values: dict
+        All simulation parameters
+
+    timestep: int
+        Position of the timestep in the window
+
+    Returns
+    -------
+    storage_levels: dict
+        Storage level of each storage of ENERGY_STORAGE, between 0 and 1.
+        Storages without capacity are not included.
+
+    Notes
+    -----
+    Tested with:
+    - test_run_oemof_with_rolling_horizon()
+    """
+    storage_contents = {}
+    for (node, target), result in results_main.items():
+        if target is None and STORAGE_CONTENT in result["sequences"]:
+            storage_contents.update(
+                {str(node.label): result["sequences"][STORAGE_CONTENT].iloc[timestep]}
+            )
+
+    storage_levels = {}
+    for storage, dict_asset in dict_values.get(ENERGY_STORAGE, {}).items():
+        capacity = dict_asset[STORAGE_CAPACITY][INSTALLED_CAP][VALUE]
+        if dict_asset[LABEL] in storage_contents and capacity > 0:
+            level = storage_contents[dict_asset[LABEL]] / capacity
+            storage_levels.update({storage: float(np.clip(level, 0, 1))})
+    return storage_levels
+
+
+def deactivate_balanced_storage_constraints(local_energy_system):
+    r"""
+    Deactivates the constraints setting the storage content at the end of the window to the initial storage content.
+
+    Parameters
+    ----------
+    local_energy_system: :oemof-solph: <oemof.solph.model>
+        Model of a window
+
+    Returns
+    -------
+    local_energy_system: :oemof-solph: <oemof.solph.model>
+        Updated model
+
+    Notes
+    -----
+    Tested with:
+    - test_run_oemof_with_rolling_horizon()
+    """
+    block = getattr(local_energy_system, "GenericStorageBlock", None)
+    if block is not None:
+        block.balanced_cstr.deactivate()
+    return local_energy_system
+
+
+def get_initial_storage_contents(local_energy_system):
+    r"""
+    Initial storage content of each storage of a solved model, by label.
+
+    Parameters
+    ----------
+    local_energy_system: :oemof-solph: <oemof.solph.model>
+        Solved model of the first window
+
+    Returns
+    -------
+    dict
+
+    Notes
+    -----
+    Tested with:
+    - test_run_oemof_with_rolling_horizon()
+    """
+    block = getattr(local_energy_system, "GenericStorageBlock", None)
+    if block is None:
+        return {}
+    return {str(n.label): block.init_content[n].value for n in block.STORAGES}
+
+
+def add_final_storage_content_constraints(
+    local_energy_system, initial_storage_contents
+):
+    r"""
+    Sets the storage content at the end of the last window to the initial storage content of the first window.
+
+    Parameters
+    ----------
+    local_energy_system: :oemof-solph: <oemof.solph.model>
+        Model of the last window
+
+    initial_storage_contents: dict
+        Initial storage content of each storage, see `get_initial_storage_contents()`
+
+    Returns
+    -------
+    local_energy_system: :oemof-solph: <oemof.solph.model>
+        Updated model
+
+    Notes
+    -----
+    Tested with:
+    - test_run_oemof_with_rolling_horizon()
+    """
+    block = getattr(local_energy_system, "GenericStorageBlock", None)
+    if block is None:
+        return local_energy_system
+    last_timestep = local_energy_system.TIMESTEPS[-1]
+    block.final_storage_content = po.Constraint(
+        block.STORAGES,
+        rule=lambda block, n: block.storage_content[n, last_timestep]
+        == initial_storage_contents[str(n.label)],
+    )
+    return local_energy_system
+
+
+def truncate_results(results_main, n_timesteps):
+    r"""
+    Keeps the first `n_timesteps` of the sequences of the results of a window, ie. removes the overlap.
+
+    Parameters
+    ----------
+    results_main: dict
+        Main results of the oemof simulation of the window, updated in place
+
+    n_timesteps: int
+        Number of timesteps to keep
+
+    Returns
+    -------
+    results_main: dict
+
+    Notes
+    -----
+    Tested with:
+    - test_stitch_results()
+    """
+    for result in results_main.values():
+        result["sequences"] = result["sequences"].iloc[:n_timesteps]
+    return results_main
+
+
+def stitch_results(results_of_windows, time_index):
+    r"""
+    Stitches the results of the windows into the results of the evaluated period.
+
+    The results are matched by the labels of the oemof nodes, as each window is a separate
+    oemof model. The scalars are the ones of the first window, except the optimized capacity
+    ("invest") of the assets added by C0 (eg. the consumption source of an energy provider),
+    which is the largest capacity of all windows.
+
+    Parameters
+    ----------
+    results_of_windows: list of dict
+        Truncated main results of each window, see `truncate_results()`
+
+    time_index: :pandas:`pandas.DatetimeIndex`
+        Time index of the evaluated period
+
+    Returns
+    -------
+    results_main: dict
+        Main results over the evaluated period, with the keys of the results of the first window
+
+    Notes
+    -----
+    Tested with:
+    - test_stitch_results()
+    """
+
+    def labels(key):
+        return tuple(str(node.label) if node is not None else None for node in key)
+
+    sequences_of_windows = {}
+    scalars_of_windows = {}
+    for results in results_of_windows:
+        for key, result in results.items():
+            sequences_of_windows.setdefault(labels(key), []).append(result["sequences"])
+            scalars_of_windows.setdefault(labels(key), []).append(result["scalars"])
+
+    results_main = {}
+    for key, result in results_of_windows[0].items():
+        sequences = pd.concat(sequences_of_windows[labels(key)])
+        if len(sequences) == len(time_index):
+            sequences.index = time_index
+        scalars = result["scalars"]
+        if "invest" in scalars:
+            scalars = scalars.copy()
+            scalars["invest"] = max(
+                window_scalars["invest"]
+                for window_scalars in scalars_of_windows[labels(key)]
+            )
+        results_main.update({key: {"scalars": scalars, "sequences": sequences}})
+    return results_main
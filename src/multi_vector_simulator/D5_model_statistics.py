@@ -0,0 +1,346 @@
+"""
+Module D5 - Model statistics
+============================
+
+Size of the optimization problem built by D0, computed before it is passed to the solver.
+
+Functional requirements of module D5:
+- measure the size of the model only if the optional simulation setting MEASURE_MODEL_SIZE is
+  True or if MAXIMUM_MODEL_SIZE is defined, as counting the non-zeros of all constraints takes a
+  significant share of the time to build the model (eg. 10 seconds for one year in hourly
+  resolution)
+- count the variables, constraints and non-zeros of the constraint matrix of the oemof model
+- break the size of the model down by the type of the oemof components (D1: transformer, storage,
+  source, sink and bus) and by constraint (incl. the constraints added by D2)
+- log the size of the model
+- warn or stop the simulation if the model is larger than the optional simulation setting
+  MAXIMUM_MODEL_SIZE, depending on MODEL_SIZE_GUARD
+- sum up the sizes of the models of independent subsystems (see D7)
+
+The statistics are stored in SIMULATION_RESULTS under MODEL_SIZE, which is None if the size of the
+model is not measured.
+"""
+
+import logging
+
+from oemof.network.network import Node
+from oemof.solph import Bus, Sink, Source, Transformer
+from oemof.solph.components import GenericStorage
+from pyomo.core import Constraint, Var
+from pyomo.repn import generate_standard_repn
+
+from multi_vector_simulator.utils.constants import (
+    MODEL_SIZE_GUARD_WARNING,
+    MODEL_SIZE_GUARD_ERROR,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    VALUE,
+    MEASURE_MODEL_SIZE,
+    OEMOF_TRANSFORMER,
+    OEMOF_GEN_STORAGE,
+    OEMOF_SOURCE,
+    OEMOF_SINK,
+    OEMOF_BUSSES,
+    MAXIMUM_MODEL_SIZE,
+    MODEL_SIZE_GUARD,
+    NUMBER_OF_VARIABLES,
+    NUMBER_OF_CONSTRAINTS,
+    NUMBER_OF_NONZEROS,
+    MODEL_SIZE_PER_ASSET_TYPE,
+    MODEL_SIZE_PER_CONSTRAINT,
+)
+from multi_vector_simulator.utils.exceptions import ModelSizeError
+
+# Type of the variables and constraints which are not related to an oemof component (eg. D2)
+OTHER = "other"
+
+# Oemof component classes of the asset types of D1
+OEMOF_CLASSES = {
+    OEMOF_TRANSFORMER: Transformer,
+    OEMOF_GEN_STORAGE: GenericStorage,
+    OEMOF_SOURCE: Source,
+    OEMOF_SINK: Sink,
+    OEMOF_BUSSES: Bus,
+}
+
+
+def is_model_size_measurement_activated(dict_values):
+    r"""
+    Reads the simulation settings MEASURE_MODEL_SIZE and MAXIMUM_MODEL_SIZE.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    bool
+        True if MEASURE_MODEL_SIZE is True or if a MAXIMUM_MODEL_SIZE is defined, which can only be
+        checked with the size of the model
+
+    Notes
+    -----
+    Raises ModelSizeError if MEASURE_MODEL_SIZE is not True or False.
+
+    Tested with:
+    - test_is_model_size_measurement_activated_not_defined()
+    - test_is_model_size_measurement_activated_maximum_model_size()
+    - test_is_model_size_measurement_activated_invalid_value_raises_error()
+    """
+    simulation_settings = dict_values[SIMULATION_SETTINGS]
+    activated = simulation_settings.get(MEASURE_MODEL_SIZE, {}).get(VALUE)
+    if activated not in (None, True, False):
+        raise ModelSizeError(
+            f"The value of {MEASURE_MODEL_SIZE} has to be True or False, not {activated}."
+        )
+    maximum_model_size = simulation_settings.get(MAXIMUM_MODEL_SIZE, {}).get(VALUE)
+    return activated is True or (
+        maximum_model_size is not None and maximum_model_size > 0
+    )
+
+
+def get_asset_type(index):
+    r"""
+    Determines the asset type of a variable or constraint from its index.
+
+    The index of the variables and constraints of oemof contains the components they belong to,
+    eg. (source, bus, timestep) for a flow. A bus is only considered if no other component is in
+    the index, so that a flow is attributed to the asset connected to the bus.
+
+    Parameters
+    ----------
+    index: tuple or object
+        Index of the variable or constraint in its pyomo component
+
+    Returns
+    -------
+    str
+        One of the keys of OEMOF_CLASSES, or OTHER if no oemof component is in the index
+
+    Notes
+    -----
+    Tested with:
+    - test_get_asset_type()
+    """
+    if not isinstance(index, tuple):
+        index = (index,)
+    nodes = [item for item in index if isinstance(item, Node)]
+    for asset_type, oemof_class in OEMOF_CLASSES.items():
+        if any(isinstance(node, oemof_class) for node in nodes):
+            return asset_type
+    return OTHER
+
+
+def count_nonzeros(constraint):
+    r"""
+    Counts the non-zeros of a constraint, ie. the number of variables in its body.
+
+    Parameters
+    ----------
+    constraint: :pyomo:`ConstraintData`
+        Constraint of the model
+
+    Returns
+    -------
+    int
+        Number of variables (which are not fixed) of the constraint
+    """
+    repn = generate_standard_repn(
+        constraint.body, compute_values=False, quadratic=False
+    )
+    return len(repn.linear_vars) + len(repn.nonlinear_vars)
+
+
+def get_model_size(local_energy_system):
+    r"""
+    Computes the size of the optimization problem.
+
+    Parameters
+    ----------
+    local_energy_system: :oemof-solph:`solph.Model <solph.models.Model>`
+        Model with all constraints, before it is solved
+
+    Returns
+    -------
+    dict
+        Number of variables (NUMBER_OF_VARIABLES), constraints (NUMBER_OF_CONSTRAINTS) and
+        non-zeros (NUMBER_OF_NONZEROS) of the model, with the same numbers per asset type
+        (MODEL_SIZE_PER_ASSET_TYPE) and the number of constraints and non-zeros per constraint
+        (MODEL_SIZE_PER_CONSTRAINT)
+
+    Notes
+    -----
+    Only the active constraints and the variables which are not fixed (eg. the flows of
+    non-dispatchable assets) are counted, as the solver does.
+
+    Tested with:
+    - test_get_model_size()
+    - test_get_model_size_per_asset_type()
+    - test_get_model_size_per_constraint()
+    """
+    size_per_asset_type = {
+        asset_type: {
+            NUMBER_OF_VARIABLES: 0,
+            NUMBER_OF_CONSTRAINTS: 0,
+            NUMBER_OF_NONZEROS: 0,
+        }
+        for asset_type in list(OEMOF_CLASSES) + [OTHER]
+    }
+    size_per_constraint = {}
+
+    for variable in local_energy_system.component_objects(
+        Var, active=True, descend_into=True
+    ):
+        for index, variable_data in variable.items():
+            if variable_data.fixed is False:
+                size_per_asset_type[get_asset_type(index)][NUMBER_OF_VARIABLES] += 1
+
+    for constraint in local_energy_system.component_objects(
+        Constraint, active=True, descend_into=True
+    ):
+        constraint_size = {NUMBER_OF_CONSTRAINTS: 0, NUMBER_OF_NONZEROS: 0}
+        for index, constraint_data in constraint.items():
+            if constraint_data.active is False:
+                continue
+            nonzeros = count_nonzeros(constraint_data)
+            asset_type_size = size_per_asset_type[get_asset_type(index)]
+            for size in (constraint_size, asset_type_size):
+                size[NUMBER_OF_CONSTRAINTS] += 1
+                size[NUMBER_OF_NONZEROS] += nonzeros
+        if constraint_size[NUMBER_OF_CONSTRAINTS] > 0:
+            size_per_constraint.update({constraint.name: constraint_size})
+
+    model_size = {
+        key: sum(size[key] for size in size_per_asset_type.values())
+        for key in (NUMBER_OF_VARIABLES, NUMBER_OF_CONSTRAINTS, NUMBER_OF_NONZEROS)
+    }
+    model_size.update(
+        {
+            MODEL_SIZE_PER_ASSET_TYPE: size_per_asset_type,
+            MODEL_SIZE_PER_CONSTRAINT: size_per_constraint,
+        }
+    )
+    return model_size
+
+
+def sum_model_sizes(model_sizes):
+    r"""
+    Sums up the sizes of several models, eg. of the subsystems of the energy system (see D7).
+
+    Parameters
+    ----------
+    model_sizes: list of dict
+        Outputs of `get_model_size()`
+
+    Returns
+    -------
+    dict or None
+        Total size of the models, in the format of `get_model_size()`, None if the size of a model
+        was not measured
+
+    Notes
+    -----
+    Tested with:
+    - test_sum_model_sizes()
+    """
+    if any(model_size is None for model_size in model_sizes):
+        return None
+    total_size = {}
+    for model_size in model_sizes:
+        for key, size in model_size.items():
+            if isinstance(size, dict):
+                total_size.update(
+                    {key: sum_model_sizes([total_size.get(key, {}), size])}
+                )
+            else:
+                total_size.update({key: total_size.get(key, 0) + size})
+    return total_size
+
+
+def log_model_size(model_size):
+    r"""
+    Logs the size of the model, in total and per asset type (detailed per constraint in debug).
+
+    Parameters
+    ----------
+    model_size: dict
+        Output of `get_model_size()`
+
+    Returns
+    -------
+    None
+    """
+    logging.info(
+        f"Size of the optimization problem: {model_size[NUMBER_OF_VARIABLES]} variables, "
+        f"{model_size[NUMBER_OF_CONSTRAINTS]} constraints and "
+        f"{model_size[NUMBER_OF_NONZEROS]} non-zeros."
+    )
+    for asset_type, size in model_size[MODEL_SIZE_PER_ASSET_TYPE].items():
+        logging.debug(
+            f"Size of the {asset_type} components: {size[NUMBER_OF_VARIABLES]} variables, "
+            f"{size[NUMBER_OF_CONSTRAINTS]} constraints, {size[NUMBER_OF_NONZEROS]} non-zeros."
+        )
+    for name, size in model_size[MODEL_SIZE_PER_CONSTRAINT].items():
+        logging.debug(
+            f"Size of the constraint {name}: {size[NUMBER_OF_CONSTRAINTS]} constraints, "
+            f"{size[NUMBER_OF_NONZEROS]} non-zeros."
+        )
+
+
+def check_model_size(dict_values, model_size):
+    r"""
+    Compares the size of the model with the optional simulation setting MAXIMUM_MODEL_SIZE.
+
+    The size of the model is measured by the number of non-zeros of the constraint matrix, which
+    determines the memory needed by the solver. If the model is larger, a warning is logged or,
+    if MODEL_SIZE_GUARD is "error", a ModelSizeError is raised before the model is solved.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation inputs
+
+    model_size: dict
+        Output of `get_model_size()`
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Tested with:
+    - test_check_model_size_not_defined()
+    - test_check_model_size_below_maximum()
+    - test_check_model_size_warning()
+    - test_check_model_size_error()
+    - test_check_model_size_invalid_guard_raises_error()
+    """
+    simulation_settings = dict_values[SIMULATION_SETTINGS]
+    maximum_model_size = simulation_settings.get(MAXIMUM_MODEL_SIZE, {}).get(VALUE)
+    guard = (
+        simulation_settings.get(MODEL_SIZE_GUARD, {}).get(VALUE)
+        or MODEL_SIZE_GUARD_WARNING
+    )
+    if guard not in (MODEL_SIZE_GUARD_WARNING, MODEL_SIZE_GUARD_ERROR):
+        raise ModelSizeError(
+            f"The value of {MODEL_SIZE_GUARD} has to be {MODEL_SIZE_GUARD_WARNING} or "
+            f"{MODEL_SIZE_GUARD_ERROR}, not {guard}."
+        )
+    if maximum_model_size is None or maximum_model_size <= 0:
+        return
+
+    if model_size[NUMBER_OF_NONZEROS] > maximum_model_size:
+        message = (
+            f"The optimization problem has {model_size[NUMBER_OF_NONZEROS]} non-zeros, which is "
+            f"more than the {MAXIMUM_MODEL_SIZE} of {maximum_model_size} defined in the "
+            f"{SIMULATION_SETTINGS}. The simulation might need a lot of time and memory, you can "
+            f"reduce the size of the model with a shorter evaluated period, a longer timestep, "
+            f"typical periods or a rolling horizon dispatch."
+        )
+        if guard == MODEL_SIZE_GUARD_ERROR:
+            logging.error(message)
+            raise ModelSizeError(message)
+        logging.warning(message)
@@ -0,0 +1,472 @@
+"""
+Module D6 - Model reduction
+===========================
+
+Optional reduction of the oemof energy system built in D0, before the pyomo model is created.
+Some components of the energy system add variables and constraints to the optimization problem
+without adding any degree of freedom. They are removed or merged, so that the problem passed to
+the solver is smaller but has the same optimal solution.
+
+Functional requirements of module D6:
+- remove the excess sink of a bus which can never have a surplus, ie. all inputs of the bus are
+  dispatchable sources which can reduce their output at no cost
+- merge the fixed non-dispatchable sources (no capacity optimization) of a bus into a single source
+- map the results of the reduced model back to the components of the full energy system, so that
+  E0-E3 evaluate the results as if the full model had been solved
+
+The reduction is activated with the optional simulation setting MODEL_REDUCTION. It is not applied
+if the minimal renewable factor or the minimal degree of autonomy constraint is active, as these
+constraints of D2 refer to the individual components of the energy system.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    TIME_INDEX,
+    ENERGY_BUSSES,
+    ENERGY_CONSUMPTION,
+    CONSTRAINTS,
+    MINIMAL_RENEWABLE_FACTOR,
+    MINIMAL_DEGREE_OF_AUTONOMY,
+    MODEL_REDUCTION,
+    EXCESS,
+    LABEL,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidModelReductionError
+
+# Keys of the dict describing the reductions of the energy system
+EXCESS_SINKS = "excess_sinks"
+FIXED_SOURCES = "fixed_sources"
+
+# Suffix of the label of the source replacing the fixed sources of a bus
+FIXED_SOURCES_SUFFIX = " fixed sources"
+
+
+def is_model_reduction_activated(dict_values):
+    r"""
+    Reads the simulation setting MODEL_REDUCTION and checks if the reduction can be applied.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    bool
+        True if the energy system is to be reduced
+
+    Notes
+    -----
+    Raises InvalidModelReductionError if MODEL_REDUCTION is not True or False.
+
+    Tested with:
+    - test_is_model_reduction_activated_not_defined()
+    - test_is_model_reduction_activated_invalid_value_raises_error()
+    - test_is_model_reduction_activated_with_renewable_constraint()
+    """
+    activated = dict_values[SIMULATION_SETTINGS].get(MODEL_REDUCTION, {}).get(VALUE)
+    if activated is None:
+        return False
+    if activated not in (True, False):
+        raise InvalidModelReductionError(
+            f"The value of {MODEL_REDUCTION} has to be True or False, not {activated}."
+        )
+    if activated is False:
+        return False
+
+    constraints = dict_values.get(CONSTRAINTS, {})
+    for constraint in (MINIMAL_RENEWABLE_FACTOR, MINIMAL_DEGREE_OF_AUTONOMY):
+        if (constraints.get(constraint, {}).get(VALUE) or 0) > 0:
+            logging.info(
+                f"The energy system model is not reduced, as the constraint {constraint} "
+                f"refers to its individual components."
+            )
+            return False
+    return True
+
+
+def get_sequence(sequence, n_timesteps):
+    r"""
+    Returns the values of a parameter of an oemof flow or component for each timestep.
+
+    Parameters
+    ----------
+    sequence: scalar, list, :pandas:`pandas.Series<series>` or oemof sequence
+        Parameter of the flow or component
+
+    n_timesteps: int
+        Number of timesteps of the energy system
+
+    Returns
+    -------
+    :numpy:`numpy.array`
+        Values of the parameter, None if the parameter is not defined
+    """
+    sequence = solph.plumbing.sequence(sequence)
+    if isinstance(sequence, pd.Series):
+        sequence = sequence.values
+    values = [sequence[t] for t in range(n_timesteps)]
+    if any(value is None for value in values):
+        return None
+    return np.array(values, dtype=float)
+
+
+def is_unbounded_flow(flow, n_timesteps):
+    r"""
+    Checks if a flow is only bounded by its capacity and has no negative costs or emissions.
+
+    Parameters
+    ----------
+    flow: :oemof-solph:`solph.Flow <solph.network.Flow>`
+        Flow of the energy system
+
+    n_timesteps: int
+        Number of timesteps of the energy system
+
+    Returns
+    -------
+    bool
+        True if the flow can take any non-negative value within its capacity (incl. its
+        optimization)
+    """
+    if (
+        get_sequence(flow.fix, n_timesteps) is not None
+        or flow.nonconvex is not None
+        or flow.summed_min is not None
+        or flow.summed_max is not None
+        or flow.positive_gradient["ub"][0] is not None
+        or flow.negative_gradient["ub"][0] is not None
+        or any(get_sequence(flow.min, n_timesteps) != 0)
+    ):
+        return False
+
+    variable_costs = get_sequence(flow.variable_costs, n_timesteps)
+    emission_factor = get_sequence(getattr(flow, "emission_factor", 0), n_timesteps)
+    return all(variable_costs >= 0) and all(emission_factor >= 0)
+
+
+def remove_excess_sinks(model, excess_sinks):
+    r"""
+    Removes the excess sinks of the busses which can never have a surplus.
+
+    A bus can never have a surplus if all its inputs are sources whose flow is only bounded by
+    their capacity and which have no negative costs or emissions. A surplus could be avoided by
+    reducing the output of the sources, without increasing the costs or emissions.
+
+    Parameters
+    ----------
+    model: :oemof-solph:`solph.EnergySystem <solph.network.EnergySystem>`
+        Energy system, its components are modified
+
+    excess_sinks: list of str
+        Labels of the excess sinks of the busses (see `C0.define_excess_sinks()`)
+
+    Returns
+    -------
+    list of dict
+        For each removed excess sink, its bus ("bus"), the sink ("sink") and its flow ("flow")
+
+    Notes
+    -----
+    Tested with:
+    - test_remove_excess_sinks()
+    - test_remove_excess_sinks_bus_with_fixed_source()
+    """
+    n_timesteps = len(model.timeindex)
+    removed_sinks = []
+    for sink in model.nodes:
+        if type(sink) is not solph.Sink or sink.label not in excess_sinks:
+            continue
+        if len(sink.inputs) != 1:
+            continue
+        bus = list(sink.inputs)[0]
+        if not isinstance(bus, solph.Bus) or bus.balanced is not True:
+            continue
+        if not is_unbounded_flow(bus.outputs[sink], n_timesteps):
+            continue
+        if all(
+            type(source) is solph.Source
+            and len(source.outputs) == 1
+            and is_unbounded_flow(source.outputs[bus], n_timesteps)
+            for source in bus.inputs
+        ):
+            removed_sinks.append({"bus": bus, "sink": sink, "flow": bus.outputs[sink]})
+
+    for removed_sink in removed_sinks:
+        del removed_sink["bus"].outputs[removed_sink["sink"]]
+        logging.debug(
+            f"Model reduction: The excess sink {removed_sink['sink']} is removed, as the bus "
+            f"{removed_sink['bus']} can not have a surplus."
+        )
+    removed_nodes = [removed_sink["sink"] for removed_sink in removed_sinks]
+    model.entities = [node for node in model.nodes if node not in removed_nodes]
+    return removed_sinks
+
+
+def get_fixed_output(source, n_timesteps):
+    r"""
+    Returns the fixed output of a non-dispatchable source without capacity optimization.
+
+    Parameters
+    ----------
+    source: :oemof-solph:`solph.Source <solph.network.Source>`
+        Source of the energy system
+
+    n_timesteps: int
+        Number of timesteps of the energy system
+
+    Returns
+    -------
+    :numpy:`numpy.array` or None
+        Output of the source in each timestep, None if the output is not fixed
+    """
+    if type(source) is not solph.Source or len(source.outputs) != 1:
+        return None
+    flow = list(source.outputs.values())[0]
+    fix = get_sequence(flow.fix, n_timesteps)
+    if (
+        fix is None
+        or flow.nominal_value is None
+        or flow.investment is not None
+        or flow.nonconvex is not None
+    ):
+        return None
+    return fix * flow.nominal_value
+
+
+def merge_fixed_sources(model):
+    r"""
+    Merges the fixed non-dispatchable sources of each bus into a single fixed source.
+
+    The output of the merged source is the sum of the outputs of the fixed sources. Its variable
+    costs and emission factor are the averages of those of the fixed sources, weighted by their
+    output, so that the objective value and the emissions do not change.
+
+    Parameters
+    ----------
+    model: :oemof-solph:`solph.EnergySystem <solph.network.EnergySystem>`
+        Energy system, its components are modified
+
+    Returns
+    -------
+    list of dict
+        For each bus with several fixed sources, the bus ("bus"), the merged source ("source")
+        and the fixed sources with their output ("fixed_outputs")
+
+    Notes
+    -----
+    Tested with:
+    - test_merge_fixed_sources()
+    """
+    n_timesteps = len(model.timeindex)
+    fixed_sources_per_bus = {}
+    for source in model.nodes:
+        fixed_output = get_fixed_output(source, n_timesteps)
+        if fixed_output is not None:
+            bus = list(source.outputs)[0]
+            fixed_sources_per_bus.setdefault(bus, []).append((source, fixed_output))
+
+    merged_sources = []
+    removed_nodes = []
+    for bus, fixed_sources in fixed_sources_per_bus.items():
+        if len(fixed_sources) < 2:
+            continue
+        total_output = sum(fixed_output for _, fixed_output in fixed_sources)
+        flow_parameters = {"fix": list(total_output), "nominal_value": 1}
+        for parameter, default in (("variable_costs", 0), ("emission_factor", None)):
+            if default is None and not any(
+                hasattr(source.outputs[bus], parameter) for source, _ in fixed_sources
+            ):
+                continue
+            weighted_sum = sum(
+                fixed_output
+                * get_sequence(getattr(source.outputs[bus], parameter, 0), n_timesteps)
+                for source, fixed_output in fixed_sources
+            )
+            flow_parameters.update(
+                {
+                    parameter: list(
+                        np.divide(
+                            weighted_sum,
+                            total_output,
+                            out=np.zeros(n_timesteps),
+                            where=total_output != 0,
+                        )
+                    )
+                }
+            )
+
+        for source, _ in fixed_sources:
+            del source.outputs[bus]
+        merged_source = solph.Source(
+            label=f"{bus}{FIXED_SOURCES_SUFFIX}",
+            outputs={bus: solph.Flow(**flow_parameters)},
+        )
+        model.add(merged_source)
+        merged_sources.append(
+            {"bus": bus, "source": merged_source, "fixed_outputs": fixed_sources,}
+        )
+        removed_nodes += [source for source, _ in fixed_sources]
+        logging.debug(
+            f"Model reduction: The fixed sources "
+            f"{', '.join(str(source) for source, _ in fixed_sources)} of the bus {bus} "
+            f"are merged into a single source."
+        )
+    model.entities = [node for node in model.nodes if node not in removed_nodes]
+    return merged_sources
+
+
+def reduce_energy_system(dict_values, model, dict_model):
+    r"""
+    Reduces the energy system before the pyomo model is created, if MODEL_REDUCTION is True.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    model: :oemof-solph:`solph.EnergySystem <solph.network.EnergySystem>`
+        Energy system built with all assets in D0
+
+    dict_model: dict
+        Oemof components of the assets in D0, the removed components are deleted
+
+    Returns
+    -------
+    model: :oemof-solph:`solph.EnergySystem <solph.network.EnergySystem>`
+        Reduced energy system, with the remaining and merged components
+
+    reductions: dict or None
+        Removed excess sinks (EXCESS_SINKS), merged fixed sources (FIXED_SOURCES) and time index of the energy system (TIME_INDEX), to be passed to
+        `expand_results()`. None if the energy system is not reduced.
+
+    Notes
+    -----
+    Tested with:
+    - test_reduce_energy_system_not_activated()
+    - test_run_oemof_with_model_reduction()
+    """
+    if is_model_reduction_activated(dict_values) is False:
+        return model, None
+
+    n_nodes = len(model.nodes)
+    excess_sinks = [
+        dict_values[ENERGY_CONSUMPTION][bus[EXCESS]][LABEL]
+        for bus in dict_values[ENERGY_BUSSES].values()
+        if bus.get(EXCESS) in dict_values[ENERGY_CONSUMPTION]
+    ]
+    reductions = {
+        EXCESS_SINKS: remove_excess_sinks(model, excess_sinks),
+        FIXED_SOURCES: merge_fixed_sources(model),
+        TIME_INDEX: model.timeindex,
+    }
+
+    model = solph.EnergySystem(
+        timeindex=model.timeindex,
+        timeincrement=model.timeincrement,
+        entities=model.nodes,
+    )
+    remaining_nodes = set(model.nodes)
+    for components in dict_model.values():
+        for label in [
+            label
+            for label, component in components.items()
+            if component not in remaining_nodes
+        ]:
+            del components[label]
+
+    logging.info(
+        f"Model reduction: {len(reductions[EXCESS_SINKS])} excess sinks removed and "
+        f"{sum(len(merge['fixed_outputs']) for merge in reductions[FIXED_SOURCES])} fixed "
+        f"sources merged, the energy system has {len(model.nodes)} instead of {n_nodes} "
+        f"components."
+    )
+    return model, reductions
+
+
+def flow_results(flow, time_index, invest=None):
+    r"""
+    Returns the results of a flow in the format of the oemof results.
+
+    Parameters
+    ----------
+    flow: array-like or scalar
+        Flow in each timestep
+
+    time_index: :pandas:`pandas.DatetimeIndex`
+        Time index of the results
+
+    invest: float or None
+        Optimized capacity of the flow, None if the flow has no capacity optimization
+        Default: None
+
+    Returns
+    -------
+    dict
+        Scalars ("scalars") and sequences ("sequences") of the flow
+    """
+    if invest is None:
+        scalars = pd.Series(dtype=float)
+    else:
+        scalars = pd.Series({"invest": invest})
+    return {
+        "scalars": scalars,
+        "sequences": pd.DataFrame({"flow": flow}, index=time_index),
+    }
+
+
+def expand_results(results_main, reductions):
+    r"""
+    Maps the results of the reduced energy system back to the components of the full system.
+
+    The reductions are undone in the reverse order of `reduce_energy_system()`:
+    - the flow of each fixed source is its fixed output, the merged source is removed
+    - the flow of a removed excess sink is 0, as is its optimized capacity
+
+    Parameters
+    ----------
+    results_main: dict
+        Results of the reduced energy system, as returned by `oemof.solph.processing.results()`,
+        they are updated in place
+
+    reductions: dict
+        Reductions of the energy system, as returned by `reduce_energy_system()`
+
+    Returns
+    -------
+    dict
+        Results of all components of the full energy system
+
+    Notes
+    -----
+    Tested with:
+    - test_expand_results()
+    - test_run_oemof_with_model_reduction()
+    """
+    time_index = reductions[TIME_INDEX]
+
+    for merge in reversed(reductions[FIXED_SOURCES]):
+        del results_main[(merge["source"], merge["bus"])]
+        for source, fixed_output in merge["fixed_outputs"]:
+            results_main.update(
+                {(source, merge["bus"]): flow_results(fixed_output, time_index)}
+            )
+
+    for removed_sink in reversed(reductions[EXCESS_SINKS]):
+        invest = 0 if removed_sink["flow"].investment is not None else None
+        results_main.update(
+            {
+                (removed_sink["bus"], removed_sink["sink"]): flow_results(
+                    0, time_index, invest
+                )
+            }
+        )
+
+    return results_main
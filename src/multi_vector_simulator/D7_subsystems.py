@@ -0,0 +1,301 @@
+"""
+Module D7 - Subsystems
+======================
+
+Optional optimization of the independent subsystems of the energy system in parallel processes.
+An energy system can consist of several subsystems which do not share any bus (eg. independent
+islands of a multi-site scenario). If no constraint couples them, the optimal solution of the
+energy system is the combination of the optimal solutions of the subsystems, which are smaller
+models and can be solved at the same time.
+
+Functional requirements of module D7:
+- find the subsystems, ie. the connected components of the graph of busses and assets after C0
+- check that the subsystems are not coupled by a constraint of D2 (maximum emissions, minimal
+  renewable factor and minimal degree of autonomy apply to the whole energy system)
+- select the busses and assets of each subsystem
+- merge the simulation results of the subsystems
+
+The subsystems are optimized in parallel if the optional simulation setting PARALLEL_SUBSYSTEMS
+is True, the models are built and solved by `D0.run_oemof_subsystems()`.
+"""
+
+import logging
+import os
+
+import multi_vector_simulator.D5_model_statistics as D5
+from multi_vector_simulator.utils.model_profiling import merge_profile_tables
+
+from multi_vector_simulator.utils.constants import PATH_OUTPUT_FOLDER
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    ENERGY_BUSSES,
+    ACCEPTED_ASSETS_FOR_ASSET_GROUPS,
+    INFLOW_DIRECTION,
+    OUTFLOW_DIRECTION,
+    CONSTRAINTS,
+    MAXIMUM_EMISSIONS,
+    MINIMAL_RENEWABLE_FACTOR,
+    MINIMAL_DEGREE_OF_AUTONOMY,
+    OUTPUT_LP_FILE,
+    STORE_SOLUTION,
+    TYPICAL_PERIODS,
+    PARALLEL_SUBSYSTEMS,
+    SUBSYSTEMS,
+    OBJECTIVE_VALUE,
+    SIMULTATION_TIME,
+    MODEL_SIZE,
+    MODEL_CONSTRUCTION_PROFILE,
+    SOLVER,
+    SOLVER_OPTIONS,
+    SOLVER_INTERFACE,
+    LABEL,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidSubsystemsError
+
+# Name of the folder of a subsystem in the output folder (for its lp file and solution)
+SUBSYSTEM_FOLDER = "subsystem_{}"
+
+
+def get_busses_of_asset(dict_asset):
+    r"""
+    Returns the busses an asset is connected to.
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Asset of one of the asset groups of ACCEPTED_ASSETS_FOR_ASSET_GROUPS
+
+    Returns
+    -------
+    list of str
+        Labels of the input and output busses of the asset
+    """
+    busses = []
+    for direction in (INFLOW_DIRECTION, OUTFLOW_DIRECTION):
+        bus = dict_asset.get(direction)
+        if isinstance(bus, list):
+            busses += bus
+        elif bus is not None:
+            busses.append(bus)
+    return busses
+
+
+def find_subsystems(dict_values):
+    r"""
+    Finds the subsystems of the energy system, ie. the groups of busses connected by assets.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    Returns
+    -------
+    list of list of str
+        Labels of the busses of each subsystem, in the order of ENERGY_BUSSES
+
+    Notes
+    -----
+    Tested with:
+    - test_find_subsystems()
+    - test_find_subsystems_connected_by_transformer()
+    """
+    parents = {bus: bus for bus in dict_values[ENERGY_BUSSES]}
+
+    def root(bus):
+        while parents[bus] != bus:
+            parents[bus] = parents[parents[bus]]
+            bus = parents[bus]
+        return bus
+
+    for asset_group in ACCEPTED_ASSETS_FOR_ASSET_GROUPS:
+        for dict_asset in dict_values.get(asset_group, {}).values():
+            busses = get_busses_of_asset(dict_asset)
+            for bus in busses[1:]:
+                parents[root(bus)] = root(busses[0])
+
+    subsystems = {}
+    for bus in dict_values[ENERGY_BUSSES]:
+        subsystems.setdefault(root(bus), []).append(bus)
+    return list(subsystems.values())
+
+
+def get_subsystems(dict_values):
+    r"""
+    Returns the subsystems which are to be optimized separately, if PARALLEL_SUBSYSTEMS is True.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    Returns
+    -------
+    list of list of str or None
+        Labels of the busses of each subsystem (see `find_subsystems()`), None if the energy
+        system is optimized as a whole
+
+    Notes
+    -----
+    The energy system is optimized as a whole if it consists of a single subsystem, if a
+    constraint of D2 couples the subsystems or if the time series are aggregated into typical
+    periods (the typical periods are selected for the whole energy system, see D3).
+    Raises InvalidSubsystemsError if PARALLEL_SUBSYSTEMS is not True or False.
+
+    Tested with:
+    - test_get_subsystems_not_activated()
+    - test_get_subsystems_invalid_value_raises_error()
+    - test_get_subsystems_coupled_by_maximum_emissions()
+    - test_get_subsystems()
+    """
+    simulation_settings = dict_values[SIMULATION_SETTINGS]
+    activated = simulation_settings.get(PARALLEL_SUBSYSTEMS, {}).get(VALUE)
+    if activated not in (None, True, False):
+        raise InvalidSubsystemsError(
+            f"The value of {PARALLEL_SUBSYSTEMS} has to be True or False, not {activated}."
+        )
+    if activated is not True:
+        return None
+
+    subsystems = find_subsystems(dict_values)
+    if len(subsystems) < 2:
+        logging.debug("The energy system consists of a single subsystem.")
+        return None
+
+    constraints = dict_values.get(CONSTRAINTS, {})
+    coupling_constraints = [
+        constraint
+        for constraint in (MINIMAL_RENEWABLE_FACTOR, MINIMAL_DEGREE_OF_AUTONOMY)
+        if (constraints.get(constraint, {}).get(VALUE) or 0) > 0
+    ]
+    if constraints.get(MAXIMUM_EMISSIONS, {}).get(VALUE) is not None:
+        coupling_constraints.append(MAXIMUM_EMISSIONS)
+    if len(coupling_constraints) > 0:
+        logging.info(
+            f"The energy system consists of {len(subsystems)} subsystems, which are optimized "
+            f"together as they are coupled by the constraints {', '.join(coupling_constraints)}."
+        )
+        return None
+    if (simulation_settings.get(TYPICAL_PERIODS, {}).get(VALUE) or 0) > 0:
+        logging.info(
+            f"The energy system consists of {len(subsystems)} subsystems, which are optimized "
+            f"together as the time series are aggregated into {TYPICAL_PERIODS}."
+        )
+        return None
+
+    logging.info(
+        f"The energy system consists of {len(subsystems)} subsystems, which are optimized "
+        f"separately."
+    )
+    return subsystems
+
+
+def select_subsystem(dict_values, busses, number):
+    r"""
+    Selects the busses and assets of a subsystem.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    busses: list of str
+        Labels of the busses of the subsystem
+
+    number: int
+        Number of the subsystem, its lp file and solution are stored in the folder
+        SUBSYSTEM_FOLDER of the output folder
+
+    Returns
+    -------
+    dict
+        Simulation parameters of the subsystem, dict_values is not modified
+
+    Notes
+    -----
+    Tested with:
+    - test_select_subsystem()
+    """
+    dict_values_subsystem = dict(dict_values)
+    dict_values_subsystem[ENERGY_BUSSES] = {
+        bus: dict_values[ENERGY_BUSSES][bus] for bus in busses
+    }
+    for asset_group in ACCEPTED_ASSETS_FOR_ASSET_GROUPS:
+        if asset_group in dict_values:
+            dict_values_subsystem[asset_group] = {
+                asset: dict_asset
+                for asset, dict_asset in dict_values[asset_group].items()
+                if any(bus in busses for bus in get_busses_of_asset(dict_asset))
+            }
+
+    simulation_settings = dict(dict_values[SIMULATION_SETTINGS])
+    if any(
+        simulation_settings.get(setting, {}).get(VALUE) is True
+        for setting in (OUTPUT_LP_FILE, STORE_SOLUTION)
+    ):
+        path_output_folder = os.path.join(
+            simulation_settings[PATH_OUTPUT_FOLDER], SUBSYSTEM_FOLDER.format(number)
+        )
+        os.makedirs(path_output_folder, exist_ok=True)
+        simulation_settings.update({PATH_OUTPUT_FOLDER: path_output_folder})
+    dict_values_subsystem[SIMULATION_SETTINGS] = simulation_settings
+    return dict_values_subsystem
+
+
+def merge_simulation_results(simulation_results_of_subsystems):
+    r"""
+    Merges the simulation results of the subsystems.
+
+    Parameters
+    ----------
+    simulation_results_of_subsystems: list of dict
+        SIMULATION_RESULTS of each subsystem
+
+    Returns
+    -------
+    dict
+        SIMULATION_RESULTS of the energy system: the objective values, simulation times and
+        model sizes are summed up, the number of subsystems is stored in SUBSYSTEMS. The profiles
+        of the model construction are merged if they are recorded.
+
+    Notes
+    -----
+    Tested with:
+    - test_merge_simulation_results()
+    - test_merge_simulation_results_with_construction_profiles()
+    """
+    first_subsystem = simulation_results_of_subsystems[0]
+    merged_results = {
+        LABEL: SIMULATION_RESULTS,
+        OBJECTIVE_VALUE: sum(
+            simulation_results[OBJECTIVE_VALUE]
+            for simulation_results in simulation_results_of_subsystems
+        ),
+        SIMULTATION_TIME: round(
+            sum(
+                simulation_results[SIMULTATION_TIME]
+                for simulation_results in simulation_results_of_subsystems
+            ),
+            2,
+        ),
+        SUBSYSTEMS: len(simulation_results_of_subsystems),
+        MODEL_SIZE: D5.sum_model_sizes(
+            [
+                simulation_results[MODEL_SIZE]
+                for simulation_results in simulation_results_of_subsystems
+            ]
+        ),
+        SOLVER: first_subsystem[SOLVER],
+        SOLVER_OPTIONS: first_subsystem[SOLVER_OPTIONS],
+        SOLVER_INTERFACE: first_subsystem[SOLVER_INTERFACE],
+    }
+    if MODEL_CONSTRUCTION_PROFILE in first_subsystem:
+        merged_results[MODEL_CONSTRUCTION_PROFILE] = merge_profile_tables(
+            [
+                simulation_results[MODEL_CONSTRUCTION_PROFILE]
+                for simulation_results in simulation_results_of_subsystems
+            ]
+        )
+    return merged_results
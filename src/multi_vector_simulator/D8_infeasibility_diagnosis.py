@@ -0,0 +1,302 @@
+"""
+Module D8 - Infeasibility diagnosis
+===================================
+
+Optional diagnosis of an infeasible optimization problem. If the solver reports that the
+optimization problem is infeasible, the model is solved once more with penalized slack variables:
+
+- a shortage and an excess slack on the balance of every bus and timestep, ie. a source and a
+  sink with very high costs connected to each bus
+- a slack on each constraint of D2 (maximum emissions, minimal renewable factor and minimal degree
+  of autonomy)
+
+The slack variables are only used where the energy system cannot be operated otherwise, the busses,
+timesteps and constraints which needed slack and the amount of slack point to the cause of the
+infeasibility.
+
+Functional requirements of module D8:
+- add the slack variables to the pyomo model and their costs to the objective
+- gather the slack needed by the solution of the relaxed model
+- summarize the diagnosis for the error message and store it in the output folder
+
+The diagnosis is activated with the optional simulation setting INFEASIBILITY_DIAGNOSIS, the model
+is solved again by `D0.model_building.diagnose_infeasibility()`.
+"""
+
+import logging
+import os
+
+import pandas as pd
+import pyomo.environ as po
+
+from multi_vector_simulator.utils.constants import PATH_OUTPUT_FOLDER
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    INFEASIBILITY_DIAGNOSIS,
+    MAXIMUM_EMISSIONS,
+    MINIMAL_RENEWABLE_FACTOR,
+    MINIMAL_DEGREE_OF_AUTONOMY,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidInfeasibilityDiagnosisError
+
+# Costs of one unit of slack in the objective, much higher than the costs of any energy flow
+SLACK_COSTS = 1e6
+
+# Slack smaller than this tolerance is considered as numerical noise of the solver
+SLACK_TOLERANCE = 1e-6
+
+# Names of the pyomo components of the constraints added by D2
+D2_CONSTRAINTS = {
+    MAXIMUM_EMISSIONS: "integral_limit_emission_factor_constraint",
+    MINIMAL_RENEWABLE_FACTOR: "constraint_minimal_renewable_share",
+    MINIMAL_DEGREE_OF_AUTONOMY: "constraint_minimal_degree_of_autonomy",
+}
+
+# Names of the slack variables added to the pyomo model
+BUS_SHORTAGE = "slack_bus_shortage"
+BUS_EXCESS = "slack_bus_excess"
+CONSTRAINT_SLACK = "slack_{}"
+
+# Columns of the table of the slack needed by the relaxed model
+SLACK_TYPE = "slack type"
+SLACK_COMPONENT = "component"
+SLACK_TIMESTEP = "timestep"
+SLACK_VALUE = "slack"
+
+# Name of the file of the diagnosis in the output folder
+INFEASIBILITY_DIAGNOSIS_FILE = "infeasibility_diagnosis.csv"
+
+
+def is_infeasibility_diagnosis_activated(dict_values):
+    r"""
+    Reads the simulation setting INFEASIBILITY_DIAGNOSIS.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    bool
+        True if an infeasible model is to be diagnosed
+
+    Notes
+    -----
+    Raises InvalidInfeasibilityDiagnosisError if INFEASIBILITY_DIAGNOSIS is not True or False.
+
+    Tested with:
+    - test_is_infeasibility_diagnosis_activated_not_defined()
+    - test_is_infeasibility_diagnosis_activated_invalid_value_raises_error()
+    """
+    activated = (
+        dict_values[SIMULATION_SETTINGS].get(INFEASIBILITY_DIAGNOSIS, {}).get(VALUE)
+    )
+    if activated not in (None, True, False):
+        raise InvalidInfeasibilityDiagnosisError(
+            f"The value of {INFEASIBILITY_DIAGNOSIS} has to be True or False, not {activated}."
+        )
+    return activated is True
+
+
+def is_infeasible(local_energy_system):
+    r"""
+    Checks if the solver reported that the optimization problem is infeasible.
+
+    Parameters
+    ----------
+    local_energy_system: object
+        pyomo object storing all constraints of the energy system model, after the solve
+
+    Returns
+    -------
+    bool
+
+    Notes
+    -----
+    Tested with:
+    - test_diagnose_infeasibility_bus_shortage()
+    """
+    solver_results = local_energy_system.solver_results
+    termination_condition = solver_results["Solver"][0]["Termination condition"]
+    return termination_condition in ("infeasible", "infeasibleOrUnbounded")
+
+
+def add_slack_variables(local_energy_system, slack_costs=SLACK_COSTS):
+    r"""
+    Relaxes the bus balances and the constraints of D2 with penalized slack variables.
+
+    The balance of a bus is rebuilt like in oemof-solph's `Bus` block, with a shortage slack on the
+    input side and an excess slack on the output side. The slack of a constraint of D2 reduces the
+    violation of its bound.
+
+    Parameters
+    ----------
+    local_energy_system: object
+        pyomo object storing all constraints of the energy system model, modified in place
+
+    slack_costs: float
+        Costs of one unit of slack in the objective
+        Default: SLACK_COSTS
+
+    Returns
+    -------
+    list of str
+        Constraints of D2 (keys of D2_CONSTRAINTS) which have a slack variable
+
+    Notes
+    -----
+    Tested with:
+    - test_add_slack_variables()
+    """
+    model = local_energy_system
+    balance = model.Bus.balance
+    balance_index = list(balance.keys())
+    setattr(model, BUS_SHORTAGE, po.Var(balance_index, within=po.NonNegativeReals))
+    setattr(model, BUS_EXCESS, po.Var(balance_index, within=po.NonNegativeReals))
+    shortage = getattr(model, BUS_SHORTAGE)
+    excess = getattr(model, BUS_EXCESS)
+    for (bus, t) in balance_index:
+        inflow = sum(model.flow[i, bus, t] for i in bus.inputs)
+        outflow = sum(model.flow[bus, o, t] for o in bus.outputs)
+        balance[bus, t].set_value(inflow + shortage[bus, t] == outflow + excess[bus, t])
+    slack_expression = sum(shortage[index] + excess[index] for index in balance_index)
+
+    relaxed_constraints = []
+    for constraint, component_name in D2_CONSTRAINTS.items():
+        component = getattr(model, component_name, None)
+        if component is None:
+            continue
+        slack_name = CONSTRAINT_SLACK.format(constraint)
+        setattr(model, slack_name, po.Var(within=po.NonNegativeReals))
+        slack = getattr(model, slack_name)
+        if component.lower is not None:
+            component.set_value((component.lower, component.body + slack, None))
+        else:
+            component.set_value((None, component.body - slack, component.upper))
+        slack_expression += slack
+        relaxed_constraints.append(constraint)
+
+    model.objective.expr = model.objective.expr + slack_costs * slack_expression
+    return relaxed_constraints
+
+
+def get_slack(local_energy_system, relaxed_constraints):
+    r"""
+    Gathers the slack needed by the solution of the relaxed model.
+
+    Parameters
+    ----------
+    local_energy_system: object
+        pyomo object of the relaxed model (see `add_slack_variables()`), after the solve
+
+    relaxed_constraints: list of str
+        Constraints of D2 which have a slack variable
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<frame>`
+        One row per bus and timestep or constraint with slack, with the columns SLACK_TYPE,
+        SLACK_COMPONENT, SLACK_TIMESTEP (None for a constraint) and SLACK_VALUE
+
+    Notes
+    -----
+    Tested with:
+    - test_diagnose_infeasibility_bus_shortage()
+    - test_diagnose_infeasibility_maximum_emissions()
+    """
+    model = local_energy_system
+    timeindex = model.es.timeindex
+    rows = []
+    for slack_type in (BUS_SHORTAGE, BUS_EXCESS):
+        for (bus, t), variable in getattr(model, slack_type).items():
+            value = po.value(variable)
+            if value is not None and value > SLACK_TOLERANCE:
+                rows.append([slack_type, str(bus), timeindex[t], value])
+    for constraint in relaxed_constraints:
+        value = po.value(getattr(model, CONSTRAINT_SLACK.format(constraint)))
+        if value is not None and value > SLACK_TOLERANCE:
+            rows.append([CONSTRAINT_SLACK.format(constraint), constraint, None, value])
+    return pd.DataFrame(
+        rows, columns=[SLACK_TYPE, SLACK_COMPONENT, SLACK_TIMESTEP, SLACK_VALUE]
+    )
+
+
+def summarize_slack(slack):
+    r"""
+    Summarizes the slack needed by the relaxed model for the error message.
+
+    Parameters
+    ----------
+    slack: :pandas:`pandas.DataFrame<frame>`
+        Output of `get_slack()`
+
+    Returns
+    -------
+    str
+        One line per bus and slack type (number of timesteps, first timestep, total and maximal
+        slack) and per constraint
+
+    Notes
+    -----
+    Tested with:
+    - test_diagnose_infeasibility_bus_shortage()
+    """
+    if slack.empty:
+        return (
+            "The relaxed model did not need any slack: the infeasibility is not caused by "
+            "the balance of a bus or a constraint."
+        )
+    lines = ["Slack needed to make the optimization problem feasible:"]
+    descriptions = {
+        BUS_SHORTAGE: "supply shortage on bus",
+        BUS_EXCESS: "unusable excess on bus",
+    }
+    for (slack_type, component), slack_of_component in slack.groupby(
+        [SLACK_TYPE, SLACK_COMPONENT], sort=False
+    ):
+        if slack_type in descriptions:
+            lines.append(
+                f"\t- {descriptions[slack_type]} '{component}' in "
+                f"{len(slack_of_component)} timestep(s) from "
+                f"{slack_of_component[SLACK_TIMESTEP].iloc[0]}: total "
+                f"{round(slack_of_component[SLACK_VALUE].sum(), 4)}, maximum "
+                f"{round(slack_of_component[SLACK_VALUE].max(), 4)}"
+            )
+        else:
+            lines.append(
+                f"\t- constraint {component} violated by "
+                f"{round(slack_of_component[SLACK_VALUE].iloc[0], 4)}"
+            )
+    return "\n".join(lines)
+
+
+def store_slack(dict_values, slack):
+    r"""
+    Stores the slack needed by the relaxed model in the output folder.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    slack: :pandas:`pandas.DataFrame<frame>`
+        Output of `get_slack()`
+
+    Returns
+    -------
+    str
+        Path of the file INFEASIBILITY_DIAGNOSIS_FILE
+
+    Notes
+    -----
+    Tested with:
+    - test_run_oemof_infeasibility_diagnosis()
+    """
+    path_output_folder = dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER]
+    os.makedirs(path_output_folder, exist_ok=True)
+    path_file = os.path.join(path_output_folder, INFEASIBILITY_DIAGNOSIS_FILE)
+    slack.to_csv(path_file, index=False)
+    logging.info(f"The infeasibility diagnosis is stored in {path_file}.")
+    return path_file
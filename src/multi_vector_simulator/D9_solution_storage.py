@@ -0,0 +1,159 @@
+"""
+Module D9 - Solution storage
+============================
+
+Optional storage of the solution of an optimization problem, eg. to compare the solutions of
+scenario variants by the values of their variables.
+
+Functional requirements of module D9:
+- store the primal solution of a solved model, keyed by the names of the variables (which are
+  built from the labels of the components and the timesteps), with the solver time and iterations
+
+The solution is stored if the optional simulation setting STORE_SOLUTION is True.
+"""
+
+import gzip
+import json
+import logging
+import os
+
+import pyomo.environ as po
+
+from multi_vector_simulator.utils.constants import PATH_OUTPUT_FOLDER
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    STORE_SOLUTION,
+    SOLVER,
+    SIMULTATION_TIME,
+    SOLVER_ITERATIONS,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidSolutionStorageError
+
+# Name of the file of the stored solution in the output folder
+SOLUTION_FILE = "solution.json.gz"
+
+# Key of the values of the variables in the file of the stored solution
+SOLUTION_VARIABLES = "variables"
+
+
+def is_solution_storage_activated(dict_values):
+    r"""
+    Reads the simulation setting STORE_SOLUTION.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    bool
+        True if the solution of the model is to be stored
+
+    Notes
+    -----
+    Raises InvalidSolutionStorageError if STORE_SOLUTION is not True or False.
+
+    Tested with:
+    - test_is_solution_storage_activated_not_defined()
+    - test_is_solution_storage_activated_invalid_value_raises_error()
+    """
+    activated = dict_values[SIMULATION_SETTINGS].get(STORE_SOLUTION, {}).get(VALUE)
+    if activated not in (None, True, False):
+        raise InvalidSolutionStorageError(
+            f"The value of {STORE_SOLUTION} has to be True or False, not {activated}."
+        )
+    return activated is True
+
+
+def get_solver_iterations(local_energy_system):
+    r"""
+    Reads the number of iterations of the solver from the solver results.
+
+    Parameters
+    ----------
+    local_energy_system: object
+        pyomo object storing all constraints of the energy system model, after the solve
+
+    Returns
+    -------
+    int or None
+        Number of iterations, None if the solver interface does not report it
+
+    Notes
+    -----
+    Tested with:
+    - test_store_solution()
+    """
+    try:
+        statistics = local_energy_system.solver_results["Solver"][0]["Statistics"]
+        iterations = statistics["Black box"]["Number of iterations"]
+    except (AttributeError, KeyError, TypeError):
+        return None
+    return iterations if isinstance(iterations, int) else None
+
+
+def get_solution(local_energy_system):
+    r"""
+    Returns the values of the variables of a solved model.
+
+    Parameters
+    ----------
+    local_energy_system: object
+        pyomo object storing all constraints of the energy system model, after the solve
+
+    Returns
+    -------
+    dict
+        Value of each variable, keyed by the name of the variable, None for the variables which are
+        not part of any constraint or of the objective
+
+    Notes
+    -----
+    Tested with:
+    - test_store_solution()
+    """
+    return {
+        variable.name: None if variable.value is None else float(variable.value)
+        for variable in local_energy_system.component_data_objects(po.Var)
+    }
+
+
+def store_solution(dict_values, local_energy_system):
+    r"""
+    Stores the solution of a solved model in the output folder.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, with the SIMULATION_RESULTS of the solve
+
+    local_energy_system: object
+        pyomo object storing all constraints of the energy system model, after the solve
+
+    Returns
+    -------
+    str
+        Path of the file SOLUTION_FILE
+
+    Notes
+    -----
+    Tested with:
+    - test_store_solution()
+    """
+    simulation_results = dict_values[SIMULATION_RESULTS]
+    path_output_folder = dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER]
+    os.makedirs(path_output_folder, exist_ok=True)
+    path_file = os.path.join(path_output_folder, SOLUTION_FILE)
+    solution = {
+        SOLVER: simulation_results[SOLVER],
+        SIMULTATION_TIME: simulation_results[SIMULTATION_TIME],
+        SOLVER_ITERATIONS: simulation_results.get(SOLVER_ITERATIONS),
+        SOLUTION_VARIABLES: get_solution(local_energy_system),
+    }
+    with gzip.open(path_file, "wt") as solution_file:
+        json.dump(solution, solution_file)
+    logging.info(f"The solution of the optimization is stored in {path_file}.")
+    return path_file
@@ -10,7 +10,7 @@ Module E0 evaluates the oemof results and calculates the KPI
 
 import logging
 
-import oemof.solph as solph
+import numpy as np
 import pandas as pd
 
 import multi_vector_simulator.E1_process_results as E1
@@ -57,6 +57,13 @@ from multi_vector_simulator.utils.constants_output import (
     KPI_SCALAR_MATRIX_ENTRIES,
 )
 
+# Columns of the result matrices, the columns which are not in KPI_MATRIX_STRING_COLUMNS are numeric
+KPI_MATRIX_ENTRIES = {
+    KPI_COST_MATRIX: KPI_COST_MATRIX_ENTRIES,
+    KPI_SCALAR_MATRIX: KPI_SCALAR_MATRIX_ENTRIES,
+}
+KPI_MATRIX_STRING_COLUMNS = [LABEL, UNIT]
+
 
 def evaluate_dict(dict_values, results_main, results_meta):
     """
@@ -75,21 +82,20 @@ def evaluate_dict(dict_values, results_main, results_meta):
 
     """
 
+    # The rows of the result matrices are collected during the evaluation of the assets and
+    # converted into data frames once all assets are evaluated
     dict_values.update(
-        {
-            KPI: {
-                KPI_COST_MATRIX: pd.DataFrame(columns=KPI_COST_MATRIX_ENTRIES),
-                KPI_SCALAR_MATRIX: pd.DataFrame(columns=KPI_SCALAR_MATRIX_ENTRIES),
-                KPI_SCALARS_DICT: {},
-            }
-        }
+        {KPI: {KPI_COST_MATRIX: [], KPI_SCALAR_MATRIX: [], KPI_SCALARS_DICT: {}}}
     )
 
+    # Convert the results of all flows into one matrix, read by node in the following
+    flow_matrix = E1.get_flow_matrix(results_main)
+
     bus_data = {}
     # Store all information related to busses in bus_data
     for bus in dict_values[ENERGY_BUSSES]:
         # Read all energy flows from busses
-        bus_data.update({bus: solph.views.node(results_main, bus)})
+        bus_data.update({bus: E1.get_node_results(flow_matrix, bus)})
 
     logging.info("Evaluating optimized capacities and dispatch.")
     # Evaluate timeseries and store to a large DataFrame for each bus:
@@ -99,8 +105,8 @@ def evaluate_dict(dict_values, results_main, results_meta):
     for storage in dict_values[ENERGY_STORAGE]:
         bus_data.update(
             {
-                dict_values[ENERGY_STORAGE][storage][LABEL]: solph.views.node(
-                    results_main, dict_values[ENERGY_STORAGE][storage][LABEL],
+                dict_values[ENERGY_STORAGE][storage][LABEL]: E1.get_node_results(
+                    flow_matrix, dict_values[ENERGY_STORAGE][storage][LABEL],
                 )
             }
         )
@@ -110,18 +116,6 @@ def evaluate_dict(dict_values, results_main, results_meta):
             dict_values[ENERGY_STORAGE][storage],
         )
 
-        for storage_item in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
-            E2.get_costs(
-                dict_values[ENERGY_STORAGE][storage][storage_item],
-                dict_values[ECONOMIC_DATA],
-            )
-
-        E2.lcoe_assets(dict_values[ENERGY_STORAGE][storage], ENERGY_STORAGE)
-        for storage_item in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
-            store_result_matrix(
-                dict_values[KPI], dict_values[ENERGY_STORAGE][storage][storage_item]
-            )
-
         if (
             dict_values[ENERGY_STORAGE][storage][INFLOW_DIRECTION]
             in dict_values[OPTIMIZED_FLOWS].keys()
@@ -163,12 +157,38 @@ def evaluate_dict(dict_values, results_main, results_meta):
                 dict_asset=dict_values[group][asset],
                 asset_group=group,
             )
-            E2.get_costs(dict_values[group][asset], dict_values[ECONOMIC_DATA])
+
+    # The costs of all assets are calculated at once
+    E2.get_costs_of_assets(
+        [
+            dict_values[ENERGY_STORAGE][storage][storage_item]
+            for storage in dict_values[ENERGY_STORAGE]
+            for storage_item in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]
+        ]
+        + [
+            dict_values[group][asset]
+            for group in [ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_CONSUMPTION]
+            for asset in dict_values[group]
+        ],
+        dict_values[ECONOMIC_DATA],
+    )
+
+    for storage in dict_values[ENERGY_STORAGE]:
+        E2.lcoe_assets(dict_values[ENERGY_STORAGE][storage], ENERGY_STORAGE)
+        for storage_item in [STORAGE_CAPACITY, INPUT_POWER, OUTPUT_POWER]:
+            store_result_matrix(
+                dict_values[KPI], dict_values[ENERGY_STORAGE][storage][storage_item]
+            )
+
+    for group in [ENERGY_CONVERSION, ENERGY_PRODUCTION, ENERGY_CONSUMPTION]:
+        for asset in dict_values[group]:
             E2.lcoe_assets(dict_values[group][asset], group)
             if group == ENERGY_PRODUCTION:
                 E3.calculate_emissions_from_flow(dict_values[group][asset])
             store_result_matrix(dict_values[KPI], dict_values[group][asset])
 
+    build_result_matrices(dict_values[KPI])
+
     logging.info("Evaluating key performance indicators of the system")
     E3.all_totals(dict_values)
     E3.total_demand_and_excess_each_sector(dict_values)
@@ -203,29 +223,33 @@ def evaluate_dict(dict_values, results_main, results_meta):
 
 def store_result_matrix(dict_kpi, dict_asset):
     """
-    Storing results to vector and then result matrix for saving it in csv.
+    Storing results of an asset as rows of the result matrices for saving them in csv.
     Defined value types: Str, bool, None, dict (with key "VALUE"), else (int, float)
 
     Parameters
     ----------
     dict_kpi: dict
-        dictionary with the two kpi groups (costs and scalars), which are pd.DF
+        dictionary with the two kpi groups (costs and scalars), which are lists of rows (dict)
+        until they are converted into data frames by `build_result_matrices()`
 
     dict_asset: dict
         all information known for a specific asset
 
     Returns
     -------
-    Updated dict_kpi DF, with new row of kpis of the specific asset
+    Updated dict_kpi, with new rows of kpis of the specific asset
 
+    Notes
+    -----
+    Tested with:
+    - test_store_result_matrix()
     """
 
     round_to_comma = 5
 
-    for kpi_storage in [KPI_COST_MATRIX, KPI_SCALAR_MATRIX]:
+    for kpi_storage, columns in KPI_MATRIX_ENTRIES.items():
         asset_result_dict = {}
-        for key in dict_kpi[kpi_storage].columns.values:
-            # Check if called value is in oemof results -> Remember: check if pandas index has certain index: pd.object.index.contains(key)
+        for key in columns:
             if key in dict_asset:
                 if isinstance(dict_asset[key], str):
                     asset_result_dict.update({key: dict_asset[key]})
@@ -244,8 +268,47 @@ def store_result_matrix(dict_kpi, dict_asset):
                         {key: round(dict_asset[key], round_to_comma)}
                     )
 
-        asset_result_df = pd.DataFrame([asset_result_dict])
+        dict_kpi[kpi_storage].append(asset_result_dict)
 
-        dict_kpi.update(
-            {kpi_storage: dict_kpi[kpi_storage].append(asset_result_df, sort=False)}
-        )
+
+def build_result_matrices(dict_kpi):
+    """
+    Converts the rows of the result matrices into data frames.
+
+    Each column is allocated once with its dtype: the columns of KPI_MATRIX_STRING_COLUMNS are
+    object columns, the other ones float columns, in which missing values are NaN. A column
+    holding non-numeric values is kept as object column.
+
+    Parameters
+    ----------
+    dict_kpi: dict
+        dictionary with the two kpi groups (costs and scalars), which are lists of rows (dict),
+        see `store_result_matrix()`
+
+    Returns
+    -------
+    Updated dict_kpi, with the KPI_COST_MATRIX and KPI_SCALAR_MATRIX as pd.DataFrame
+
+    Notes
+    -----
+    Tested with:
+    - test_build_result_matrices()
+    """
+    for kpi_storage, columns in KPI_MATRIX_ENTRIES.items():
+        rows = dict_kpi[kpi_storage]
+        matrix = {}
+        for column in columns:
+            values = [row.get(column) for row in rows]
+            if column in KPI_MATRIX_STRING_COLUMNS:
+                matrix[column] = pd.Series(values, dtype=object)
+            else:
+                try:
+                    matrix[column] = pd.Series(
+                        np.array(
+                            [np.nan if value is None else value for value in values],
+                            dtype=float,
+                        )
+                    )
+                except (TypeError, ValueError):
+                    matrix[column] = pd.Series(values, dtype=object)
+        dict_kpi[kpi_storage] = pd.DataFrame(matrix, columns=columns)
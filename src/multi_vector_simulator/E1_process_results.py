@@ -3,6 +3,7 @@ Module E1 process results
 =========================
 
 Module E1 processes the oemof results.
+- convert the oemof results into one matrix of all flows
 - receive time series per bus for all assets
 - write time series to dictionary
 - get optimal capacity of optimized assets
@@ -11,6 +12,7 @@ Module E1 processes the oemof results.
 """
 import logging
 import copy
+import numpy as np
 import pandas as pd
 
 from multi_vector_simulator.utils.constants import TYPE_NONE, TOTAL_FLOW
@@ -75,6 +77,159 @@ ASSET_GROUPS_DEFINED_BY_INFLUX = [ENERGY_CONSUMPTION]
 # b outflux into a bus
 ASSET_GROUPS_DEFINED_BY_OUTFLUX = [ENERGY_CONVERSION, ENERGY_PRODUCTION]
 
+# Keys of the flow matrix, see get_flow_matrix()
+FLOW_MATRIX_VALUES = "values"
+FLOW_MATRIX_COLUMNS = "columns"
+FLOW_MATRIX_INDEX = "index"
+FLOW_MATRIX_SCALARS = "scalars"
+FLOW_MATRIX_NODES = "nodes"
+FLOW_MATRIX_TOTALS = "totals"
+FLOW_MATRIX_PEAKS = "peaks"
+
+
+def get_flow_matrix(results_main):
+    r"""
+    Converts the oemof results into one matrix of all flows, in a single pass over the results.
+
+    Parameters
+    ----------
+    results_main: dict
+        oemof simulation results as output by processing.results()
+
+    Returns
+    -------
+    dict
+        FLOW_MATRIX_VALUES: (np.ndarray) float array of all sequences (timesteps x edges), stored
+        column by column so that each sequence is a contiguous view of the matrix
+        FLOW_MATRIX_COLUMNS: (list) key of each column, eg. (('pv', 'Electricity'), 'flow'), with
+        the labels of the nodes as in `solph.views.node()` (the storage content of a storage is
+        keyed by (label, TYPE_NONE))
+        FLOW_MATRIX_INDEX: (pd.DatetimeIndex) timesteps of the sequences
+        FLOW_MATRIX_SCALARS: (dict) scalar results, eg. the invest values, keyed as the columns
+        FLOW_MATRIX_NODES: (dict) sorted numbers of the columns and keys of the scalars of each node
+        FLOW_MATRIX_TOTALS: (np.ndarray) sum of each column
+        FLOW_MATRIX_PEAKS: (np.ndarray) maximum of each column
+
+    Notes
+    -----
+    `solph.views.node()` scans all results for each node, the flow matrix is built once and the
+    results of each node are read with `get_node_results()`. The total and peak of all flows are
+    computed at once, so that they do not need to be computed for each asset.
+
+    Tested with:
+    - test_get_flow_matrix()
+    """
+    sequences = []
+    scalars = {}
+    index = None
+    for (source, target), result in results_main.items():
+        labels = (str(source), str(target))
+        result_sequences = result["sequences"]
+        if index is None:
+            index = result_sequences.index
+        elif not result_sequences.index.equals(index):
+            result_sequences = result_sequences.reindex(index)
+        for variable in result_sequences.columns:
+            sequences.append(((labels, variable), result_sequences[variable]))
+        for variable, value in result["scalars"].items():
+            scalars[(labels, variable)] = value
+
+    values = np.empty((len(index), len(sequences)), dtype=float, order="F")
+    nodes = {}
+    for column, (key, sequence) in enumerate(sequences):
+        values[:, column] = sequence.to_numpy(dtype=float)
+        for node in set(key[0]):
+            nodes.setdefault(node, ([], []))[0].append(column)
+    for key in scalars:
+        for node in set(key[0]):
+            nodes.setdefault(node, ([], []))[1].append(key)
+
+    columns = [key for key, _ in sequences]
+    # the results of each node are sorted as by solph.views.node()
+    nodes = {
+        node: (sorted(node_columns, key=lambda column: columns[column]), sorted(keys))
+        for node, (node_columns, keys) in nodes.items()
+    }
+    return {
+        FLOW_MATRIX_VALUES: values,
+        FLOW_MATRIX_COLUMNS: columns,
+        FLOW_MATRIX_INDEX: index,
+        FLOW_MATRIX_SCALARS: scalars,
+        FLOW_MATRIX_NODES: nodes,
+        FLOW_MATRIX_TOTALS: values.sum(axis=0),
+        FLOW_MATRIX_PEAKS: values.max(axis=0, initial=-np.inf),
+    }
+
+
+def get_node_results(flow_matrix, node):
+    r"""
+    Reads the results of a node from the flow matrix.
+
+    Parameters
+    ----------
+    flow_matrix: dict
+        Flow matrix of the oemof results, see `get_flow_matrix()`
+
+    node: str
+        Label of the node, eg. of a bus or a storage
+
+    Returns
+    -------
+    dict
+        'sequences': (dict) time series of the flows from and to the node (pd.Series), which are
+        views of the flow matrix and must not be modified in place
+        'scalars': (dict) scalar results of the flows from and to the node
+        TOTAL_FLOW: (dict) sum of each time series
+        PEAK_FLOW: (dict) maximum of each time series
+        The keys are the ones of `solph.views.node()`, eg. (('pv', 'Electricity'), 'flow').
+
+    Notes
+    -----
+    Tested with:
+    - test_get_node_results()
+    """
+    columns, keys = flow_matrix[FLOW_MATRIX_NODES].get(node, ([], []))
+    values = flow_matrix[FLOW_MATRIX_VALUES]
+    index = flow_matrix[FLOW_MATRIX_INDEX]
+    sequences = {}
+    totals = {}
+    peaks = {}
+    for column in columns:
+        key = flow_matrix[FLOW_MATRIX_COLUMNS][column]
+        sequences[key] = pd.Series(values[:, column], index=index, name=key, copy=False)
+        totals[key] = flow_matrix[FLOW_MATRIX_TOTALS][column]
+        peaks[key] = flow_matrix[FLOW_MATRIX_PEAKS][column]
+    scalars = {key: flow_matrix[FLOW_MATRIX_SCALARS][key] for key in keys}
+    return {
+        "sequences": sequences,
+        "scalars": scalars,
+        TOTAL_FLOW: totals,
+        PEAK_FLOW: peaks,
+    }
+
+
+def get_flow_statistics(bus, key):
+    r"""
+    Returns the total and the peak of a flow computed with the flow matrix.
+
+    Parameters
+    ----------
+    bus : dict
+        Results of a node, see `get_node_results()` (or `solph.views.node()`)
+
+    key : tuple
+        Key of the flow in the sequences of `bus`, eg. (('pv', 'Electricity'), 'flow')
+
+    Returns
+    -------
+    dict or None
+        Total (TOTAL_FLOW) and peak (PEAK_FLOW) of the flow, None if they were not computed
+        (eg. for results of `solph.views.node()`)
+    """
+    if TOTAL_FLOW not in bus or key not in bus[TOTAL_FLOW]:
+        return None
+    return {TOTAL_FLOW: bus[TOTAL_FLOW][key], PEAK_FLOW: bus[PEAK_FLOW][key]}
+
 
 def get_timeseries_per_bus(dict_values, bus_data):
     r"""
@@ -89,13 +244,19 @@ def get_timeseries_per_bus(dict_values, bus_data):
         1st level keys: bus names;
         2nd level keys:
 
-            'scalars': (pd.Series) (does not exist in all dicts)
-            'sequences': (pd.DataFrame) - contains flows between components and busses
+            'scalars': (pd.Series or dict) (does not exist in all dicts)
+            'sequences': (pd.DataFrame or dict of pd.Series) - contains flows between components and busses
+
+        as returned by `solph.views.node()` or `get_node_results()`
 
     Notes
     -----
+    The data frame of each bus is built from a single array of all its flows, the flows out of
+    the bus being negative.
+
     Tested with:
     - test_get_timeseries_per_bus_two_timeseries_for_directly_connected_storage()
+    - test_get_timeseries_per_bus_large_bus()
 
     Returns
     -------
@@ -105,45 +266,42 @@ def get_timeseries_per_bus(dict_values, bus_data):
     logging.debug(
         "Time series for plots and 'timeseries.xlsx' are added to `dict_values[OPTIMIZED_FLOWS]` in `E1.get_timeseries_per_bus`; check there in case of problems."
     )
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
     bus_data_timeseries = {}
     for bus in bus_data.keys():
-        bus_data_timeseries.update(
-            {bus: pd.DataFrame(index=dict_values[SIMULATION_SETTINGS][TIME_INDEX])}
-        )
-
-        # obtain flows that flow into the bus
+        sequences = bus_data[bus]["sequences"]
+        # obtain flows that flow into and out of the bus
         to_bus = {
             key[0][0]: key
-            for key in bus_data[bus]["sequences"].keys()
+            for key in sequences.keys()
             if key[0][1] == bus and key[1] == "flow"
         }
-        for asset in to_bus:
-            bus_data_timeseries[bus][asset] = bus_data[bus]["sequences"][to_bus[asset]]
-
-        # obtain flows that flow out of the bus
         from_bus = {
             key[0][1]: key
-            for key in bus_data[bus]["sequences"].keys()
+            for key in sequences.keys()
             if key[0][0] == bus and key[1] == "flow"
         }
-        for asset in from_bus:
-            try:
-                # if `asset` already exists add input/output power to column name
-                # (occurs for storages that are directly added to a bus)
-                bus_data_timeseries[bus][asset]
-                # asset is already in bus_data_timeseries[bus]. Therefore a renaming is necessary:
-                bus_data_timeseries[bus].rename(
-                    columns={asset: " ".join([asset, OUTPUT_POWER])}, inplace=True
-                )
-                # Now the "from_bus" ie. the charging/input power of the storage asset is added to the data set:
-                bus_data_timeseries[bus][" ".join([asset, INPUT_POWER])] = -bus_data[
-                    bus
-                ]["sequences"][from_bus[asset]]
-            except KeyError:
-                # The asset was not previously added to the `OPTIMIZED_FLOWS`, ie. is not a storage asset
-                bus_data_timeseries[bus][asset] = -bus_data[bus]["sequences"][
-                    from_bus[asset]
-                ]
+
+        # Assets with flows into and out of the bus are storages that are directly added to the
+        # bus, their output and input power are named after the asset
+        columns = [
+            (" ".join([asset, OUTPUT_POWER]) if asset in from_bus else asset, key, 1)
+            for asset, key in to_bus.items()
+        ] + [
+            (" ".join([asset, INPUT_POWER]) if asset in to_bus else asset, key, -1)
+            for asset, key in from_bus.items()
+        ]
+
+        # The flows are written into one array, which is the single block of the data frame
+        values = np.empty((len(time_index), len(columns)), order="F")
+        for column, (_, key, sign) in enumerate(columns):
+            flow = sequences[key]
+            if not flow.index.equals(time_index):
+                flow = flow.reindex(time_index)
+            np.multiply(flow.to_numpy(dtype=float), sign, out=values[:, column])
+        bus_data_timeseries[bus] = pd.DataFrame(
+            values, index=time_index, columns=[name for name, _, _ in columns]
+        )
 
     dict_values.update({OPTIMIZED_FLOWS: bus_data_timeseries})
 
@@ -171,20 +329,17 @@ def get_storage_results(settings, storage_bus, dict_asset):
     storage.
 
     """
-    power_charge = storage_bus["sequences"][
-        ((dict_asset[INFLOW_DIRECTION], dict_asset[LABEL]), "flow")
-    ]
-    add_info_flows(settings, dict_asset[INPUT_POWER], power_charge)
-
-    power_discharge = storage_bus["sequences"][
-        ((dict_asset[LABEL], dict_asset[OUTFLOW_DIRECTION]), "flow")
-    ]
-    add_info_flows(settings, dict_asset[OUTPUT_POWER], power_discharge)
-
-    capacity = storage_bus["sequences"][
-        ((dict_asset[LABEL], TYPE_NONE), "storage_content")
-    ]
-    add_info_flows(settings, dict_asset[STORAGE_CAPACITY], capacity)
+    for storage_item, key in [
+        (INPUT_POWER, ((dict_asset[INFLOW_DIRECTION], dict_asset[LABEL]), "flow")),
+        (OUTPUT_POWER, ((dict_asset[LABEL], dict_asset[OUTFLOW_DIRECTION]), "flow")),
+        (STORAGE_CAPACITY, ((dict_asset[LABEL], TYPE_NONE), "storage_content")),
+    ]:
+        add_info_flows(
+            settings,
+            dict_asset[storage_item],
+            storage_bus["sequences"][key],
+            flow_statistics=get_flow_statistics(storage_bus, key),
+        )
 
     if OPTIMIZE_CAP in dict_asset:
         if dict_asset[OPTIMIZE_CAP][VALUE] is True:
@@ -292,8 +447,10 @@ def get_results(settings, bus_data, dict_asset, asset_group):
         1st level keys: bus names;
         2nd level keys:
 
-            'scalars': (pd.Series) (does not exist in all dicts)
-            'sequences': (pd.DataFrame) - contains flows between components and busses
+            'scalars': (pd.Series or dict) (does not exist in all dicts)
+            'sequences': (pd.DataFrame or dict of pd.Series) - contains flows between components and busses
+
+        as returned by `solph.views.node()` or `get_node_results()`
 
     dict_asset : dict
         Contains information about the asset.
@@ -536,7 +693,12 @@ def get_flow(settings, bus, dict_asset, flow_tuple):
 
     """
     flow = bus["sequences"][(flow_tuple, "flow")]
-    add_info_flows(settings, dict_asset, flow)
+    add_info_flows(
+        settings,
+        dict_asset,
+        flow,
+        flow_statistics=get_flow_statistics(bus, (flow_tuple, "flow")),
+    )
 
     logging.debug(
         "Accessed simulated timeseries of asset %s (total sum: %s)",
@@ -545,7 +707,7 @@ def get_flow(settings, bus, dict_asset, flow_tuple):
     )
 
 
-def add_info_flows(settings, dict_asset, flow):
+def add_info_flows(settings, dict_asset, flow, flow_statistics=None):
     r"""
     Adds `flow` and total flow amongst other information to `dict_asset`.
 
@@ -559,6 +721,10 @@ def add_info_flows(settings, dict_asset, flow):
         Contains information about the asset `flow` belongs to.
     flow : pd.Series
         Time series of the flow.
+    flow_statistics : dict or None
+        Total (TOTAL_FLOW) and peak (PEAK_FLOW) of the flow if they were computed for all flows at
+        once, see `get_flow_statistics()`, otherwise they are computed from `flow`.
+        Default: None.
 
     Returns
     -------
@@ -567,7 +733,13 @@ def add_info_flows(settings, dict_asset, flow):
     the flow ('average_flow').
 
     """
-    total_flow = sum(flow)
+    if flow_statistics is None:
+        values = np.asarray(flow, dtype=float)
+        total_flow = values.sum()
+        peak_flow = values.max()
+    else:
+        total_flow = flow_statistics[TOTAL_FLOW]
+        peak_flow = flow_statistics[PEAK_FLOW]
     dict_asset.update(
         {
             FLOW: flow,
@@ -576,7 +748,7 @@ def add_info_flows(settings, dict_asset, flow):
                 VALUE: total_flow * 365 / settings[EVALUATED_PERIOD][VALUE],
                 UNIT: "kWh",
             },
-            PEAK_FLOW: {VALUE: max(flow), UNIT: "kW"},
+            PEAK_FLOW: {VALUE: peak_flow, UNIT: "kW"},
             AVERAGE_FLOW: {VALUE: total_flow / len(flow), UNIT: "kW"},
         }
     )
@@ -16,9 +16,13 @@ The module processes the simulation results regarding economic parameters:
 - calculate net present value
 - calculate levelised cost of energy
 - calculate levelised cost of energy carriers (electricity, H2, heat)
+
+The costs of all assets are calculated at once from a table of their economic parameters and a
+matrix of their flows, see `get_costs_of_assets()`.
 """
 
 import logging
+import numpy as np
 import pandas as pd
 import warnings
 
@@ -70,6 +74,18 @@ class MissingParametersForEconomicEvaluation(UserWarning):
     pass
 
 
+# Economic parameters of the assets in the asset table of `get_costs_of_assets()`
+ASSET_TABLE_PARAMETERS = [
+    OPTIMIZED_ADD_CAP,
+    SPECIFIC_COSTS,
+    DEVELOPMENT_COSTS,
+    SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
+    SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
+    INSTALLED_CAP,
+    LIFETIME_SPECIFIC_COST_OM,
+]
+
+
 def get_costs(dict_asset, economic_data):
     r"""
     Calculates economic KPI of the asset handed to the function
@@ -96,14 +112,160 @@ def get_costs(dict_asset, economic_data):
     - ANNUITY_TOTAL
     - ANNUITY_OM
 
+    Notes
+    -----
+    The costs are calculated with `get_costs_of_assets()`, which should be used to evaluate
+    several assets.
+
     Tested with:
     - test_all_cost_info_parameters_added_to_dict_asset()
     - Test_Economic_KPI.test_benchmark_Economic_KPI_C2_E2()
 
     """
+    get_costs_of_assets([dict_asset], economic_data)
+
+
+def get_costs_of_assets(assets, economic_data):
+    r"""
+    Calculates economic KPI of all assets handed to the function at once
 
-    logging.debug("Calculating costs of asset %s", dict_asset[LABEL])
+    Parameters
+    ----------
+    assets: list of dict
+        Assets to be evaluated, eg. the assets of the energy conversion, production and consumption
+        and the input power, output power and storage capacity of the storages.
+        Warning messages in place in case that an asset should not be evaluated.
+
+    economic_data: dict
+        Economic data of the project
 
+    Returns
+    -------
+    Updated assets with the KPI of `get_costs()`
+
+    Notes
+    -----
+    The economic parameters of the assets are gathered in one table (see `get_asset_table()`), so
+    that the costs of all assets are calculated with one operation per cost type. The dispatch
+    expenditures are calculated from the matrix of the flows of all assets, see
+    `calculate_dispatch_expenditures_of_assets()`.
+
+    Tested with:
+    - test_get_costs_of_assets()
+    - Test_Economic_KPI.test_benchmark_Economic_KPI_C2_E2()
+    """
+    for dict_asset in assets:
+        logging.debug("Calculating costs of asset %s", dict_asset[LABEL])
+        check_asset_for_costs(dict_asset)
+    if len(assets) == 0:
+        return
+
+    asset_table = get_asset_table(assets)
+
+    # Part of the investment costs to be paid upfront at t=0
+    costs_investment_upfront = calculate_costs_upfront_investment(
+        capacity=asset_table[OPTIMIZED_ADD_CAP],
+        specific_cost=asset_table[SPECIFIC_COSTS],
+        development_costs=asset_table[DEVELOPMENT_COSTS],
+    )
+
+    # Part of the investment costs to be paid due to replacements
+    costs_replacement = calculate_costs_replacement(
+        specific_replacement_of_initial_capacity=asset_table[
+            SPECIFIC_REPLACEMENT_COSTS_INSTALLED
+        ],
+        specific_replacement_of_optimized_capacity=asset_table[
+            SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED
+        ],
+        initial_capacity=asset_table[INSTALLED_CAP],
+        optimized_capacity=asset_table[OPTIMIZED_ADD_CAP],
+    )
+
+    # Total investment costs including investments into the asset, replacement costs and development costs
+    costs_investment_lifetime = calculate_total_capital_costs(
+        upfront=costs_investment_upfront, replacement=costs_replacement,
+    )
+
+    # Operation and management expenditures over the project lifetime
+    operation_and_management_expenditures = calculate_operation_and_management_expenditures(
+        specific_om_cost=asset_table[LIFETIME_SPECIFIC_COST_OM],
+        installed_capacity=asset_table[INSTALLED_CAP],
+        optimized_add_capacity=asset_table[OPTIMIZED_ADD_CAP],
+    )
+
+    # Dispatch expenditures of the assets over the project lifetime
+    costs_dispatch = calculate_dispatch_expenditures_of_assets(assets)
+
+    # Total operational expenditures over the lifetime
+    total_operational_expenditures = calculate_total_operational_expenditures(
+        operation_and_management_expenditures, costs_dispatch
+    )
+
+    # Total costs of the assets, capital and operational
+    total_asset_costs_over_lifetime = calculate_total_asset_costs_over_lifetime(
+        costs_investment_lifetime, total_operational_expenditures
+    )
+
+    costs = pd.DataFrame(
+        {
+            COST_UPFRONT: costs_investment_upfront,
+            COST_REPLACEMENT: costs_replacement,
+            COST_INVESTMENT: costs_investment_lifetime,
+            COST_OM: operation_and_management_expenditures,
+            COST_DISPATCH: costs_dispatch,
+            COST_OPERATIONAL_TOTAL: total_operational_expenditures,
+            COST_TOTAL: total_asset_costs_over_lifetime,
+            ANNUITY_TOTAL: total_asset_costs_over_lifetime * economic_data[CRF][VALUE],
+            ANNUITY_OM: total_operational_expenditures * economic_data[CRF][VALUE],
+        }
+    )
+
+    # The costs are written back into the asset dictionaries
+    for dict_asset, asset_costs in zip(assets, costs.to_dict(orient="records")):
+        for cost in [
+            COST_UPFRONT,
+            COST_REPLACEMENT,
+            COST_INVESTMENT,
+            COST_OM,
+            COST_DISPATCH,
+            COST_TOTAL,
+        ]:
+            dict_asset.update(
+                {cost: {VALUE: asset_costs[cost], UNIT: economic_data[CURR]}}
+            )
+        dict_asset.update(
+            {
+                COST_OPERATIONAL_TOTAL: {VALUE: asset_costs[COST_OPERATIONAL_TOTAL]},
+                ANNUITY_TOTAL: {
+                    VALUE: asset_costs[ANNUITY_TOTAL],
+                    UNIT: CURR + "/" + UNIT_YEAR,
+                },
+                ANNUITY_OM: {
+                    VALUE: asset_costs[ANNUITY_OM],
+                    UNIT: CURR + "/" + UNIT_YEAR,
+                },
+            }
+        )
+
+
+def check_asset_for_costs(dict_asset):
+    r"""
+    Checks that an asset can be evaluated by `get_costs_of_assets()`
+
+    Parameters
+    ----------
+    dict_asset: dict
+        Asset to be evaluated
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Raises MissingParametersForEconomicEvaluation if a parameter needed for the economic evaluation
+    is missing, see `all_list_in_dict()`.
+    """
     # helper for developing get_costs() and E modules
     if not isinstance(dict_asset, dict):
         logging.warning(
@@ -129,101 +291,123 @@ def get_costs(dict_asset, economic_data):
         ],
     )
 
-    # Part of the investment costs to be paid upfront at t=0
-    costs_investment_upfront = calculate_costs_upfront_investment(
-        capacity=dict_asset[OPTIMIZED_ADD_CAP][VALUE],
-        specific_cost=dict_asset[SPECIFIC_COSTS][VALUE],
-        development_costs=dict_asset[DEVELOPMENT_COSTS][VALUE],
-    )
 
-    dict_asset.update(
-        {COST_UPFRONT: {VALUE: costs_investment_upfront, UNIT: economic_data[CURR]}}
-    )
+def get_asset_table(assets):
+    r"""
+    Gathers the economic parameters of the assets in a table
 
-    # Part of the investment costs to be paid due to replacements
-    costs_replacement = calculate_costs_replacement(
-        specific_replacement_of_initial_capacity=dict_asset[
-            SPECIFIC_REPLACEMENT_COSTS_INSTALLED
-        ][VALUE],
-        specific_replacement_of_optimized_capacity=dict_asset[
-            SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED
-        ][VALUE],
-        initial_capacity=dict_asset[INSTALLED_CAP][VALUE],
-        optimized_capacity=dict_asset[OPTIMIZED_ADD_CAP][VALUE],
-    )
+    Parameters
+    ----------
+    assets: list of dict
+        Assets to be evaluated
 
-    dict_asset.update(
-        {COST_REPLACEMENT: {VALUE: costs_replacement, UNIT: economic_data[CURR]}}
-    )
+    Returns
+    -------
+    asset_table: :pandas:`pandas.DataFrame<frame>`
+        Value of each parameter of ASSET_TABLE_PARAMETERS (columns) of each asset (rows)
 
-    # Total investment costs including investments into the asset, replacement costs and development costs
-    costs_investment_lifetime = calculate_total_capital_costs(
-        upfront=dict_asset[COST_UPFRONT][VALUE],
-        replacement=dict_asset[COST_REPLACEMENT][VALUE],
+    Notes
+    -----
+    Tested with:
+    - test_get_costs_of_assets()
+    """
+    return pd.DataFrame(
+        {
+            parameter: [dict_asset[parameter][VALUE] for dict_asset in assets]
+            for parameter in ASSET_TABLE_PARAMETERS
+        },
+        dtype=float,
     )
 
-    dict_asset.update(
-        {COST_INVESTMENT: {VALUE: costs_investment_lifetime, UNIT: economic_data[CURR]}}
-    )
 
-    # Operation and management expenditures over the project lifetime
-    operation_and_management_expenditures = calculate_operation_and_management_expenditures(
-        specific_om_cost=dict_asset[LIFETIME_SPECIFIC_COST_OM][VALUE],
-        installed_capacity=dict_asset[INSTALLED_CAP][VALUE],
-        optimized_add_capacity=dict_asset[OPTIMIZED_ADD_CAP][VALUE],
-    )
-    dict_asset.update(
-        {
-            COST_OM: {
-                VALUE: operation_and_management_expenditures,
-                UNIT: economic_data[CURR],
-            }
-        }
-    )
+def calculate_dispatch_expenditures_of_assets(assets):
+    r"""
+    Calculate the expenditures connected to the assets due to their dispatch
 
-    # Dispatch expenditures of the asset over the project lifetime
-    costs_dispatch = calculate_dispatch_expenditures(
-        dispatch_price=dict_asset[LIFETIME_PRICE_DISPATCH][VALUE],
-        flow=dict_asset[FLOW],
-        asset=dict_asset[LABEL],
-    )
+    Parameters
+    ----------
+    assets: list of dict
+        Assets to be evaluated, with their flows (FLOW) and dispatch prices
+        (LIFETIME_PRICE_DISPATCH, see `calculate_dispatch_expenditures()`)
 
-    dict_asset.update(
-        {COST_DISPATCH: {VALUE: costs_dispatch, UNIT: economic_data[CURR]}}
-    )
+    Returns
+    -------
+    dispatch_expenditures: :numpy:`numpy.ndarray`
+        Total dispatch expenditures of each asset
 
-    # Total operational expenditures over the lifetime
-    total_operational_expenditures = calculate_total_operational_expenditures(
-        dict_asset[COST_OM][VALUE], dict_asset[COST_DISPATCH][VALUE]
-    )
-    dict_asset.update({COST_OPERATIONAL_TOTAL: {VALUE: total_operational_expenditures}})
+    Notes
+    -----
+    The flows of the assets are stacked in one matrix (timesteps x assets). The scalar dispatch
+    prices of each asset are summed up and multiplied with the total flows, the dispatch prices
+    defined as time series are multiplied with the flows of their assets at once.
 
-    # Total costs of the assets, capital and operational
-    total_asset_costs_over_lifetime = calculate_total_asset_costs_over_lifetime(
-        dict_asset[COST_INVESTMENT][VALUE], dict_asset[COST_OPERATIONAL_TOTAL][VALUE]
-    )
-    dict_asset.update(
-        {
-            COST_TOTAL: {
-                VALUE: total_asset_costs_over_lifetime,
-                UNIT: economic_data[CURR],
-            }
-        }
+    Tested with:
+    - test_calculate_dispatch_expenditures_of_assets()
+    """
+    flows = np.column_stack(
+        [np.asarray(dict_asset[FLOW], dtype=float) for dict_asset in assets]
     )
+    scalar_prices = np.zeros(len(assets))
+    timeseries_prices = []
+    for position, dict_asset in enumerate(assets):
+        for price in get_dispatch_prices(
+            dict_asset[LIFETIME_PRICE_DISPATCH][VALUE], dict_asset[LABEL]
+        ):
+            if isinstance(price, pd.Series):
+                if isinstance(dict_asset[FLOW], pd.Series):
+                    # The price is aligned to the time index of the flow
+                    price = price.reindex(dict_asset[FLOW].index)
+                # Undefined prices do not add to the dispatch expenditures, as with pd.Series.sum()
+                timeseries_prices.append(
+                    (position, np.nan_to_num(np.asarray(price, dtype=float)))
+                )
+            else:
+                scalar_prices[position] += price
+
+    dispatch_expenditures = scalar_prices * flows.sum(axis=0)
+    if len(timeseries_prices) > 0:
+        positions = [position for position, _ in timeseries_prices]
+        prices = np.column_stack([price for _, price in timeseries_prices])
+        np.add.at(
+            dispatch_expenditures,
+            positions,
+            np.einsum("tk,tk->k", prices, flows[:, positions]),
+        )
+    return dispatch_expenditures
 
-    dict_asset.update(
-        {
-            ANNUITY_TOTAL: {
-                VALUE: dict_asset[COST_TOTAL][VALUE] * economic_data[CRF][VALUE],
-                UNIT: CURR + "/" + UNIT_YEAR,
-            },
-            ANNUITY_OM: {
-                VALUE: dict_asset[COST_OPERATIONAL_TOTAL][VALUE]
-                * economic_data[CRF][VALUE],
-                UNIT: CURR + "/" + UNIT_YEAR,
-            },
-        }
-    )
+
+def get_dispatch_prices(dispatch_price, asset):
+    r"""
+    Lists the dispatch prices of an asset
+
+    Parameters
+    ----------
+    dispatch_price: float, int, pd.Series or list
+        Dispatch price of an asset, a list if the asset has multiple flows
+        Raises error if type does not match
+
+    asset: str
+        Label of the asset
+
+    Returns
+    -------
+    list of float, int or pd.Series
+        Scalar dispatch prices and dispatch prices defined as time series of the asset
+    """
+    if isinstance(dispatch_price, float) or isinstance(dispatch_price, int):
+        return [dispatch_price]
+    elif isinstance(dispatch_price, pd.Series):
+        return [dispatch_price]
+    elif isinstance(dispatch_price, list):
+        prices = []
+        for list_price in dispatch_price:
+            prices.extend(get_dispatch_prices(list_price, asset + " (list entry)"))
+        return prices
+    else:
+        raise TypeError(
+            f"The dispatch price of asset {asset} is neither float, list nor pd.Series but {type(dispatch_price)}."
+            f"Please adapt E2.calculate_dispatch_costs() to evaluate the dispatch_expenditures of the asset."
+        )
 
 
 def calculate_total_asset_costs_over_lifetime(
@@ -16,6 +16,7 @@ import logging
 
 from multi_vector_simulator.utils.constants import DEFAULT_WEIGHTS_ENERGY_CARRIERS
 from multi_vector_simulator.utils.constants import PROJECT_DATA
+from multi_vector_simulator.utils.asset_registry import get_asset_registry
 from multi_vector_simulator.utils.constants_json_strings import (
     VALUE,
     LABEL,
@@ -147,11 +148,9 @@ def total_demand_and_excess_each_sector(dict_values):
         total_excess_dict.update({sector: 0})
 
     # determine all dso feedin sinks that should not be evaluated for the total demand
-    dso_feedin_sinks = []
-    for dso in dict_values[ENERGY_PROVIDERS]:
-        dso_feedin_sinks.append(
-            dict_values[ENERGY_PROVIDERS][dso][CONNECTED_FEEDIN_SINK]
-        )
+    dso_feedin_sinks = set(
+        get_asset_registry(dict_values).energy_provider_feedin_sinks.values()
+    )
 
     # Loop though energy consumption assets to determine those that are demand
     for consumption_asset in dict_values[ENERGY_CONSUMPTION]:
@@ -313,12 +312,13 @@ def add_total_renewable_and_non_renewable_energy_origin(dict_values):
     )
 
     # Aggregate the total use of non renewable and renewable energy at DSO level
-    for dso in dict_values[ENERGY_PROVIDERS]:
+    # Get source connected to the specific DSO in question
+    dso_consumption_sources = get_asset_registry(
+        dict_values
+    ).energy_provider_consumption_sources
+    for dso, DSO_source_name in dso_consumption_sources.items():
         sector = dict_values[ENERGY_PROVIDERS][dso][ENERGY_VECTOR]
 
-        # Get source connected to the specific DSO in question
-        DSO_source_name = dso + DSO_CONSUMPTION
-
         # Add renewable share of energy consumption from DSO to the renewable origin (total)
         renewable_origin[sector] += (
             dict_values[ENERGY_PRODUCTION][DSO_source_name][TOTAL_FLOW][VALUE]
@@ -690,10 +690,10 @@ def add_total_feedin_electricity_equivalent(dict_values):
     """
 
     total_feedin_dict = {}
-    # Get source connected to the specific DSO in question
-    for dso in dict_values[ENERGY_PROVIDERS]:
+    # Get sink connected to the specific DSO in question
+    dso_feedin_sinks = get_asset_registry(dict_values).energy_provider_feedin_sinks
+    for feedin_sink in dso_feedin_sinks.values():
         # load total flow into the dso sink
-        feedin_sink = str(dso + DSO_FEEDIN + AUTO_SINK)
         energy_carrier = dict_values[ENERGY_CONSUMPTION][feedin_sink][ENERGY_VECTOR]
         total_feedin_dict.update({energy_carrier: {}})
         total_feedin_dict.update(
@@ -735,9 +735,11 @@ def add_total_consumption_from_provider_electricity_equivalent(dict_values):
 
     total_consumption_dict = {}
     # Get source connected to the specific DSO in question
-    for dso in dict_values[ENERGY_PROVIDERS]:
-        # load total flow into the dso sink
-        consumption_source = str(dso + DSO_CONSUMPTION)
+    dso_consumption_sources = get_asset_registry(
+        dict_values
+    ).energy_provider_consumption_sources
+    for consumption_source in dso_consumption_sources.values():
+        # load total flow from the dso source
         energy_carrier = dict_values[ENERGY_PRODUCTION][consumption_source][
             ENERGY_VECTOR
         ]
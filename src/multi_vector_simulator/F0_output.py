@@ -11,6 +11,7 @@ The model F0 output defines all functions that store evaluation results to file.
 - Store scalars/KPI to excel
 - Process dictionary so that it can be stored to Json
 - Store dictionary to Json
+- Store pre-processed dictionary to Json, with a checksum to resume a simulation from it
 """
 
 
@@ -20,9 +21,13 @@ import os
 
 import pandas as pd
 
-from multi_vector_simulator.B0_data_input_json import convert_from_special_types_to_json
+from multi_vector_simulator.B0_data_input_json import (
+    convert_from_special_types_to_json,
+    compute_processed_json_checksum,
+)
 from multi_vector_simulator.E1_process_results import get_units_of_cost_matrix_entries
 import multi_vector_simulator.F1_plotting as F1_plots
+from multi_vector_simulator.utils.simulation_log import get_log_messages
 
 try:
     import multi_vector_simulator.F2_autoreport as autoreport
@@ -41,6 +46,7 @@ from multi_vector_simulator.utils.constants import (
 )
 
 from multi_vector_simulator.utils.constants import (
+    JSON_PROCESSED,
     JSON_WITH_RESULTS,
     JSON_FILE_EXTENSION,
 )
@@ -62,10 +68,13 @@ from multi_vector_simulator.utils.constants_json_strings import (
     WARNINGS,
     FIX_COST,
     ENERGY_BUSSES,
+    PROCESSED_JSON_CHECKSUM,
 )
 
 
-def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
+def evaluate_dict(
+    dict_values, path_pdf_report=None, path_png_figs=None, log_records=None
+):
     """This is the main function of F0. It calls all functions that prepare the simulation output, ie. Storing all simulation output into excellent files, bar charts, and graphs.
 
     Parameters
@@ -79,6 +88,9 @@ def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
     path_png_figs : (str)
         if provided, generate png figures of the simulation's results to the given path
 
+    log_records : (list)
+        if provided, log records of the simulation kept in memory, which are used instead of the log file
+
     Returns
     -------
     type
@@ -95,6 +107,7 @@ def evaluate_dict(dict_values, path_pdf_report=None, path_png_figs=None):
             dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER], LOGFILE
         ),
         dict_values=dict_values,
+        log_records=log_records,
     )
 
     # storing all flows to exel.
@@ -214,7 +227,7 @@ def store_timeseries_all_busses_to_excel(dict_values):
     logging.debug("Saved flows at busses to: %s.", timeseries_output_file)
 
 
-def parse_simulation_log(path_log_file, dict_values):
+def parse_simulation_log(path_log_file, dict_values, log_records=None):
     """Gather a log file with several log messages, this function gathers them all and inputs them into the dict with
     all input and output parameters up to F0
 
@@ -227,6 +240,11 @@ def parse_simulation_log(path_log_file, dict_values):
     dict_values :
         dict Of all input and output parameters up to F0
 
+    log_records: list/None
+        log records of the simulation kept in memory (see `utils.simulation_log.simulation_log()`),
+        if provided they are used instead of the log file
+        Default: None
+
     Returns
     -------
     Updates the results dictionary with the log messages of the simulation
@@ -234,32 +252,38 @@ def parse_simulation_log(path_log_file, dict_values):
     """
     # Dictionaries to gather non-fatal warning and error messages that appear during the simulation
 
-    error_dict, warning_dict = {}, {}
+    if log_records is not None:
+        log_dict = get_log_messages(log_records)
+    else:
+        error_dict, warning_dict = {}, {}
 
-    if path_log_file is None:
-        path_log_file = os.path.join(OUTPUT_FOLDER, LOGFILE)
+        if path_log_file is None:
+            path_log_file = os.path.join(OUTPUT_FOLDER, LOGFILE)
 
-    with open(path_log_file) as log_messages:
-        log_messages = log_messages.readlines()
+        with open(path_log_file) as log_messages:
+            log_messages = log_messages.readlines()
 
-    i = j = 0
+        i = j = 0
 
-    # Loop through the list of lines of the log file to check for the relevant log messages and gather them in dicts
-    for line in log_messages:
-        if "ERROR" in line:
-            i = i + 1
-            substrings = line.split(" - ")
-            message_string = substrings[-1]
-            error_dict.update({i: message_string})
-        elif "WARNING" in line:
-            j = j + 1
-            substrings = line.split(" - ")
-            message_string = substrings[-1]
-            warning_dict.update({j: message_string})
+        # Loop through the list of lines of the log file to check for the relevant log messages and gather them in dicts
+        for line in log_messages:
+            if "ERROR" in line:
+                i = i + 1
+                substrings = line.split(" - ")
+                message_string = substrings[-1]
+                error_dict.update({i: message_string})
+            elif "WARNING" in line:
+                j = j + 1
+                substrings = line.split(" - ")
+                message_string = substrings[-1]
+                warning_dict.update({j: message_string})
 
-    log_dict = {ERRORS: error_dict, WARNINGS: warning_dict}
+        log_dict = {ERRORS: error_dict, WARNINGS: warning_dict}
 
-    dict_values.update({SIMULATION_RESULTS: {LOGS: log_dict}})
+    if SIMULATION_RESULTS in dict_values:
+        dict_values[SIMULATION_RESULTS].update({LOGS: log_dict})
+    else:
+        dict_values.update({SIMULATION_RESULTS: {LOGS: log_dict}})
 
 
 def store_as_json(dict_values, output_folder=None, file_name=None):
@@ -306,3 +330,31 @@ def store_as_json(dict_values, output_folder=None, file_name=None):
         answer = json_data
 
     return answer
+
+
+def store_processed_json(dict_values, output_folder):
+    """Stores the pre-processed dict_values as JSON_PROCESSED, with a checksum of the MVS version and the content
+
+    A simulation can be resumed from this file without pre-processing, see B0.load_processed_json().
+
+    Parameters
+    ----------
+    dict_values : (dict)
+        All simulation parameters, after the pre-processing in C0
+    output_folder : (path)
+        Folder into which the json file should be stored
+
+    Returns
+    -------
+    The path to the stored json file, None if the output_folder does not exist
+
+    Notes
+    -----
+    Tested with:
+    - B0.test_load_processed_json()
+    """
+    json_dict = json.loads(store_as_json(dict_values))
+    json_dict.update(
+        {PROCESSED_JSON_CHECKSUM: compute_processed_json_checksum(json_dict)}
+    )
+    return store_as_json(json_dict, output_folder, JSON_PROCESSED)
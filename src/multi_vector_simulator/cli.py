@@ -15,6 +15,7 @@ Tool structure:
 (child)     --D0_modelling_and_optimization.py
 (child sub)    --D1_model_components.py
 (child sub)    --D2_model_constraints.py
+(child sub)    --D11_raw_results.py
 
 (child)     --F0_output.py
 (child sub)    --E1_process_results.py
@@ -35,6 +36,7 @@ import multi_vector_simulator.A1_csv_to_json as load_data_from_csv
 import multi_vector_simulator.B0_data_input_json as data_input
 import multi_vector_simulator.C0_data_processing as data_processing
 import multi_vector_simulator.D0_modelling_and_optimization as modelling
+import multi_vector_simulator.D11_raw_results as raw_results
 import multi_vector_simulator.E0_evaluation as evaluation
 import multi_vector_simulator.F0_output as output_processing
 
@@ -52,6 +54,7 @@ except ModuleNotFoundError:
 from multi_vector_simulator.version import version_num, version_date
 
 from multi_vector_simulator.utils import copy_inputs_template
+from multi_vector_simulator.utils.simulation_log import simulation_log
 
 from multi_vector_simulator.utils.constants import (
     REPO_PATH,
@@ -69,12 +72,18 @@ from multi_vector_simulator.utils.constants import (
     ARG_PATH_SIM_OUTPUT,
     ARG_DEBUG_REPORT,
     SIMULATION_SETTINGS,
-    JSON_PROCESSED,
+    DISPLAY_OUTPUT,
+    LOGFILE,
+    FROM_PROCESSED,
+    RAW_RESULTS,
+    STORE_RAW_RESULTS,
     JSON_FILE_EXTENSION,
+    SOLVER_ARGUMENTS,
+    VALUE,
 )
 
 
-def main(**kwargs):
+def main(reevaluation=False, **kwargs):
     r"""
     Starts MVS tool simulations.
 
@@ -104,6 +113,43 @@ def main(**kwargs):
     lp_file_output : bool, optional
         Specifies whether linear equation system generated is saved as lp file.
         Default: False.
+    from_processed : str, optional
+        The path to the processed json file (`json_input_processed.json`) of a previous
+        simulation, or to the folder containing it. The simulation is resumed from this file:
+        the input files are not read and pre-processed again (B0, C0), which is useful if only the
+        solver or output options change. The file has to be stored by the same MVS version.
+        Default: None.
+    raw_results : str, optional
+        The path to the raw results file (`raw_results.npz`) of a previous simulation, or to the
+        folder containing it. The simulation is re-evaluated from these results with the
+        (modified) inputs: the optimization model is not built and solved again (D0), see
+        `reevaluate()`.
+        Default: None.
+    store_raw_results : bool, optional
+        If True, the raw results of the optimization are stored in the output folder
+        (`raw_results.npz`), so that the simulation can be re-evaluated with `reevaluate()`.
+        Default: the simulation setting `store_raw_results`, False if not defined.
+    solver : str, optional
+        The solver used for the optimization, any solver pyomo can find locally.
+        Default: the solver of the simulation settings, or 'cbc' if not defined.
+    solver_threads : int, optional
+        Number of threads used by the solver.
+    solver_time_limit : float, optional
+        Time limit of the solver in seconds.
+    solver_mip_gap : float, optional
+        Relative MIP gap at which the solver stops. Default: 0.03.
+    solver_presolve : bool, optional
+        Turn the presolve of the solver on (True) or off (False).
+    solver_method : str, optional
+        Method used by the solver to solve the linear problems.
+        Options: "simplex", "barrier".
+    solver_interface : str, optional
+        Interface used to pass the model to the solver. The direct and persistent interfaces
+        avoid writing an lp file, if they are not available for the solver the shell interface
+        is used. Options: "shell", "direct", "persistent". Default: "shell".
+
+    The solver options which are provided overwrite the ones of the simulation settings,
+    otherwise the defaults of the solver are used.
 
     """
 
@@ -122,42 +168,92 @@ def main(**kwargs):
 
     logging.debug("Accessing script: A0_initialization")
 
-    user_input = initializing.process_user_arguments(
-        welcome_text=welcome_text, **kwargs
-    )
+    user_input = initializing.process_user_arguments(**kwargs)
+    if reevaluation is True and user_input[RAW_RESULTS] is None:
+        raise FileNotFoundError(
+            "The raw results of a previous simulation are needed to re-evaluate it, please "
+            "provide the path to them with option --raw-results."
+        )
+
+    # The log messages of the simulation are stored in the output folder and kept in memory for F0
+    with simulation_log(
+        path_log_file=os.path.join(user_input[PATH_OUTPUT_FOLDER], LOGFILE),
+        screen_level=initializing.get_screen_level(user_input[DISPLAY_OUTPUT]),
+    ) as log_handler:
+        logging.info(welcome_text)
+        run_simulation_steps(user_input, log_handler)
+    return 1
+
+
+def run_simulation_steps(user_input, log_handler):
+    r"""
+    Runs the simulation steps B0 to F0 of `main()`
+
+    Parameters
+    ----------
+    user_input: dict
+        Output of `A0.process_user_arguments()`
+
+    log_handler: :class:`utils.simulation_log.LogCaptureHandler`
+        Handler keeping the warning and error messages of the simulation in memory
 
+    Returns
+    -------
+    None
+    """
     # Read all inputs
     #    print("")
     #    # todo: is user input completely used?
     #    dict_values = data_input.load_json(user_input[PATH_INPUT_FILE ])
 
-    move_copy_config_file = False
+    if user_input[FROM_PROCESSED] is True:
+        logging.debug("Accessing script: B0_data_input_json")
+        dict_values = data_input.load_processed_json(
+            user_input[PATH_INPUT_FILE],
+            path_output_folder=user_input[PATH_OUTPUT_FOLDER],
+        )
 
-    if user_input[INPUT_TYPE] == CSV_EXT:
-        logging.debug("Accessing script: A1_csv_to_json")
-        move_copy_config_file = True
-        load_data_from_csv.create_input_json(
-            input_directory=os.path.join(user_input[PATH_INPUT_FOLDER], CSV_ELEMENTS)
+    else:
+        move_copy_config_file = False
+
+        if user_input[INPUT_TYPE] == CSV_EXT:
+            logging.debug("Accessing script: A1_csv_to_json")
+            move_copy_config_file = True
+            load_data_from_csv.create_input_json(
+                input_directory=os.path.join(
+                    user_input[PATH_INPUT_FOLDER], CSV_ELEMENTS
+                )
+            )
+
+        logging.debug("Accessing script: B0_data_input_json")
+        dict_values = data_input.load_json(
+            user_input[PATH_INPUT_FILE],
+            path_input_folder=user_input[PATH_INPUT_FOLDER],
+            path_output_folder=user_input[PATH_OUTPUT_FOLDER],
+            move_copy=move_copy_config_file,
+            set_default_values=True,
         )
 
-    logging.debug("Accessing script: B0_data_input_json")
-    dict_values = data_input.load_json(
-        user_input[PATH_INPUT_FILE],
-        path_input_folder=user_input[PATH_INPUT_FOLDER],
-        path_output_folder=user_input[PATH_OUTPUT_FOLDER],
-        move_copy=move_copy_config_file,
-        set_default_values=True,
-    )
+        print("")
+        logging.debug("Accessing script: C0_data_processing")
+        data_processing.all(dict_values)
 
-    print("")
-    logging.debug("Accessing script: C0_data_processing")
-    data_processing.all(dict_values)
+    output_processing.store_processed_json(
+        dict_values, dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER],
+    )
 
-    output_processing.store_as_json(
-        dict_values,
-        dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER],
-        JSON_PROCESSED,
+    # The solver settings provided by the user overwrite the ones of the input files
+    dict_values[SIMULATION_SETTINGS].update(
+        {
+            setting: {VALUE: user_input[setting]}
+            for setting in SOLVER_ARGUMENTS
+            if user_input[setting] is not None
+        }
     )
+    if user_input[STORE_RAW_RESULTS] is not None:
+        dict_values[SIMULATION_SETTINGS].update(
+            {STORE_RAW_RESULTS: {VALUE: user_input[STORE_RAW_RESULTS]}}
+        )
 
     if "path_pdf_report" in user_input or "path_png_figs" in user_input:
         save_energy_system_graph = True
@@ -165,10 +261,16 @@ def main(**kwargs):
         save_energy_system_graph = False
 
     print("")
-    logging.debug("Accessing script: D0_modelling_and_optimization")
-    results_meta, results_main = modelling.run_oemof(
-        dict_values, save_energy_system_graph=save_energy_system_graph,
-    )
+    if user_input[RAW_RESULTS] is None:
+        logging.debug("Accessing script: D0_modelling_and_optimization")
+        results_meta, results_main = modelling.run_oemof(
+            dict_values, save_energy_system_graph=save_energy_system_graph,
+        )
+    else:
+        logging.debug("Accessing script: D11_raw_results")
+        results_meta, results_main = raw_results.load_raw_results(
+            dict_values, user_input[RAW_RESULTS]
+        )
 
     print("")
     logging.debug("Accessing script: E0_evaluation")
@@ -179,8 +281,36 @@ def main(**kwargs):
         dict_values,
         path_pdf_report=user_input.get("path_pdf_report", None),
         path_png_figs=user_input.get("path_png_figs", None),
+        log_records=log_handler.records,
     )
-    return 1
+
+
+def reevaluate(**kwargs):
+    r"""
+    Re-evaluates a MVS simulation from its raw results with modified inputs
+
+    Command line use:
+
+    .. code-block:: bash
+
+        mvs_reevaluate --raw-results <path_to_previous_output_folder> -i <path_to_input_folder> -o <path_to_output_folder>
+
+    The evaluation (E0 to F0) of the previous simulation is run again with the inputs, eg. with
+    other emission factors, renewable shares or weights of the energy carriers, without building
+    and solving the optimization model. Only parameters which are not part of the optimization
+    problem should be modified, the optimized capacities and dispatch are the ones of the previous
+    simulation.
+
+    Other Parameters
+    ----------------
+    raw_results : str
+        The path to the raw results file (`raw_results.npz`) stored by the previous simulation,
+        or to the folder containing it.
+
+    The other parameters are the ones of `main()`.
+
+    """
+    return main(reevaluation=True, **kwargs)
 
 
 def report(pdf=None, path_simulation_output_json=None, path_pdf_report=None):
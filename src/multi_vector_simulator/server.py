@@ -33,6 +33,7 @@ child:      Child file, one of the main functions of the tool.
 child-sub:  Sub-child function, feeds only back to child functions
 """
 
+import copy
 import logging
 import json
 
@@ -40,10 +41,17 @@ import json
 import multi_vector_simulator.B0_data_input_json as data_input
 import multi_vector_simulator.C0_data_processing as data_processing
 import multi_vector_simulator.D0_modelling_and_optimization as modelling
+import multi_vector_simulator.D11_raw_results as raw_results
 import multi_vector_simulator.E0_evaluation as evaluation
 import multi_vector_simulator.F0_output as output_processing
 from multi_vector_simulator.version import version_num, version_date
 from multi_vector_simulator.utils import data_parser
+from multi_vector_simulator.utils.simulation_log import simulation_log
+
+# Keys of the pre-processed input and of the fingerprints of its raw input in the
+# processed_input_cache of run_simulation()
+PROCESSED_INPUT = "processed_input"
+PREPROCESSING_FINGERPRINTS = "preprocessing_fingerprints"
 
 
 def run_simulation(json_dict, epa_format=True, **kwargs):
@@ -69,6 +77,23 @@ def run_simulation(json_dict, epa_format=True, **kwargs):
      lp_file_output : bool, optional
          Specifies whether linear equation system generated is saved as lp file.
          Default: False.
+     processed_input_cache : dict, optional
+         Cache of the pre-processed input, shared between consecutive simulations (eg. of a
+         parameter sweep). If it holds the pre-processed input of a previous simulation, only the
+         assets whose input changed are pre-processed again (C0.all_incremental()). The cache is
+         updated with the pre-processed input of this simulation and the fingerprints of its raw
+         input, which are not part of dict_values and thus not stored in the outputs.
+         Default: None.
+     from_processed : bool, optional
+         Specifies whether json_dict is the content of a processed json file
+         (`json_input_processed.json`) stored by a previous simulation. The simulation is then
+         resumed from it without pre-processing. The file has to be stored by the same MVS version.
+         Default: False.
+     raw_results : str, optional
+         Path to the raw results file of a previous simulation of the same energy system (see
+         D11_raw_results). The simulation is re-evaluated from these results without building and
+         solving the optimization model.
+         Default: None.
 
     """
 
@@ -85,22 +110,65 @@ def run_simulation(json_dict, epa_format=True, **kwargs):
         + "\n Contributors: Martha M. Hoffmann \n \n "
     )
 
-    logging.info(welcome_text)
-
-    logging.debug("Accessing script: B0_data_input_json")
-    dict_values = data_input.convert_from_json_to_special_types(json_dict)
-
-    print("")
-    logging.debug("Accessing script: C0_data_processing")
-    data_processing.all(dict_values)
-
-    print("")
-    logging.debug("Accessing script: D0_modelling_and_optimization")
-    results_meta, results_main = modelling.run_oemof(dict_values)
-
-    print("")
-    logging.debug("Accessing script: E0_evaluation")
-    evaluation.evaluate_dict(dict_values, results_main, results_meta)
+    # The warning and error messages of this simulation are kept in memory, independently of
+    # simulations running concurrently in other threads
+    with simulation_log() as log_handler:
+        logging.info(welcome_text)
+
+        if kwargs.get("from_processed", False) is True:
+            logging.debug("Accessing script: B0_data_input_json")
+            dict_values = data_input.convert_processed_json_to_dict_values(json_dict)
+            logging.info("The simulation is resumed from the processed json file.")
+        else:
+            logging.debug("Accessing script: B0_data_input_json")
+            dict_values = data_input.convert_from_json_to_special_types(json_dict)
+
+            print("")
+            logging.debug("Accessing script: C0_data_processing")
+            processed_input_cache = kwargs.get("processed_input_cache", None)
+            if processed_input_cache is not None:
+                # C0 modifies dict_values, the fingerprints have to be taken of the raw input
+                fingerprints = data_processing.get_preprocessing_fingerprints(
+                    dict_values
+                )
+            if (
+                processed_input_cache is not None
+                and PROCESSED_INPUT in processed_input_cache
+            ):
+                data_processing.all_incremental(
+                    dict_values,
+                    processed_input_cache[PROCESSED_INPUT],
+                    processed_input_cache[PREPROCESSING_FINGERPRINTS],
+                    fingerprints,
+                )
+            else:
+                data_processing.all(dict_values)
+            if processed_input_cache is not None:
+                # D0 and E0 add the results to dict_values, the cache has to hold the pre-processed input only
+                processed_input_cache.update(
+                    {
+                        PROCESSED_INPUT: copy.deepcopy(dict_values),
+                        PREPROCESSING_FINGERPRINTS: fingerprints,
+                    }
+                )
+
+        print("")
+        if kwargs.get("raw_results", None) is None:
+            logging.debug("Accessing script: D0_modelling_and_optimization")
+            results_meta, results_main = modelling.run_oemof(dict_values)
+        else:
+            logging.debug("Accessing script: D11_raw_results")
+            results_meta, results_main = raw_results.load_raw_results(
+                dict_values, kwargs["raw_results"]
+            )
+
+        print("")
+        logging.debug("Accessing script: E0_evaluation")
+        evaluation.evaluate_dict(dict_values, results_main, results_meta)
+
+        output_processing.parse_simulation_log(
+            path_log_file=None, dict_values=dict_values, log_records=log_handler.records
+        )
 
     logging.debug("Convert results to json")
 
@@ -51,6 +51,8 @@ def single_param_variation_analysis(
         )
     param_path_tuple = split_nested_path(json_path_to_param_value)
     answer = []
+    # Only the assets affected by the varied parameter are pre-processed again in each simulation
+    processed_input_cache = {}
     if simulation_input is not None:
         for param_val in param_values:
             # modify the value of the parameter before running a new simulation
@@ -60,7 +62,10 @@ def single_param_variation_analysis(
             # run a simulation with next value of the variable parameter and convert the result to
             # mvs special json type
             sim_output_json = run_simulation(
-                modified_input, display_output="error", epa_format=False
+                modified_input,
+                display_output="error",
+                epa_format=False,
+                processed_input_cache=processed_input_cache,
             )
             print(sim_output_json)
             if json_path_to_output_value is None:
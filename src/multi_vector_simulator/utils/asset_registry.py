@@ -0,0 +1,266 @@
+"""
+Asset registry
+==============
+
+Index of all busses and assets of the energy system:
+
+- label of a bus or asset -> (asset group, key in the asset group, dict of the asset), which is
+  also used to check that the labels are unique
+- bus -> labels of the assets that feed into the bus (incoming) and that are supplied by the bus (outgoing)
+- energy vector -> labels of the assets of this energy vector
+- energy provider -> key of its consumption source and its feed-in sink
+
+The registry is built when the pre-processing (C0) checks the labels of the inputs, so that C0 looks
+up the busses of the assets in it, C0 registers the busses it defines and builds the registry again
+from the pre-processed dict_values at its end.
+Downstream modules (D2, E3) look up the auxiliary assets of the energy providers in the registry.
+The registry is not stored in dict_values but kept for the dict_values processed last in the
+current thread, see `get_asset_registry()`, so that it is neither copied with dict_values nor
+stored in the json files.
+"""
+
+import logging
+import threading
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    LABEL,
+    ENERGY_VECTOR,
+    INFLOW_DIRECTION,
+    OUTFLOW_DIRECTION,
+    ENERGY_BUSSES,
+    ENERGY_PROVIDERS,
+    ENERGY_CONVERSION,
+    ENERGY_STORAGE,
+    ENERGY_PRODUCTION,
+    ENERGY_CONSUMPTION,
+    DSO_CONSUMPTION,
+    DSO_FEEDIN,
+    AUTO_SINK,
+    CONNECTED_FEEDIN_SINK,
+)
+from multi_vector_simulator.utils.exceptions import DuplicateLabels
+
+# Asset groups indexed by the registry (in addition to ENERGY_BUSSES)
+ASSET_GROUPS_OF_REGISTRY = (
+    ENERGY_PROVIDERS,
+    ENERGY_CONVERSION,
+    ENERGY_STORAGE,
+    ENERGY_PRODUCTION,
+    ENERGY_CONSUMPTION,
+)
+
+# dict_values and its asset registry, for the last dict_values of the thread, see get_asset_registry()
+_current_registry = threading.local()
+
+
+class AssetRegistry:
+    """
+    Lookup tables of the busses and assets defined in dict_values.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters, after the pre-processing in C0
+
+    Notes
+    -----
+    Assets without a LABEL are registered under their key.
+    Labels occurring more than once are collected in `duplicate_labels`,
+    use `check_for_label_duplicates()` to raise an error for them.
+
+    Tested with:
+    - test_utils.test_asset_registry_label_lookup()
+    - test_utils.test_asset_registry_incoming_and_outgoing_assets_of_bus()
+    - test_utils.test_asset_registry_assets_of_energy_vector()
+    - test_utils.test_asset_registry_energy_provider_assets()
+    - test_utils.test_asset_registry_check_for_label_duplicates()
+    """
+
+    def __init__(self, dict_values):
+        self.labels = {}
+        self.duplicate_labels = {}
+        self.busses = {}
+        self.incoming_assets = {}
+        self.outgoing_assets = {}
+        self.energy_vectors = {}
+        self.energy_provider_consumption_sources = {}
+        self.energy_provider_feedin_sinks = {}
+
+        for bus in dict_values.get(ENERGY_BUSSES, {}):
+            self.add(ENERGY_BUSSES, bus, dict_values[ENERGY_BUSSES][bus])
+
+        for group in ASSET_GROUPS_OF_REGISTRY:
+            if isinstance(dict_values.get(group), dict):
+                for asset in dict_values[group]:
+                    self.add(group, asset, dict_values[group][asset])
+
+        # Keys of the auxiliary assets defined in C0.define_auxiliary_assets_of_energy_providers()
+        for dso in dict_values.get(ENERGY_PROVIDERS, {}):
+            self.energy_provider_consumption_sources.update(
+                {dso: dso + DSO_CONSUMPTION}
+            )
+            feedin_sink = dso + DSO_FEEDIN + AUTO_SINK
+            if isinstance(dict_values[ENERGY_PROVIDERS], dict):
+                feedin_sink = dict_values[ENERGY_PROVIDERS][dso].get(
+                    CONNECTED_FEEDIN_SINK, feedin_sink
+                )
+            self.energy_provider_feedin_sinks.update({dso: feedin_sink})
+
+    def add(self, group, key, dict_asset):
+        """
+        Registers an asset or bus with its label, flow directions and energy vector.
+
+        Parameters
+        ----------
+        group: str
+            Asset group, ie. ENERGY_BUSSES or one of ASSET_GROUPS_OF_REGISTRY
+
+        key: str
+            Key of the asset in dict_values[group]
+
+        dict_asset: dict
+            All parameters of the asset
+
+        Returns
+        -------
+        None
+        """
+        label = dict_asset.get(LABEL, key)
+        if label in self.labels:
+            self.duplicate_labels.update(
+                {label: self.duplicate_labels.get(label, 1) + 1}
+            )
+        self.labels.update({label: (group, key, dict_asset)})
+
+        if group == ENERGY_BUSSES:
+            self.busses.update({key: dict_asset})
+            self.incoming_assets.setdefault(key, [])
+            self.outgoing_assets.setdefault(key, [])
+            return
+
+        # An asset with OUTFLOW_DIRECTION into a bus feeds into it, an asset with INFLOW_DIRECTION from it draws from it
+        for direction, bus_index in [
+            (OUTFLOW_DIRECTION, self.incoming_assets),
+            (INFLOW_DIRECTION, self.outgoing_assets),
+        ]:
+            busses = dict_asset.get(direction, [])
+            if not isinstance(busses, list):
+                busses = [busses]
+            for bus in busses:
+                bus_index.setdefault(bus, []).append(label)
+
+        if ENERGY_VECTOR in dict_asset:
+            self.energy_vectors.setdefault(dict_asset[ENERGY_VECTOR], []).append(label)
+
+    def __contains__(self, label):
+        return label in self.labels
+
+    def get(self, label):
+        """
+        Returns (asset group, key, dict_asset) of the bus or asset with the label.
+        """
+        return self.labels[label]
+
+    def get_asset(self, label):
+        """
+        Returns the dict of the bus or asset with the label.
+        """
+        return self.labels[label][2]
+
+    def has_bus(self, bus):
+        """
+        Returns True if the bus is defined in dict_values[ENERGY_BUSSES].
+        """
+        return bus in self.busses
+
+    def get_incoming_assets(self, bus):
+        """
+        Returns the labels of all assets feeding into the bus (OUTFLOW_DIRECTION of the asset).
+        """
+        return self.incoming_assets.get(bus, [])
+
+    def get_outgoing_assets(self, bus):
+        """
+        Returns the labels of all assets supplied by the bus (INFLOW_DIRECTION of the asset).
+        """
+        return self.outgoing_assets.get(bus, [])
+
+    def get_assets_of_energy_vector(self, energy_vector):
+        """
+        Returns the labels of all assets with the energy vector.
+        """
+        return self.energy_vectors.get(energy_vector, [])
+
+    def check_for_label_duplicates(self):
+        """
+        Raises DuplicateLabels if any bus or asset label is registered multiple times, as oemof can not build a model with identical labels.
+        """
+        if len(self.duplicate_labels) > 0:
+            msg = ""
+            for label, occurrences in self.duplicate_labels.items():
+                msg += f"Following asset label is not unique with {occurrences} occurrences: {label}. \n"
+            msg += f"Please make sure that each label is only used once, as oemof otherwise can not build the model."
+            raise DuplicateLabels(msg)
+
+
+def build_asset_registry(dict_values):
+    """
+    Builds the asset registry of dict_values and checks that the labels are unique.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    asset_registry: :class:`AssetRegistry`
+        Registry of all busses and assets, returned by `get_asset_registry()` for dict_values
+        from now on
+
+    Notes
+    -----
+    Raises DuplicateLabels if a label of a bus or asset is not unique.
+
+    Tested with:
+    - test_utils.test_build_asset_registry_not_stored_in_dict_values()
+    - test_utils.test_asset_registry_check_for_label_duplicates()
+    """
+    asset_registry = AssetRegistry(dict_values)
+    asset_registry.check_for_label_duplicates()
+    _current_registry.dict_values = dict_values
+    _current_registry.asset_registry = asset_registry
+    logging.debug(
+        f"Registered {len(asset_registry.labels)} busses and assets in the asset registry."
+    )
+    return asset_registry
+
+
+def get_asset_registry(dict_values):
+    """
+    Returns the asset registry of dict_values.
+
+    The registry of the dict_values used last in the current thread is returned again. For other
+    dict_values (eg. a copy of dict_values, or dict_values loaded from a json file), the registry
+    is built, without checking the labels, and kept for the next calls (eg. of each KPI of E3).
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    asset_registry: :class:`AssetRegistry`
+        Registry of all busses and assets
+
+    Notes
+    -----
+    Tested with:
+    - test_utils.test_build_asset_registry_not_stored_in_dict_values()
+    - test_utils.test_get_asset_registry_of_other_dict_values()
+    """
+    if getattr(_current_registry, "dict_values", None) is not dict_values:
+        _current_registry.dict_values = dict_values
+        _current_registry.asset_registry = AssetRegistry(dict_values)
+    return _current_registry.asset_registry
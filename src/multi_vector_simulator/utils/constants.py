@@ -61,11 +61,15 @@ INPUT_TYPE = "input_type"
 OVERWRITE = "overwrite"
 DISPLAY_OUTPUT = "display_output"
 SAVE_PNG = "save_png"
+FROM_PROCESSED = "from_processed"
+RAW_RESULTS = "raw_results"
 
 # Filenames of the json files stored to disc:
 JSON_PROCESSED = "json_input_processed"
 JSON_WITH_RESULTS = "json_with_results"
 JSON_FILE_EXTENSION = ".json"
+# Filename of the raw results of the optimization, see D11_raw_results
+RAW_RESULTS_FILE = "raw_results.npz"
 
 USER_INPUT_ARGUMENTS = (
     PATH_INPUT_FILE,
@@ -85,6 +89,27 @@ DEFAULT_MAIN_KWARGS = dict(
     path_output_folder=DEFAULT_OUTPUT_PATH,
     display_output="info",
     lp_file_output=False,
+    from_processed=None,
+    raw_results=None,
+    store_raw_results=None,
+    solver=None,
+    solver_threads=None,
+    solver_time_limit=None,
+    solver_mip_gap=None,
+    solver_presolve=None,
+    solver_method=None,
+    solver_interface=None,
+)
+
+# Solver settings which can be set with the command line (they overwrite the simulation settings)
+SOLVER_ARGUMENTS = (
+    SOLVER,
+    SOLVER_THREADS,
+    SOLVER_TIME_LIMIT,
+    SOLVER_MIP_GAP,
+    SOLVER_PRESOLVE,
+    SOLVER_METHOD,
+    SOLVER_INTERFACE,
 )
 # list of csv filename which must be present within the CSV_ELEMENTS folder with the parameters
 # associated to each of these filenames
@@ -301,6 +326,110 @@ DEFAULT_WEIGHTS_ENERGY_CARRIERS = {
     },
 }
 
+# Solver used if SOLVER is not defined in the simulation settings and its default MIP gap
+DEFAULT_SOLVER = "cbc"
+DEFAULT_SOLVER_MIP_GAP = 0.03
+# Possible values of SOLVER_METHOD
+SOLVER_METHOD_SIMPLEX = "simplex"
+SOLVER_METHOD_BARRIER = "barrier"
+# Names of the solver options of the solvers supported by pyomo. The options of SOLVER_PRESOLVE
+# and SOLVER_METHOD depend on the value of the setting, an empty option value is passed as flag
+SOLVER_OPTION_NAMES = {
+    "cbc": {
+        SOLVER_THREADS: "threads",
+        SOLVER_TIME_LIMIT: "sec",
+        SOLVER_MIP_GAP: "ratioGap",
+        SOLVER_PRESOLVE: {True: ("presolve", "on"), False: ("presolve", "off")},
+        SOLVER_METHOD: {
+            SOLVER_METHOD_SIMPLEX: ("dualSimplex", ""),
+            SOLVER_METHOD_BARRIER: ("barrier", ""),
+        },
+    },
+    "glpk": {
+        SOLVER_TIME_LIMIT: "tmlim",
+        SOLVER_MIP_GAP: "mipgap",
+        SOLVER_PRESOLVE: {True: ("presol", ""), False: ("nopresol", "")},
+        SOLVER_METHOD: {
+            SOLVER_METHOD_SIMPLEX: ("simplex", ""),
+            SOLVER_METHOD_BARRIER: ("interior", ""),
+        },
+    },
+    "highs": {
+        SOLVER_THREADS: "threads",
+        SOLVER_TIME_LIMIT: "time_limit",
+        SOLVER_MIP_GAP: "mip_rel_gap",
+        SOLVER_PRESOLVE: {True: ("presolve", "on"), False: ("presolve", "off")},
+        SOLVER_METHOD: {
+            SOLVER_METHOD_SIMPLEX: ("solver", "simplex"),
+            SOLVER_METHOD_BARRIER: ("solver", "ipm"),
+        },
+    },
+    "gurobi": {
+        SOLVER_THREADS: "Threads",
+        SOLVER_TIME_LIMIT: "TimeLimit",
+        SOLVER_MIP_GAP: "MIPGap",
+        SOLVER_PRESOLVE: {True: ("Presolve", -1), False: ("Presolve", 0)},
+        SOLVER_METHOD: {
+            SOLVER_METHOD_SIMPLEX: ("Method", 1),
+            SOLVER_METHOD_BARRIER: ("Method", 2),
+        },
+    },
+    "cplex": {
+        SOLVER_THREADS: "threads",
+        SOLVER_TIME_LIMIT: "timelimit",
+        SOLVER_MIP_GAP: "mip_tolerances_mipgap",
+        SOLVER_PRESOLVE: {
+            True: ("preprocessing_presolve", 1),
+            False: ("preprocessing_presolve", 0),
+        },
+        SOLVER_METHOD: {
+            SOLVER_METHOD_SIMPLEX: ("lpmethod", 2),
+            SOLVER_METHOD_BARRIER: ("lpmethod", 4),
+        },
+    },
+}
+
+# Possible values of SOLVER_INTERFACE: the shell interface writes the model to an lp file which is
+# read by the solver executable, the direct and persistent interfaces pass the model in memory
+SOLVER_INTERFACE_SHELL = "shell"
+SOLVER_INTERFACE_DIRECT = "direct"
+SOLVER_INTERFACE_PERSISTENT = "persistent"
+# Names of the direct and persistent pyomo interfaces of the solvers, which pass the model in memory
+# to their python bindings (cbc and glpk have none: pyomo's appsi_cbc writes an lp file for the
+# executable as the shell interface)
+SOLVER_INTERFACE_NAMES = {
+    SOLVER_INTERFACE_DIRECT: {
+        "gurobi": "gurobi_direct",
+        "cplex": "cplex_direct",
+        "xpress": "xpress_direct",
+        "mosek": "mosek_direct",
+    },
+    SOLVER_INTERFACE_PERSISTENT: {
+        "gurobi": "gurobi_persistent",
+        "cplex": "cplex_persistent",
+        "xpress": "xpress_persistent",
+        "mosek": "mosek_persistent",
+    },
+}
+
+# Possible values of MODEL_SIZE_GUARD, ie. what happens if the model is larger than MAXIMUM_MODEL_SIZE
+MODEL_SIZE_GUARD_WARNING = "warning"
+MODEL_SIZE_GUARD_ERROR = "error"
+
+# Name of the lp file (without extension) and of the map of its labels
+LP_FILE = "lp_file"
+LP_FILE_LABELS = "lp_file_labels.csv"
+# Possible values of LP_FILE_FORMAT, which are also the extensions of the files written by pyomo
+LP_FILE_FORMAT_LP = "lp"
+LP_FILE_FORMAT_MPS = "mps"
+# Possible values of LP_FILE_COMPRESSION and the extensions of the compressed files
+LP_FILE_COMPRESSION_GZIP = "gzip"
+LP_FILE_COMPRESSION_ZSTD = "zstd"
+LP_FILE_COMPRESSION_EXTENSIONS = {
+    LP_FILE_COMPRESSION_GZIP: ".gz",
+    LP_FILE_COMPRESSION_ZSTD: ".zst",
+}
+
 # dict keys in results_json file
 TIMESERIES = "timeseries"
 
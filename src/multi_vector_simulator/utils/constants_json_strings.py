@@ -24,6 +24,10 @@ ENERGY_STORAGE = "energyStorage"
 ENERGY_BUSSES = "energyBusses"
 ENERGY_PROVIDERS = "energyProviders"
 
+ASSET_TOPOLOGY = "asset_topology"
+# Checksum of the stored processed json file (JSON_PROCESSED) and the MVS version
+PROCESSED_JSON_CHECKSUM = "processed_json_checksum"
+
 ##### For D1 ######################
 # Definition of allowed oemof types
 OEMOF_TRANSFORMER = "transformer"
@@ -75,6 +79,42 @@ COUNTRY = "country"
 PROJECT_ID = "project_id"
 SCENARIO_ID = "scenario_id"
 SCENARIO_DESCRIPTION = "scenario_description"
+# Simulation settings: Time series aggregation into typical periods (optional)
+TYPICAL_PERIODS = "typical_periods"
+TYPICAL_PERIOD_LENGTH = "typical_period_length"
+# Simulation settings: Rolling horizon dispatch (optional)
+ROLLING_HORIZON_WINDOW = "rolling_horizon_window"
+ROLLING_HORIZON_OVERLAP = "rolling_horizon_overlap"
+# Simulation settings: Solver and solver options (optional)
+SOLVER = "solver"
+SOLVER_THREADS = "solver_threads"
+SOLVER_TIME_LIMIT = "solver_time_limit"
+SOLVER_MIP_GAP = "solver_mip_gap"
+SOLVER_PRESOLVE = "solver_presolve"
+SOLVER_METHOD = "solver_method"
+SOLVER_INTERFACE = "solver_interface"
+# Simulation settings: Measurement of the size of the optimization problem (optional)
+MEASURE_MODEL_SIZE = "measure_model_size"
+# Simulation settings: Maximal size of the optimization problem (optional)
+MAXIMUM_MODEL_SIZE = "maximum_model_size"
+MODEL_SIZE_GUARD = "model_size_guard"
+# Simulation settings: Export of the lp file (optional)
+LP_FILE_FORMAT = "lp_file_format"
+LP_FILE_SYMBOLIC_LABELS = "lp_file_symbolic_labels"
+LP_FILE_COMPRESSION = "lp_file_compression"
+LP_FILE_FROM_SOLVER = "lp_file_from_solver"
+# Simulation settings: Reduction of the energy system model (optional)
+MODEL_REDUCTION = "model_reduction"
+# Simulation settings: Optimization of independent subsystems in parallel processes (optional)
+PARALLEL_SUBSYSTEMS = "parallel_subsystems"
+# Simulation settings: Diagnosis of an infeasible optimization problem with slack variables (optional)
+INFEASIBILITY_DIAGNOSIS = "infeasibility_diagnosis"
+# Simulation settings: Storage of the solution of the optimization (optional)
+STORE_SOLUTION = "store_solution"
+# Simulation settings: Storage of the raw results of the optimization for a re-evaluation (optional)
+STORE_RAW_RESULTS = "store_raw_results"
+# Simulation settings: Profiling of the construction of the optimization model (optional)
+PROFILE_MODEL_CONSTRUCTION = "profile_model_construction"
 
 # Asset definitions
 DSM = "dsm"
@@ -126,6 +166,7 @@ MINIMAL_DEGREE_OF_AUTONOMY = "minimal_degree_of_autonomy"
 UNIT_YEAR = "year"
 UNIT_HOUR = "hour"
 UNIT_MINUTE = "min"
+UNIT_DAY = "day"
 UNIT_EMISSIONS = "kgCO2eq/a"
 UNIT_SPECIFIC_EMISSIONS = "kgCO2eq/kWheleq"
 
@@ -197,6 +238,26 @@ SIMULATION_RESULTS = "simulation_results"
 # oemof simulation parameters:
 OBJECTIVE_VALUE = "objective_value"
 SIMULTATION_TIME = "simulation_time"
+# Time series aggregation: weight of each timestep of the reduced model, error of the aggregation
+TYPICAL_PERIOD_WEIGHTS = "typical_period_weights"
+AGGREGATION_ERROR = "aggregation_error"
+# Rolling horizon dispatch: number of solved windows
+ROLLING_HORIZON_WINDOWS = "rolling_horizon_windows"
+# Independent subsystems: number of subsystems optimized separately
+SUBSYSTEMS = "subsystems"
+# Number of iterations of the solver
+SOLVER_ITERATIONS = "solver_iterations"
+# Profile of the construction of the optimization model
+MODEL_CONSTRUCTION_PROFILE = "model_construction_profile"
+# Options passed to the solver (the solver itself is stored with SOLVER)
+SOLVER_OPTIONS = "solver_options"
+# Size of the optimization problem, in total, per asset type and per constraint
+MODEL_SIZE = "model_size"
+NUMBER_OF_VARIABLES = "number_of_variables"
+NUMBER_OF_CONSTRAINTS = "number_of_constraints"
+NUMBER_OF_NONZEROS = "number_of_nonzeros"
+MODEL_SIZE_PER_ASSET_TYPE = "per_asset_type"
+MODEL_SIZE_PER_CONSTRAINT = "per_constraint"
 
 # Logs
 LOGS = "logs"
@@ -95,6 +95,8 @@ from multi_vector_simulator.utils.constants_json_strings import (
     DSM,
     THERM_LOSSES_REL,
     THERM_LOSSES_ABS,
+    SIMULATION_RESULTS,
+    MODEL_SIZE,
 )
 
 from multi_vector_simulator.utils.exceptions import MissingParameterError
@@ -131,6 +133,7 @@ MAP_EPA_MVS = {
     "specific_replacement_costs_of_installed_capacity": SPECIFIC_REPLACEMENT_COSTS_INSTALLED,
     "specific_replacement_costs_of_optimized_capacity": SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED,
     "asset_type": TYPE_ASSET,
+    "simulation_results": SIMULATION_RESULTS,
 }
 
 MAP_MVS_EPA = {value: key for (key, value) in MAP_EPA_MVS.items()}
@@ -140,6 +143,7 @@ EPA_PARAM_KEYS = {
     PROJECT_DATA: [PROJECT_ID, PROJECT_NAME, SCENARIO_ID, SCENARIO_NAME],
     SIMULATION_SETTINGS: [START_DATE, EVALUATED_PERIOD, TIMESTEP],
     KPI: [KPI_SCALARS_DICT, KPI_UNCOUPLED_DICT, KPI_COST_MATRIX, KPI_SCALAR_MATRIX],
+    SIMULATION_RESULTS: [MODEL_SIZE],
 }
 
 # Fields expected for assets' parameters of json returned to EPA
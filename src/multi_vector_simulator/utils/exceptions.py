@@ -60,3 +60,87 @@ class DuplicateLabels(ValueError):
     """Exception raised in case an label is defined multiple times as Oemof requires labels to be unique"""
 
     pass
+
+
+class ProcessedJsonChecksumError(ValueError):
+    """Exception raised if a processed json file does not match the current MVS version or was modified"""
+
+    pass
+
+
+class InvalidTypicalPeriodsError(ValueError):
+    """Exception raised if the evaluated period can not be divided into typical periods"""
+
+    pass
+
+
+class InvalidModelReductionError(ValueError):
+    """Exception raised if the simulation setting of the model reduction is not a boolean"""
+
+    pass
+
+
+class InvalidSubsystemsError(ValueError):
+    """Exception raised if the simulation setting of the parallel subsystems is not a boolean"""
+
+    pass
+
+
+class InvalidInfeasibilityDiagnosisError(ValueError):
+    """Exception raised if the simulation setting of the infeasibility diagnosis is not a boolean"""
+
+    pass
+
+
+class InvalidSolutionStorageError(ValueError):
+    """Exception raised if the simulation setting of the solution storage is not a boolean"""
+
+    pass
+
+
+class InvalidModelProfilingError(ValueError):
+    """Exception raised if the simulation setting of the profiling of the model construction is not a boolean"""
+
+    pass
+
+
+class InvalidModelTemplateError(ValueError):
+    """Exception raised if a model template can not be built or a variant is not compatible with it"""
+
+    pass
+
+
+class InvalidRawResultsError(ValueError):
+    """Exception raised if the stored raw results of an optimization can not be used to re-evaluate a simulation"""
+
+    pass
+
+
+class InvalidRollingHorizonError(ValueError):
+    """Exception raised if the rolling horizon dispatch can not be applied to the simulation"""
+
+    pass
+
+
+class SolverNotAvailableError(ValueError):
+    """Exception raised if the solver defined in the simulation settings can not be found by pyomo"""
+
+    pass
+
+
+class InvalidSolverOptionError(ValueError):
+    """Exception raised if a solver option of the simulation settings has an invalid value"""
+
+    pass
+
+
+class ModelSizeError(ValueError):
+    """Exception raised if the optimization problem is larger than the maximum model size of the simulation settings, or if the model size guard is not valid"""
+
+    pass
+
+
+class InvalidLpFileOptionError(ValueError):
+    """Exception raised if an option of the export of the lp file in the simulation settings has an invalid value"""
+
+    pass
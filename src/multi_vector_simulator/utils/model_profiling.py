@@ -0,0 +1,239 @@
+"""
+Model profiling
+===============
+
+Optional profiling of the construction of the optimization model. The time needed by each step of
+the construction is measured, so that the components which are expensive to build can be
+identified:
+
+- each constructor of D1 called for the assets of the energy system (eg. `storage_optimize()`)
+- each constraint added by D2
+- each block of oemof-solph created while building the pyomo model (eg. `InvestmentFlow`)
+
+The profile is only recorded for the thread which started it, so that concurrent simulations of a
+process (eg. a server) do not interfere. The steps of the construction are timed with `timed()`,
+which does nothing if no profile is recorded.
+"""
+
+import contextlib
+import logging
+import threading
+import timeit
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    PROFILE_MODEL_CONSTRUCTION,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidModelProfilingError
+
+# Categories of the steps of the model construction
+CATEGORY_D1 = "D1 constructor"
+CATEGORY_D2 = "D2 constraint"
+CATEGORY_OEMOF = "oemof block"
+
+# Columns of the profile table
+PROFILE_CATEGORY = "category"
+PROFILE_COMPONENT = "component"
+PROFILE_CALLS = "calls"
+PROFILE_TIME = "time"
+
+# Profile recorded by the current thread
+_active_profile = threading.local()
+
+
+class ConstructionProfile:
+    """Construction time and number of calls of each step of the model construction"""
+
+    def __init__(self):
+        self.records = {}
+
+    def add(self, category, component, duration, calls=1):
+        record = self.records.setdefault((category, component), [0, 0.0])
+        record[0] += calls
+        record[1] += duration
+
+    def table(self):
+        r"""
+        Returns the profile as a table sorted by decreasing construction time.
+
+        Returns
+        -------
+        list of dict
+            One row per step with the keys PROFILE_CATEGORY, PROFILE_COMPONENT, PROFILE_CALLS and
+            PROFILE_TIME (seconds)
+        """
+        rows = [
+            {
+                PROFILE_CATEGORY: category,
+                PROFILE_COMPONENT: component,
+                PROFILE_CALLS: calls,
+                PROFILE_TIME: round(duration, 4),
+            }
+            for (category, component), (calls, duration) in self.records.items()
+        ]
+        return sorted(rows, key=lambda row: row[PROFILE_TIME], reverse=True)
+
+
+def is_profiling_activated(dict_values):
+    r"""
+    Reads the simulation setting PROFILE_MODEL_CONSTRUCTION.
+
+    Parameters
+    ----------
+    dict_values: dict
+        All simulation parameters
+
+    Returns
+    -------
+    bool
+        True if the construction of the model is to be profiled
+
+    Notes
+    -----
+    Raises InvalidModelProfilingError if PROFILE_MODEL_CONSTRUCTION is not True or False.
+
+    Tested with:
+    - test_is_profiling_activated_not_defined()
+    - test_is_profiling_activated_invalid_value_raises_error()
+    """
+    activated = (
+        dict_values[SIMULATION_SETTINGS].get(PROFILE_MODEL_CONSTRUCTION, {}).get(VALUE)
+    )
+    if activated not in (None, True, False):
+        raise InvalidModelProfilingError(
+            f"The value of {PROFILE_MODEL_CONSTRUCTION} has to be True or False, not {activated}."
+        )
+    return activated is True
+
+
+def get_active_profile():
+    r"""
+    Returns the profile recorded by the current thread.
+
+    Returns
+    -------
+    :class:`ConstructionProfile` or None
+        None if no profile is recorded
+    """
+    return getattr(_active_profile, "profile", None)
+
+
+@contextlib.contextmanager
+def construction_profile(profile):
+    r"""
+    Records the steps of the model construction in profile for the duration of the with statement
+
+    Parameters
+    ----------
+    profile: :class:`ConstructionProfile` or None
+        Profile in which the steps are recorded, if None, no profile is recorded
+
+    Returns
+    -------
+    :class:`ConstructionProfile` or None
+        profile
+
+    Notes
+    -----
+    Tested with:
+    - test_construction_profile()
+    - test_construction_profile_ignores_other_threads()
+    """
+    previous_profile = get_active_profile()
+    _active_profile.profile = profile
+    try:
+        yield profile
+    finally:
+        _active_profile.profile = previous_profile
+
+
+@contextlib.contextmanager
+def timed(category, component):
+    r"""
+    Times the statements of the with statement as one call of a step of the model construction
+
+    Parameters
+    ----------
+    category: str
+        Category of the step, eg. CATEGORY_D1
+
+    component: str
+        Name of the step, eg. the name of the constructor of D1
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Tested with:
+    - test_construction_profile()
+    """
+    profile = get_active_profile()
+    if profile is None:
+        yield
+        return
+    start = timeit.default_timer()
+    try:
+        yield
+    finally:
+        profile.add(category, component, timeit.default_timer() - start)
+
+
+def merge_profile_tables(tables):
+    r"""
+    Merges the profile tables of several models, eg. of the windows of a rolling horizon dispatch.
+
+    Parameters
+    ----------
+    tables: list of list of dict
+        Outputs of `ConstructionProfile.table()`
+
+    Returns
+    -------
+    list of dict
+        Profile table with the summed up calls and construction times of each step
+
+    Notes
+    -----
+    Tested with:
+    - test_merge_profile_tables()
+    """
+    profile = ConstructionProfile()
+    for table in tables:
+        for row in table:
+            profile.add(
+                row[PROFILE_CATEGORY],
+                row[PROFILE_COMPONENT],
+                row[PROFILE_TIME],
+                calls=row[PROFILE_CALLS],
+            )
+    return profile.table()
+
+
+def log_profile_table(table):
+    r"""
+    Logs the profile table, sorted by decreasing construction time.
+
+    Parameters
+    ----------
+    table: list of dict
+        Output of `ConstructionProfile.table()`
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Tested with:
+    - test_run_oemof_with_profiling()
+    """
+    lines = [
+        f"{'Step of the model construction':<60} {PROFILE_CALLS:>6} {PROFILE_TIME + ' [s]':>10}"
+    ]
+    for row in table:
+        step = f"{row[PROFILE_CATEGORY]}: {row[PROFILE_COMPONENT]}"
+        lines.append(f"{step:<60} {row[PROFILE_CALLS]:>6} {row[PROFILE_TIME]:>10.4f}")
+    logging.info("Profile of the model construction:\n" + "\n".join(lines))
@@ -0,0 +1,227 @@
+"""
+Simulation log
+==============
+
+Logging of a single simulation run. The handlers are attached to the root logger for the duration
+of the run only, instead of configuring the logging of the whole process:
+
+- the log messages of the run are written to the log file of its output folder and displayed on screen
+- the warning and error messages of the run are kept in memory, so that F0 can add them to the
+  results without reading the log file again
+- only the messages logged by the thread of the run are considered, so that several simulations
+  can run concurrently in the threads of one process (eg. a server)
+"""
+
+import contextlib
+import logging
+import sys
+import threading
+
+from multi_vector_simulator.utils.constants_json_strings import ERRORS, WARNINGS
+
+# Formats of the log messages in the log file and on screen
+FILE_FORMAT = "%(asctime)s - %(levelname)s - %(module)s - %(message)s"
+SCREEN_FORMAT = "%(asctime)s-%(levelname)s-%(message)s"
+SCREEN_DATE_FORMAT = "%H:%M:%S"
+
+# Loggers of external libraries which only log messages of level ERROR or CRITICAL
+EXTERNAL_LIBRARY_LOGGERS = (
+    "asyncio",
+    "asyncio.coroutines",
+    "websockets.server",
+    "websockets.protocol",
+    "websockets.client",
+    "urllib3.connectionpool",
+    "PIL.PngImagePlugin",
+)
+
+
+class ThreadFilter(logging.Filter):
+    """Only lets the log records of the thread which created the filter through"""
+
+    def __init__(self):
+        super().__init__()
+        self.thread = threading.get_ident()
+
+    def filter(self, record):
+        return record.thread == self.thread
+
+
+class LevelFilter(logging.Filter):
+    """Only lets the log records of the given level or above through"""
+
+    def __init__(self, level):
+        super().__init__()
+        self.level = level
+
+    def filter(self, record):
+        return record.levelno >= self.level
+
+
+class LogCaptureHandler(logging.Handler):
+    """Keeps the log records of a simulation run in memory"""
+
+    def __init__(self, level=logging.WARNING):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+# Minimal levels of the handlers of the active runs, and the level and handlers of the root logger
+# before the first active run
+_root_logger_state = {"run_levels": [], "level": None, "handlers": [], "filter": None}
+_lock = threading.Lock()
+
+
+def set_root_logger_level(run_level=None, finished_run_level=None):
+    r"""
+    Sets the level of the root logger to the minimal level of the active runs
+
+    The root logger discards the log records below its level before they reach the handlers of the
+    runs. The handlers which were defined before the first active run (eg. by `logging.basicConfig()`)
+    keep receiving the log records of their former level only. The initial level of the root logger
+    is restored when the last active run is finished.
+
+    Parameters
+    ----------
+    run_level: int or None
+        Minimal level of the handlers of a run which starts
+        Default: None
+
+    finished_run_level: int or None
+        Minimal level of the handlers of a run which is finished
+        Default: None
+
+    Returns
+    -------
+    None
+    """
+    root_logger = logging.getLogger()
+    state = _root_logger_state
+    with _lock:
+        if len(state["run_levels"]) == 0:
+            state["level"] = root_logger.level
+            state["handlers"] = list(root_logger.handlers)
+            state["filter"] = LevelFilter(root_logger.level)
+            for handler in state["handlers"]:
+                handler.addFilter(state["filter"])
+        if run_level is not None:
+            state["run_levels"].append(run_level)
+        if finished_run_level is not None:
+            state["run_levels"].remove(finished_run_level)
+        if len(state["run_levels"]) == 0:
+            root_logger.setLevel(state["level"])
+            for handler in state["handlers"]:
+                handler.removeFilter(state["filter"])
+            state["handlers"] = []
+        else:
+            root_logger.setLevel(min([state["level"]] + state["run_levels"]))
+
+
+@contextlib.contextmanager
+def simulation_log(
+    path_log_file=None,
+    screen_level=None,
+    file_level=logging.DEBUG,
+    capture_level=logging.WARNING,
+):
+    r"""
+    Logs the messages of a simulation run for the duration of the with statement
+
+    Parameters
+    ----------
+    path_log_file: str or None
+        Path of the log file, if None, the messages are not written to a file
+        Default: None
+
+    screen_level: int or None
+        Level of the messages displayed on screen, if None, no messages are displayed by the run
+        (the handlers already defined in the process are not modified)
+        Default: None
+
+    file_level: int
+        Level of the messages written to the log file
+        Default: logging.DEBUG
+
+    capture_level: int
+        Level of the messages kept in memory
+        Default: logging.WARNING
+
+    Returns
+    -------
+    :class:`LogCaptureHandler`
+        Handler whose attribute `records` holds the log records of the run
+
+    Notes
+    -----
+    Tested with:
+    - test_simulation_log_captures_warnings_and_errors()
+    - test_simulation_log_writes_log_file()
+    - test_simulation_log_ignores_other_threads()
+    - test_simulation_log_restores_root_logger()
+    """
+    thread_filter = ThreadFilter()
+    capture_handler = LogCaptureHandler(capture_level)
+    handlers = [capture_handler]
+    if path_log_file is not None:
+        file_handler = logging.FileHandler(path_log_file)
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        file_handler.setLevel(file_level)
+        handlers.append(file_handler)
+    if screen_level is not None:
+        screen_handler = logging.StreamHandler(sys.stdout)
+        screen_handler.setFormatter(
+            logging.Formatter(SCREEN_FORMAT, SCREEN_DATE_FORMAT)
+        )
+        screen_handler.setLevel(screen_level)
+        handlers.append(screen_handler)
+
+    for ext_lib_logger in EXTERNAL_LIBRARY_LOGGERS:
+        logging.getLogger(ext_lib_logger).setLevel(logging.ERROR)
+
+    root_logger = logging.getLogger()
+    run_level = min(handler.level for handler in handlers)
+    set_root_logger_level(run_level=run_level)
+    for handler in handlers:
+        handler.addFilter(thread_filter)
+        root_logger.addHandler(handler)
+    try:
+        yield capture_handler
+    finally:
+        for handler in handlers:
+            root_logger.removeHandler(handler)
+            handler.close()
+        set_root_logger_level(finished_run_level=run_level)
+
+
+def get_log_messages(records):
+    r"""
+    Gathers the error and warning messages of log records
+
+    Parameters
+    ----------
+    records: list of :class:`logging.LogRecord`
+        Log records of a simulation run, eg. `records` of the handler of `simulation_log()`
+
+    Returns
+    -------
+    dict
+        Messages of level ERROR and above (ERRORS) and of level WARNING (WARNINGS), numbered from 1
+
+    Notes
+    -----
+    Tested with:
+    - test_simulation_log_captures_warnings_and_errors()
+    """
+    log_messages = {ERRORS: {}, WARNINGS: {}}
+    for record in records:
+        if record.levelno >= logging.ERROR:
+            messages = log_messages[ERRORS]
+        elif record.levelno >= logging.WARNING:
+            messages = log_messages[WARNINGS]
+        else:
+            continue
+        messages.update({len(messages) + 1: record.getMessage()})
+    return log_messages
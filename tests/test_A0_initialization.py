@@ -6,7 +6,20 @@ import pytest
 
 import multi_vector_simulator.A0_initialization as A0
 
-from multi_vector_simulator.utils.constants import INPUT_FOLDER, OUTPUT_FOLDER
+from multi_vector_simulator.utils.constants import (
+    INPUT_FOLDER,
+    OUTPUT_FOLDER,
+    FROM_PROCESSED,
+    RAW_RESULTS,
+    RAW_RESULTS_FILE,
+    JSON_PROCESSED,
+    JSON_FILE_EXTENSION,
+    SOLVER,
+    SOLVER_THREADS,
+    SOLVER_MIP_GAP,
+    SOLVER_PRESOLVE,
+    SOLVER_METHOD,
+)
 
 from multi_vector_simulator.cli import main
 from _constants import (
@@ -236,6 +249,103 @@ class TestProcessUserArguments:
         assert "path_png_figs" in user_inputs.keys()
         assert "path_pdf_report" in user_inputs.keys()
 
+    @mock.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=PARSER.parse_args(
+            ["-f", "-log", "warning", "-i", test_in_path, "-o", test_out_path]
+        ),
+    )
+    def test_if_from_processed_opt_path_input_file_set_to_processed_json(
+        self, m_args, tmpdir
+    ):
+        path_processed_json = os.path.join(tmpdir, JSON_PROCESSED + JSON_FILE_EXTENSION)
+        with open(path_processed_json, "w") as of:
+            of.write("{}")
+        user_inputs = A0.process_user_arguments(from_processed=str(tmpdir))
+        assert user_inputs[FROM_PROCESSED] is True
+        assert user_inputs[PATH_INPUT_FILE] == path_processed_json
+
+    @mock.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=PARSER.parse_args(
+            ["-f", "-log", "warning", "-i", test_in_path, "-o", test_out_path]
+        ),
+    )
+    def test_if_from_processed_opt_and_no_processed_json_raise_filenotfound_error(
+        self, m_args, tmpdir
+    ):
+        with pytest.raises(FileNotFoundError):
+            A0.process_user_arguments(from_processed=str(tmpdir))
+
+    @mock.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=PARSER.parse_args(
+            ["-f", "-log", "warning", "-i", test_in_path, "-o", test_out_path]
+        ),
+    )
+    def test_if_from_processed_opt_and_processed_json_in_overwritten_output_folder_raise_fileexists_error(
+        self, m_args
+    ):
+        os.makedirs(self.test_out_path, exist_ok=True)
+        with open(
+            os.path.join(self.test_out_path, JSON_PROCESSED + JSON_FILE_EXTENSION), "w"
+        ) as of:
+            of.write("{}")
+        with pytest.raises(FileExistsError):
+            A0.process_user_arguments(from_processed=self.test_out_path)
+
+    @mock.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=PARSER.parse_args(
+            ["-f", "-log", "warning", "-i", test_in_path, "-o", test_out_path]
+        ),
+    )
+    def test_if_raw_results_opt_raw_results_set_to_raw_results_file(
+        self, m_args, tmpdir
+    ):
+        path_raw_results = os.path.join(tmpdir, RAW_RESULTS_FILE)
+        with open(path_raw_results, "w") as of:
+            of.write("")
+        user_inputs = A0.process_user_arguments(raw_results=str(tmpdir))
+        assert user_inputs[RAW_RESULTS] == path_raw_results
+
+    @mock.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=PARSER.parse_args(
+            ["-f", "-log", "warning", "-i", test_in_path, "-o", test_out_path]
+        ),
+    )
+    def test_if_raw_results_opt_and_no_raw_results_file_raise_filenotfound_error(
+        self, m_args, tmpdir
+    ):
+        with pytest.raises(FileNotFoundError):
+            A0.process_user_arguments(raw_results=str(tmpdir))
+
+    @mock.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=PARSER.parse_args(
+            [
+                "-f",
+                "-log",
+                "warning",
+                "-i",
+                test_in_path,
+                "-o",
+                test_out_path,
+                "--solver",
+                "glpk",
+                "--solver-presolve",
+                "off",
+            ]
+        ),
+    )
+    def test_if_solver_opt_solver_settings_in_user_inputs(self, m_args):
+        user_inputs = A0.process_user_arguments(solver="cbc", solver_threads=2)
+        assert user_inputs[SOLVER] == "cbc"
+        assert user_inputs[SOLVER_THREADS] == 2
+        assert user_inputs[SOLVER_PRESOLVE] is False
+        assert user_inputs[SOLVER_MIP_GAP] is None
+
     def teardown_method(self):
         if os.path.exists(self.test_out_path):
             shutil.rmtree(self.test_out_path, ignore_errors=True)
@@ -326,6 +436,68 @@ class TestCommandLineInput:
             parsed = self.parser.parse_args(["-log", "something"])
         assert str(argparse_error.value) == "2"
 
+    def test_from_processed_none_by_default(self):
+        parsed = self.parser.parse_args([])
+        assert parsed.from_processed is None
+
+    def test_from_processed_path(self):
+        parsed = self.parser.parse_args(["--from-processed", "output_folder"])
+        assert parsed.from_processed == "output_folder"
+
+    def test_raw_results_none_by_default(self):
+        parsed = self.parser.parse_args([])
+        assert parsed.raw_results is None
+
+    def test_raw_results_path(self):
+        parsed = self.parser.parse_args(["--raw-results", "output_folder"])
+        assert parsed.raw_results == "output_folder"
+
+    def test_store_raw_results_none_by_default(self):
+        parsed = self.parser.parse_args([])
+        assert parsed.store_raw_results is None
+
+    def test_store_raw_results_true(self):
+        parsed = self.parser.parse_args(["--store-raw-results"])
+        assert parsed.store_raw_results is True
+
+    def test_solver_settings_none_by_default(self):
+        parsed = self.parser.parse_args([])
+        assert parsed.solver is None
+        assert parsed.solver_mip_gap is None
+
+    def test_solver_settings(self):
+        parsed = self.parser.parse_args(
+            [
+                "--solver",
+                "glpk",
+                "--solver-threads",
+                "4",
+                "--solver-time-limit",
+                "60",
+                "--solver-mip-gap",
+                "0.01",
+                "--solver-presolve",
+                "on",
+                "--solver-method",
+                "barrier",
+            ]
+        )
+        assert parsed.solver == "glpk"
+        assert parsed.solver_threads == 4
+        assert parsed.solver_time_limit == 60
+        assert parsed.solver_mip_gap == 0.01
+        assert parsed.solver_presolve == "on"
+        assert parsed.solver_method == "barrier"
+
+    def test_solver_interface(self):
+        parsed = self.parser.parse_args(["--solver-interface", "persistent"])
+        assert parsed.solver_interface == "persistent"
+
+    def test_solver_method_not_accepting_other_choices(self):
+        with pytest.raises(SystemExit) as argparse_error:
+            parsed = self.parser.parse_args(["--solver-method", "something"])
+        assert str(argparse_error.value) == "2"
+
     # this ensure that the test is only ran if explicitly executed,
     # ie not when the `pytest` command alone it called
     @pytest.mark.skipif(
@@ -1,14 +1,23 @@
+import json
 import os
 import shutil
 
 import mock
 import pandas as pd
+import pytest
 
 import multi_vector_simulator.A0_initialization as A0
 import multi_vector_simulator.A1_csv_to_json as A1
 import multi_vector_simulator.B0_data_input_json as B0
-
-from multi_vector_simulator.utils.constants import INPUT_FOLDER, OUTPUT_FOLDER
+import multi_vector_simulator.C0_data_processing as C0
+import multi_vector_simulator.F0_output as F0
+
+from multi_vector_simulator.utils.constants import (
+    INPUT_FOLDER,
+    OUTPUT_FOLDER,
+    JSON_PROCESSED,
+    JSON_FILE_EXTENSION,
+)
 from multi_vector_simulator.utils.constants_json_strings import (
     SIMULATION_SETTINGS,
     VALUE,
@@ -18,7 +27,11 @@ from multi_vector_simulator.utils.constants_json_strings import (
     END_DATE,
     TIME_INDEX,
     PERIODS,
+    LABEL,
+    ENERGY_PRODUCTION,
+    PROCESSED_JSON_CHECKSUM,
 )
+from multi_vector_simulator.utils.exceptions import ProcessedJsonChecksumError
 from _constants import (
     JSON_PATH,
     CSV_PATH,
@@ -210,3 +223,81 @@ class TestConversionJsonToPythonTypes:
             in log_msg[2]
         )
         assert (pd_series["series"].values == self.test_result_series.values).all()
+
+
+class TestProcessedJson:
+
+    test_out_path = os.path.join(TEST_REPO_PATH, OUTPUT_FOLDER)
+    path_processed_json = os.path.join(
+        test_out_path, JSON_PROCESSED + JSON_FILE_EXTENSION
+    )
+
+    def setup_method(self):
+        os.makedirs(self.test_out_path, exist_ok=True)
+        self.dict_values = B0.load_json(
+            JSON_PATH,
+            path_input_folder=os.path.join(TEST_REPO_PATH, INPUT_FOLDER),
+            path_output_folder=self.test_out_path,
+            move_copy=False,
+        )
+        C0.all(self.dict_values)
+        F0.store_processed_json(self.dict_values, self.test_out_path)
+
+    def modify_processed_json(self, modify):
+        with open(self.path_processed_json) as json_file:
+            json_dict = json.load(json_file)
+        modify(json_dict)
+        with open(self.path_processed_json, "w") as json_file:
+            json.dump(json_dict, json_file)
+
+    def test_load_processed_json(self):
+        dict_values = B0.load_processed_json(self.path_processed_json)
+        assert F0.store_as_json(dict_values) == F0.store_as_json(
+            self.dict_values
+        ), f"The processed json file should be loaded as the pre-processed dict_values."
+
+    def test_load_processed_json_path_output_folder(self):
+        dict_values = B0.load_processed_json(
+            self.path_processed_json, path_output_folder="test"
+        )
+        assert dict_values[SIMULATION_SETTINGS][PATH_OUTPUT_FOLDER] == "test"
+        assert dict_values[SIMULATION_SETTINGS][
+            PATH_OUTPUT_FOLDER_INPUTS
+        ] == os.path.join("test", INPUT_FOLDER)
+
+    def test_load_processed_json_modified_content(self):
+        def modify(json_dict):
+            asset = list(json_dict[ENERGY_PRODUCTION].keys())[0]
+            json_dict[ENERGY_PRODUCTION][asset][LABEL] = "modified_label"
+
+        self.modify_processed_json(modify)
+        with pytest.raises(ProcessedJsonChecksumError):
+            B0.load_processed_json(self.path_processed_json)
+
+    def test_load_processed_json_without_checksum(self):
+        def modify(json_dict):
+            json_dict.pop(PROCESSED_JSON_CHECKSUM)
+
+        self.modify_processed_json(modify)
+        with pytest.raises(ProcessedJsonChecksumError):
+            B0.load_processed_json(self.path_processed_json)
+
+    def test_compute_processed_json_checksum_depends_on_content(self):
+        json_dict = {SIMULATION_SETTINGS: {VALUE: 1}}
+        checksum = B0.compute_processed_json_checksum(json_dict)
+        json_dict.update({PROCESSED_JSON_CHECKSUM: checksum})
+        assert (
+            B0.compute_processed_json_checksum(json_dict) == checksum
+        ), f"The {PROCESSED_JSON_CHECKSUM} itself should not be considered for the checksum."
+        with mock.patch.object(B0, "version_num", "0.0.0"):
+            assert (
+                B0.compute_processed_json_checksum(json_dict) != checksum
+            ), f"The checksum should depend on the MVS version."
+        json_dict[SIMULATION_SETTINGS][VALUE] = 2
+        assert (
+            B0.compute_processed_json_checksum(json_dict) != checksum
+        ), f"The checksum should depend on the content of the processed json file."
+
+    def teardown_method(self):
+        if os.path.exists(self.test_out_path):
+            shutil.rmtree(self.test_out_path, ignore_errors=True)
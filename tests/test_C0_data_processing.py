@@ -1,13 +1,16 @@
+import os
 import pandas as pd
 import numpy as np
 import pytest
 import logging
 import copy
+import mock
 from copy import deepcopy
 
+import multi_vector_simulator.B0_data_input_json as B0
 import multi_vector_simulator.C0_data_processing as C0
 
-from multi_vector_simulator.utils.constants import TYPE_BOOL
+from multi_vector_simulator.utils.constants import TYPE_BOOL, INPUT_FOLDER
 from multi_vector_simulator.utils.constants_json_strings import (
     UNIT,
     PROJECT_DATA,
@@ -83,9 +86,15 @@ from multi_vector_simulator.utils.constants_json_strings import (
     TIMESERIES_TOTAL,
     TIMESERIES_AVERAGE,
     TIMESERIES_NORMALIZED,
+    STORAGE_CAPACITY,
+    INPUT_POWER,
+    OUTPUT_POWER,
+    ASSET_TOPOLOGY,
 )
 from multi_vector_simulator.utils.exceptions import InvalidPeakDemandPricingPeriodsError
 
+from _constants import JSON_PATH, TEST_REPO_PATH
+
 
 def test_add_economic_parameters():
     economic_parameters = {
@@ -518,6 +527,100 @@ def test_evaluate_lifetime_costs():
         assert k in dict_asset, f"Function does not add {k} to the asset dictionary."
 
 
+# Lifetime costs of the assets of test_evaluate_lifetime_costs_of_assets(), as evaluated for
+# each asset with the scalar functions of C2
+EXPECTED_LIFETIME_COSTS_OF_ASSETS = [
+    {
+        LIFETIME_SPECIFIC_COST: (152.40976183724848, "unit"),
+        LIFETIME_SPECIFIC_COST_OM: (0, "un"),
+        ANNUITY_SPECIFIC_INVESTMENT_AND_OM: (15.240976183724849, "unit/year"),
+        SIMULATION_ANNUITY: (0.41756099133492736, "currency/unit/evaluated_period",),
+        LIFETIME_PRICE_DISPATCH: (7, "unit/hour"),
+        SPECIFIC_REPLACEMENT_COSTS_INSTALLED: (42.40976183724846, "unit"),
+        SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED: (42.40976183724846, "unit"),
+    },
+    {
+        LIFETIME_SPECIFIC_COST: (111.10000000000001, "unit"),
+        LIFETIME_SPECIFIC_COST_OM: (35, "un"),
+        ANNUITY_SPECIFIC_INVESTMENT_AND_OM: (16.11, "unit/year"),
+        SIMULATION_ANNUITY: (0.4413698630136986, "currency/unit/evaluated_period"),
+        LIFETIME_PRICE_DISPATCH: (7, "unit/hour"),
+        SPECIFIC_REPLACEMENT_COSTS_INSTALLED: (23.631411324239593, "unit"),
+        SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED: (0, "unit"),
+    },
+    {
+        LIFETIME_SPECIFIC_COST: (106.64072831189704, "unit"),
+        LIFETIME_SPECIFIC_COST_OM: (70, "un"),
+        ANNUITY_SPECIFIC_INVESTMENT_AND_OM: (20.664072831189706, "unit/year"),
+        SIMULATION_ANNUITY: (0.5661389816764304, "currency/unit/evaluated_period"),
+        LIFETIME_PRICE_DISPATCH: (7, "unit/hour"),
+        SPECIFIC_REPLACEMENT_COSTS_INSTALLED: (17.380481367737264, "unit"),
+        SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED: (-5.559271688102966, "unit"),
+    },
+]
+
+
+def test_evaluate_lifetime_costs_of_assets():
+    settings = {EVALUATED_PERIOD: {VALUE: 10}}
+    economic_data = {
+        PROJECT_DURATION: {VALUE: 20},
+        DISCOUNTFACTOR: {VALUE: 0.1},
+        TAX: {VALUE: 0.1},
+        CRF: {VALUE: 0.1},
+        ANNUITY_FACTOR: {VALUE: 7},
+    }
+
+    list_of_dict_assets = []
+    for i, (lifetime, age_installed) in enumerate([(10, 0), (20, 5), (30, 12)]):
+        list_of_dict_assets.append(
+            {
+                SPECIFIC_COSTS_OM: {VALUE: 5 * i, UNIT: "unit"},
+                SPECIFIC_COSTS: {VALUE: 100 + i, UNIT: "unit"},
+                DISPATCH_PRICE: {VALUE: 1, UNIT: "unit"},
+                LIFETIME: {VALUE: lifetime},
+                UNIT: UNIT,
+                AGE_INSTALLED: {VALUE: age_installed},
+                LABEL: f"test_{i}",
+            }
+        )
+
+    C0.evaluate_lifetime_costs_of_assets(settings, economic_data, list_of_dict_assets)
+    for dict_asset, expected_costs in zip(
+        list_of_dict_assets, EXPECTED_LIFETIME_COSTS_OF_ASSETS
+    ):
+        for k, (value, unit) in expected_costs.items():
+            assert dict_asset[k][VALUE] == pytest.approx(
+                value
+            ), f"The batched evaluation of {k} differs from the evaluation per asset for asset {dict_asset[LABEL]}."
+            assert dict_asset[k][UNIT] == unit
+
+
+def test_get_assets_with_costs():
+    dict_values = {
+        ENERGY_PROVIDERS: {"dso": {LABEL: "dso"}},
+        ENERGY_CONVERSION: {"transformer": {LABEL: "transformer"}},
+        ENERGY_STORAGE: {
+            "ess": {
+                STORAGE_CAPACITY: {LABEL: "capacity"},
+                INPUT_POWER: {LABEL: "input"},
+                OUTPUT_POWER: {LABEL: "output"},
+            }
+        },
+        ENERGY_PRODUCTION: {"pv": {LABEL: "pv"}},
+        ENERGY_CONSUMPTION: {"demand": {LABEL: "demand"}},
+    }
+    labels = [dict_asset[LABEL] for dict_asset in C0.get_assets_with_costs(dict_values)]
+    assert labels == [
+        "dso",
+        "transformer",
+        "capacity",
+        "input",
+        "output",
+        "pv",
+        "demand",
+    ]
+
+
 group = "GROUP"
 asset = "ASSET"
 subasset = "SUBASSET"
@@ -1146,6 +1249,131 @@ def test_replace_nans_in_timeseries_with_0(caplog):
     assert timeseries[1] == 0, f"The NaN was not replaced by zero!"
 
 
+def load_test_input():
+    return B0.load_json(
+        JSON_PATH,
+        path_input_folder=os.path.join(TEST_REPO_PATH, INPUT_FOLDER),
+        path_output_folder=os.path.join(TEST_REPO_PATH, "MVS_outputs"),
+        move_copy=False,
+    )
+
+
+def get_processed_test_input():
+    dict_values = load_test_input()
+    fingerprints = C0.get_preprocessing_fingerprints(dict_values)
+    C0.all(dict_values)
+    return dict_values, fingerprints
+
+
+def assert_all_incremental_equals_all(modify_input):
+    processed_dict_values, processed_fingerprints = get_processed_test_input()
+
+    dict_values = load_test_input()
+    modify_input(dict_values)
+    C0.all(dict_values)
+
+    dict_values_incremental = load_test_input()
+    modify_input(dict_values_incremental)
+    C0.all_incremental(
+        dict_values_incremental,
+        processed_dict_values,
+        processed_fingerprints,
+        C0.get_preprocessing_fingerprints(dict_values_incremental),
+    )
+
+    assert C0.fingerprint(dict_values) == C0.fingerprint(
+        dict_values_incremental
+    ), f"The incremental pre-processing does not result in the same dict_values as the pre-processing of all assets."
+
+
+def test_all_incremental_equals_all_for_changed_asset():
+    def modify_input(dict_values):
+        asset = list(dict_values[ENERGY_PRODUCTION].keys())[0]
+        dict_values[ENERGY_PRODUCTION][asset][SPECIFIC_COSTS][VALUE] += 100
+
+    assert_all_incremental_equals_all(modify_input)
+
+
+def test_all_incremental_equals_all_for_changed_energy_provider():
+    def modify_input(dict_values):
+        dso = list(dict_values[ENERGY_PROVIDERS].keys())[0]
+        dict_values[ENERGY_PROVIDERS][dso][ENERGY_PRICE][VALUE] += 0.1
+
+    assert_all_incremental_equals_all(modify_input)
+
+
+def test_all_incremental_equals_all_for_changed_economic_data():
+    def modify_input(dict_values):
+        dict_values[ECONOMIC_DATA][DISCOUNTFACTOR][VALUE] = 0.1
+        dict_values[ECONOMIC_DATA][PROJECT_DURATION][VALUE] = 15
+
+    assert_all_incremental_equals_all(modify_input)
+
+
+def test_all_incremental_does_not_reprocess_unchanged_assets():
+    processed_dict_values, processed_fingerprints = get_processed_test_input()
+    dict_values = load_test_input()
+    asset = list(dict_values[ENERGY_PRODUCTION].keys())[0]
+    dict_values[ENERGY_PRODUCTION][asset][SPECIFIC_COSTS][VALUE] += 100
+    fingerprints = C0.get_preprocessing_fingerprints(dict_values)
+
+    with mock.patch.object(
+        C0, "energyProduction", wraps=C0.energyProduction
+    ) as energy_production, mock.patch.object(
+        C0, "energyConsumption", wraps=C0.energyConsumption
+    ) as energy_consumption:
+        C0.all_incremental(
+            dict_values, processed_dict_values, processed_fingerprints, fingerprints
+        )
+
+    assert energy_production.call_args[1]["asset_keys"] == [
+        asset
+    ], f"Only the changed asset {asset} should be pre-processed again."
+    assert (
+        energy_consumption.called is False
+    ), f"The unchanged energy consumption assets should not be pre-processed again."
+
+
+def test_get_assets_to_reprocess_topology_changed():
+    dict_values = load_test_input()
+    previous_fingerprints = C0.get_preprocessing_fingerprints(dict_values)
+    asset = list(dict_values[ENERGY_PRODUCTION].keys())[0]
+    dict_values[ENERGY_PRODUCTION][asset][OUTFLOW_DIRECTION] = "new_bus"
+    assert (
+        C0.get_assets_to_reprocess(
+            previous_fingerprints, C0.get_preprocessing_fingerprints(dict_values)
+        )
+        is None
+    ), f"A change of the asset topology should require the pre-processing of all assets."
+
+
+def test_get_assets_to_reprocess_asset_changed():
+    dict_values = load_test_input()
+    previous_fingerprints = C0.get_preprocessing_fingerprints(dict_values)
+    asset = list(dict_values[ENERGY_PRODUCTION].keys())[0]
+    dict_values[ENERGY_PRODUCTION][asset][SPECIFIC_COSTS][VALUE] += 100
+    assets_to_reprocess = C0.get_assets_to_reprocess(
+        previous_fingerprints, C0.get_preprocessing_fingerprints(dict_values)
+    )
+    assert assets_to_reprocess[ENERGY_PRODUCTION] == [asset]
+    for group in [ENERGY_PROVIDERS, ENERGY_CONVERSION, ENERGY_STORAGE]:
+        assert (
+            assets_to_reprocess[group] == []
+        ), f"No asset of {group} should be pre-processed again."
+
+
+def test_get_preprocessing_fingerprints():
+    dict_values = load_test_input()
+    fingerprints = C0.get_preprocessing_fingerprints(dict_values)
+    for k in [SIMULATION_SETTINGS, ENERGY_BUSSES, ECONOMIC_DATA, ASSET_TOPOLOGY]:
+        assert k in fingerprints, f"The fingerprint of {k} is missing."
+    for group in [ENERGY_PROVIDERS, ENERGY_PRODUCTION]:
+        assert set(fingerprints[group].keys()) == set(dict_values[group].keys())
+    assert fingerprints == C0.get_preprocessing_fingerprints(
+        load_test_input()
+    ), f"The fingerprints of identical inputs should be identical."
+
+
 """
 
 def test_asess_energyVectors_and_add_to_project_data():
@@ -127,6 +127,29 @@ def test_capex_from_investment_lifetime_bigger_than_project_life():
     assert specific_replacement_costs_optimized < 0
 
 
+def test_capex_from_investment_vectorized_equals_capex_from_investment():
+    """
+
+    Tests whether the array-capable capex calculation returns the same values as the scalar one for each asset
+    """
+    lifetimes = list(lifetime.values())
+    ages = [0, 3, 10]
+    (
+        specific_capex,
+        specific_replacement_costs_optimized,
+        specific_replacement_costs_installed,
+    ) = C2.capex_from_investment_vectorized(
+        investment_t0, lifetimes, project_life, discount_factor, tax, ages,
+    )
+    for i, (asset_lifetime, age) in enumerate(zip(lifetimes, ages)):
+        expected = C2.capex_from_investment(
+            investment_t0, asset_lifetime, project_life, discount_factor, tax, age,
+        )
+        assert specific_capex[i] == pytest.approx(expected[0])
+        assert specific_replacement_costs_optimized[i] == pytest.approx(expected[1])
+        assert specific_replacement_costs_installed[i] == pytest.approx(expected[2])
+
+
 def test_annuity():
     """
 
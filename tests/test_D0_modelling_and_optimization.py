@@ -1,3 +1,5 @@
+import gzip
+import logging
 import os
 import shutil
 import argparse
@@ -9,6 +11,7 @@ import mock
 
 from multi_vector_simulator.cli import main
 import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D5_model_statistics as D5
 from multi_vector_simulator.B0_data_input_json import load_json
 
 from multi_vector_simulator.utils.constants_json_strings import (
@@ -30,12 +33,30 @@ from multi_vector_simulator.utils.constants_json_strings import (
     SIMULTATION_TIME,
     ASSET_DICT,
     ENERGY_VECTOR,
+    SOLVER,
+    SOLVER_THREADS,
+    SOLVER_TIME_LIMIT,
+    SOLVER_MIP_GAP,
+    SOLVER_PRESOLVE,
+    SOLVER_METHOD,
+    SOLVER_OPTIONS,
+    SOLVER_INTERFACE,
+    LP_FILE_FORMAT,
+    LP_FILE_SYMBOLIC_LABELS,
+    LP_FILE_COMPRESSION,
+    LP_FILE_FROM_SOLVER,
+    PROFILE_MODEL_CONSTRUCTION,
+    MODEL_CONSTRUCTION_PROFILE,
 )
+from multi_vector_simulator.utils import model_profiling
 
 from multi_vector_simulator.utils.exceptions import (
     MVSOemofError,
     WrongOemofAssetForGroupError,
     UnknownOemofAssetType,
+    SolverNotAvailableError,
+    InvalidSolverOptionError,
+    InvalidLpFileOptionError,
 )
 
 
@@ -228,10 +249,317 @@ def test_if_lp_file_is_stored_to_file_if_output_lp_file_false(dict_values):
     assert os.path.exists(path_lp_file) is False
 
 
+def lp_file_settings(dict_values, **settings):
+    dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE].update({VALUE: True})
+    for setting, value in settings.items():
+        dict_values[SIMULATION_SETTINGS].update({setting: {VALUE: value}})
+    return dict_values
+
+
+def test_get_lp_file_options_default(dict_values):
+    lp_file_options = D0.model_building.get_lp_file_options(
+        lp_file_settings(dict_values)
+    )
+    assert lp_file_options == {
+        PATH_OUTPUT_FOLDER: TEST_OUTPUT_PATH,
+        LP_FILE_FORMAT: "lp",
+        LP_FILE_SYMBOLIC_LABELS: True,
+        LP_FILE_COMPRESSION: None,
+        LP_FILE_FROM_SOLVER: False,
+    }
+
+
+def test_get_lp_file_options_output_lp_file_false(dict_values):
+    dict_values[SIMULATION_SETTINGS][OUTPUT_LP_FILE].update({VALUE: False})
+    assert D0.model_building.get_lp_file_options(dict_values) is None
+
+
+def test_get_lp_file_options_invalid_format_raises_error(dict_values):
+    with pytest.raises(InvalidLpFileOptionError):
+        D0.model_building.get_lp_file_options(
+            lp_file_settings(dict_values, **{LP_FILE_FORMAT: "nl"})
+        )
+
+
+def test_get_lp_file_options_invalid_compression_raises_error(dict_values):
+    with pytest.raises(InvalidLpFileOptionError):
+        D0.model_building.get_lp_file_options(
+            lp_file_settings(dict_values, **{LP_FILE_COMPRESSION: "zip"})
+        )
+
+
+def build_local_energy_system(dict_values):
+    model, dict_model = D0.model_building.initialize(dict_values)
+    model = D0.model_building.adding_assets_to_energysystem_model(
+        dict_values, dict_model, model
+    )
+    return model, solph.Model(model)
+
+
+def test_store_lp_file_mps_without_symbolic_labels(dict_values):
+    dict_values = lp_file_settings(
+        dict_values, **{LP_FILE_FORMAT: "mps", LP_FILE_SYMBOLIC_LABELS: False}
+    )
+    model, local_energy_system = build_local_energy_system(dict_values)
+    assert D0.model_building.store_lp_file(dict_values, local_energy_system) is None
+    assert os.path.exists(os.path.join(TEST_OUTPUT_PATH, "lp_file.mps")) is True
+    labels = pd.read_csv(os.path.join(TEST_OUTPUT_PATH, "lp_file_labels.csv"))
+    assert "x1" in labels["solver_label"].values
+    assert labels["model_label"].str.startswith("flow[").any()
+
+
+def test_store_lp_file_compressed(dict_values):
+    dict_values = lp_file_settings(dict_values, **{LP_FILE_COMPRESSION: "gzip"})
+    model, local_energy_system = build_local_energy_system(dict_values)
+    D0.model_building.store_lp_file(dict_values, local_energy_system)
+    assert os.path.exists(path_lp_file) is False
+    with gzip.open(path_lp_file + ".gz", "rt") as lp_file:
+        assert "objective" in lp_file.read()
+
+
+@pytest.mark.parametrize("symbolic_labels", [True, False])
+def test_store_lp_file_from_solver(dict_values, symbolic_labels):
+    model, local_energy_system = build_local_energy_system(dict_values)
+    D0.model_building.simulating(dict_values, model, local_energy_system)
+    objective_value = dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+
+    dict_values = lp_file_settings(
+        dict_values,
+        **{LP_FILE_FROM_SOLVER: True, LP_FILE_SYMBOLIC_LABELS: symbolic_labels},
+    )
+    model, local_energy_system = build_local_energy_system(dict_values)
+    lp_file_options = D0.model_building.store_lp_file(dict_values, local_energy_system)
+    assert os.path.exists(path_lp_file) is False
+    D0.model_building.simulating(
+        dict_values, model, local_energy_system, lp_file_options=lp_file_options
+    )
+    assert os.path.exists(path_lp_file) is True
+    # the solution of the lp file is loaded into the model
+    assert dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE] == pytest.approx(
+        objective_value
+    )
+    assert local_energy_system.objective() == pytest.approx(objective_value)
+
+
 path_oemof_file = os.path.join(TEST_OUTPUT_PATH, "oemof_simulation_results.oemof")
 
 
 def test_if_simulation_results_added_to_dict_values(dict_values):
     D0.run_oemof(dict_values)
-    for k in (LABEL, OBJECTIVE_VALUE, SIMULTATION_TIME):
+    for k in (
+        LABEL,
+        OBJECTIVE_VALUE,
+        SIMULTATION_TIME,
+        SOLVER,
+        SOLVER_OPTIONS,
+        SOLVER_INTERFACE,
+    ):
         assert k in dict_values[SIMULATION_RESULTS].keys()
+
+
+def solver_settings(solver=None, **settings):
+    simulation_settings = {key: {VALUE: value} for key, value in settings.items()}
+    if solver is not None:
+        simulation_settings.update({SOLVER: {VALUE: solver}})
+    return {SIMULATION_SETTINGS: simulation_settings}
+
+
+def test_get_solver_options_default():
+    solver, cmdline_options = D0.model_building.get_solver_options(solver_settings())
+    assert solver == "cbc"
+    assert cmdline_options == {"ratioGap": 0.03}
+
+
+def test_get_solver_options_cbc():
+    solver, cmdline_options = D0.model_building.get_solver_options(
+        solver_settings(
+            "cbc",
+            **{
+                SOLVER_THREADS: 2.0,
+                SOLVER_TIME_LIMIT: 60,
+                SOLVER_MIP_GAP: 0.01,
+                SOLVER_PRESOLVE: False,
+                SOLVER_METHOD: "barrier",
+            },
+        )
+    )
+    assert cmdline_options == {
+        "threads": 2,
+        "sec": 60,
+        "ratioGap": 0.01,
+        "presolve": "off",
+        "barrier": "",
+    }
+
+
+def test_get_solver_options_glpk():
+    solver, cmdline_options = D0.model_building.get_solver_options(
+        solver_settings("glpk", **{SOLVER_PRESOLVE: True, SOLVER_METHOD: "simplex"})
+    )
+    assert solver == "glpk"
+    assert cmdline_options == {"mipgap": 0.03, "presol": "", "simplex": ""}
+
+
+def test_get_solver_options_unsupported_option_ignored(caplog):
+    solver, cmdline_options = D0.model_building.get_solver_options(
+        solver_settings("glpk", **{SOLVER_THREADS: 2})
+    )
+    assert cmdline_options == {"mipgap": 0.03}
+    assert SOLVER_THREADS in caplog.text
+
+
+def test_get_solver_options_unknown_solver():
+    solver, cmdline_options = D0.model_building.get_solver_options(
+        solver_settings("some_solver")
+    )
+    assert solver == "some_solver"
+    assert cmdline_options == {}
+
+
+def test_get_solver_options_invalid_method_raises_error():
+    with pytest.raises(InvalidSolverOptionError):
+        D0.model_building.get_solver_options(
+            solver_settings(**{SOLVER_METHOD: "something"})
+        )
+
+
+def test_get_solver_options_invalid_presolve_raises_error():
+    with pytest.raises(InvalidSolverOptionError):
+        D0.model_building.get_solver_options(solver_settings(**{SOLVER_PRESOLVE: "on"}))
+
+
+def test_check_solver_availability():
+    D0.model_building.check_solver_availability("cbc")
+
+
+def test_check_solver_availability_unknown_solver_raises_error():
+    with pytest.raises(SolverNotAvailableError):
+        D0.model_building.check_solver_availability("some_solver")
+
+
+def test_get_solver_interface_default():
+    solver_name, solver_interface = D0.model_building.get_solver_interface(
+        solver_settings(), "cbc"
+    )
+    assert solver_name == "cbc"
+    assert solver_interface == "shell"
+
+
+def test_get_solver_interface_falls_back_to_shell(caplog):
+    solver_name, solver_interface = D0.model_building.get_solver_interface(
+        solver_settings(**{SOLVER_INTERFACE: "direct"}), "glpk"
+    )
+    assert solver_name == "glpk"
+    assert solver_interface == "shell"
+    assert "direct interface" in caplog.text
+
+
+def test_get_solver_interface_persistent_cbc_falls_back_to_shell(caplog):
+    solver_name, solver_interface = D0.model_building.get_solver_interface(
+        solver_settings(**{SOLVER_INTERFACE: "persistent"}), "cbc"
+    )
+    assert solver_name == "cbc"
+    assert solver_interface == "shell"
+    assert "persistent interface" in caplog.text
+
+
+def test_get_solver_interface_invalid_value_raises_error():
+    with pytest.raises(InvalidSolverOptionError):
+        D0.model_building.get_solver_interface(
+            solver_settings(**{SOLVER_INTERFACE: "something"}), "cbc"
+        )
+
+
+def test_run_oemof_with_solver_options(dict_values):
+    dict_values[SIMULATION_SETTINGS].update(
+        {SOLVER_PRESOLVE: {VALUE: False}, SOLVER_METHOD: {VALUE: "barrier"}}
+    )
+    D0.run_oemof(dict_values)
+    assert dict_values[SIMULATION_RESULTS][SOLVER] == "cbc"
+    assert dict_values[SIMULATION_RESULTS][SOLVER_OPTIONS] == {
+        "ratioGap": 0.03,
+        "presolve": "off",
+        "barrier": "",
+    }
+
+
+class SolvedModel:
+    def __init__(self, status, termination_condition):
+        self.solver_results = {
+            "Solver": [
+                {"Status": status, "Termination condition": termination_condition}
+            ]
+        }
+
+
+def test_check_solver_status_optimal():
+    D0.model_building.check_solver_status(SolvedModel("ok", "optimal"))
+
+
+def test_check_solver_status_infeasible_raises_error():
+    with pytest.raises(MVSOemofError, match="not properly connected"):
+        D0.model_building.check_solver_status(SolvedModel("warning", "infeasible"))
+
+
+def test_check_solver_status_not_optimal_raises_error():
+    with pytest.raises(MVSOemofError, match="maxTimeLimit"):
+        D0.model_building.check_solver_status(SolvedModel("aborted", "maxTimeLimit"))
+
+
+def energy_system_with_investment():
+    model = oemof.solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=3, freq="H")
+    )
+    electricity = oemof.solph.Bus(label="electricity")
+    model.add(
+        electricity,
+        oemof.solph.Source(
+            label="pv",
+            outputs={
+                electricity: oemof.solph.Flow(
+                    max=[0.5] * 3, investment=oemof.solph.Investment(ep_costs=0.1)
+                )
+            },
+        ),
+        oemof.solph.Sink(
+            label="demand",
+            inputs={electricity: oemof.solph.Flow(fix=[1] * 3, nominal_value=1)},
+        ),
+    )
+    return model
+
+
+def test_create_model_with_profiling():
+    profile = model_profiling.ConstructionProfile()
+    with model_profiling.construction_profile(profile):
+        local_energy_system = D0.model_building.create_model(
+            energy_system_with_investment()
+        )
+    components = [row[model_profiling.PROFILE_COMPONENT] for row in profile.table()]
+    assert "InvestmentFlow" in components
+    assert "objective" in components
+    reference = oemof.solph.Model(energy_system_with_investment())
+    assert str(local_energy_system.objective.expr) == str(reference.objective.expr)
+    assert D5.get_model_size(local_energy_system) == D5.get_model_size(reference)
+
+
+def test_run_oemof_with_profiling(dict_values, caplog):
+    dict_values[SIMULATION_SETTINGS].update({PROFILE_MODEL_CONSTRUCTION: {VALUE: True}})
+    with caplog.at_level(logging.INFO):
+        D0.run_oemof(dict_values)
+    table = dict_values[SIMULATION_RESULTS][MODEL_CONSTRUCTION_PROFILE]
+    categories = {row[model_profiling.PROFILE_CATEGORY] for row in table}
+    assert categories == {
+        model_profiling.CATEGORY_D1,
+        model_profiling.CATEGORY_D2,
+        model_profiling.CATEGORY_OEMOF,
+    }
+    times = [row[model_profiling.PROFILE_TIME] for row in table]
+    assert times == sorted(times, reverse=True)
+    assert "Profile of the model construction" in caplog.text
+    assert model_profiling.get_active_profile() is None
+
+
+def test_run_oemof_without_profiling(dict_values):
+    D0.run_oemof(dict_values)
+    assert MODEL_CONSTRUCTION_PROFILE not in dict_values[SIMULATION_RESULTS]
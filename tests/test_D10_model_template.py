@@ -0,0 +1,189 @@
+import copy
+import os
+import pickle
+
+import pandas as pd
+import pytest
+from oemof import solph
+
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D10_model_template as D10
+from multi_vector_simulator.B0_data_input_json import load_json
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    ENERGY_PROVIDERS,
+    ENERGY_CONSUMPTION,
+    ENERGY_PRODUCTION,
+    ENERGY_CONVERSION,
+    DISPATCH_PRICE,
+    TIMESERIES,
+    TIMESERIES_NORMALIZED,
+    INSTALLED_CAP,
+    OPTIMIZE_CAP,
+    OBJECTIVE_VALUE,
+    MODEL_SIZE,
+    ROLLING_HORIZON_WINDOW,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidModelTemplateError
+
+from _constants import (
+    TEST_REPO_PATH,
+    TEST_INPUT_DIRECTORY,
+    JSON_FNAME,
+)
+
+JSON_PATH = os.path.join(
+    TEST_REPO_PATH, TEST_INPUT_DIRECTORY, "inputs_for_D0", JSON_FNAME
+)
+
+
+@pytest.fixture(scope="module")
+def dict_values():
+    return load_json(JSON_PATH, flag_missing_values=False)
+
+
+@pytest.fixture(scope="module")
+def model_template(dict_values):
+    return D10.ModelTemplate(dict_values)
+
+
+def energy_system():
+    """Diesel generator with a fixed efficiency and pv plant supplying a demand"""
+    model = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=3, freq="H")
+    )
+    fuel = solph.Bus(label="fuel")
+    electricity = solph.Bus(label="electricity")
+    model.add(
+        fuel,
+        electricity,
+        solph.Source(label="diesel", outputs={fuel: solph.Flow(variable_costs=1)}),
+        solph.Transformer(
+            label="generator",
+            inputs={fuel: solph.Flow()},
+            outputs={electricity: solph.Flow(nominal_value=10)},
+            conversion_factors={electricity: 0.3},
+        ),
+        solph.Source(
+            label="pv",
+            outputs={
+                electricity: solph.Flow(
+                    max=[0.5, 0.2, 0], investment=solph.Investment(ep_costs=0.1)
+                )
+            },
+        ),
+        solph.Sink(
+            label="demand",
+            inputs={electricity: solph.Flow(fix=[3, 2, 1], nominal_value=1)},
+        ),
+    )
+    return model
+
+
+def dispatch_price_variant(dict_values, factor):
+    variant = copy.deepcopy(dict_values)
+    for asset in variant[ENERGY_PROVIDERS].values():
+        asset[DISPATCH_PRICE][VALUE] *= factor
+    return variant
+
+
+def demand_variant(dict_values, factor):
+    variant = copy.deepcopy(dict_values)
+    for asset in variant[ENERGY_CONSUMPTION].values():
+        asset[TIMESERIES] = asset[TIMESERIES] * factor
+    return variant
+
+
+def pv_variant(dict_values, factor):
+    variant = copy.deepcopy(dict_values)
+    asset = variant[ENERGY_PRODUCTION]["pv_plant_01"]
+    asset[TIMESERIES] = asset[TIMESERIES] * factor
+    asset[TIMESERIES_NORMALIZED] = asset[TIMESERIES_NORMALIZED] * factor
+    return variant
+
+
+def capacity_variant(dict_values, factor):
+    variant = copy.deepcopy(dict_values)
+    variant[ENERGY_CONVERSION]["transformer_station_in"][INSTALLED_CAP][VALUE] *= factor
+    return variant
+
+
+def test_check_template_settings_unsupported_setting_raises_error(dict_values):
+    variant = copy.deepcopy(dict_values)
+    variant[SIMULATION_SETTINGS][ROLLING_HORIZON_WINDOW] = {VALUE: 24}
+    with pytest.raises(InvalidModelTemplateError):
+        D10.check_template_settings(variant)
+
+
+def test_get_attributes():
+    attributes = D10.get_attributes(
+        energy_system(),
+        D10.FLOW_PARAMETERS,
+        D10.INVESTMENT_PARAMETERS,
+        D10.STORAGE_PARAMETERS,
+    )
+    assert ("pv", "electricity", "max") in attributes
+    assert ("pv", "electricity", "investment", "ep_costs") in attributes
+    assert ("generator", "electricity", "conversion_factors") in attributes
+    assert ("demand", "electricity", "fix") not in attributes
+    assert ("electricity", "demand", "fix") in attributes
+    # the fix of the flows without fixed time series is not defined
+    assert ("diesel", "fuel", "fix") not in attributes
+    assert ("generator", "electricity", "investment", "ep_costs") not in attributes
+
+
+def test_get_fixed_variables(model_template):
+    local_energy_system = model_template.local_energy_system
+    fixed_variables = D10.get_fixed_variables(local_energy_system)
+    # the flows of the three demands are fixed for each timestep
+    assert len(fixed_variables) == 3 * len(local_energy_system.TIMESTEPS)
+    for variable, value in fixed_variables:
+        assert variable.fixed is True
+        assert value.is_expression_type() is True
+
+
+@pytest.mark.parametrize(
+    "variant_function,factor",
+    [
+        (dispatch_price_variant, 0.5),
+        (dispatch_price_variant, 2),
+        (demand_variant, 1.5),
+        (pv_variant, 0.8),
+        (capacity_variant, 0.8),
+    ],
+)
+def test_model_template_run(dict_values, model_template, variant_function, factor):
+    variant = variant_function(dict_values, factor)
+    reference = copy.deepcopy(variant)
+    model_template.run(variant)
+    D0.run_oemof(reference)
+    assert variant[SIMULATION_RESULTS][OBJECTIVE_VALUE] == pytest.approx(
+        reference[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+    )
+    assert MODEL_SIZE in variant[SIMULATION_RESULTS]
+
+
+def test_bind_incompatible_variant_raises_error(dict_values, model_template):
+    variant = copy.deepcopy(dict_values)
+    asset = next(
+        asset
+        for asset in variant[ENERGY_CONVERSION].values()
+        if asset[OPTIMIZE_CAP][VALUE] is False
+    )
+    asset[OPTIMIZE_CAP][VALUE] = True
+    with pytest.raises(InvalidModelTemplateError):
+        model_template.bind(variant)
+
+
+def test_model_template_pickle(dict_values, model_template):
+    unpickled_template = pickle.loads(pickle.dumps(model_template))
+    variant = dispatch_price_variant(dict_values, 2)
+    reference = copy.deepcopy(variant)
+    unpickled_template.run(variant)
+    model_template.run(reference)
+    assert variant[SIMULATION_RESULTS][OBJECTIVE_VALUE] == pytest.approx(
+        reference[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+    )
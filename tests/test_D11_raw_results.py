@@ -0,0 +1,141 @@
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import multi_vector_simulator.B0_data_input_json as B0
+import multi_vector_simulator.C0_data_processing as C0
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D11_raw_results as D11
+import multi_vector_simulator.E0_evaluation as E0
+
+from multi_vector_simulator.utils.constants import (
+    INPUT_FOLDER,
+    PATH_OUTPUT_FOLDER,
+    RAW_RESULTS_FILE,
+)
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    STORE_RAW_RESULTS,
+    OBJECTIVE_VALUE,
+    TIME_INDEX,
+    ENERGY_PRODUCTION,
+    KPI,
+    KPI_SCALARS_DICT,
+    KPI_COST_MATRIX,
+    LABEL,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidRawResultsError
+
+from _constants import TEST_REPO_PATH, JSON_PATH
+
+
+@pytest.fixture(scope="module")
+def simulation(tmp_path_factory):
+    """Pre-processed inputs and results of their optimization, stored as raw results"""
+    path_output_folder = str(tmp_path_factory.mktemp("raw_results"))
+    dict_values = B0.load_json(
+        JSON_PATH,
+        path_input_folder=os.path.join(TEST_REPO_PATH, INPUT_FOLDER),
+        path_output_folder=path_output_folder,
+        move_copy=False,
+    )
+    C0.all(dict_values)
+    dict_values[SIMULATION_SETTINGS].update({STORE_RAW_RESULTS: {VALUE: True}})
+    dict_values_pre_processed = copy.deepcopy(dict_values)
+    results_meta, results_main = D0.run_oemof(dict_values)
+    return dict_values_pre_processed, dict_values, results_main, path_output_folder
+
+
+def test_is_raw_results_storage_activated_not_defined():
+    assert (
+        D11.is_raw_results_storage_activated(
+            {SIMULATION_SETTINGS: {PATH_OUTPUT_FOLDER: "outputs"}}
+        )
+        is False
+    ), f"The raw results should not be stored if {STORE_RAW_RESULTS} is not defined."
+
+
+def test_is_raw_results_storage_activated_true():
+    assert (
+        D11.is_raw_results_storage_activated(
+            {SIMULATION_SETTINGS: {STORE_RAW_RESULTS: {VALUE: True}}}
+        )
+        is True
+    )
+
+
+def test_is_raw_results_storage_activated_invalid_value_raises_error():
+    with pytest.raises(InvalidRawResultsError):
+        D11.is_raw_results_storage_activated(
+            {SIMULATION_SETTINGS: {STORE_RAW_RESULTS: {VALUE: "yes"}}}
+        )
+
+
+def test_store_and_load_raw_results(simulation):
+    (
+        dict_values_pre_processed,
+        dict_values,
+        results_main,
+        path_output_folder,
+    ) = simulation
+    path_file = os.path.join(path_output_folder, RAW_RESULTS_FILE)
+    assert os.path.isfile(
+        path_file
+    ), f"The raw results should be stored by D0.run_oemof() in {path_file} if {STORE_RAW_RESULTS} is True."
+
+    dict_values_reevaluated = copy.deepcopy(dict_values_pre_processed)
+    results_meta, results_main_reevaluated = D11.load_raw_results(
+        dict_values_reevaluated, path_file
+    )
+    assert (
+        results_meta["objective"]
+        == dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+        == dict_values_reevaluated[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+    )
+
+    E0.evaluate_dict(dict_values, results_main, None)
+    E0.evaluate_dict(dict_values_reevaluated, results_main_reevaluated, None)
+    for kpi, value in dict_values[KPI][KPI_SCALARS_DICT].items():
+        assert dict_values_reevaluated[KPI][KPI_SCALARS_DICT][kpi] == pytest.approx(
+            value
+        ), f"The KPI {kpi} of the re-evaluation should be the one of the simulation."
+    pd.testing.assert_frame_equal(
+        dict_values_reevaluated[KPI][KPI_COST_MATRIX], dict_values[KPI][KPI_COST_MATRIX]
+    )
+
+
+def test_load_raw_results_other_format_raises_error(simulation, tmpdir):
+    dict_values_pre_processed, _, _, path_output_folder = simulation
+    with np.load(os.path.join(path_output_folder, RAW_RESULTS_FILE)) as raw_results:
+        arrays = dict(raw_results)
+    arrays[D11.RAW_RESULTS_FORMAT_VERSION] = np.array(D11.RAW_RESULTS_FORMAT + 1)
+    path_file = os.path.join(tmpdir, RAW_RESULTS_FILE)
+    np.savez_compressed(path_file, **arrays)
+    with pytest.raises(InvalidRawResultsError):
+        D11.load_raw_results(copy.deepcopy(dict_values_pre_processed), path_file)
+
+
+def test_check_raw_results_other_time_index_raises_error(simulation):
+    dict_values_pre_processed = simulation[0]
+    time_index = dict_values_pre_processed[SIMULATION_SETTINGS][TIME_INDEX]
+    keys = [[[label, "bus"], "flow"] for label in ("pv", "demand")]
+    with pytest.raises(InvalidRawResultsError):
+        D11.check_raw_results(
+            dict_values_pre_processed, keys, time_index[1:], RAW_RESULTS_FILE
+        )
+
+
+def test_check_raw_results_missing_asset_raises_error(simulation):
+    dict_values_pre_processed = simulation[0]
+    dict_values = copy.deepcopy(dict_values_pre_processed)
+    asset = list(dict_values[ENERGY_PRODUCTION].keys())[0]
+    dict_values[ENERGY_PRODUCTION][asset][LABEL] = "new_asset"
+    with pytest.raises(InvalidRawResultsError):
+        D11.load_raw_results(
+            dict_values, os.path.join(simulation[3], RAW_RESULTS_FILE),
+        )
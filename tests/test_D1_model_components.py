@@ -1,6 +1,7 @@
 import json
 import os
 
+import numpy as np
 import oemof.solph as solph
 import pandas as pd
 import pytest
@@ -906,3 +907,47 @@ def test_check_optimize_cap_raise_error(get_json, get_model, get_busses):
             bus=busses,
             transformers={},
         )
+
+
+def asset_with_timeseries(prices):
+    time_index = pd.date_range("2020-01-01", periods=3, freq="H")
+    return {
+        LABEL: "pv",
+        TIMESERIES: pd.Series([1, 2, 3], index=time_index),
+        DISPATCH_PRICE: {VALUE: pd.Series(prices, index=time_index), UNIT: "currency"},
+        INSTALLED_CAP: {VALUE: 5},
+        INFLOW_DIRECTION: ["bus_1", "bus_2"],
+        TIMESERIES_PEAK: {VALUE: [0.5, pd.Series([0.1, 0.2, 0.3], index=time_index)]},
+    }
+
+
+def test_timeseries_to_arrays():
+    dict_asset = asset_with_timeseries([0.1, 0.2, 0.3])
+    dict_asset_arrays = D1.timeseries_to_arrays(dict_asset)
+    for array in (
+        dict_asset_arrays[TIMESERIES],
+        dict_asset_arrays[DISPATCH_PRICE][VALUE],
+        dict_asset_arrays[TIMESERIES_PEAK][VALUE][1],
+    ):
+        assert isinstance(array, np.ndarray)
+        assert array.dtype == np.float64
+        assert array.flags.c_contiguous
+    assert list(dict_asset_arrays[TIMESERIES]) == [1, 2, 3]
+    assert dict_asset_arrays[INSTALLED_CAP] == {VALUE: 5}
+    assert dict_asset_arrays[INFLOW_DIRECTION] == ["bus_1", "bus_2"]
+    assert dict_asset_arrays[TIMESERIES_PEAK][VALUE][0] == 0.5
+    assert isinstance(dict_asset[TIMESERIES], pd.Series)
+    assert isinstance(dict_asset[DISPATCH_PRICE][VALUE], pd.Series)
+
+
+def test_timeseries_to_arrays_interned():
+    interned_arrays = {}
+    first_asset = D1.timeseries_to_arrays(
+        asset_with_timeseries([0.1, 0.2, 0.3]), interned_arrays
+    )
+    second_asset = D1.timeseries_to_arrays(
+        asset_with_timeseries([0.1, 0.2, 0.4]), interned_arrays
+    )
+    assert first_asset[TIMESERIES] is second_asset[TIMESERIES]
+    assert first_asset[DISPATCH_PRICE][VALUE] is not second_asset[DISPATCH_PRICE][VALUE]
+    assert first_asset[TIMESERIES].flags.writeable is False
@@ -5,6 +5,8 @@ import mock
 import pandas as pd
 import logging
 import shutil
+import timeit
+import pyomo.environ as po
 
 import multi_vector_simulator.D2_model_constraints as D2
 import multi_vector_simulator.A0_initialization as A0
@@ -39,11 +41,15 @@ from multi_vector_simulator.utils.constants_json_strings import (
     EXCESS_SINK_POSTFIX,
     EXCESS,
     INFLOW_DIRECTION,
+    SIMULATION_SETTINGS,
+    TYPICAL_PERIOD_WEIGHTS,
 )
 
 from multi_vector_simulator.utils.constants import OUTPUT_FOLDER
 
 from _constants import (
+    EXECUTE_TESTS_ON,
+    TESTS_ON_MASTER,
     TEST_REPO_PATH,
     INPUT_FOLDER,
     PATH_INPUT_FILE,
@@ -265,6 +271,102 @@ def test_prepare_constraint_minimal_degree_of_autonomy():
         ), f"The expected value (exp[key]) of {key} for {DSO_source_name} is not met, but is of value {energy_provider_consumption_sources[DSO_source_name][key]}."
 
 
+def test_sum_of_flow_with_timestep_weights():
+    energy_system = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=3, freq="H")
+    )
+    bus = solph.Bus(label="bus")
+    source = solph.Source(label="source", outputs={bus: solph.Flow()})
+    energy_system.add(bus, source)
+    model = solph.Model(energy_system)
+    for t, value in enumerate([1, 2, 3]):
+        model.flow[source, bus, t].value = value
+
+    dict_values = {SIMULATION_SETTINGS: {}}
+    timestep_weights = D2.get_timestep_weights(dict_values)
+    assert timestep_weights is None
+    assert (
+        po.value(D2.sum_of_flow(model, source, bus, timestep_weights)) == 6
+    ), f"Without timestep weights the flow should be summed over all timesteps."
+
+    dict_values[SIMULATION_SETTINGS].update({TYPICAL_PERIOD_WEIGHTS: [2, 1, 3]})
+    timestep_weights = D2.get_timestep_weights(dict_values)
+    assert (
+        po.value(D2.sum_of_flow(model, source, bus, timestep_weights)) == 13
+    ), f"The flow of each timestep should be weighted by the timestep weight."
+
+
+def energy_system_with_sources(n_timesteps, n_sources):
+    """Model of a bus supplied by n_sources sources with emissions"""
+    energy_system = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=n_timesteps, freq="H")
+    )
+    bus = solph.Bus(label="bus")
+    energy_system.add(bus)
+    for number in range(n_sources):
+        energy_system.add(
+            solph.Source(
+                label=f"source {number}",
+                outputs={bus: solph.Flow(emission_factor=0.1 * (number + 1))},
+            )
+        )
+    return solph.Model(energy_system)
+
+
+def test_linear_expression():
+    model = energy_system_with_sources(n_timesteps=3, n_sources=2)
+    bus = model.es.groups["bus"]
+    sources = [model.es.groups["source 0"], model.es.groups["source 1"]]
+    for source in sources:
+        for t, value in enumerate([1, 2, 3]):
+            model.flow[source, bus, t].value = value
+
+    expression = D2.linear_expression(
+        [
+            D2.flow_terms(model, sources[0], bus, 2),
+            D2.flow_terms(model, sources[1], bus, [1, 0, -1], [2, 1, 3]),
+        ]
+    )
+    assert isinstance(expression, D2.LinearExpression)
+    assert po.value(expression) == 2 * 6 + (2 * 1 + 0 * 2 - 3 * 3)
+
+
+def test_emission_limit():
+    model = energy_system_with_sources(n_timesteps=3, n_sources=2)
+    D2.emission_limit(model, limit=10, timestep_weights=[2, 1, 3])
+    for (i, o) in model.flows:
+        for t in model.TIMESTEPS:
+            model.flow[i, o, t].value = 1
+    # emission factors of 0.1 and 0.2, sum of the timestep weights of 6
+    assert po.value(model.integral_limit_emission_factor) == pytest.approx(0.3 * 6)
+    assert model.integral_limit_emission_factor_constraint.upper == 10
+
+
+@pytest.mark.skipif(
+    EXECUTE_TESTS_ON not in (TESTS_ON_MASTER),
+    reason="Benchmark test deactivated, set env variable "
+    "EXECUTE_TESTS_ON to 'master' to run this test",
+)
+def test_benchmark_constraint_build_time():
+    """Build time of the emission limit for an increasing number of timesteps x assets"""
+    build_times = {}
+    for n_timesteps, n_sources in ((8760, 1), (8760, 4), (8760, 16), (4 * 8760, 4)):
+        model = energy_system_with_sources(n_timesteps, n_sources)
+        start = timeit.default_timer()
+        D2.emission_limit(model, limit=10)
+        build_times[(n_timesteps, n_sources)] = timeit.default_timer() - start
+        logging.info(
+            f"Emission limit with {n_timesteps} timesteps x {n_sources} assets built in "
+            f"{round(build_times[(n_timesteps, n_sources)], 3)} seconds."
+        )
+    # the build time grows linearly with the number of flow variables
+    time_per_variable = [
+        build_time / (n_timesteps * n_sources)
+        for (n_timesteps, n_sources), build_time in build_times.items()
+    ]
+    assert max(time_per_variable) < 3 * min(time_per_variable)
+
+
 class TestConstraints:
     def setup_class(self):
         """Run the simulation up to constraints adding in D2 and define class attributes."""
@@ -0,0 +1,329 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import oemof.solph as solph
+
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D3_timeseries_aggregation as D3
+from multi_vector_simulator.B0_data_input_json import load_json
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    ENERGY_CONSUMPTION,
+    ENERGY_PRODUCTION,
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    TIME_INDEX,
+    PERIODS,
+    TIMESTEP,
+    TIMESERIES,
+    VALUE,
+    UNIT,
+    UNIT_DAY,
+    UNIT_MINUTE,
+    TYPICAL_PERIODS,
+    TYPICAL_PERIOD_LENGTH,
+    TYPICAL_PERIOD_WEIGHTS,
+    AGGREGATION_ERROR,
+)
+from multi_vector_simulator.utils.exceptions import InvalidTypicalPeriodsError
+
+from _constants import (
+    TEST_REPO_PATH,
+    TEST_INPUT_DIRECTORY,
+    PATH_OUTPUT_FOLDER,
+    JSON_FNAME,
+)
+
+TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, "test_outputs")
+
+PERIOD_LENGTH = 24
+N_PERIODS = 6
+
+
+def simulation_settings(n_periods=N_PERIODS, typical_periods=None, length=None):
+    settings = {
+        TIMESTEP: {VALUE: 60, UNIT: UNIT_MINUTE},
+        PERIODS: n_periods * PERIOD_LENGTH,
+        TIME_INDEX: pd.date_range(
+            "2020-01-01", periods=n_periods * PERIOD_LENGTH, freq="60min"
+        ),
+    }
+    if typical_periods is not None:
+        settings.update({TYPICAL_PERIODS: {VALUE: typical_periods, UNIT: "factor"}})
+    if length is not None:
+        settings.update({TYPICAL_PERIOD_LENGTH: {VALUE: length, UNIT: UNIT_DAY}})
+    return settings
+
+
+def synthetic_dict_values(typical_periods=2):
+    """Periods 0, 2, 4 have a high demand, periods 1, 3, 5 a low demand"""
+    settings = simulation_settings(typical_periods=typical_periods)
+    daily_profile = np.sin(np.linspace(0, np.pi, PERIOD_LENGTH))
+    demand = np.concatenate(
+        [daily_profile * (10 if period % 2 == 0 else 1) for period in range(N_PERIODS)]
+    )
+    return {
+        SIMULATION_SETTINGS: settings,
+        ENERGY_CONSUMPTION: {
+            "demand": {TIMESERIES: pd.Series(demand, index=settings[TIME_INDEX])}
+        },
+        ENERGY_PRODUCTION: {
+            "pv": {
+                TIMESERIES: pd.Series(
+                    np.tile(daily_profile, N_PERIODS), index=settings[TIME_INDEX]
+                ),
+                "constant": pd.Series(
+                    np.ones(N_PERIODS * PERIOD_LENGTH), index=settings[TIME_INDEX]
+                ),
+            }
+        },
+    }
+
+
+def test_get_typical_period_settings_not_defined():
+    assert D3.get_typical_period_settings(simulation_settings()) == (None, None)
+
+
+def test_get_typical_period_settings_days():
+    settings = simulation_settings(typical_periods=2)
+    assert D3.get_typical_period_settings(settings) == (2, PERIOD_LENGTH)
+
+
+def test_get_typical_period_settings_weeks():
+    settings = simulation_settings(n_periods=14, typical_periods=1, length=7)
+    assert D3.get_typical_period_settings(settings) == (1, 7 * PERIOD_LENGTH)
+
+
+def test_get_typical_period_settings_negative_number_raises_error():
+    settings = simulation_settings(typical_periods=-1)
+    with pytest.raises(InvalidTypicalPeriodsError):
+        D3.get_typical_period_settings(settings)
+
+
+def test_get_typical_period_settings_indivisible_evaluated_period_raises_error():
+    settings = simulation_settings(typical_periods=1, length=4)
+    with pytest.raises(InvalidTypicalPeriodsError):
+        D3.get_typical_period_settings(settings)
+
+
+def test_get_time_series_features():
+    dict_values = synthetic_dict_values()
+    dict_values[ENERGY_CONSUMPTION]["demand"][TIMESERIES].iloc[3] = np.nan
+    features = D3.get_time_series_features(dict_values, PERIOD_LENGTH)
+    # the constant time series is not considered
+    assert features.shape == (N_PERIODS, 2 * PERIOD_LENGTH)
+    assert np.abs(features).max() == 1
+    assert np.isnan(features).any() == False
+
+
+def test_k_medoids_separates_distinct_periods():
+    features = D3.get_time_series_features(synthetic_dict_values(), PERIOD_LENGTH)
+    medoids, assignment = D3.k_medoids(features, 2)
+    assert list(medoids) == sorted(medoids)
+    assert list(assignment[[0, 2, 4]]) == [assignment[0]] * 3
+    assert list(assignment[[1, 3, 5]]) == [assignment[1]] * 3
+    assert assignment[0] != assignment[1]
+    for position, medoid in enumerate(medoids):
+        assert assignment[medoid] == position
+
+
+def test_k_medoids_identical_periods():
+    medoids, assignment = D3.k_medoids(np.zeros((N_PERIODS, 3)), 3)
+    assert len(set(medoids)) == 3
+    assert set(assignment) == {0, 1, 2}
+
+
+def test_aggregation_error():
+    features = D3.get_time_series_features(synthetic_dict_values(), PERIOD_LENGTH)
+    medoids, assignment = D3.k_medoids(features, 2)
+    assert D3.aggregation_error(features, medoids, assignment) == pytest.approx(0)
+    assert D3.aggregation_error(features, medoids[:1], assignment * 0) > 0
+
+
+def test_select_typical_periods_not_activated():
+    assert D3.select_typical_periods(synthetic_dict_values(None)) is None
+
+
+def test_select_typical_periods_more_typical_periods_than_periods():
+    assert D3.select_typical_periods(synthetic_dict_values(N_PERIODS)) is None
+
+
+def test_select_typical_periods():
+    typical_periods = D3.select_typical_periods(synthetic_dict_values())
+    assert len(typical_periods[D3.MEDOIDS]) == 2
+    assert len(typical_periods[D3.ASSIGNMENT]) == N_PERIODS
+    assert typical_periods[D3.PERIOD_LENGTH] == PERIOD_LENGTH
+    assert typical_periods[AGGREGATION_ERROR] == pytest.approx(0)
+
+
+def test_reduce_dict_values():
+    dict_values = synthetic_dict_values()
+    typical_periods = D3.select_typical_periods(dict_values)
+    reduced = D3.reduce_dict_values(dict_values, typical_periods)
+
+    settings = reduced[SIMULATION_SETTINGS]
+    assert settings[PERIODS] == 2 * PERIOD_LENGTH
+    assert len(settings[TIME_INDEX]) == 2 * PERIOD_LENGTH
+    assert settings[TYPICAL_PERIOD_WEIGHTS] == [3] * 2 * PERIOD_LENGTH
+    demand = reduced[ENERGY_CONSUMPTION]["demand"][TIMESERIES]
+    assert demand.index.equals(settings[TIME_INDEX])
+    assert demand.sum() == pytest.approx(
+        dict_values[ENERGY_CONSUMPTION]["demand"][TIMESERIES].sum() / 3
+    )
+    # the input is not modified
+    assert dict_values[SIMULATION_SETTINGS][PERIODS] == N_PERIODS * PERIOD_LENGTH
+    assert TYPICAL_PERIOD_WEIGHTS not in dict_values[SIMULATION_SETTINGS]
+
+
+def test_get_objective_weighting():
+    dict_values = synthetic_dict_values()
+    reduced = D3.reduce_dict_values(dict_values, D3.select_typical_periods(dict_values))
+    assert D3.get_objective_weighting(reduced) == [3.0] * 2 * PERIOD_LENGTH
+
+
+def test_expand_results_to_time_index():
+    typical_periods = {
+        D3.MEDOIDS: np.array([0, 1]),
+        D3.ASSIGNMENT: np.array([0, 1, 0, 1, 0, 1]),
+        D3.PERIOD_LENGTH: PERIOD_LENGTH,
+    }
+    time_index = simulation_settings()[TIME_INDEX]
+    sequences = pd.DataFrame(
+        {"flow": np.arange(2 * PERIOD_LENGTH)}, index=time_index[: 2 * PERIOD_LENGTH]
+    )
+    results_main = {("a", "b"): {"scalars": pd.Series([1.0]), "sequences": sequences}}
+    D3.expand_results_to_time_index(results_main, typical_periods, time_index)
+
+    expanded = results_main[("a", "b")]["sequences"]
+    assert expanded.index.equals(time_index)
+    assert list(expanded["flow"]) == list(np.arange(2 * PERIOD_LENGTH)) * 3
+    assert list(results_main[("a", "b")]["scalars"]) == [1.0]
+
+
+# The first typical period charges the storage and the second one discharges it,
+# each represents two periods of the evaluated period
+SEASONAL_TYPICAL_PERIODS = {
+    D3.MEDOIDS: np.array([0, 2]),
+    D3.ASSIGNMENT: np.array([0, 0, 1, 1]),
+    D3.PERIOD_LENGTH: 2,
+}
+SEASONAL_STORAGE_CONTENT = [1, 2, 3, 4, 3, 2, 1, 0]
+
+
+# Storage content relative to the start of each typical period and content at the start of each period
+SEASONAL_SCALARS = pd.Series(
+    {
+        f"{D3.PERIOD_START_CONTENT}_0": 0.0,
+        f"{D3.PERIOD_START_CONTENT}_1": 2.0,
+        f"{D3.PERIOD_START_CONTENT}_2": 4.0,
+        f"{D3.PERIOD_START_CONTENT}_3": 2.0,
+        f"{D3.PERIOD_START_CONTENT}_4": 0.0,
+        f"{D3.TYPICAL_PERIOD_MAX_CONTENT}_0": 2.0,
+        f"{D3.TYPICAL_PERIOD_MIN_CONTENT}_1": -2.0,
+        "init_content": 0.0,
+    }
+)
+
+
+def test_expand_results_to_time_index_storage_content():
+    time_index = pd.date_range("2020-01-01", periods=8, freq="60min")
+    sequences = pd.DataFrame({"storage_content": [1, 2, -1, -2]}, index=time_index[:4])
+    results_main = {
+        ("storage", None): {"scalars": SEASONAL_SCALARS, "sequences": sequences}
+    }
+    D3.expand_results_to_time_index(results_main, SEASONAL_TYPICAL_PERIODS, time_index)
+    assert list(
+        results_main[("storage", None)]["sequences"]["storage_content"]
+    ) == pytest.approx(SEASONAL_STORAGE_CONTENT)
+    assert list(results_main[("storage", None)]["scalars"].index) == ["init_content"]
+
+
+def test_get_storage_contents_of_periods_with_self_discharge():
+    sequences = pd.DataFrame({"storage_content": [1, 2, -1, -2]})
+    storage_content = D3.get_storage_contents_of_periods(
+        sequences, SEASONAL_SCALARS, SEASONAL_TYPICAL_PERIODS, [0.5] * 4
+    )
+    assert list(storage_content) == pytest.approx([1, 2, 2, 2.5, 1, -1, 0, -1.5])
+
+
+@pytest.mark.parametrize("investment", [False, True])
+def test_add_storage_linking_constraints_seasonal_storage(investment):
+    energy_system = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=4, freq="60min")
+    )
+    bus = solph.Bus(label="bus")
+    if investment is True:
+        storage_capacity = {"investment": solph.Investment(ep_costs=1)}
+    else:
+        storage_capacity = {"nominal_storage_capacity": 4}
+    energy_system.add(
+        bus,
+        solph.Source(
+            label="pv", outputs={bus: solph.Flow(fix=[2, 2, 0, 0], nominal_value=1)}
+        ),
+        solph.Source(label="shortage", outputs={bus: solph.Flow(variable_costs=1000)}),
+        solph.Sink(
+            label="demand", inputs={bus: solph.Flow(fix=[1] * 4, nominal_value=1)}
+        ),
+        solph.Sink(label="excess", inputs={bus: solph.Flow()}),
+        solph.components.GenericStorage(
+            label="storage",
+            inputs={bus: solph.Flow()},
+            outputs={bus: solph.Flow()},
+            **storage_capacity,
+        ),
+    )
+    model = solph.Model(energy_system, objective_weighting=[2] * 4)
+    model = D3.add_storage_linking_constraints(model, SEASONAL_TYPICAL_PERIODS)
+    model.solve(solver="cbc")
+
+    results_main = D3.expand_results_to_time_index(
+        solph.processing.results(model),
+        SEASONAL_TYPICAL_PERIODS,
+        pd.date_range("2020-01-01", periods=8, freq="60min"),
+    )
+    # the surplus of the first two periods covers the demand of the last two periods
+    assert results_main[(energy_system.groups["shortage"], bus)]["sequences"][
+        "flow"
+    ].sum() == pytest.approx(0)
+    storage_content = results_main[(energy_system.groups["storage"], None)][
+        "sequences"
+    ]["storage_content"]
+    assert list(storage_content) == pytest.approx(SEASONAL_STORAGE_CONTENT)
+    assert not any(
+        name.startswith(D3.PERIOD_START_CONTENT)
+        for name in results_main[(energy_system.groups["storage"], None)][
+            "scalars"
+        ].index
+    )
+
+
+@pytest.fixture
+def dict_values():
+    answer = load_json(
+        os.path.join(TEST_REPO_PATH, TEST_INPUT_DIRECTORY, "inputs_for_D0", JSON_FNAME),
+        flag_missing_values=False,
+    )
+    answer[SIMULATION_SETTINGS].update({PATH_OUTPUT_FOLDER: TEST_OUTPUT_PATH})
+    return answer
+
+
+def test_run_oemof_with_typical_periods(dict_values):
+    dict_values[SIMULATION_SETTINGS].update(
+        {TYPICAL_PERIODS: {VALUE: 1, UNIT: "factor"}}
+    )
+    results_meta, results_main = D0.run_oemof(dict_values)
+
+    assert dict_values[SIMULATION_RESULTS][TYPICAL_PERIODS] == 1
+    assert dict_values[SIMULATION_RESULTS][AGGREGATION_ERROR] > 0
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    for result in results_main.values():
+        sequences = result["sequences"]
+        if len(sequences) > 0:
+            assert sequences.index.equals(time_index)
+            # both days of the evaluated period are represented by the same typical day
+            assert np.allclose(
+                sequences.values[:PERIOD_LENGTH], sequences.values[PERIOD_LENGTH:]
+            )
@@ -0,0 +1,302 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import multi_vector_simulator.A1_csv_to_json as A1
+import multi_vector_simulator.B0_data_input_json as B0
+import multi_vector_simulator.C0_data_processing as C0
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D4_rolling_horizon as D4
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    ENERGY_CONSUMPTION,
+    ENERGY_PRODUCTION,
+    ENERGY_STORAGE,
+    ENERGY_BUSSES,
+    ENERGY_PROVIDERS,
+    EXCESS,
+    CONNECTED_FEEDIN_SINK,
+    CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS,
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    CONSTRAINTS,
+    MAXIMUM_EMISSIONS,
+    MINIMAL_RENEWABLE_FACTOR,
+    MINIMAL_DEGREE_OF_AUTONOMY,
+    TIME_INDEX,
+    PERIODS,
+    TIMESTEP,
+    TIMESERIES,
+    LABEL,
+    VALUE,
+    UNIT,
+    UNIT_DAY,
+    UNIT_MINUTE,
+    OPTIMIZE_CAP,
+    STORAGE_CAPACITY,
+    SOC_INITIAL,
+    TYPICAL_PERIODS,
+    ROLLING_HORIZON_WINDOW,
+    ROLLING_HORIZON_OVERLAP,
+    ROLLING_HORIZON_WINDOWS,
+)
+from multi_vector_simulator.utils.exceptions import InvalidRollingHorizonError
+
+from _constants import (
+    TEST_REPO_PATH,
+    PATH_INPUT_FOLDER,
+    PATH_OUTPUT_FOLDER,
+    CSV_ELEMENTS,
+    CSV_FNAME,
+)
+
+TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, "test_outputs")
+
+N_TIMESTEPS = 96
+
+
+def synthetic_dict_values(window=None, overlap=None):
+    time_index = pd.date_range("2020-01-01", periods=N_TIMESTEPS, freq="60min")
+    settings = {
+        TIMESTEP: {VALUE: 60, UNIT: UNIT_MINUTE},
+        PERIODS: N_TIMESTEPS,
+        TIME_INDEX: time_index,
+    }
+    if window is not None:
+        settings.update({ROLLING_HORIZON_WINDOW: {VALUE: window, UNIT: UNIT_DAY}})
+    if overlap is not None:
+        settings.update({ROLLING_HORIZON_OVERLAP: {VALUE: overlap, UNIT: UNIT_DAY}})
+    return {
+        SIMULATION_SETTINGS: settings,
+        CONSTRAINTS: {MAXIMUM_EMISSIONS: {VALUE: 960, UNIT: "kgCO2eq/a"}},
+        ENERGY_CONSUMPTION: {
+            "demand": {
+                LABEL: "demand",
+                OPTIMIZE_CAP: {VALUE: False},
+                TIMESERIES: pd.Series(np.arange(N_TIMESTEPS), index=time_index),
+            }
+        },
+        ENERGY_STORAGE: {
+            "battery": {
+                LABEL: "battery",
+                OPTIMIZE_CAP: {VALUE: False},
+                STORAGE_CAPACITY: {SOC_INITIAL: {VALUE: None, UNIT: "factor"}},
+            }
+        },
+    }
+
+
+def test_get_rolling_horizon_settings_not_defined():
+    settings = synthetic_dict_values()[SIMULATION_SETTINGS]
+    assert D4.get_rolling_horizon_settings(settings) == (None, None)
+
+
+def test_get_rolling_horizon_settings():
+    settings = synthetic_dict_values(window=1, overlap=0.25)[SIMULATION_SETTINGS]
+    assert D4.get_rolling_horizon_settings(settings) == (24, 6)
+
+
+def test_get_rolling_horizon_settings_not_a_multiple_of_the_timestep():
+    settings = synthetic_dict_values(window=0.01)[SIMULATION_SETTINGS]
+    with pytest.raises(InvalidRollingHorizonError):
+        D4.get_rolling_horizon_settings(settings)
+
+
+def test_get_rolling_horizon_windows_not_activated():
+    assert D4.get_rolling_horizon_windows(synthetic_dict_values()) is None
+
+
+def test_get_rolling_horizon_windows():
+    windows = D4.get_rolling_horizon_windows(synthetic_dict_values(1.5, 0.5))
+    assert windows == [(0, 36, 48), (36, 72, 84), (72, 96, 96)]
+
+
+def test_get_rolling_horizon_windows_longer_than_evaluated_period():
+    assert D4.get_rolling_horizon_windows(synthetic_dict_values(window=5)) is None
+
+
+def test_get_rolling_horizon_windows_with_capacity_optimization_raises_error():
+    dict_values = synthetic_dict_values(window=1)
+    dict_values[ENERGY_STORAGE]["battery"][OPTIMIZE_CAP][VALUE] = True
+    with pytest.raises(InvalidRollingHorizonError, match="battery"):
+        D4.get_rolling_horizon_windows(dict_values)
+
+
+def test_get_rolling_horizon_windows_with_typical_periods_raises_error():
+    dict_values = synthetic_dict_values(window=1)
+    dict_values[SIMULATION_SETTINGS].update({TYPICAL_PERIODS: {VALUE: 2}})
+    with pytest.raises(InvalidRollingHorizonError):
+        D4.get_rolling_horizon_windows(dict_values)
+
+
+def test_get_rolling_horizon_windows_with_minimal_renewable_factor(caplog):
+    dict_values = synthetic_dict_values(window=1)
+    dict_values[CONSTRAINTS].update(
+        {
+            MINIMAL_RENEWABLE_FACTOR: {VALUE: 0.5, UNIT: "factor"},
+            MINIMAL_DEGREE_OF_AUTONOMY: {VALUE: 0, UNIT: "factor"},
+        }
+    )
+    D4.get_rolling_horizon_windows(dict_values)
+    assert MINIMAL_RENEWABLE_FACTOR in caplog.text
+    assert MINIMAL_DEGREE_OF_AUTONOMY not in caplog.text
+
+
+def test_get_rolling_horizon_windows_without_share_constraints(caplog):
+    D4.get_rolling_horizon_windows(synthetic_dict_values(window=1))
+    assert "each window" not in caplog.text
+
+
+def synthetic_dict_values_with_auxiliary_assets():
+    dict_values = synthetic_dict_values(window=1)
+    dict_values.update(
+        {
+            ENERGY_BUSSES: {"bus": {LABEL: "bus", EXCESS: "bus_excess"}},
+            ENERGY_PROVIDERS: {
+                "dso": {
+                    LABEL: "dso",
+                    OPTIMIZE_CAP: {VALUE: True},
+                    CONNECTED_FEEDIN_SINK: "dso_feedin_sink",
+                    CONNECTED_PEAK_DEMAND_PRICING_TRANSFORMERS: [
+                        "dso_consumption_period"
+                    ],
+                }
+            },
+            ENERGY_PRODUCTION: {
+                "dso_consumption": {
+                    LABEL: "dso_consumption_source",
+                    OPTIMIZE_CAP: {VALUE: True},
+                }
+            },
+        }
+    )
+    dict_values[ENERGY_CONSUMPTION].update(
+        {
+            asset: {LABEL: asset + "_sink", OPTIMIZE_CAP: {VALUE: True}}
+            for asset in ("bus_excess", "dso_feedin_sink")
+        }
+    )
+    return dict_values
+
+
+def test_get_auxiliary_assets():
+    assert D4.get_auxiliary_assets(synthetic_dict_values_with_auxiliary_assets()) == {
+        "bus_excess",
+        "dso_consumption",
+        "dso_feedin_sink",
+        "dso_consumption_period",
+    }
+
+
+def test_get_rolling_horizon_windows_without_capacity_optimization_by_the_user():
+    windows = D4.get_rolling_horizon_windows(
+        synthetic_dict_values_with_auxiliary_assets()
+    )
+    assert len(windows) == 4
+
+
+def test_select_window():
+    dict_values = synthetic_dict_values(window=1)
+    window = D4.select_window(dict_values, 24, 48, storage_levels={"battery": 0.4})
+
+    assert window[SIMULATION_SETTINGS][PERIODS] == 24
+    assert window[SIMULATION_SETTINGS][TIME_INDEX].equals(
+        dict_values[SIMULATION_SETTINGS][TIME_INDEX][24:48]
+    )
+    demand = window[ENERGY_CONSUMPTION]["demand"][TIMESERIES]
+    assert list(demand) == list(range(24, 48))
+    assert window[CONSTRAINTS][MAXIMUM_EMISSIONS][VALUE] == 240
+    assert (
+        window[ENERGY_STORAGE]["battery"][STORAGE_CAPACITY][SOC_INITIAL][VALUE] == 0.4
+    )
+    # the input is not modified
+    assert dict_values[CONSTRAINTS][MAXIMUM_EMISSIONS][VALUE] == 960
+    assert (
+        dict_values[ENERGY_STORAGE]["battery"][STORAGE_CAPACITY][SOC_INITIAL][VALUE]
+        is None
+    )
+
+
+class Node:
+    def __init__(self, label):
+        self.label = label
+
+
+def test_stitch_results():
+    time_index = synthetic_dict_values()[SIMULATION_SETTINGS][TIME_INDEX]
+    results_of_windows = []
+    for start, end_of_results, end in [(0, 48, 60), (48, 96, 96)]:
+        key = (Node("source"), Node("bus"))
+        sequences = pd.DataFrame(
+            {"flow": np.arange(start, end)}, index=time_index[start:end]
+        )
+        results = {key: {"scalars": pd.Series([start]), "sequences": sequences}}
+        results_of_windows.append(D4.truncate_results(results, end_of_results - start))
+
+    results_main = D4.stitch_results(results_of_windows, time_index)
+    assert len(results_main) == 1
+    result = list(results_main.values())[0]
+    assert result["sequences"].index.equals(time_index)
+    assert list(result["sequences"]["flow"]) == list(range(N_TIMESTEPS))
+    assert list(result["scalars"]) == [0]
+
+
+def test_stitch_results_largest_invest_of_windows():
+    time_index = synthetic_dict_values()[SIMULATION_SETTINGS][TIME_INDEX]
+    results_of_windows = []
+    for start, end, invest in [(0, 48, 5), (48, 96, 8)]:
+        key = (Node("dso_consumption_source"), Node("bus"))
+        sequences = pd.DataFrame(
+            {"flow": np.arange(start, end)}, index=time_index[start:end]
+        )
+        scalars = pd.Series({"invest": invest})
+        results_of_windows.append({key: {"scalars": scalars, "sequences": sequences}})
+
+    results_main = D4.stitch_results(results_of_windows, time_index)
+    assert list(results_main.values())[0]["scalars"]["invest"] == 8
+    # the results of the windows are not modified
+    assert list(results_of_windows[0].values())[0]["scalars"]["invest"] == 5
+
+
+@pytest.fixture
+def dict_values(tmp_path):
+    """Dispatch-only scenario (no capacity defined by the user is optimized) processed by C0"""
+    path_input_folder = os.path.join(tmp_path, "inputs")
+    shutil.copytree(
+        os.path.join(TEST_REPO_PATH, "benchmark_test_inputs", "ABE_grid_PV_battery"),
+        path_input_folder,
+    )
+    A1.create_input_json(input_directory=os.path.join(path_input_folder, CSV_ELEMENTS))
+    path_output_folder = os.path.join(tmp_path, "outputs")
+    os.makedirs(path_output_folder)
+    answer = B0.load_json(
+        os.path.join(path_input_folder, CSV_ELEMENTS, CSV_FNAME),
+        path_input_folder=path_input_folder,
+        path_output_folder=path_output_folder,
+        move_copy=False,
+    )
+    C0.all(answer)
+    return answer
+
+
+def test_run_oemof_with_rolling_horizon(dict_values):
+    dict_values[SIMULATION_SETTINGS].update(
+        {
+            ROLLING_HORIZON_WINDOW: {VALUE: 1, UNIT: UNIT_DAY},
+            ROLLING_HORIZON_OVERLAP: {VALUE: 0.5, UNIT: UNIT_DAY},
+        }
+    )
+    results_meta, results_main = D0.run_oemof(dict_values)
+
+    assert dict_values[SIMULATION_RESULTS][ROLLING_HORIZON_WINDOWS] == 7
+    time_index = dict_values[SIMULATION_SETTINGS][TIME_INDEX]
+    storage_contents = []
+    for (node, target), result in results_main.items():
+        if len(result["sequences"]) > 0:
+            assert result["sequences"].index.equals(time_index)
+        if target is None and D4.STORAGE_CONTENT in result["sequences"]:
+            storage_contents.append(result["sequences"][D4.STORAGE_CONTENT])
+    assert len(storage_contents) == len(dict_values[ENERGY_STORAGE])
@@ -0,0 +1,233 @@
+import os
+
+import pandas as pd
+import pyomo.environ as po
+import pytest
+from oemof import solph
+
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D5_model_statistics as D5
+from multi_vector_simulator.B0_data_input_json import load_json
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    VALUE,
+    OEMOF_TRANSFORMER,
+    OEMOF_GEN_STORAGE,
+    OEMOF_SOURCE,
+    OEMOF_SINK,
+    OEMOF_BUSSES,
+    MAXIMUM_MODEL_SIZE,
+    MEASURE_MODEL_SIZE,
+    MODEL_SIZE_GUARD,
+    MODEL_SIZE,
+    NUMBER_OF_VARIABLES,
+    NUMBER_OF_CONSTRAINTS,
+    NUMBER_OF_NONZEROS,
+    MODEL_SIZE_PER_ASSET_TYPE,
+    MODEL_SIZE_PER_CONSTRAINT,
+)
+from multi_vector_simulator.utils.exceptions import ModelSizeError
+
+from _constants import (
+    TEST_REPO_PATH,
+    TEST_INPUT_DIRECTORY,
+    PATH_OUTPUT_FOLDER,
+    JSON_FNAME,
+)
+
+TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, "test_outputs")
+
+N_TIMESTEPS = 3
+
+
+@pytest.fixture
+def local_energy_system():
+    """Source and transformer supplying a sink, without investment"""
+    energy_system = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=N_TIMESTEPS, freq="H")
+    )
+    fuel = solph.Bus(label="fuel")
+    electricity = solph.Bus(label="electricity")
+    energy_system.add(
+        fuel,
+        electricity,
+        solph.Source(label="diesel", outputs={fuel: solph.Flow(variable_costs=1)}),
+        solph.Transformer(
+            label="generator",
+            inputs={fuel: solph.Flow()},
+            outputs={electricity: solph.Flow()},
+            conversion_factors={electricity: 0.3},
+        ),
+        solph.Sink(
+            label="demand",
+            inputs={electricity: solph.Flow(fix=[1, 2, 3], nominal_value=1)},
+        ),
+    )
+    model = solph.Model(energy_system)
+    # a constraint which is not related to a component, like the constraints of D2
+    model.constraint_total_fuel = po.Constraint(
+        expr=sum(
+            model.flow[i, o, t]
+            for (i, o) in model.FLOWS
+            if i is fuel
+            for t in model.TIMESTEPS
+        )
+        <= 100
+    )
+    return model
+
+
+def test_get_asset_type():
+    source = solph.Source(label="source")
+    bus = solph.Bus(label="bus")
+    storage = solph.components.GenericStorage(label="storage")
+    assert D5.get_asset_type((source, bus, 0)) == OEMOF_SOURCE
+    assert D5.get_asset_type((bus, storage, 0)) == OEMOF_GEN_STORAGE
+    assert D5.get_asset_type((bus, 0)) == OEMOF_BUSSES
+    assert D5.get_asset_type(storage) == OEMOF_GEN_STORAGE
+    assert D5.get_asset_type(0) == D5.OTHER
+    assert D5.get_asset_type(None) == D5.OTHER
+
+
+def test_get_model_size(local_energy_system):
+    model_size = D5.get_model_size(local_energy_system)
+    # one variable per flow and timestep
+    assert model_size[NUMBER_OF_VARIABLES] == 3 * N_TIMESTEPS
+    # bus balances, transformer relation and the additional constraint
+    assert model_size[NUMBER_OF_CONSTRAINTS] == 3 * N_TIMESTEPS + 1
+    # the fixed flow of the demand is not counted in the balance of the electricity bus
+    assert model_size[NUMBER_OF_NONZEROS] == (2 + 1 + 2 + 1) * N_TIMESTEPS
+
+
+def test_get_model_size_per_asset_type(local_energy_system):
+    size = D5.get_model_size(local_energy_system)[MODEL_SIZE_PER_ASSET_TYPE]
+    assert size[OEMOF_SOURCE][NUMBER_OF_VARIABLES] == N_TIMESTEPS
+    assert size[OEMOF_TRANSFORMER][NUMBER_OF_VARIABLES] == 2 * N_TIMESTEPS
+    assert size[OEMOF_TRANSFORMER][NUMBER_OF_CONSTRAINTS] == N_TIMESTEPS
+    assert size[OEMOF_SINK][NUMBER_OF_VARIABLES] == 0
+    assert size[OEMOF_BUSSES][NUMBER_OF_CONSTRAINTS] == 2 * N_TIMESTEPS
+    assert size[D5.OTHER][NUMBER_OF_CONSTRAINTS] == 1
+
+
+def test_get_model_size_per_constraint(local_energy_system):
+    size = D5.get_model_size(local_energy_system)[MODEL_SIZE_PER_CONSTRAINT]
+    assert size["constraint_total_fuel"] == {
+        NUMBER_OF_CONSTRAINTS: 1,
+        NUMBER_OF_NONZEROS: N_TIMESTEPS,
+    }
+    assert size["Bus.balance"][NUMBER_OF_CONSTRAINTS] == 2 * N_TIMESTEPS
+
+
+def test_sum_model_sizes(local_energy_system):
+    model_size = D5.get_model_size(local_energy_system)
+    total_size = D5.sum_model_sizes([model_size, model_size])
+    assert total_size[NUMBER_OF_NONZEROS] == 2 * model_size[NUMBER_OF_NONZEROS]
+    assert (
+        total_size[MODEL_SIZE_PER_ASSET_TYPE][OEMOF_SOURCE][NUMBER_OF_VARIABLES]
+        == 2 * N_TIMESTEPS
+    )
+    assert total_size[MODEL_SIZE_PER_CONSTRAINT]["constraint_total_fuel"] == {
+        NUMBER_OF_CONSTRAINTS: 2,
+        NUMBER_OF_NONZEROS: 2 * N_TIMESTEPS,
+    }
+
+
+def test_sum_model_sizes_not_measured(local_energy_system):
+    model_size = D5.get_model_size(local_energy_system)
+    assert D5.sum_model_sizes([model_size, None]) is None
+
+
+def model_size_settings(maximum_model_size=None, guard=None, measure=None):
+    settings = {}
+    if measure is not None:
+        settings.update({MEASURE_MODEL_SIZE: {VALUE: measure}})
+    if maximum_model_size is not None:
+        settings.update({MAXIMUM_MODEL_SIZE: {VALUE: maximum_model_size}})
+    if guard is not None:
+        settings.update({MODEL_SIZE_GUARD: {VALUE: guard}})
+    return {SIMULATION_SETTINGS: settings}
+
+
+MODEL_SIZE_EXAMPLE = {NUMBER_OF_NONZEROS: 100}
+
+
+def test_is_model_size_measurement_activated_not_defined():
+    assert D5.is_model_size_measurement_activated(model_size_settings()) is False
+    assert D5.is_model_size_measurement_activated(model_size_settings(0)) is False
+    assert (
+        D5.is_model_size_measurement_activated(model_size_settings(measure=True))
+        is True
+    )
+
+
+def test_is_model_size_measurement_activated_maximum_model_size():
+    assert (
+        D5.is_model_size_measurement_activated(model_size_settings(100, measure=False))
+        is True
+    )
+
+
+def test_is_model_size_measurement_activated_invalid_value_raises_error():
+    with pytest.raises(ModelSizeError):
+        D5.is_model_size_measurement_activated(model_size_settings(measure="yes"))
+
+
+def test_check_model_size_not_defined(caplog):
+    D5.check_model_size(model_size_settings(), MODEL_SIZE_EXAMPLE)
+    assert caplog.text == ""
+
+
+def test_check_model_size_below_maximum(caplog):
+    D5.check_model_size(model_size_settings(100, "error"), MODEL_SIZE_EXAMPLE)
+    assert caplog.text == ""
+
+
+def test_check_model_size_warning(caplog):
+    D5.check_model_size(model_size_settings(99), MODEL_SIZE_EXAMPLE)
+    assert MAXIMUM_MODEL_SIZE in caplog.text
+
+
+def test_check_model_size_error():
+    with pytest.raises(ModelSizeError):
+        D5.check_model_size(model_size_settings(99, "error"), MODEL_SIZE_EXAMPLE)
+
+
+def test_check_model_size_invalid_guard_raises_error():
+    with pytest.raises(ModelSizeError):
+        D5.check_model_size(model_size_settings(guard="stop"), MODEL_SIZE_EXAMPLE)
+
+
+@pytest.fixture
+def dict_values():
+    answer = load_json(
+        os.path.join(TEST_REPO_PATH, TEST_INPUT_DIRECTORY, "inputs_for_D0", JSON_FNAME),
+        flag_missing_values=False,
+    )
+    answer[SIMULATION_SETTINGS].update({PATH_OUTPUT_FOLDER: TEST_OUTPUT_PATH})
+    return answer
+
+
+def test_run_oemof_model_size_not_measured(dict_values):
+    D0.run_oemof(dict_values)
+    assert dict_values[SIMULATION_RESULTS][MODEL_SIZE] is None
+
+
+def test_run_oemof_model_size_stored(dict_values):
+    dict_values[SIMULATION_SETTINGS].update({MEASURE_MODEL_SIZE: {VALUE: True}})
+    D0.run_oemof(dict_values)
+    model_size = dict_values[SIMULATION_RESULTS][MODEL_SIZE]
+    assert model_size[NUMBER_OF_VARIABLES] > 0
+    assert model_size[NUMBER_OF_NONZEROS] == sum(
+        size[NUMBER_OF_NONZEROS]
+        for size in model_size[MODEL_SIZE_PER_CONSTRAINT].values()
+    )
+
+
+def test_run_oemof_model_size_error(dict_values):
+    dict_values[SIMULATION_SETTINGS].update(
+        {MAXIMUM_MODEL_SIZE: {VALUE: 1}, MODEL_SIZE_GUARD: {VALUE: "error"}}
+    )
+    with pytest.raises(ModelSizeError):
+        D0.run_oemof(dict_values)
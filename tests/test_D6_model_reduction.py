@@ -0,0 +1,255 @@
+import copy
+import os
+
+import pandas as pd
+import pytest
+from oemof import solph
+from oemof.solph import processing
+
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D6_model_reduction as D6
+from multi_vector_simulator.B0_data_input_json import load_json
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    ENERGY_BUSSES,
+    ENERGY_CONSUMPTION,
+    ENERGY_PRODUCTION,
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    CONSTRAINTS,
+    MINIMAL_RENEWABLE_FACTOR,
+    MODEL_REDUCTION,
+    OBJECTIVE_VALUE,
+    OPTIMIZE_CAP,
+    OEMOF_BUSSES,
+    EXCESS,
+    LABEL,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidModelReductionError
+
+from _constants import (
+    TEST_REPO_PATH,
+    TEST_INPUT_DIRECTORY,
+    PATH_OUTPUT_FOLDER,
+    JSON_FNAME,
+)
+
+TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, "test_outputs")
+
+N_TIMESTEPS = 3
+
+
+def energy_system():
+    """Generator on a fuel bus and two pv plants behind an inverter, supplying a demand with wind"""
+    model = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=N_TIMESTEPS, freq="H")
+    )
+    fuel = solph.Bus(label="fuel")
+    pv_bus = solph.Bus(label="pv bus")
+    electricity = solph.Bus(label="electricity")
+    model.add(
+        fuel,
+        pv_bus,
+        electricity,
+        solph.Source(
+            label="diesel",
+            outputs={fuel: solph.Flow(variable_costs=1, emission_factor=0.3)},
+        ),
+        solph.Sink(
+            label="fuel excess",
+            inputs={fuel: solph.Flow(investment=solph.Investment())},
+        ),
+        solph.Transformer(
+            label="generator",
+            inputs={fuel: solph.Flow()},
+            outputs={electricity: solph.Flow(nominal_value=10)},
+            conversion_factors={electricity: 0.3},
+        ),
+        solph.Source(
+            label="pv",
+            outputs={
+                pv_bus: solph.Flow(fix=[0, 5, 10], nominal_value=1, variable_costs=0.1)
+            },
+        ),
+        solph.Transformer(
+            label="inverter",
+            inputs={pv_bus: solph.Flow()},
+            outputs={electricity: solph.Flow(nominal_value=15)},
+        ),
+        solph.Source(
+            label="pv 2",
+            outputs={
+                pv_bus: solph.Flow(fix=[1, 1, 1], nominal_value=1, variable_costs=0.3)
+            },
+        ),
+        solph.Source(
+            label="wind",
+            outputs={
+                electricity: solph.Flow(
+                    fix=[4, 2, 0], nominal_value=1, variable_costs=0.2
+                )
+            },
+        ),
+        solph.Sink(
+            label="demand",
+            inputs={electricity: solph.Flow(fix=[5, 6, 7], nominal_value=1)},
+        ),
+        solph.Sink(
+            label="electricity excess",
+            inputs={electricity: solph.Flow(investment=solph.Investment())},
+        ),
+    )
+    return model
+
+
+def reduction_settings(model_reduction=True, minimal_renewable_factor=0):
+    return {
+        SIMULATION_SETTINGS: {MODEL_REDUCTION: {VALUE: model_reduction}},
+        CONSTRAINTS: {MINIMAL_RENEWABLE_FACTOR: {VALUE: minimal_renewable_factor}},
+        ENERGY_BUSSES: {
+            "fuel": {EXCESS: "fuel excess"},
+            "electricity": {EXCESS: "electricity excess"},
+        },
+        ENERGY_CONSUMPTION: {
+            "fuel excess": {LABEL: "fuel excess"},
+            "electricity excess": {LABEL: "electricity excess"},
+        },
+    }
+
+
+def labels(nodes):
+    return sorted(str(node) for node in nodes)
+
+
+def test_is_model_reduction_activated_not_defined():
+    assert D6.is_model_reduction_activated({SIMULATION_SETTINGS: {}}) is False
+
+
+def test_is_model_reduction_activated_invalid_value_raises_error():
+    with pytest.raises(InvalidModelReductionError):
+        D6.is_model_reduction_activated(reduction_settings(model_reduction="yes"))
+
+
+def test_is_model_reduction_activated_with_renewable_constraint():
+    dict_values = reduction_settings(minimal_renewable_factor=0.5)
+    assert D6.is_model_reduction_activated(dict_values) is False
+
+
+def test_remove_excess_sinks():
+    model = energy_system()
+    removed_sinks = D6.remove_excess_sinks(model, ["fuel excess", "electricity excess"])
+    assert labels(removed_sink["sink"] for removed_sink in removed_sinks) == [
+        "fuel excess"
+    ]
+    assert "fuel excess" not in labels(model.nodes)
+    assert labels(model.groups["fuel"].outputs) == ["generator"]
+
+
+def test_remove_excess_sinks_bus_with_fixed_source():
+    model = energy_system()
+    removed_sinks = D6.remove_excess_sinks(model, ["electricity excess"])
+    assert removed_sinks == []
+    assert "electricity excess" in labels(model.nodes)
+
+
+def test_merge_fixed_sources():
+    model = energy_system()
+    merged_sources = D6.merge_fixed_sources(model)
+    assert len(merged_sources) == 1
+    assert labels(source for source, _ in merged_sources[0]["fixed_outputs"]) == [
+        "pv",
+        "pv 2",
+    ]
+    assert "pv" not in labels(model.nodes)
+    assert "wind" in labels(model.nodes)
+    flow = merged_sources[0]["source"].outputs[model.groups["pv bus"]]
+    assert list(flow.fix) == [1, 6, 11]
+    assert flow.variable_costs[0] == pytest.approx(0.3)
+    assert flow.variable_costs[1] == pytest.approx((0.5 + 0.3) / 6)
+
+
+def test_reduce_energy_system_not_activated():
+    model = energy_system()
+    reduced_model, reductions = D6.reduce_energy_system(
+        reduction_settings(model_reduction=False), model, {}
+    )
+    assert reduced_model is model
+    assert reductions is None
+
+
+def solve(model):
+    local_energy_system = solph.Model(model)
+    local_energy_system.solve(solver="cbc")
+    return local_energy_system, processing.results(local_energy_system)
+
+
+def test_expand_results():
+    model = energy_system()
+    dict_model = {
+        OEMOF_BUSSES: {
+            label: model.groups[label] for label in ("fuel", "pv bus", "electricity")
+        }
+    }
+    full_model, full_results = solve(energy_system())
+    model, reductions = D6.reduce_energy_system(reduction_settings(), model, dict_model)
+    assert sorted(dict_model[OEMOF_BUSSES]) == ["electricity", "fuel", "pv bus"]
+    assert labels(model.nodes) == [
+        "demand",
+        "diesel",
+        "electricity",
+        "electricity excess",
+        "fuel",
+        "generator",
+        "inverter",
+        "pv bus",
+        "pv bus fixed sources",
+        "wind",
+    ]
+    reduced_model, results = solve(model)
+    assert reduced_model.objective() == pytest.approx(full_model.objective())
+
+    results = D6.expand_results(results, reductions)
+    results = processing.convert_keys_to_strings(results)
+    full_results = processing.convert_keys_to_strings(full_results)
+    assert sorted(results) == sorted(full_results)
+    for key, result in full_results.items():
+        assert list(results[key]["sequences"]["flow"]) == pytest.approx(
+            list(result["sequences"]["flow"])
+        )
+        assert dict(results[key]["scalars"]) == pytest.approx(dict(result["scalars"]))
+
+
+@pytest.fixture
+def dict_values():
+    answer = load_json(
+        os.path.join(TEST_REPO_PATH, TEST_INPUT_DIRECTORY, "inputs_for_D0", JSON_FNAME),
+        flag_missing_values=False,
+    )
+    answer[SIMULATION_SETTINGS].update({PATH_OUTPUT_FOLDER: TEST_OUTPUT_PATH})
+    # A second pv plant with the same bus, both without capacity optimization
+    pv_plant = answer[ENERGY_PRODUCTION]["pv_plant_01"]
+    pv_plant[OPTIMIZE_CAP][VALUE] = False
+    second_pv_plant = copy.deepcopy(pv_plant)
+    second_pv_plant[LABEL] = "PV plant (mono) 2"
+    answer[ENERGY_PRODUCTION].update({"pv_plant_02": second_pv_plant})
+    return answer
+
+
+def test_run_oemof_with_model_reduction(dict_values):
+    dict_values_reduced = copy.deepcopy(dict_values)
+    dict_values_reduced[SIMULATION_SETTINGS].update({MODEL_REDUCTION: {VALUE: True}})
+    results_meta, results_main = D0.run_oemof(dict_values)
+    results_meta, results_main_reduced = D0.run_oemof(dict_values_reduced)
+
+    assert dict_values_reduced[SIMULATION_RESULTS][OBJECTIVE_VALUE] == pytest.approx(
+        dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+    )
+    results_main = processing.convert_keys_to_strings(results_main)
+    results_main_reduced = processing.convert_keys_to_strings(results_main_reduced)
+    assert sorted(results_main_reduced) == sorted(results_main)
+    for pv_plant in ("PV plant (mono)", "PV plant (mono) 2"):
+        key = (pv_plant, "PV plant (mono) bus")
+        assert list(results_main_reduced[key]["sequences"]["flow"]) == pytest.approx(
+            list(results_main[key]["sequences"]["flow"])
+        )
@@ -0,0 +1,226 @@
+import copy
+import os
+
+import pytest
+from oemof.solph import processing
+
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D7_subsystems as D7
+from multi_vector_simulator.B0_data_input_json import load_json
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    ENERGY_BUSSES,
+    ENERGY_CONVERSION,
+    ENERGY_CONSUMPTION,
+    ENERGY_PRODUCTION,
+    ENERGY_STORAGE,
+    INFLOW_DIRECTION,
+    OUTFLOW_DIRECTION,
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    CONSTRAINTS,
+    MAXIMUM_EMISSIONS,
+    PARALLEL_SUBSYSTEMS,
+    SUBSYSTEMS,
+    OBJECTIVE_VALUE,
+    SIMULTATION_TIME,
+    MODEL_SIZE,
+    MODEL_CONSTRUCTION_PROFILE,
+    NUMBER_OF_VARIABLES,
+    SOLVER,
+    SOLVER_OPTIONS,
+    SOLVER_INTERFACE,
+    LABEL,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidSubsystemsError
+from multi_vector_simulator.utils.model_profiling import (
+    CATEGORY_OEMOF,
+    PROFILE_CATEGORY,
+    PROFILE_COMPONENT,
+    PROFILE_CALLS,
+    PROFILE_TIME,
+)
+
+from _constants import (
+    TEST_REPO_PATH,
+    TEST_INPUT_DIRECTORY,
+    PATH_OUTPUT_FOLDER,
+    JSON_FNAME,
+)
+
+TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, "test_outputs")
+
+
+def synthetic_dict_values(parallel_subsystems=True, maximum_emissions=None):
+    """Fuel bus and electricity bus connected by a generator, heat bus with a demand"""
+    return {
+        SIMULATION_SETTINGS: {PARALLEL_SUBSYSTEMS: {VALUE: parallel_subsystems}},
+        CONSTRAINTS: {MAXIMUM_EMISSIONS: {VALUE: maximum_emissions}},
+        ENERGY_BUSSES: {"fuel": {}, "electricity": {}, "heat": {}},
+        ENERGY_CONVERSION: {
+            "generator": {INFLOW_DIRECTION: "fuel", OUTFLOW_DIRECTION: "electricity"}
+        },
+        ENERGY_PRODUCTION: {"diesel": {OUTFLOW_DIRECTION: "fuel"}},
+        ENERGY_CONSUMPTION: {
+            "demand": {INFLOW_DIRECTION: "electricity"},
+            "heat demand": {INFLOW_DIRECTION: "heat"},
+        },
+    }
+
+
+def test_find_subsystems():
+    subsystems = D7.find_subsystems(synthetic_dict_values())
+    assert subsystems == [["fuel", "electricity"], ["heat"]]
+
+
+def test_find_subsystems_connected_by_transformer():
+    dict_values = synthetic_dict_values()
+    dict_values[ENERGY_CONVERSION]["generator"][OUTFLOW_DIRECTION] = [
+        "electricity",
+        "heat",
+    ]
+    assert D7.find_subsystems(dict_values) == [["fuel", "electricity", "heat"]]
+
+
+def test_get_subsystems_not_activated():
+    assert D7.get_subsystems(synthetic_dict_values(parallel_subsystems=False)) is None
+
+
+def test_get_subsystems_invalid_value_raises_error():
+    with pytest.raises(InvalidSubsystemsError):
+        D7.get_subsystems(synthetic_dict_values(parallel_subsystems="yes"))
+
+
+def test_get_subsystems_coupled_by_maximum_emissions():
+    assert D7.get_subsystems(synthetic_dict_values(maximum_emissions=1000)) is None
+
+
+def test_get_subsystems():
+    assert len(D7.get_subsystems(synthetic_dict_values())) == 2
+
+
+def test_select_subsystem():
+    dict_values = synthetic_dict_values()
+    subsystem = D7.select_subsystem(dict_values, ["heat"], 1)
+    assert list(subsystem[ENERGY_BUSSES]) == ["heat"]
+    assert subsystem[ENERGY_CONVERSION] == {}
+    assert subsystem[ENERGY_PRODUCTION] == {}
+    assert list(subsystem[ENERGY_CONSUMPTION]) == ["heat demand"]
+    # dict_values is not modified
+    assert len(dict_values[ENERGY_BUSSES]) == 3
+    assert len(dict_values[ENERGY_CONSUMPTION]) == 2
+
+
+def test_merge_simulation_results():
+    simulation_results = [
+        {
+            OBJECTIVE_VALUE: objective_value,
+            SIMULTATION_TIME: 1.5,
+            MODEL_SIZE: {NUMBER_OF_VARIABLES: 10},
+            SOLVER: "cbc",
+            SOLVER_OPTIONS: {},
+            SOLVER_INTERFACE: "shell",
+        }
+        for objective_value in (100, 20)
+    ]
+    merged_results = D7.merge_simulation_results(simulation_results)
+    assert merged_results[OBJECTIVE_VALUE] == 120
+    assert merged_results[SIMULTATION_TIME] == 3
+    assert merged_results[MODEL_SIZE] == {NUMBER_OF_VARIABLES: 20}
+    assert merged_results[SUBSYSTEMS] == 2
+    assert MODEL_CONSTRUCTION_PROFILE not in merged_results
+
+
+def test_merge_simulation_results_with_construction_profiles():
+    simulation_results = [
+        {
+            OBJECTIVE_VALUE: 100,
+            SIMULTATION_TIME: 1.5,
+            MODEL_SIZE: {NUMBER_OF_VARIABLES: 10},
+            SOLVER: "cbc",
+            SOLVER_OPTIONS: {},
+            SOLVER_INTERFACE: "shell",
+            MODEL_CONSTRUCTION_PROFILE: [
+                {
+                    PROFILE_CATEGORY: CATEGORY_OEMOF,
+                    PROFILE_COMPONENT: "Flow",
+                    PROFILE_CALLS: 1,
+                    PROFILE_TIME: 0.25,
+                }
+            ],
+        }
+        for _ in range(2)
+    ]
+    merged_results = D7.merge_simulation_results(simulation_results)
+    assert merged_results[MODEL_CONSTRUCTION_PROFILE] == [
+        {
+            PROFILE_CATEGORY: CATEGORY_OEMOF,
+            PROFILE_COMPONENT: "Flow",
+            PROFILE_CALLS: 2,
+            PROFILE_TIME: 0.5,
+        }
+    ]
+
+
+ISLAND_SUFFIX = " (island 2)"
+
+
+@pytest.fixture
+def dict_values():
+    answer = load_json(
+        os.path.join(TEST_REPO_PATH, TEST_INPUT_DIRECTORY, "inputs_for_D0", JSON_FNAME),
+        flag_missing_values=False,
+    )
+    answer[SIMULATION_SETTINGS].update({PATH_OUTPUT_FOLDER: TEST_OUTPUT_PATH})
+    answer[CONSTRAINTS][MAXIMUM_EMISSIONS][VALUE] = None
+    return answer
+
+
+def add_island(dict_values):
+    """Adds a copy of all busses and assets, which is not connected to the original ones"""
+    for group in (
+        ENERGY_BUSSES,
+        ENERGY_CONVERSION,
+        ENERGY_CONSUMPTION,
+        ENERGY_PRODUCTION,
+        ENERGY_STORAGE,
+    ):
+        for key, dict_asset in list(dict_values[group].items()):
+            island_asset = copy.deepcopy(dict_asset)
+            island_asset[LABEL] += ISLAND_SUFFIX
+            for direction in (INFLOW_DIRECTION, OUTFLOW_DIRECTION):
+                if isinstance(island_asset.get(direction), list):
+                    island_asset[direction] = [
+                        bus + ISLAND_SUFFIX for bus in island_asset[direction]
+                    ]
+                elif direction in island_asset:
+                    island_asset[direction] += ISLAND_SUFFIX
+            dict_values[group].update({key + ISLAND_SUFFIX: island_asset})
+
+
+def test_run_oemof_with_subsystems(dict_values):
+    results_meta, results_main = D0.run_oemof(dict_values)
+    objective_value = dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE]
+
+    add_island(dict_values)
+    dict_values[SIMULATION_SETTINGS].update({PARALLEL_SUBSYSTEMS: {VALUE: True}})
+    results_meta, results_main_islands = D0.run_oemof(dict_values)
+
+    assert dict_values[SIMULATION_RESULTS][SUBSYSTEMS] == 2
+    assert dict_values[SIMULATION_RESULTS][OBJECTIVE_VALUE] == pytest.approx(
+        2 * objective_value
+    )
+    results_main = processing.convert_keys_to_strings(results_main, True)
+    results_main_islands = processing.convert_keys_to_strings(
+        results_main_islands, True
+    )
+    assert len(results_main_islands) == 2 * len(results_main)
+    for (node, target), result in results_main.items():
+        island_key = (
+            node + ISLAND_SUFFIX,
+            None if target is None else target + ISLAND_SUFFIX,
+        )
+        assert results_main_islands[island_key]["sequences"].values == pytest.approx(
+            result["sequences"].values
+        )
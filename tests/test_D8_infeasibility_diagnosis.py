@@ -0,0 +1,151 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+from oemof import solph
+
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D2_model_constraints as D2
+import multi_vector_simulator.D8_infeasibility_diagnosis as D8
+from multi_vector_simulator.B0_data_input_json import load_json
+
+from multi_vector_simulator.utils.constants import SOLVER_INTERFACE_SHELL
+from multi_vector_simulator.utils.constants_json_strings import (
+    ENERGY_CONVERSION,
+    SIMULATION_SETTINGS,
+    CONSTRAINTS,
+    MAXIMUM_EMISSIONS,
+    INFEASIBILITY_DIAGNOSIS,
+    OPTIMIZE_CAP,
+    INSTALLED_CAP,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import (
+    MVSOemofError,
+    InvalidInfeasibilityDiagnosisError,
+)
+
+from _constants import (
+    TEST_REPO_PATH,
+    TEST_INPUT_DIRECTORY,
+    PATH_OUTPUT_FOLDER,
+    JSON_FNAME,
+)
+
+TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, "test_outputs")
+
+N_TIMESTEPS = 3
+
+
+def local_energy_system(maximum_emissions=None):
+    """Diesel generator of 5 kW supplying a demand of up to 8 kW"""
+    model = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=N_TIMESTEPS, freq="H")
+    )
+    electricity = solph.Bus(label="electricity")
+    model.add(
+        electricity,
+        solph.Source(
+            label="diesel",
+            outputs={
+                electricity: solph.Flow(
+                    nominal_value=5, variable_costs=1, emission_factor=0.5
+                )
+            },
+        ),
+        solph.Sink(
+            label="demand",
+            inputs={electricity: solph.Flow(fix=[3, 6, 8], nominal_value=1)},
+        ),
+    )
+    local_energy_system = solph.Model(model)
+    if maximum_emissions is not None:
+        D2.constraint_maximum_emissions(
+            local_energy_system,
+            {CONSTRAINTS: {MAXIMUM_EMISSIONS: {VALUE: maximum_emissions}}},
+        )
+    return local_energy_system
+
+
+def diagnose(local_energy_system):
+    local_energy_system.solve(solver="cbc")
+    assert D8.is_infeasible(local_energy_system) is True
+    return D0.model_building.diagnose_infeasibility(
+        {SIMULATION_SETTINGS: {PATH_OUTPUT_FOLDER: TEST_OUTPUT_PATH}},
+        local_energy_system,
+        "cbc",
+        SOLVER_INTERFACE_SHELL,
+        {},
+    )
+
+
+@pytest.fixture(autouse=True)
+def output_folder():
+    yield
+    if os.path.exists(TEST_OUTPUT_PATH):
+        shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
+
+
+def test_is_infeasibility_diagnosis_activated_not_defined():
+    assert D8.is_infeasibility_diagnosis_activated({SIMULATION_SETTINGS: {}}) is False
+
+
+def test_is_infeasibility_diagnosis_activated_invalid_value_raises_error():
+    with pytest.raises(InvalidInfeasibilityDiagnosisError):
+        D8.is_infeasibility_diagnosis_activated(
+            {SIMULATION_SETTINGS: {INFEASIBILITY_DIAGNOSIS: {VALUE: "yes"}}}
+        )
+
+
+def test_add_slack_variables():
+    model = local_energy_system(maximum_emissions=10)
+    relaxed_constraints = D8.add_slack_variables(model)
+    assert relaxed_constraints == [MAXIMUM_EMISSIONS]
+    assert len(getattr(model, D8.BUS_SHORTAGE)) == N_TIMESTEPS
+    assert len(getattr(model, D8.BUS_EXCESS)) == N_TIMESTEPS
+    assert hasattr(model, D8.CONSTRAINT_SLACK.format(MAXIMUM_EMISSIONS))
+
+
+def test_diagnose_infeasibility_bus_shortage():
+    model = local_energy_system()
+    diagnosis = diagnose(model)
+    slack = D8.get_slack(model, [])
+    assert list(slack[D8.SLACK_TYPE]) == [D8.BUS_SHORTAGE] * 2
+    assert list(slack[D8.SLACK_COMPONENT]) == ["electricity"] * 2
+    assert list(slack[D8.SLACK_TIMESTEP]) == list(model.es.timeindex[1:])
+    assert list(slack[D8.SLACK_VALUE]) == pytest.approx([1, 3])
+    assert "supply shortage on bus 'electricity' in 2 timestep(s)" in diagnosis
+    assert os.path.exists(
+        os.path.join(TEST_OUTPUT_PATH, D8.INFEASIBILITY_DIAGNOSIS_FILE)
+    )
+
+
+def test_diagnose_infeasibility_maximum_emissions():
+    model = local_energy_system(maximum_emissions=5)
+    diagnosis = diagnose(model)
+    slack = D8.get_slack(model, [MAXIMUM_EMISSIONS])
+    # the shortage of the demand is covered by bus slack, the emissions of the diesel generator
+    # (0.5 * (3 + 5 + 5)) exceed the maximum emissions
+    constraint_slack = slack[slack[D8.SLACK_COMPONENT] == MAXIMUM_EMISSIONS]
+    assert list(constraint_slack[D8.SLACK_VALUE]) == pytest.approx([1.5])
+    assert f"constraint {MAXIMUM_EMISSIONS} violated by 1.5" in diagnosis
+
+
+def test_run_oemof_infeasibility_diagnosis():
+    dict_values = load_json(
+        os.path.join(TEST_REPO_PATH, TEST_INPUT_DIRECTORY, "inputs_for_D0", JSON_FNAME),
+        flag_missing_values=False,
+    )
+    dict_values[SIMULATION_SETTINGS].update(
+        {PATH_OUTPUT_FOLDER: TEST_OUTPUT_PATH, INFEASIBILITY_DIAGNOSIS: {VALUE: True},}
+    )
+    # No supply from the grid and no discharge of the storage
+    for asset in ("transformer_station_in", "storage_charge_controller_out"):
+        dict_values[ENERGY_CONVERSION][asset][OPTIMIZE_CAP][VALUE] = False
+        dict_values[ENERGY_CONVERSION][asset][INSTALLED_CAP][VALUE] = 0
+    with pytest.raises(MVSOemofError, match="supply shortage on bus 'Electricity'"):
+        D0.run_oemof(dict_values)
+    assert os.path.exists(
+        os.path.join(TEST_OUTPUT_PATH, D8.INFEASIBILITY_DIAGNOSIS_FILE)
+    )
@@ -0,0 +1,135 @@
+import gzip
+import json
+import os
+import shutil
+
+import pandas as pd
+import pytest
+from oemof import solph
+
+import multi_vector_simulator.D0_modelling_and_optimization as D0
+import multi_vector_simulator.D9_solution_storage as D9
+from multi_vector_simulator.B0_data_input_json import load_json
+
+from multi_vector_simulator.utils.constants_json_strings import (
+    SIMULATION_SETTINGS,
+    SIMULATION_RESULTS,
+    STORE_SOLUTION,
+    SOLVER,
+    SIMULTATION_TIME,
+    SOLVER_ITERATIONS,
+    VALUE,
+)
+from multi_vector_simulator.utils.exceptions import InvalidSolutionStorageError
+
+from _constants import (
+    TEST_REPO_PATH,
+    TEST_INPUT_DIRECTORY,
+    PATH_OUTPUT_FOLDER,
+    JSON_FNAME,
+)
+
+TEST_OUTPUT_PATH = os.path.join(TEST_REPO_PATH, "test_outputs")
+SOLUTION_PATH = os.path.join(TEST_OUTPUT_PATH, D9.SOLUTION_FILE)
+
+
+def local_energy_system(n_timesteps=3):
+    """Diesel generator with a minimal load and pv plant supplying a demand"""
+    model = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=n_timesteps, freq="H")
+    )
+    electricity = solph.Bus(label="electricity")
+    model.add(
+        electricity,
+        solph.Source(
+            label="diesel",
+            outputs={
+                electricity: solph.Flow(
+                    nominal_value=10,
+                    variable_costs=1,
+                    min=0.2,
+                    nonconvex=solph.NonConvex(),
+                )
+            },
+        ),
+        solph.Source(
+            label="pv",
+            outputs={
+                electricity: solph.Flow(
+                    max=[0.5] * n_timesteps, investment=solph.Investment(ep_costs=0.1)
+                )
+            },
+        ),
+        solph.Sink(
+            label="demand",
+            inputs={electricity: solph.Flow(fix=[3] * n_timesteps, nominal_value=1)},
+        ),
+    )
+    return solph.Model(model)
+
+
+def solution_storage_settings(store_solution=None):
+    return {
+        SIMULATION_SETTINGS: {
+            PATH_OUTPUT_FOLDER: TEST_OUTPUT_PATH,
+            STORE_SOLUTION: {VALUE: store_solution},
+        }
+    }
+
+
+@pytest.fixture(autouse=True)
+def output_folder():
+    yield
+    if os.path.exists(TEST_OUTPUT_PATH):
+        shutil.rmtree(TEST_OUTPUT_PATH, ignore_errors=True)
+
+
+@pytest.fixture
+def stored_solution():
+    model = local_energy_system()
+    model.solve(solver="cbc")
+    dict_values = solution_storage_settings(store_solution=True)
+    dict_values[SIMULATION_RESULTS] = {
+        SOLVER: "cbc",
+        SIMULTATION_TIME: 1.5,
+        SOLVER_ITERATIONS: D9.get_solver_iterations(model),
+    }
+    D9.store_solution(dict_values, model)
+    return model
+
+
+def test_is_solution_storage_activated_not_defined():
+    assert D9.is_solution_storage_activated({SIMULATION_SETTINGS: {}}) is False
+
+
+def test_is_solution_storage_activated_invalid_value_raises_error():
+    with pytest.raises(InvalidSolutionStorageError):
+        D9.is_solution_storage_activated(
+            solution_storage_settings(store_solution="yes")
+        )
+
+
+def test_store_solution(stored_solution):
+    with gzip.open(SOLUTION_PATH, "rt") as solution_file:
+        solution = json.load(solution_file)
+    assert solution[SOLVER] == "cbc"
+    assert isinstance(solution[SOLVER_ITERATIONS], int)
+    variables = solution[D9.SOLUTION_VARIABLES]
+    assert variables == D9.get_solution(stored_solution)
+    assert variables["flow[pv,electricity,0]"] == pytest.approx(3)
+
+
+def test_run_oemof_with_solution_storage():
+    dict_values = load_json(
+        os.path.join(TEST_REPO_PATH, TEST_INPUT_DIRECTORY, "inputs_for_D0", JSON_FNAME),
+        flag_missing_values=False,
+    )
+    dict_values[SIMULATION_SETTINGS].update(
+        {PATH_OUTPUT_FOLDER: TEST_OUTPUT_PATH, STORE_SOLUTION: {VALUE: True}}
+    )
+    D0.run_oemof(dict_values)
+    with gzip.open(SOLUTION_PATH, "rt") as solution_file:
+        solution = json.load(solution_file)
+    assert (
+        solution[SIMULTATION_TIME] == dict_values[SIMULATION_RESULTS][SIMULTATION_TIME]
+    )
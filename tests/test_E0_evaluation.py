@@ -22,6 +22,17 @@ from multi_vector_simulator.utils.constants_json_strings import (
     KPI_SCALAR_MATRIX,
     KPI_SCALARS_DICT,
     OPTIMIZED_FLOWS,
+    LABEL,
+    UNIT,
+    COST_TOTAL,
+    INSTALLED_CAP,
+    OPTIMIZED_ADD_CAP,
+    TOTAL_FLOW,
+    PEAK_FLOW,
+)
+from multi_vector_simulator.utils.constants_output import (
+    KPI_COST_MATRIX_ENTRIES,
+    KPI_SCALAR_MATRIX_ENTRIES,
 )
 from _constants import (
     TEST_REPO_PATH,
@@ -76,28 +87,49 @@ def setup_module(m_args):
 
 
 def test_store_result_matrix():
-    dict_kpi = {
-        KPI_COST_MATRIX: pd.DataFrame(columns=["A", "B", "C"]),
-        KPI_SCALAR_MATRIX: pd.DataFrame(columns=["D", "E", "F", "G"]),
-    }
+    dict_kpi = {KPI_COST_MATRIX: [], KPI_SCALAR_MATRIX: []}
     dict_asset = {
-        "A": 3.551111,
-        "B": "str",
-        "D": None,
-        "E": {VALUE: 2},
-        "F": False,
-        "G": {VALUE: None},  # Returns empty cell
+        LABEL: "str",
+        COST_TOTAL: 3.551111,
+        UNIT: "kW",
+        INSTALLED_CAP: {VALUE: 2},
+        OPTIMIZED_ADD_CAP: {VALUE: None},  # Returns empty cell
+        TOTAL_FLOW: None,
+        PEAK_FLOW: False,
         "H": 1,
     }
 
     E0.store_result_matrix(dict_kpi, dict_asset)
-    assert len(dict_kpi[KPI_COST_MATRIX]) == 1
-    assert len(dict_kpi[KPI_SCALAR_MATRIX]) == 1
-    assert dict_kpi[KPI_COST_MATRIX]["A"][0] == 3.55111
-    assert dict_kpi[KPI_COST_MATRIX]["B"][0] == "str"
-    assert dict_kpi[KPI_SCALAR_MATRIX]["D"][0] is None
-    assert dict_kpi[KPI_SCALAR_MATRIX]["E"][0] == 2
-    assert dict_kpi[KPI_SCALAR_MATRIX]["F"][0] is False
+    assert dict_kpi[KPI_COST_MATRIX] == [{LABEL: "str", COST_TOTAL: 3.55111}]
+    assert dict_kpi[KPI_SCALAR_MATRIX] == [
+        {
+            LABEL: "str",
+            UNIT: "kW",
+            INSTALLED_CAP: 2,
+            TOTAL_FLOW: None,
+            PEAK_FLOW: False,
+        }
+    ]
+
+
+def test_build_result_matrices():
+    dict_kpi = {KPI_COST_MATRIX: [], KPI_SCALAR_MATRIX: []}
+    for label, installed_cap in [("pv", 2), ("wind", None)]:
+        E0.store_result_matrix(
+            dict_kpi,
+            {LABEL: label, COST_TOTAL: 1.5, INSTALLED_CAP: {VALUE: installed_cap}},
+        )
+    E0.build_result_matrices(dict_kpi)
+    cost_matrix = dict_kpi[KPI_COST_MATRIX]
+    scalar_matrix = dict_kpi[KPI_SCALAR_MATRIX]
+    assert list(cost_matrix.columns) == KPI_COST_MATRIX_ENTRIES
+    assert list(scalar_matrix.columns) == KPI_SCALAR_MATRIX_ENTRIES
+    assert list(cost_matrix[LABEL]) == ["pv", "wind"]
+    assert cost_matrix[LABEL].dtype == object
+    assert list(cost_matrix[COST_TOTAL]) == [1.5, 1.5]
+    assert scalar_matrix[INSTALLED_CAP][0] == 2
+    assert pd.isna(scalar_matrix[INSTALLED_CAP][1])
+    assert (scalar_matrix.drop(columns=[LABEL, UNIT]).dtypes == float).all()
 
 
 def test_evaluate_dict_append_new_fields():
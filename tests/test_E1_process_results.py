@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
 import os
 import logging
 import shutil
+import warnings
 import mock
+import pytest
 import oemof.solph as solph
 import pickle
 
@@ -13,7 +16,7 @@ import multi_vector_simulator.C0_data_processing as C0
 import multi_vector_simulator.D0_modelling_and_optimization as D0
 import multi_vector_simulator.E1_process_results as E1
 
-from multi_vector_simulator.utils.constants import OUTPUT_FOLDER, CSV_EXT
+from multi_vector_simulator.utils.constants import OUTPUT_FOLDER, CSV_EXT, TYPE_NONE
 
 from multi_vector_simulator.utils.constants_json_strings import *
 
@@ -36,6 +39,97 @@ BUS_DATA_DUMP = os.path.join(TEST_REPO_PATH, "bus_data_E1.p")
 # Note: test functions might be summed up in classes..
 
 
+def results_of_storage_system():
+    """oemof results of a pv plant and a storage supplying a demand"""
+    model = solph.EnergySystem(
+        timeindex=pd.date_range("2020-01-01", periods=3, freq="H")
+    )
+    electricity = solph.Bus(label="Electricity")
+    model.add(
+        electricity,
+        solph.Source(
+            label="pv",
+            outputs={
+                electricity: solph.Flow(
+                    max=[1, 0, 0], investment=solph.Investment(ep_costs=0.1)
+                )
+            },
+        ),
+        solph.components.GenericStorage(
+            label="battery",
+            inputs={electricity: solph.Flow()},
+            outputs={electricity: solph.Flow()},
+            investment=solph.Investment(ep_costs=0.2),
+            invest_relation_input_capacity=1,
+            invest_relation_output_capacity=1,
+        ),
+        solph.Sink(
+            label="demand",
+            inputs={electricity: solph.Flow(fix=[1, 2, 3], nominal_value=1)},
+        ),
+    )
+    local_energy_system = solph.Model(model)
+    local_energy_system.solve(solver="cbc")
+    return solph.processing.results(local_energy_system)
+
+
+def test_get_flow_matrix():
+    results_main = results_of_storage_system()
+    flow_matrix = E1.get_flow_matrix(results_main)
+    values = flow_matrix[E1.FLOW_MATRIX_VALUES]
+    columns = flow_matrix[E1.FLOW_MATRIX_COLUMNS]
+    assert values.shape == (3, len(columns))
+    assert values.flags["F_CONTIGUOUS"]
+    assert (("battery", TYPE_NONE), "storage_content") in columns
+    column = columns.index((("pv", "Electricity"), "flow"))
+    assert list(values[:, column]) == [6, 0, 0]
+    assert flow_matrix[E1.FLOW_MATRIX_SCALARS][
+        (("pv", "Electricity"), "invest")
+    ] == pytest.approx(6)
+    assert flow_matrix[E1.FLOW_MATRIX_TOTALS][column] == 6
+    assert flow_matrix[E1.FLOW_MATRIX_PEAKS][column] == 6
+
+
+def test_get_node_results():
+    results_main = results_of_storage_system()
+    flow_matrix = E1.get_flow_matrix(results_main)
+    for node in ["Electricity", "battery"]:
+        node_results = E1.get_node_results(flow_matrix, node)
+        expected = solph.views.node(results_main, node)
+        assert list(node_results["sequences"].keys()) == list(
+            expected["sequences"].columns
+        )
+        for key, flow in node_results["sequences"].items():
+            pd.testing.assert_series_equal(
+                flow, expected["sequences"][key], check_names=False
+            )
+            # the time series are views of the flow matrix
+            assert np.shares_memory(flow.values, flow_matrix[E1.FLOW_MATRIX_VALUES])
+        assert node_results["scalars"] == expected["scalars"].to_dict()
+
+
+def test_add_info_flows_with_flow_statistics():
+    """The statistics of the flow matrix are the ones computed for the single flow"""
+    results_main = results_of_storage_system()
+    flow_matrix = E1.get_flow_matrix(results_main)
+    bus = E1.get_node_results(flow_matrix, "Electricity")
+    settings = {EVALUATED_PERIOD: {VALUE: 365}}
+    key = (("Electricity", "demand"), "flow")
+    dict_asset = {}
+    E1.add_info_flows(
+        settings,
+        dict_asset,
+        bus["sequences"][key],
+        flow_statistics=E1.get_flow_statistics(bus, key),
+    )
+    dict_asset_single_flow = {}
+    E1.add_info_flows(settings, dict_asset_single_flow, bus["sequences"][key])
+    for parameter in [TOTAL_FLOW, ANNUAL_TOTAL_FLOW, PEAK_FLOW, AVERAGE_FLOW]:
+        assert dict_asset[parameter] == dict_asset_single_flow[parameter]
+    assert dict_asset[TOTAL_FLOW][VALUE] == 6
+    assert dict_asset[PEAK_FLOW][VALUE] == 3
+
+
 class TestGetTimeseriesPerBus:
     @mock.patch(
         "argparse.ArgumentParser.parse_args",
@@ -123,6 +217,29 @@ class TestGetTimeseriesPerBus:
             os.remove(BUS_DATA_DUMP)
 
 
+def test_get_timeseries_per_bus_large_bus():
+    """The data frame of a bus with 200 assets is built from one array of all flows"""
+    time_index = pd.date_range("2020-01-01", freq="H", periods=8760)
+    flow = pd.Series(np.arange(8760, dtype=float), index=time_index)
+    sequences = {(("storage", "bus"), "flow"): flow, (("bus", "storage"), "flow"): flow}
+    for asset in range(99):
+        sequences[((f"source {asset}", "bus"), "flow")] = flow
+        sequences[(("bus", f"sink {asset}"), "flow")] = flow
+    dict_values = {SIMULATION_SETTINGS: {TIME_INDEX: time_index}}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", pd.errors.PerformanceWarning)
+        E1.get_timeseries_per_bus(
+            dict_values=dict_values, bus_data={"bus": {"sequences": sequences}}
+        )
+    df = dict_values[OPTIMIZED_FLOWS]["bus"]
+    assert df.shape == (8760, 200)
+    assert list(df.columns[:2]) == [f"storage {OUTPUT_POWER}", "source 0"]
+    assert f"storage {INPUT_POWER}" in df.columns
+    assert df["source 98"].equals(flow)
+    assert df["sink 98"].equals(-flow)
+    assert (df.dtypes == float).all()
+
+
 def test_get_storage_results_optimize():
     pass
     # check dict_asset updated. updated are for all functions:
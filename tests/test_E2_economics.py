@@ -29,6 +29,8 @@ from multi_vector_simulator.utils.constants_json_strings import (
     COST_OPERATIONAL_TOTAL,
     COST_DISPATCH,
     COST_OM,
+    COST_UPFRONT,
+    COST_REPLACEMENT,
     LCOE_ASSET,
     ENERGY_CONSUMPTION,
     ENERGY_CONVERSION,
@@ -265,6 +267,100 @@ def test_calculate_annual_dispatch_expenditures_str_error():
         )
 
 
+def asset_with_costs(label, dispatch_price, flow, **parameters):
+    asset_costs = {
+        LABEL: label,
+        LIFETIME_SPECIFIC_COST: {VALUE: 0},
+        LIFETIME_PRICE_DISPATCH: {VALUE: dispatch_price},
+        FLOW: flow,
+    }
+    for parameter in E2.ASSET_TABLE_PARAMETERS:
+        asset_costs.update({parameter: {VALUE: parameters.get(parameter, 0)}})
+    return asset_costs
+
+
+def test_get_costs_of_assets():
+    """Tests whether the costs of several assets calculated at once are the costs of each asset."""
+    assets = [
+        asset_with_costs(
+            "pv",
+            0.5,
+            flow,
+            **{
+                OPTIMIZED_ADD_CAP: 10,
+                SPECIFIC_COSTS: 100,
+                DEVELOPMENT_COSTS: 200,
+                INSTALLED_CAP: 5,
+                LIFETIME_SPECIFIC_COST_OM: 3,
+            },
+        ),
+        asset_with_costs(
+            "generator",
+            [1, pd.Series([1, 2, 3])],
+            flow,
+            **{
+                SPECIFIC_REPLACEMENT_COSTS_INSTALLED: 4,
+                SPECIFIC_REPLACEMENT_COSTS_OPTIMIZED: 2,
+                INSTALLED_CAP: 1,
+                OPTIMIZED_ADD_CAP: 2,
+            },
+        ),
+    ]
+    E2.get_costs_of_assets(assets, dict_economic)
+    expected_costs = {
+        "pv": {
+            COST_UPFRONT: 1200,
+            COST_REPLACEMENT: 0,
+            COST_OM: 45,
+            COST_DISPATCH: 1.5,
+            COST_TOTAL: 1246.5,
+        },
+        "generator": {
+            COST_UPFRONT: 0,
+            COST_REPLACEMENT: 8,
+            COST_OM: 0,
+            COST_DISPATCH: 9,
+            COST_TOTAL: 17,
+        },
+    }
+    for asset_costs in assets:
+        for cost, value in expected_costs[asset_costs[LABEL]].items():
+            assert asset_costs[cost][VALUE] == pytest.approx(
+                value
+            ), f"The {cost} of asset {asset_costs[LABEL]} are {asset_costs[cost][VALUE]} instead of {value}."
+        assert asset_costs[ANNUITY_TOTAL][VALUE] == pytest.approx(
+            asset_costs[COST_TOTAL][VALUE] * dict_economic[CRF][VALUE]
+        )
+
+
+def test_calculate_dispatch_expenditures_of_assets():
+    """Tests whether the dispatch expenditures of several assets are the ones of each asset."""
+    dispatch_prices = [1, pd.Series([1, 2, 3]), [1, [1, 2]], [1, pd.Series([1, 2, 3])]]
+    assets = [
+        asset_with_costs(f"asset_{i}", dispatch_price, flow * (i + 1))
+        for i, dispatch_price in enumerate(dispatch_prices)
+    ]
+    dispatch_expenditures = E2.calculate_dispatch_expenditures_of_assets(assets)
+    for asset_costs, dispatch_expenditure in zip(assets, dispatch_expenditures):
+        assert dispatch_expenditure == pytest.approx(
+            E2.calculate_dispatch_expenditures(
+                asset_costs[LIFETIME_PRICE_DISPATCH][VALUE],
+                asset_costs[FLOW],
+                asset_costs[LABEL],
+            )
+        )
+
+
+def test_calculate_dispatch_expenditures_of_assets_str_error():
+    """Tests if a error is raised if one of the dispatch prices is provided as a str."""
+    assets = [
+        asset_with_costs("asset", 1, flow),
+        asset_with_costs("str_asset", [1, "hi"], flow),
+    ]
+    with pytest.raises(TypeError):
+        E2.calculate_dispatch_expenditures_of_assets(assets)
+
+
 def test_all_list_in_dict_passes_as_all_keys_included():
     """Tests whether looking for list items in dict_asset is plausible."""
     list_true = [ANNUAL_TOTAL_FLOW, OPTIMIZED_ADD_CAP]
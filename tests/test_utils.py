@@ -1,15 +1,47 @@
+import logging
 import os
 import shutil
+import threading
+import pytest
 import pandas as pd
 
 from _constants import TEST_REPO_PATH
 
 from multi_vector_simulator.utils.helpers import find_value_by_key
+from multi_vector_simulator.utils.asset_registry import (
+    AssetRegistry,
+    build_asset_registry,
+    get_asset_registry,
+)
+from multi_vector_simulator.utils.simulation_log import (
+    simulation_log,
+    get_log_messages,
+)
+from multi_vector_simulator.utils import model_profiling
+from multi_vector_simulator.utils.exceptions import (
+    DuplicateLabels,
+    InvalidModelProfilingError,
+)
 from multi_vector_simulator.utils.constants_json_strings import (
     UNIT,
     LABEL,
     ENERGY_PROVIDERS,
     ENERGY_PRODUCTION,
+    ENERGY_CONSUMPTION,
+    ENERGY_CONVERSION,
+    ENERGY_BUSSES,
+    ENERGY_VECTOR,
+    INFLOW_DIRECTION,
+    OUTFLOW_DIRECTION,
+    DSO_CONSUMPTION,
+    DSO_FEEDIN,
+    AUTO_SINK,
+    CONNECTED_FEEDIN_SINK,
+    ERRORS,
+    WARNINGS,
+    SIMULATION_SETTINGS,
+    PROFILE_MODEL_CONSTRUCTION,
+    VALUE,
 )
 
 
@@ -65,3 +97,248 @@ def test_find_value_by_key_multiple_key_apperance():
     assert (
         result == expected_output
     ), f"Not all key duplicates ({expected_output}) were identified, but {result}."
+
+
+ELECTRICITY = "Electricity"
+HEAT = "Heat"
+DSO = "DSO"
+dict_values_asset_registry = {
+    ENERGY_BUSSES: {
+        ELECTRICITY: {LABEL: ELECTRICITY, ENERGY_VECTOR: ELECTRICITY},
+        HEAT: {LABEL: HEAT, ENERGY_VECTOR: HEAT},
+    },
+    ENERGY_PROVIDERS: {
+        DSO: {
+            LABEL: "Grid",
+            ENERGY_VECTOR: ELECTRICITY,
+            CONNECTED_FEEDIN_SINK: DSO + DSO_FEEDIN + AUTO_SINK,
+        }
+    },
+    ENERGY_PRODUCTION: {
+        "pv": {LABEL: "PV", OUTFLOW_DIRECTION: ELECTRICITY, ENERGY_VECTOR: ELECTRICITY},
+        DSO
+        + DSO_CONSUMPTION: {
+            LABEL: "DSO source",
+            OUTFLOW_DIRECTION: ELECTRICITY,
+            ENERGY_VECTOR: ELECTRICITY,
+        },
+    },
+    ENERGY_CONVERSION: {
+        "heat_pump": {
+            LABEL: "Heat pump",
+            INFLOW_DIRECTION: ELECTRICITY,
+            OUTFLOW_DIRECTION: HEAT,
+            ENERGY_VECTOR: HEAT,
+        },
+    },
+    ENERGY_CONSUMPTION: {
+        "demand": {LABEL: "Demand", INFLOW_DIRECTION: HEAT, ENERGY_VECTOR: HEAT},
+        DSO
+        + DSO_FEEDIN
+        + AUTO_SINK: {
+            LABEL: "DSO sink",
+            INFLOW_DIRECTION: [ELECTRICITY],
+            ENERGY_VECTOR: ELECTRICITY,
+        },
+    },
+}
+
+
+def test_asset_registry_label_lookup():
+    asset_registry = AssetRegistry(dict_values_asset_registry)
+    assert "PV" in asset_registry, f"The asset label PV is not registered."
+    group, key, dict_asset = asset_registry.get("Heat pump")
+    assert (
+        group == ENERGY_CONVERSION and key == "heat_pump"
+    ), f"The asset Heat pump should be registered as {ENERGY_CONVERSION}, heat_pump, but is {group}, {key}."
+    assert (
+        dict_asset is dict_values_asset_registry[ENERGY_CONVERSION]["heat_pump"]
+    ), f"The registry should refer to the asset dict of dict_values, not to a copy."
+    assert (
+        asset_registry.get(HEAT)[0] == ENERGY_BUSSES
+    ), f"The bus {HEAT} is not registered as {ENERGY_BUSSES}."
+
+
+def test_asset_registry_incoming_and_outgoing_assets_of_bus():
+    asset_registry = AssetRegistry(dict_values_asset_registry)
+    assert asset_registry.get_incoming_assets(ELECTRICITY) == [
+        "PV",
+        "DSO source",
+    ], f"The assets feeding into bus {ELECTRICITY} are not identified correctly: {asset_registry.get_incoming_assets(ELECTRICITY)}."
+    assert asset_registry.get_outgoing_assets(ELECTRICITY) == [
+        "Heat pump",
+        "DSO sink",
+    ], f"The assets supplied by bus {ELECTRICITY} are not identified correctly: {asset_registry.get_outgoing_assets(ELECTRICITY)}."
+    assert asset_registry.get_incoming_assets(HEAT) == ["Heat pump"]
+    assert asset_registry.get_outgoing_assets(HEAT) == ["Demand"]
+    assert asset_registry.has_bus(HEAT) and not asset_registry.has_bus("Gas")
+
+
+def test_asset_registry_assets_of_energy_vector():
+    asset_registry = AssetRegistry(dict_values_asset_registry)
+    assert asset_registry.get_assets_of_energy_vector(HEAT) == [
+        "Heat pump",
+        "Demand",
+    ], f"The assets of energy vector {HEAT} are not identified correctly: {asset_registry.get_assets_of_energy_vector(HEAT)}."
+    assert asset_registry.get_assets_of_energy_vector("Gas") == []
+
+
+def test_asset_registry_energy_provider_assets():
+    asset_registry = AssetRegistry(dict_values_asset_registry)
+    assert asset_registry.energy_provider_consumption_sources == {
+        DSO: DSO + DSO_CONSUMPTION
+    }
+    assert asset_registry.energy_provider_feedin_sinks == {
+        DSO: DSO + DSO_FEEDIN + AUTO_SINK
+    }
+
+
+def test_asset_registry_check_for_label_duplicates():
+    dict_values = {
+        ENERGY_PRODUCTION: {"pv": {LABEL: "PV"}},
+        ENERGY_CONSUMPTION: {"pv": {LABEL: "PV"}},
+    }
+    with pytest.raises(DuplicateLabels):
+        build_asset_registry(dict_values)
+
+
+def test_build_asset_registry_not_stored_in_dict_values():
+    dict_values = {ENERGY_PRODUCTION: {"pv": {LABEL: "PV"}}}
+    asset_registry = build_asset_registry(dict_values)
+    assert list(dict_values) == [
+        ENERGY_PRODUCTION
+    ], f"The asset registry should not be stored in dict_values."
+    assert (
+        get_asset_registry(dict_values) is asset_registry
+    ), f"The built asset registry should be returned by get_asset_registry()."
+
+
+def test_get_asset_registry_of_other_dict_values():
+    dict_values = {ENERGY_PRODUCTION: {"pv": {LABEL: "PV"}}}
+    asset_registry = build_asset_registry(dict_values)
+    other_dict_values = {ENERGY_PRODUCTION: {"wind": {LABEL: "Wind"}}}
+    other_asset_registry = get_asset_registry(other_dict_values)
+    assert (
+        "Wind" in other_asset_registry and "PV" not in other_asset_registry
+    ), f"The asset registry of other dict_values should be built from them."
+    assert (
+        get_asset_registry(other_dict_values) is other_asset_registry
+    ), f"The asset registry should only be built once."
+    assert get_asset_registry(
+        dict_values
+    ) is not asset_registry and "PV" in get_asset_registry(
+        dict_values
+    ), f"The asset registry should be built again for the previous dict_values."
+
+
+def test_simulation_log_captures_warnings_and_errors():
+    with simulation_log() as log_handler:
+        logging.info("info message")
+        logging.warning("warning message")
+        logging.error("error message")
+    log_messages = get_log_messages(log_handler.records)
+    assert log_messages == {
+        ERRORS: {1: "error message"},
+        WARNINGS: {1: "warning message"},
+    }
+    logging.warning("message after the simulation")
+    assert (
+        len(log_handler.records) == 2
+    ), f"The handler should be removed after the run."
+
+
+def test_simulation_log_writes_log_file(tmpdir):
+    path_log_file = os.path.join(tmpdir, "log_file.log")
+    with simulation_log(path_log_file=path_log_file):
+        logging.debug("debug message")
+    with open(path_log_file) as log_file:
+        assert "DEBUG" in log_file.read()
+
+
+def test_simulation_log_ignores_other_threads():
+    with simulation_log() as log_handler:
+        thread = threading.Thread(target=logging.warning, args=("other simulation",))
+        thread.start()
+        thread.join()
+        logging.warning("this simulation")
+    assert [record.getMessage() for record in log_handler.records] == [
+        "this simulation"
+    ]
+
+
+def test_simulation_log_restores_root_logger():
+    root_logger = logging.getLogger()
+    level = root_logger.level
+    handlers = list(root_logger.handlers)
+    with simulation_log(path_log_file=None, screen_level=logging.DEBUG):
+        assert root_logger.level == logging.DEBUG
+    assert root_logger.level == level
+    assert root_logger.handlers == handlers
+
+
+def test_is_profiling_activated_not_defined():
+    assert model_profiling.is_profiling_activated({SIMULATION_SETTINGS: {}}) is False
+
+
+def test_is_profiling_activated_invalid_value_raises_error():
+    with pytest.raises(InvalidModelProfilingError):
+        model_profiling.is_profiling_activated(
+            {SIMULATION_SETTINGS: {PROFILE_MODEL_CONSTRUCTION: {VALUE: "yes"}}}
+        )
+
+
+def test_construction_profile():
+    profile = model_profiling.ConstructionProfile()
+    with model_profiling.construction_profile(profile):
+        for _ in range(2):
+            with model_profiling.timed(model_profiling.CATEGORY_D1, "source"):
+                pass
+        with model_profiling.timed(model_profiling.CATEGORY_D2, "constraint"):
+            sum(range(10000))
+    with model_profiling.timed(model_profiling.CATEGORY_D1, "not profiled"):
+        pass
+    assert model_profiling.get_active_profile() is None
+    table = profile.table()
+    assert [row[model_profiling.PROFILE_COMPONENT] for row in table] == [
+        "constraint",
+        "source",
+    ]
+    assert table[1][model_profiling.PROFILE_CALLS] == 2
+
+
+def test_construction_profile_ignores_other_threads():
+    profile = model_profiling.ConstructionProfile()
+
+    def build_other_model():
+        with model_profiling.timed(model_profiling.CATEGORY_D1, "other"):
+            pass
+
+    with model_profiling.construction_profile(profile):
+        thread = threading.Thread(target=build_other_model)
+        thread.start()
+        thread.join()
+    assert profile.table() == []
+
+
+def test_merge_profile_tables():
+    tables = [
+        [
+            {
+                model_profiling.PROFILE_CATEGORY: model_profiling.CATEGORY_OEMOF,
+                model_profiling.PROFILE_COMPONENT: component,
+                model_profiling.PROFILE_CALLS: 1,
+                model_profiling.PROFILE_TIME: time,
+            }
+            for component, time in components
+        ]
+        for components in ([("Flow", 0.5), ("Bus", 0.1)], [("Bus", 0.6)])
+    ]
+    merged_table = model_profiling.merge_profile_tables(tables)
+    assert [
+        (
+            row[model_profiling.PROFILE_COMPONENT],
+            row[model_profiling.PROFILE_CALLS],
+            row[model_profiling.PROFILE_TIME],
+        )
+        for row in merged_table
+    ] == [("Bus", 2, 0.7), ("Flow", 1, 0.5)]